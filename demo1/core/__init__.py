@@ -1,4 +1,15 @@
 from .base import BaseCore
-from .modules import DataProcessor, TextProcessor
+from .modules import (DataProcessor, TextProcessor, XorProcessor, SecretFinder, HashCracker,
+                      ImageProcessor, TiledImage, BitPlaneProcessor,
+                      LsbExtractor, ColorFilterProcessor, PngDimensionSolver,
+                      JigsawSolver, SeedShuffleSolver, ChaoticMapScrambler, AnimationDecoder,
+                      FrameReducer, ImageSequence, ColorFrequencyAnalyzer,
+                      SpectrumAnalyzer, ImageCombiner,
+                      BatchImageProcessor, PngInspector)
 
-__all__ = ['BaseCore', 'DataProcessor', 'TextProcessor']
\ No newline at end of file
+__all__ = ['BaseCore', 'DataProcessor', 'TextProcessor', 'XorProcessor', 'SecretFinder', 'HashCracker',
+           'ImageProcessor', 'TiledImage', 'BitPlaneProcessor',
+           'LsbExtractor', 'ColorFilterProcessor', 'PngDimensionSolver', 'JigsawSolver',
+           'SeedShuffleSolver', 'ChaoticMapScrambler', 'AnimationDecoder', 'FrameReducer', 'ImageSequence',
+           'ColorFrequencyAnalyzer', 'SpectrumAnalyzer',
+           'ImageCombiner', 'BatchImageProcessor', 'PngInspector']
\ No newline at end of file
@@ -1,6 +1,7 @@
 """
 核心业务逻辑基类
 """
+import threading
 from abc import ABC, abstractmethod
 
 
@@ -9,6 +10,8 @@ class BaseCore(ABC):
     
     def __init__(self):
         self._initialized = False
+        self._cancel_event = threading.Event()
+        self._progress_callback = None
     
     @abstractmethod
     def initialize(self):
@@ -24,3 +27,24 @@ class BaseCore(ABC):
     def cleanup(self):
         """清理资源"""
         pass
+    
+    def cancel(self):
+        """请求取消正在执行的长任务（由处理器在循环中检查）"""
+        self._cancel_event.set()
+    
+    def is_cancelled(self):
+        """是否已请求取消"""
+        return self._cancel_event.is_set()
+    
+    def reset_cancel(self):
+        """清除取消标记，开始新任务前调用"""
+        self._cancel_event.clear()
+    
+    def set_progress_callback(self, callback):
+        """设置进度回调 callback(dict)，可能在工作线程中被调用"""
+        self._progress_callback = callback
+    
+    def report_progress(self, current, total, **info):
+        """上报进度"""
+        if self._progress_callback:
+            self._progress_callback({'current': current, 'total': total, **info})
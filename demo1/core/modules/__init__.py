@@ -3,5 +3,30 @@
 """
 from .text_processor import TextProcessor
 from .data_processor import DataProcessor
+from .xor_processor import XorProcessor
+from .secret_finder import SecretFinder
+from .hash_cracker import HashCracker
+from .image_processor import ImageProcessor
+from .tiled_image import TiledImage
+from .bit_plane import BitPlaneProcessor
+from .lsb_extractor import LsbExtractor
+from .color_filter import ColorFilterProcessor
+from .png_crc_solver import PngDimensionSolver
+from .jigsaw_solver import JigsawSolver
+from .seed_shuffle import SeedShuffleSolver
+from .chaotic_map import ChaoticMapScrambler
+from .animation_decoder import AnimationDecoder
+from .frame_reducer import FrameReducer, ImageSequence
+from .color_frequency import ColorFrequencyAnalyzer
+from .spectrum_analyzer import SpectrumAnalyzer
+from .image_combiner import ImageCombiner
+from .batch_processor import BatchImageProcessor
+from .png_inspector import PngInspector
 
-__all__ = ['TextProcessor', 'DataProcessor']
+__all__ = ['TextProcessor', 'DataProcessor', 'XorProcessor', 'SecretFinder', 'HashCracker',
+           'ImageProcessor', 'TiledImage', 'BitPlaneProcessor',
+           'LsbExtractor', 'ColorFilterProcessor', 'PngDimensionSolver', 'JigsawSolver',
+           'SeedShuffleSolver', 'ChaoticMapScrambler', 'AnimationDecoder',
+           'FrameReducer', 'ImageSequence', 'ColorFrequencyAnalyzer',
+           'SpectrumAnalyzer', 'ImageCombiner',
+           'BatchImageProcessor', 'PngInspector']
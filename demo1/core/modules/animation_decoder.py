@@ -0,0 +1,707 @@
+"""
+动画帧引擎 - GIF / APNG 惰性逐帧解码
+
+打开文件时只扫描一遍块结构，为每帧记录数据位置、区域、延时、处置方式与调色板，不解码像素。
+取第 i 帧时：
+- 从 i 向前找最近的已缓存画布，或不依赖之前内容的关键帧（从空画布开始即可合成）
+- 从那里逐帧解码并合成到 i，途中每隔 CHECKPOINT_INTERVAL 帧把画布留作检查点
+- 显示过的帧与检查点分别放在按字节数限制的 LRU 中，拖动进度条时内存占用与总帧数无关
+
+GIF 的 LZW 在 Python 中逐码解码；APNG 的帧数据交给 PngStreamReader 做反滤波与像素转换。
+"""
+
+import os
+import struct
+import threading
+from collections import OrderedDict
+
+import numpy as np
+
+from ..base import BaseCore
+from .png_codec import PNG_SIGNATURE, PngStreamReader, read_chunk_header, write_png
+
+
+# 统一后的处置方式：none 保留画布，background 把帧区域清为透明，previous 恢复到绘制该帧之前
+DISPOSALS = ('none', 'background', 'previous')
+GIF_DISPOSALS = {2: 'background', 3: 'previous'}
+APNG_DISPOSALS = {0: 'none', 1: 'background', 2: 'previous'}
+
+# GIF 隔行扫描的 4 遍 (起始行, 行距)
+GIF_INTERLACE_PASSES = ((0, 8), (4, 8), (2, 4), (1, 2))
+
+LZW_MAX_CODES = 4096
+
+
+def lzw_decode(data, min_code_size, pixel_count):
+    """
+    GIF 变长 LZW 解码
+    
+    Args:
+        data (bytes): 去掉子块长度字节后的压缩数据
+        min_code_size (int): 图像数据前记录的最小码长
+        pixel_count (int): 期望的像素数，解出足够的像素后立即停止
+    
+    Returns:
+        bytearray: 调色板索引（数据损坏或不完整时比 pixel_count 短）
+    """
+    if not 1 <= min_code_size <= 11:
+        raise ValueError(f"无效的 LZW 最小码长: {min_code_size}")
+    clear = 1 << min_code_size
+    stop = clear + 1
+    table = [bytes((i,)) for i in range(clear)] + [b'', b'']
+    base = len(table)
+    size = min_code_size + 1
+    mask = (1 << size) - 1
+    out = bytearray()
+    buffer = bits = 0
+    previous = None
+    
+    for byte in data:
+        buffer |= byte << bits
+        bits += 8
+        while bits >= size:
+            code = buffer & mask
+            buffer >>= size
+            bits -= size
+            if code == clear:
+                del table[base:]
+                size = min_code_size + 1
+                mask = (1 << size) - 1
+                previous = None
+                continue
+            if code == stop:
+                return out[:pixel_count]
+            if code < len(table):
+                entry = table[code]
+                if previous is not None and len(table) < LZW_MAX_CODES:
+                    table.append(previous + entry[:1])
+            elif previous is not None and code == len(table):
+                # KwKwK：码恰好是下一个要加入的表项
+                entry = previous + previous[:1]
+                table.append(entry)
+            else:
+                return out[:pixel_count]
+            out += entry
+            previous = entry
+            if len(table) > mask and size < 12:
+                size += 1
+                mask = (1 << size) - 1
+            if len(out) >= pixel_count:
+                return out[:pixel_count]
+    return out[:pixel_count]
+
+
+def gif_interlace_rows(height):
+    """隔行扫描的 GIF 中，第 k 个存储行对应的图像行号"""
+    return np.concatenate([np.arange(start, height, step) for start, step in GIF_INTERLACE_PASSES])
+
+
+def read_sub_blocks(f):
+    """读取一串 GIF 数据子块，返回拼接后的数据"""
+    data = bytearray()
+    while True:
+        size = f.read(1)
+        if not size or not size[0]:
+            return bytes(data)
+        data += f.read(size[0])
+
+
+def skip_sub_blocks(f):
+    """跳过一串 GIF 数据子块（只读长度字节），返回其中的数据字节数"""
+    total = 0
+    while True:
+        size = f.read(1)
+        if not size or not size[0]:
+            return total
+        f.seek(size[0], os.SEEK_CUR)
+        total += size[0]
+
+
+def strip_sub_blocks(raw):
+    """去掉子块长度字节：raw 是从第一个长度字节开始的原始数据"""
+    data = bytearray()
+    pos = 0
+    while pos < len(raw) and raw[pos]:
+        data += raw[pos + 1:pos + 1 + raw[pos]]
+        pos += 1 + raw[pos]
+    return bytes(data)
+
+
+class _FrameCache:
+    """按字节数限制的 LRU（值为 (画布, 恢复画布或 None)，在引擎的锁内使用）"""
+    
+    def __init__(self, max_bytes):
+        self.max_bytes = max_bytes
+        self.total_bytes = 0
+        self._items = OrderedDict()
+    
+    def get(self, key):
+        if key not in self._items:
+            return None
+        self._items.move_to_end(key)
+        return self._items[key][0]
+    
+    def put(self, key, value):
+        self.total_bytes -= self._items.pop(key, (None, 0))[1]
+        size = sum(array.nbytes for array in value if array is not None)
+        self._items[key] = (value, size)
+        self.total_bytes += size
+        while len(self._items) > 1 and self.total_bytes > self.max_bytes:
+            _, (_, old_size) = self._items.popitem(last=False)
+            self.total_bytes -= old_size
+    
+    def clear(self):
+        self._items.clear()
+        self.total_bytes = 0
+    
+    def __contains__(self, key):
+        return key in self._items
+    
+    def __len__(self):
+        return len(self._items)
+
+
+class _ApngFrameReader(PngStreamReader):
+    """按 APNG 帧的数据段解码：沿用 PngStreamReader 的头信息、反滤波与像素转换"""
+    
+    def __init__(self, header, file, width, height, segments):
+        self.__dict__.update(header.__dict__)
+        self.file = file
+        self.width, self.height = width, height
+        self.stride = width * self.bpp
+        self.segments = segments
+    
+    def _iter_idat(self):
+        for offset, length in self.segments:
+            self.file.seek(offset)
+            yield self.file.read(length)
+
+
+class AnimationDecoder(BaseCore):
+    """
+    GIF / APNG 帧引擎
+    
+    功能：
+    - 扫描块结构建立帧索引：区域、延时、处置方式、调色板、透明色、注释与尾部附加数据
+    - 按需解码并合成任意一帧（LRU 缓存 + 检查点），单帧原始像素与调色板索引
+    - 导出选中的帧（合成后的画布或帧区域原始像素）为 PNG
+    """
+    
+    # 每隔多少帧在合成途中保留一个检查点
+    CHECKPOINT_INTERVAL = 32
+    # 显示帧缓存与检查点缓存的字节数上限
+    CACHE_BYTES = 128 << 20
+    CHECKPOINT_BYTES = 128 << 20
+    
+    def __init__(self):
+        super().__init__()
+        self.file_path = None
+        self.file = None
+        self.format = None
+        self.width = self.height = 0
+        self.frames = []
+        self.result = None
+        self._png_header = None
+        self._lock = threading.Lock()
+        self._generation = 0  # 每次打开 / 关闭文件递增，解码途中文件被更换时据此发现
+        self._cache = _FrameCache(self.CACHE_BYTES)
+        self._checkpoints = _FrameCache(self.CHECKPOINT_BYTES)
+    
+    def initialize(self):
+        """初始化处理器"""
+        self._initialized = True
+        print("✅ AnimationDecoder 已初始化")
+    
+    def process(self, *args, **kwargs):
+        """
+        打开动画并建立帧索引（不解码像素）
+        
+        Args:
+            args[0] (str): GIF / PNG / APNG 文件路径
+            kwargs['options']: 处理选项
+                - cache_mb (int): 显示帧缓存上限（MB），默认 128
+                - checkpoint_mb (int): 检查点缓存上限（MB），默认 128
+        
+        Returns:
+            bool: 处理是否成功
+        """
+        if not self._initialized:
+            self.initialize()
+        
+        try:
+            self.reset_cancel()
+            file_path = args[0] if args else self.file_path
+            options = kwargs.get('options', {})
+            if not file_path:
+                print("❌ 没有动画文件")
+                return False
+            
+            self.open(file_path)
+            self._cache.max_bytes = int(options.get('cache_mb', self.CACHE_BYTES >> 20)) << 20
+            self._checkpoints.max_bytes = int(options.get('checkpoint_mb', self.CHECKPOINT_BYTES >> 20)) << 20
+            result = self.result
+            print(f"🎬 {result['format']} {self.width}x{self.height}, {len(self.frames)} 帧, "
+                  f"总时长 {result['duration'] / 1000:.2f} 秒, {result['key_frames']} 个关键帧")
+            return True
+        
+        except Exception as e:
+            print(f"❌ 处理失败: {e}")
+            return False
+    
+    def cleanup(self):
+        """清理资源"""
+        self.cancel()
+        self.close()
+        print("🧹 AnimationDecoder 已清理")
+    
+    def get_result(self):
+        """获取处理结果"""
+        return self.result
+    
+    # ==================== 业务逻辑方法 ====================
+    
+    def open(self, file_path):
+        """
+        打开文件并扫描帧索引
+        
+        Returns:
+            dict: format, width, height, frame_count, frames, loop, duration, key_frames,
+                  comments, trailing (结束标记之后的字节数), hidden_default (APNG 不参与动画的默认图像)
+        """
+        self.close()
+        f = open(file_path, 'rb')
+        try:
+            signature = f.read(8)
+            f.seek(0)
+            if signature[:6] in (b'GIF87a', b'GIF89a'):
+                info = self._index_gif(f)
+            elif signature == PNG_SIGNATURE:
+                info = self._index_apng(f, file_path)
+            else:
+                raise ValueError("不是 GIF / PNG 文件")
+            if not self.frames:
+                raise ValueError("文件中没有图像帧")
+        except Exception:
+            f.close()
+            self.frames = []
+            raise
+        
+        with self._lock:
+            self.file = f
+            self.file_path = file_path
+            self._generation += 1
+        self._mark_key_frames()
+        self.result = {
+            'format': self.format, 'width': self.width, 'height': self.height,
+            'frame_count': len(self.frames), 'frames': self.frames,
+            'duration': sum(frame['delay'] for frame in self.frames),
+            'key_frames': sum(frame['key'] for frame in self.frames),
+            **info,
+        }
+        return self.result
+    
+    def close(self):
+        """关闭文件并清空缓存"""
+        with self._lock:
+            if self.file:
+                self.file.close()
+            self.file = None
+            self.file_path = None
+            self.frames = []
+            self.result = None
+            self._generation += 1
+            self._cache.clear()
+            self._checkpoints.clear()
+    
+    @property
+    def generation(self):
+        """当前文件的代号，传给 frame / raw_frame 可保证结果来自同一个文件"""
+        with self._lock:
+            return self._generation
+    
+    def _check_file(self, generation):
+        """确认文件仍然打开且没有被更换（调用时需持有 _lock）"""
+        if self.file is None or (generation is not None and generation != self._generation):
+            raise ValueError("动画文件已关闭或已更换")
+    
+    def _index_gif(self, f):
+        """扫描 GIF 块结构：逻辑屏幕、全局调色板、图形控制扩展、图像描述符"""
+        header = f.read(13)
+        self.format = header[:6].decode('ascii')
+        self.width, self.height, packed, background, _ = struct.unpack('<HHBBB', header[6:13])
+        global_palette = self._read_palette(f, packed) if packed & 0x80 else None
+        
+        loop = None
+        comments = []
+        control = None
+        while True:
+            marker = f.read(1)
+            if not marker or marker == b'\x3b':
+                break
+            if marker == b'\x21':
+                label = f.read(1)
+                if label == b'\xf9':
+                    data = read_sub_blocks(f)
+                    if len(data) >= 4:
+                        flags, delay, transparent = struct.unpack('<BHB', data[:4])
+                        control = ((flags >> 2) & 7, delay * 10, transparent if flags & 1 else None)
+                elif label == b'\xff':
+                    data = read_sub_blocks(f)
+                    if data[:11] in (b'NETSCAPE2.0', b'ANIMEXTS1.0') and len(data) >= 14 and data[11] == 1:
+                        loop = struct.unpack('<H', data[12:14])[0]
+                elif label == b'\xfe':
+                    comments.append(read_sub_blocks(f).decode('latin-1'))
+                else:
+                    skip_sub_blocks(f)
+            elif marker == b'\x2c':
+                x, y, width, height, packed = struct.unpack('<HHHHB', f.read(9))
+                local = bool(packed & 0x80)
+                palette = self._read_palette(f, packed) if local else global_palette
+                min_code_size = f.read(1)
+                offset = f.tell()
+                size = skip_sub_blocks(f)
+                disposal, delay, transparent = control or (0, 0, None)
+                self.frames.append({
+                    'index': len(self.frames), 'x': x, 'y': y, 'width': width, 'height': height,
+                    'delay': delay, 'disposal': GIF_DISPOSALS.get(disposal, 'none'),
+                    'disposal_code': disposal, 'blend': 'over', 'transparent': transparent,
+                    'palette': palette, 'local_palette': local, 'interlaced': bool(packed & 0x40),
+                    'min_code_size': min_code_size[0] if min_code_size else 0,
+                    'segments': [(offset, f.tell() - offset)], 'data_size': size,
+                })
+                control = None
+            else:
+                # 未知标记：按数据结束处理
+                f.seek(-1, os.SEEK_CUR)
+                break
+        
+        end = f.tell()
+        trailing = f.seek(0, os.SEEK_END) - end
+        return {'loop': loop, 'comments': comments, 'trailing': trailing,
+                'background': background, 'hidden_default': False}
+    
+    @staticmethod
+    def _read_palette(f, packed):
+        """读取 2^(n+1) 项的 RGB 调色板"""
+        count = 2 << (packed & 7)
+        data = f.read(count * 3)
+        return np.frombuffer(data[:len(data) // 3 * 3], dtype=np.uint8).reshape(-1, 3)
+    
+    def _index_apng(self, f, file_path):
+        """扫描 APNG 块结构：acTL / fcTL / IDAT / fdAT（没有 fcTL 时当作单帧 PNG）"""
+        header = PngStreamReader(file_path)
+        header.close()
+        self._png_header = header
+        self.format = 'PNG'
+        self.width, self.height = header.width, header.height
+        
+        loop = None
+        comments = []
+        current = None
+        default_segments = []
+        f.seek(8)
+        while True:
+            length, chunk_type = read_chunk_header(f)
+            if not chunk_type or chunk_type == b'IEND':
+                break
+            offset = f.tell()
+            if chunk_type == b'acTL':
+                self.format = 'APNG'
+                _, loop = struct.unpack('>II', f.read(8))
+            elif chunk_type == b'fcTL':
+                (_, width, height, x, y, delay_num, delay_den,
+                 dispose, blend) = struct.unpack('>IIIIIHHBB', f.read(26))
+                current = {
+                    'index': len(self.frames), 'x': x, 'y': y, 'width': width, 'height': height,
+                    'delay': round(delay_num * 1000 / (delay_den or 100)),
+                    'disposal': APNG_DISPOSALS.get(dispose, 'none'), 'disposal_code': dispose,
+                    'blend': 'over' if blend else 'source', 'transparent': None,
+                    'palette': header.palette[:, :3] if header.palette is not None else None,
+                    'local_palette': False, 'interlaced': False, 'segments': [], 'data_size': 0,
+                }
+                self.frames.append(current)
+            elif chunk_type == b'IDAT':
+                # 第一个 fcTL 出现在 IDAT 之前时，默认图像就是第 0 帧
+                target = current['segments'] if current is not None else default_segments
+                target.append((offset, length))
+            elif chunk_type == b'fdAT' and current is not None:
+                current['segments'].append((offset + 4, length - 4))
+            elif chunk_type in (b'tEXt', b'iTXt', b'zTXt'):
+                comments.append(f"{chunk_type.decode()}: {f.read(length).decode('latin-1')}")
+            f.seek(offset + length + 4)
+        
+        for frame in self.frames:
+            frame['data_size'] = sum(length for _, length in frame['segments'])
+        hidden_default = bool(self.frames) and bool(default_segments)
+        if not self.frames and default_segments:
+            self.frames.append({
+                'index': 0, 'x': 0, 'y': 0, 'width': self.width, 'height': self.height, 'delay': 0,
+                'disposal': 'none', 'disposal_code': 0, 'blend': 'source', 'transparent': None,
+                'palette': header.palette[:, :3] if header.palette is not None else None,
+                'local_palette': False, 'interlaced': False, 'segments': default_segments,
+                'data_size': sum(length for _, length in default_segments),
+            })
+        self._default_segments = default_segments
+        end = f.tell() + 4
+        trailing = max(f.seek(0, os.SEEK_END) - end, 0)
+        return {'loop': loop, 'comments': comments, 'trailing': trailing,
+                'background': None, 'hidden_default': hidden_default}
+    
+    @property
+    def frame_count(self):
+        """帧数"""
+        return len(self.frames)
+    
+    @property
+    def is_gif(self):
+        """当前文件是否为 GIF"""
+        return bool(self.format) and self.format.startswith('GIF')
+    
+    def _mark_key_frames(self):
+        """
+        标记关键帧：绘制前的画布一定为空，或者帧覆盖整个画布、不透明且不需要恢复之前的画布
+        
+        从关键帧开始合成时直接使用空画布
+        """
+        empty = True
+        for frame in self.frames:
+            full = (frame['x'] == 0 and frame['y'] == 0 and frame['width'] >= self.width
+                    and frame['height'] >= self.height)
+            opaque = frame['transparent'] is None if self.is_gif else frame['blend'] == 'source'
+            # APNG 第一帧的 previous 按 background 处理
+            if frame['index'] == 0 and frame['disposal'] == 'previous' and self.format == 'APNG':
+                frame['disposal'] = 'background'
+            frame['key'] = empty or (full and opaque and frame['disposal'] != 'previous')
+            if frame['disposal'] == 'background':
+                empty = empty or full
+            elif frame['disposal'] == 'none':
+                empty = False
+    
+    # ==================== 单帧解码 ====================
+    
+    def frame_indices(self, index, generation=None):
+        """
+        GIF 帧区域的调色板索引
+        
+        Args:
+            generation (int): 期望的文件代号，文件已更换时抛出 ValueError
+        
+        Returns:
+            tuple: ((h, w) uint8 索引, (h, w) bool 有数据的像素；数据完整时为 None)
+        """
+        with self._lock:
+            self._check_file(generation)
+            frame = self.frames[index]
+            (offset, length), = frame['segments']
+            self.file.seek(offset)
+            raw = self.file.read(length)
+        width, height = frame['width'], frame['height']
+        data = lzw_decode(strip_sub_blocks(raw), frame['min_code_size'], width * height)
+        pixels = np.zeros(width * height, dtype=np.uint8)
+        pixels[:len(data)] = np.frombuffer(bytes(data), dtype=np.uint8)
+        valid = None
+        if len(data) < width * height:
+            valid = np.zeros(width * height, dtype=bool)
+            valid[:len(data)] = True
+            valid = valid.reshape(height, width)
+        pixels = pixels.reshape(height, width)
+        if frame['interlaced'] and height:
+            rows = gif_interlace_rows(height)
+            deinterlaced = np.empty_like(pixels)
+            deinterlaced[rows] = pixels
+            pixels = deinterlaced
+            if valid is not None:
+                mask = np.empty_like(valid)
+                mask[rows] = valid
+                valid = mask
+        return pixels, valid
+    
+    def raw_frame(self, index, generation=None):
+        """
+        帧区域的原始像素（未与之前的帧合成）
+        
+        Args:
+            generation (int): 期望的文件代号，文件已更换时抛出 ValueError
+        
+        Returns:
+            ndarray: (h, w, 4) RGBA，透明色与缺失的像素 Alpha 为 0
+        """
+        with self._lock:
+            self._check_file(generation)
+            frame = self.frames[index]
+        if self.is_gif:
+            pixels, valid = self.frame_indices(index, generation)
+            lut = np.zeros((256, 4), dtype=np.uint8)
+            palette = frame['palette']
+            if palette is not None:
+                lut[:len(palette), :3] = palette[:256]
+            lut[:, 3] = 255
+            if frame['transparent'] is not None:
+                lut[frame['transparent'], 3] = 0
+            rgba = lut[pixels]
+            if valid is not None:
+                rgba[~valid, 3] = 0
+            return rgba
+        
+        with self._lock:
+            self._check_file(generation)
+            reader = _ApngFrameReader(self._png_header, self.file, frame['width'], frame['height'],
+                                      frame['segments'])
+            rows = np.concatenate([strip for _, strip in reader.iter_strips(256)])
+        if rows.ndim == 2:
+            rgba = np.empty(rows.shape + (4,), dtype=np.uint8)
+            rgba[..., :3] = rows[..., None]
+            rgba[..., 3] = 255
+            return rgba
+        return rows
+    
+    def _draw(self, frame, canvas, generation):
+        """把一帧画到画布上（区域超出画布的部分裁掉）"""
+        pixels = self.raw_frame(frame['index'], generation)
+        x, y = frame['x'], frame['y']
+        width = min(frame['width'], canvas.shape[1] - x)
+        height = min(frame['height'], canvas.shape[0] - y)
+        if width <= 0 or height <= 0:
+            return
+        pixels = pixels[:height, :width]
+        region = canvas[y:y + height, x:x + width]
+        if frame['blend'] == 'source':
+            region[...] = pixels
+            return
+        alpha = pixels[..., 3]
+        if self.is_gif:
+            # GIF 只有完全透明与完全不透明两种
+            opaque = alpha > 0
+            region[opaque] = pixels[opaque]
+            return
+        if alpha.min() == 255:
+            region[...] = pixels
+            return
+        # APNG over 混合（非预乘 Alpha）
+        source_alpha = alpha[..., None].astype(np.float32) / 255
+        target_alpha = region[..., 3:].astype(np.float32) / 255 * (1 - source_alpha)
+        out_alpha = source_alpha + target_alpha
+        color = (pixels[..., :3] * source_alpha + region[..., :3] * target_alpha) / np.maximum(out_alpha, 1e-6)
+        region[..., :3] = np.clip(color + 0.5, 0, 255).astype(np.uint8)
+        region[..., 3] = np.clip(out_alpha[..., 0] * 255 + 0.5, 0, 255).astype(np.uint8)
+    
+    def _dispose(self, frame, canvas, restore):
+        """按一帧的处置方式得到下一帧的起始画布（可能原地修改 canvas）"""
+        if frame['disposal'] == 'previous' and restore is not None:
+            return restore.copy()
+        if frame['disposal'] == 'background':
+            x, y = frame['x'], frame['y']
+            canvas[y:y + frame['height'], x:x + frame['width']] = 0
+        return canvas
+    
+    def _blank(self):
+        return np.zeros((self.height, self.width, 4), dtype=np.uint8)
+    
+    # ==================== 合成 ====================
+    
+    def frame(self, index, generation=None):
+        """
+        合成后的第 index 帧
+        
+        解码途中不持有锁，每次读文件与写缓存前都在锁内核对文件代号，
+        文件被关闭或更换时抛出 ValueError，旧文件的画布不会进入新文件的缓存
+        
+        Args:
+            generation (int): 期望的文件代号，默认取调用时的当前文件
+        
+        Returns:
+            ndarray: (H, W, 4) RGBA 只读数组（缓存中的画布，不要修改）
+        """
+        with self._lock:
+            generation = self._generation if generation is None else generation
+            self._check_file(generation)
+            if not 0 <= index < len(self.frames):
+                raise IndexError(f"帧号超出范围: {index}")
+            for cache in (self._cache, self._checkpoints):
+                entry = cache.get(index)
+                if entry is not None:
+                    if cache is self._checkpoints:
+                        self._cache.put(index, entry)
+                    return entry[0]
+            canvas, first = self._start_canvas(index)
+            # close / open 会换成新的帧列表，这里保留的仍是本文件的
+            frames = self.frames
+        
+        display = None
+        for k in range(first, index + 1):
+            restore = canvas.copy() if frames[k]['disposal'] == 'previous' else None
+            self._draw(frames[k], canvas, generation)
+            if k == index or k % self.CHECKPOINT_INTERVAL == 0:
+                display = canvas.copy()
+                display.flags.writeable = False
+                with self._lock:
+                    self._check_file(generation)
+                    (self._cache if k == index else self._checkpoints).put(k, (display, restore))
+            if k < index:
+                canvas = self._dispose(frames[k], canvas, restore)
+        return display
+    
+    def _start_canvas(self, index):
+        """从 index 向前找最近的缓存画布或关键帧，返回 (起始画布, 第一帧要绘制的帧号)"""
+        for j in range(index, -1, -1):
+            if j < index:
+                entry = self._cache.get(j) or self._checkpoints.get(j)
+                if entry is not None:
+                    display, restore = entry
+                    return self._dispose(self.frames[j], display.copy(), restore), j + 1
+            if self.frames[j]['key']:
+                return self._blank(), j
+        return self._blank(), 0
+    
+    def is_cached(self, index):
+        """第 index 帧是否已缓存（不需要解码）"""
+        with self._lock:
+            return index in self._cache or index in self._checkpoints
+    
+    def cache_info(self):
+        """缓存占用：(显示帧数, 检查点数, 字节数)"""
+        with self._lock:
+            return (len(self._cache), len(self._checkpoints),
+                    self._cache.total_bytes + self._checkpoints.total_bytes)
+    
+    def default_image(self):
+        """APNG 中不参与动画的默认图像（没有时返回 None）"""
+        if not self.result or not self.result['hidden_default']:
+            return None
+        with self._lock:
+            self._check_file(None)
+            reader = _ApngFrameReader(self._png_header, self.file, self.width, self.height,
+                                      self._default_segments)
+            return np.concatenate([strip for _, strip in reader.iter_strips(256)])
+    
+    # ==================== 导出 ====================
+    
+    def export_frames(self, indices, directory, composited=True, prefix='frame'):
+        """
+        把选中的帧导出为 PNG（按帧号顺序合成，连续帧可以复用上一帧的画布）
+        
+        Args:
+            indices (list): 帧号
+            composited (bool): True 导出合成后的整幅画布，False 导出帧区域的原始像素
+        
+        Returns:
+            list: 写出的文件路径（被取消时只包含已完成的部分）
+        """
+        self.reset_cancel()
+        generation = self.generation
+        indices = sorted(set(indices))
+        digits = len(str(max(len(self.frames) - 1, 1)))
+        paths = []
+        for done, index in enumerate(indices):
+            if self.is_cancelled():
+                break
+            pixels = self.frame(index, generation) if composited else self.raw_frame(index, generation)
+            path = os.path.join(directory, f"{prefix}_{index:0{digits}d}.png")
+            write_png(path, pixels.shape[1], pixels.shape[0], 4, [pixels])
+            paths.append(path)
+            self.report_progress(done + 1, len(indices))
+        return paths
+    
+    def delays(self):
+        """每帧延时（毫秒）"""
+        return [frame['delay'] for frame in self.frames]
@@ -0,0 +1,320 @@
+"""
+批量图像处理 - 对目录树中的每幅图像执行同一种 ImageProcessor 处理
+
+流水线分三段：
+- 读取：I/O 线程池把文件读成字节
+- 解码 → 处理 → 编码：进程池（spawn）中完成，子进程只收发编码后的字节，
+  传输量与文件大小相当，每个文件的开销主要是编解码本身
+- 写出：I/O 线程池把结果字节写到原文件旁（加后缀）或镜像到输出目录
+
+三段中在途的文件总数有上限（进程数的两倍加 I/O 线程数），内存占用与文件数量无关。
+编解码函数由调用方传入（界面层使用 Qt 的编解码器，core 不依赖 Qt），
+必须是模块级函数，才能传给子进程。
+"""
+
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, FIRST_COMPLETED, wait
+
+from ..base import BaseCore
+from .image_processor import ImageProcessor, OPERATIONS, DEFAULT_PARAMS
+
+
+# 识别为图像的扩展名
+IMAGE_EXTENSIONS = ('.png', '.bmp', '.jpg', '.jpeg', '.gif', '.tif', '.tiff', '.webp', '.pgm', '.ppm')
+
+# 输出格式：键为扩展名，'same' 表示与输入相同（不能写出的格式改为 PNG）
+OUTPUT_FORMATS = {
+    'same': "与原图相同",
+    'png': "PNG",
+    'jpg': "JPEG",
+    'bmp': "BMP",
+}
+
+# 可以写出的扩展名 → 编码器使用的格式名
+_WRITABLE = {'.png': 'PNG', '.jpg': 'JPG', '.jpeg': 'JPG', '.bmp': 'BMP', '.tif': 'TIFF',
+             '.tiff': 'TIFF', '.webp': 'WEBP', '.pgm': 'PGM', '.ppm': 'PPM'}
+
+# 每个子进程复用一个处理器实例
+_PROCESSOR = None
+
+
+def _read_bytes(path):
+    with open(path, 'rb') as f:
+        return f.read()
+
+
+def _write_bytes(path, data):
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    with open(path, 'wb') as f:
+        f.write(data)
+    return len(data)
+
+
+def _convert(decode, encode, data, operation, param, image_format, quality):
+    """
+    解码 → 处理 → 编码（在子进程中执行）
+    
+    Returns:
+        bytes: 编码后的结果
+    """
+    global _PROCESSOR
+    if _PROCESSOR is None:
+        _PROCESSOR = ImageProcessor()
+        # 子进程之间已经按文件并行，带处理不再开线程
+        if multiprocessing.parent_process() is not None:
+            _PROCESSOR.workers = 1
+    result = _PROCESSOR.apply(decode(data), operation, param)
+    return encode(result, image_format, quality)
+
+
+def scan_images(root, recursive=True, exclude=None):
+    """
+    目录中的图像文件（按路径排序）
+    
+    Args:
+        exclude: 返回 True 时跳过该路径的函数（用于排除已有的输出）
+    """
+    paths = []
+    for directory, names, files in os.walk(root):
+        names.sort()
+        paths.extend(os.path.join(directory, name) for name in files
+                     if name.lower().endswith(IMAGE_EXTENSIONS))
+        if not recursive:
+            break
+    return sorted(path for path in paths if not (exclude and exclude(path)))
+
+
+def output_path(path, root, output_dir=None, suffix='_processed', output_format='same', tag=''):
+    """
+    输出路径：output_dir 为 None 时写在原文件旁并加后缀，否则在 output_dir 下镜像 root 的目录结构
+    
+    Args:
+        tag (str): 附加在文件名后的区分标记，如 "_png"（同名不同扩展名的输入会映射到同一输出时使用）
+    
+    Returns:
+        tuple: (输出路径, 编码器格式名)
+    """
+    stem, extension = os.path.splitext(path)
+    stem += tag
+    extension = extension.lower() if output_format == 'same' else '.' + output_format
+    if extension not in _WRITABLE:
+        extension = '.png'
+    if output_dir is None:
+        target = stem + suffix + extension
+    else:
+        relative = os.path.relpath(stem, root)
+        target = os.path.join(output_dir, relative + extension)
+    return target, _WRITABLE[extension]
+
+
+class BatchImageProcessor(BaseCore):
+    """
+    批量图像处理器
+    
+    示例:
+        batch = BatchImageProcessor()
+        batch.process("photos/", options={'operation': 'grayscale', 'decode': decode_image_bytes,
+                                          'encode': encode_image_bytes})
+        summary = batch.get_result()
+    """
+    
+    # 文件数不超过该值或只有一个进程时在线程中处理，省去启动子进程的开销
+    INPROCESS_FILES = 2
+    # 默认的 I/O 线程数
+    IO_WORKERS = 4
+    
+    def __init__(self):
+        super().__init__()
+        self.result = None
+    
+    def initialize(self):
+        """初始化处理器"""
+        self._initialized = True
+        print("✅ BatchImageProcessor 已初始化")
+    
+    def process(self, *args, **kwargs):
+        """
+        批量处理目录
+        
+        Args:
+            args[0] (str): 输入目录
+            kwargs['options']: 处理选项
+                - operation (str) / param (int): 与 ImageProcessor 相同
+                - decode (callable): 模块级函数，decode(bytes) -> ndarray
+                - encode (callable): 模块级函数，encode(ndarray, 格式名, quality) -> bytes
+                - quality (int): 有损格式的保存质量，-1 为默认
+                - output_dir (str): 输出目录，None 表示写在原文件旁
+                - suffix (str): 写在原文件旁时的文件名后缀，默认 '_processed'
+                - format (str): OUTPUT_FORMATS 之一，默认 'same'
+                - recursive (bool): 是否包含子目录，默认 True
+                - overwrite (bool): 是否覆盖已存在的输出，默认 False（跳过）
+                - workers (int): 进程数，默认为 CPU 核数
+                - io_workers (int): I/O 线程数，默认 IO_WORKERS
+        
+        Returns:
+            bool: 处理是否成功（被取消也返回 True，result['cancelled'] 为 True）
+        """
+        if not self._initialized:
+            self.initialize()
+        
+        try:
+            root = args[0] if args else None
+            options = kwargs.get('options', {})
+            operation = options.get('operation', 'grayscale')
+            if not root or not os.path.isdir(root):
+                print(f"❌ 目录不存在: {root}")
+                return False
+            if operation not in OPERATIONS:
+                print(f"❌ 未知的处理类型: {operation}")
+                return False
+            if not options.get('decode') or not options.get('encode'):
+                print("❌ 没有指定编解码函数")
+                return False
+            
+            self.reset_cancel()
+            self.result = self.run(root, options)
+            result = self.result
+            print(f"✨ 批量处理: {result['done']}/{result['total']} 个文件, 失败 {len(result['failed'])}, "
+                  f"跳过 {result['skipped']}, {result['rate']:.1f} 个/s")
+            return True
+        
+        except Exception as e:
+            print(f"❌ 批量处理失败: {e}")
+            return False
+    
+    def cleanup(self):
+        """清理资源"""
+        self.cancel()
+        self.result = None
+        self._initialized = False
+        print("🧹 BatchImageProcessor 已清理")
+    
+    # ==================== 业务逻辑方法 ====================
+    
+    def plan(self, root, options):
+        """
+        列出要处理的文件及其输出
+        
+        Returns:
+            tuple: ([(输入, 输出, 格式名), ...], 因输出已存在而跳过的文件数)
+        """
+        output_dir = options.get('output_dir')
+        suffix = options.get('suffix', '_processed')
+        output_format = options.get('format', 'same')
+        if output_dir is None and not suffix:
+            raise ValueError("写在原文件旁时后缀不能为空")
+        output_root = os.path.abspath(output_dir) + os.sep if output_dir else None
+        
+        def exclude(path):
+            # 排除以前的输出，避免把结果再处理一遍
+            if output_root:
+                return os.path.abspath(path).startswith(output_root)
+            return os.path.splitext(path)[0].endswith(suffix)
+        
+        paths = scan_images(root, options.get('recursive', True), exclude)
+        planned = [output_path(path, root, output_dir, suffix, output_format) for path in paths]
+        
+        # 指定输出格式（或原格式不能写出）时 a.png 与 a.jpg 会映射到同一输出，
+        # 这些文件的输出名都带上原扩展名（a_png.jpg / a_jpg.jpg），仍然重复时再加序号
+        def key(target):
+            return os.path.normcase(os.path.abspath(target))
+        
+        counts = {}
+        for target, _ in planned:
+            counts[key(target)] = counts.get(key(target), 0) + 1
+        used = set()
+        tasks, skipped = [], 0
+        for path, (target, image_format) in zip(paths, planned):
+            if counts[key(target)] > 1:
+                tag = '_' + os.path.splitext(path)[1][1:].lower()
+                target, image_format = output_path(path, root, output_dir, suffix, output_format, tag)
+                number = 2
+                while key(target) in used or key(target) in counts:
+                    target, image_format = output_path(path, root, output_dir, suffix, output_format,
+                                                       f"{tag}_{number}")
+                    number += 1
+            used.add(key(target))
+            if not options.get('overwrite') and os.path.exists(target):
+                skipped += 1
+                continue
+            tasks.append((path, target, image_format))
+        return tasks, skipped
+    
+    def run(self, root, options):
+        """按流水线处理全部文件，返回汇总"""
+        tasks, skipped = self.plan(root, options)
+        operation = options.get('operation', 'grayscale')
+        param = options.get('param')
+        if param is None:
+            param = DEFAULT_PARAMS.get(operation, 0)
+        codec = (options['decode'], options['encode'])
+        quality = options.get('quality', -1)
+        workers = options.get('workers') or os.cpu_count() or 1
+        io_workers = options.get('io_workers') or self.IO_WORKERS
+        print(f"📂 批量处理: {root}, {len(tasks)} 个文件, {operation}, 参数 {param}, {workers} 个进程")
+        
+        summary = {'total': len(tasks), 'done': 0, 'failed': [], 'skipped': skipped, 'outputs': [],
+                   'bytes_in': 0, 'bytes_out': 0, 'cancelled': False}
+        started = time.perf_counter()
+        if len(tasks) <= self.INPROCESS_FILES or workers <= 1:
+            compute_pool = ThreadPoolExecutor(1)
+        else:
+            compute_pool = ProcessPoolExecutor(max_workers=workers,
+                                               mp_context=multiprocessing.get_context('spawn'))
+        window = workers * 2 + io_workers
+        queue = iter(tasks)
+        pending = {}  # future -> (阶段, 任务, 附加信息)
+        
+        def record_progress():
+            elapsed = max(time.perf_counter() - started, 1e-9)
+            finished = summary['done'] + len(summary['failed'])
+            self.report_progress(finished, len(tasks), rate=finished / elapsed,
+                                 throughput=summary['bytes_in'] / elapsed, failed=len(summary['failed']))
+        
+        with compute_pool, ThreadPoolExecutor(io_workers) as io_pool:
+            while True:
+                while len(pending) < window and not self.is_cancelled():
+                    task = next(queue, None)
+                    if task is None:
+                        break
+                    pending[io_pool.submit(_read_bytes, task[0])] = ('read', task, 0)
+                if not pending:
+                    break
+                finished, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    stage, task, size = pending.pop(future)
+                    try:
+                        value = future.result()
+                    except Exception as e:
+                        summary['failed'].append((task[0], str(e) or type(e).__name__))
+                        record_progress()
+                        continue
+                    if stage == 'read':
+                        future = compute_pool.submit(_convert, *codec, value, operation, param, task[2], quality)
+                        pending[future] = ('convert', task, len(value))
+                    elif stage == 'convert':
+                        summary['bytes_in'] += size
+                        pending[io_pool.submit(_write_bytes, task[1], value)] = ('write', task, 0)
+                    else:
+                        summary['done'] += 1
+                        summary['bytes_out'] += value
+                        summary['outputs'].append(task[1])
+                        record_progress()
+                if self.is_cancelled():
+                    # 未开始的任务直接取消，已在运行的等待其结束
+                    for future in pending:
+                        future.cancel()
+                    wait(pending)
+                    summary['cancelled'] = True
+                    break
+        
+        elapsed = time.perf_counter() - started
+        summary.update(elapsed=elapsed, rate=summary['done'] / max(elapsed, 1e-9),
+                       throughput=summary['bytes_in'] / max(elapsed, 1e-9))
+        return summary
+    
+    def get_result(self):
+        """获取结果"""
+        return self.result
@@ -0,0 +1,173 @@
+"""
+位平面处理器 - 一次向量化计算图像全部位平面
+
+Stegsolve 式逐个浏览位平面时，每个平面都用 (pixel >> bit) & 1 重新计算太慢。
+这里一次算出所有通道 × 8 位的平面，并以位打包的形式缓存（与原图同样大小）：
+- 每 8 个像素的同一通道组成一个 uint64，做一次 8x8 位矩阵转置后，
+  第 k 个字节恰好是这 8 个像素第 k 位组成的字节
+- 平面每行补齐到 32 像素的整数倍，打包字节按 LSB 在前排列，
+  可直接作为 QImage.Format_MonoLSB 显示，不需要解包
+"""
+
+import numpy as np
+
+from ..base import BaseCore
+
+
+# 每个字节值的置位数
+_POPCOUNT = np.unpackbits(np.arange(256, dtype=np.uint8)[:, None], axis=1).sum(1).astype(np.uint8)
+
+# 8x8 位矩阵转置的三步 (移位, 掩码)
+_TRANSPOSE_STEPS = tuple((np.uint64(shift), np.uint64(mask)) for shift, mask in (
+    (7, 0x00AA00AA00AA00AA),
+    (14, 0x0000CCCC0000CCCC),
+    (28, 0x00000000F0F0F0F0),
+))
+
+
+def transpose_bits(words):
+    """
+    原地转置 uint64 数组中每个元素的 8x8 位矩阵
+    
+    输入第 i 个字节的第 k 位 → 输出第 k 个字节的第 i 位
+    """
+    temp = np.empty_like(words)
+    for shift, mask in _TRANSPOSE_STEPS:
+        np.right_shift(words, shift, out=temp)
+        temp ^= words
+        temp &= mask
+        words ^= temp
+        temp <<= shift
+        words ^= temp
+    return words
+
+
+class BitPlaneProcessor(BaseCore):
+    """
+    位平面处理器
+    
+    功能：
+    - 一次计算全部位平面（RGBA 图像为 4 × 8 = 32 个）
+    - 取单个平面的打包数据（用于显示）或布尔掩码
+    - 统计平面中 1 的比例
+    """
+    
+    # 每带处理的像素数（中间数组保持在缓存大小附近）
+    BAND_PIXELS = 1 << 18
+    # 平面每行补齐的像素数（打包后每行 4 字节对齐，满足 QImage 要求）
+    ROW_ALIGN = 32
+    
+    def __init__(self):
+        super().__init__()
+        self.planes = None  # (通道, 8, H, 行字节数) uint8，LSB 在前
+        self.width = 0
+        self.height = 0
+        self.channel_names = ()
+    
+    def initialize(self):
+        """初始化"""
+        self._initialized = True
+        print("✅ BitPlaneProcessor 已初始化")
+    
+    def process(self, *args, **kwargs):
+        """
+        计算全部位平面
+        
+        Args:
+            args[0]: 图像数组，(H, W, 4) RGBA 或 (H, W) 灰度，uint8
+        
+        Returns:
+            bool: 处理是否成功（被取消时返回 False）
+        """
+        if not self._initialized:
+            self.initialize()
+        
+        try:
+            image = args[0] if args else None
+            if image is None or image.size == 0:
+                print("❌ 没有图像数据")
+                return False
+            
+            self.reset_cancel()
+            planes = self.compute_planes(image)
+            if planes is None:
+                print("⚠️ 位平面计算已取消")
+                return False
+            self.planes = planes
+            self.height, self.width = image.shape[:2]
+            self.channel_names = ('R', 'G', 'B', 'A') if image.ndim == 3 else ('L',)
+            print(f"✨ 位平面计算完成: {self.width}x{self.height}, {planes.shape[0] * 8} 个平面")
+            return True
+        
+        except Exception as e:
+            print(f"❌ 位平面计算失败: {e}")
+            return False
+    
+    def cleanup(self):
+        """清理资源"""
+        self.planes = None
+        print("🧹 BitPlaneProcessor 已清理")
+    
+    def get_result(self):
+        """获取打包的位平面"""
+        return self.planes
+    
+    # ==================== 业务逻辑方法 ====================
+    
+    def compute_planes(self, image):
+        """
+        计算打包的位平面
+        
+        按行分带：每带把通道分离到补齐后的平面缓冲区，以 uint64 为单位做位矩阵转置，
+        再把 8 个字节分别写入 8 个位平面
+        
+        Returns:
+            np.ndarray: (通道, 8, H, 行字节数) uint8；取消时返回 None
+        """
+        if image.ndim == 2:
+            image = image[:, :, None]
+        height, width, channels = image.shape
+        padded = -(-width // self.ROW_ALIGN) * self.ROW_ALIGN
+        row_bytes = padded // 8
+        planes = np.empty((channels, 8, height, row_bytes), dtype=np.uint8)
+        
+        rows = max(self.BAND_PIXELS // padded, 1)
+        band = np.zeros((channels, rows, padded), dtype=np.uint8)
+        for y0 in range(0, height, rows):
+            y1 = min(y0 + rows, height)
+            count = y1 - y0
+            band[:, :count, :width] = image[y0:y1].transpose(2, 0, 1)
+            words = transpose_bits(band[:, :count].view(np.uint64))
+            # words 的第 k 个字节即第 k 位平面
+            planes[:, :, y0:y1] = words.view(np.uint8).reshape(channels, count, row_bytes, 8).transpose(0, 3, 1, 2)
+            self.report_progress(y1, height)
+            if self.is_cancelled():
+                return None
+        return planes
+    
+    def plane_count(self):
+        """位平面总数"""
+        return 0 if self.planes is None else self.planes.shape[0] * 8
+    
+    def plane(self, channel, bit):
+        """
+        单个平面的打包数据
+        
+        Returns:
+            np.ndarray: (H, 行字节数) uint8，每字节 8 个像素，LSB 在前（QImage.Format_MonoLSB）
+        """
+        return self.planes[channel, bit]
+    
+    def plane_mask(self, channel, bit):
+        """单个平面解包为 (H, W) 布尔数组"""
+        bits = np.unpackbits(self.planes[channel, bit], axis=1, count=self.width, bitorder='little')
+        return bits.view(bool)
+    
+    def plane_ratio(self, channel, bit):
+        """平面中 1 的比例（补齐的像素始终为 0，不影响计数）"""
+        ones = int(_POPCOUNT[self.planes[channel, bit]].sum(dtype=np.int64))
+        return ones / max(self.width * self.height, 1)
+    
+    def plane_name(self, channel, bit):
+        """平面名称，如 'R 0'"""
+        return f"{self.channel_names[channel]} {bit}"
@@ -0,0 +1,402 @@
+"""
+混沌映射置乱 - Arnold 猫映射、离散面包师映射等可逆像素置乱的正向 / 逆向变换与参数爆破
+
+所有映射都表示为像素下标的置换 p（散射形式：输出[p[i]] = 输入[i]）：
+- 迭代 k 次即 p 的 k 次幂，按平方求幂只需 O(log k) 次整幅置换的复合，
+  正向置乱写成一次散射、还原写成一次花式索引，不再逐次搬运整幅图像
+- 周期：Arnold 映射是线性的，周期等于矩阵 [[1, a], [b, ab+1]] 模 N 的阶；
+  一般置换的周期为各轮换长度的最小公倍数，轮换用指针倍增在 O(n log n) 内标记
+- 爆破 (a, b, 次数)：评分只需要下采样的少数像素，逐次迭代时只跟踪这些采样点
+  经过 p 的位置，每次迭代的代价与图像大小无关；参数组交给进程池并行
+"""
+
+import heapq
+import math
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+
+import numpy as np
+
+from ..base import BaseCore
+from .seed_shuffle import ShuffleScorer
+
+
+# 映射类型：名称 -> 说明
+MAPS = {
+    'arnold': "Arnold 猫映射",
+    'baker': "面包师映射 (离散化)",
+}
+
+# 子进程中的评分器（由进程池的 initializer 设置）
+_worker_scorer = None
+
+
+def parse_key(text):
+    """解析面包师映射的分块序列，如 "8, 8, 16" """
+    values = tuple(int(part) for part in text.replace('，', ',').replace(' ', ',').split(',') if part)
+    if not values or min(values) <= 0:
+        raise ValueError(f"无效的分块序列: {text}")
+    return values
+
+
+def _coordinates(size, swap_axes):
+    """全部像素的 (u, v) 坐标：默认 u 为列、v 为行，swap_axes 时交换"""
+    rows, cols = np.divmod(np.arange(size * size, dtype=np.int64), size)
+    return (rows, cols) if swap_axes else (cols, rows)
+
+
+def _destination(u, v, size, swap_axes):
+    """变换后的 (u, v) 坐标 -> 扁平下标"""
+    return u * size + v if swap_axes else v * size + u
+
+
+def arnold_permutation(size, a, b, swap_axes=False):
+    """
+    一次 Arnold 变换的像素置换：(u, v) -> (u + a·v, b·u + (ab+1)·v) mod N
+    
+    Returns:
+        np.ndarray: (N·N,) int64，散射形式
+    """
+    a, b = a % size, b % size
+    u, v = _coordinates(size, swap_axes)
+    return _destination((u + a * v) % size, (b * u + (a * b + 1) * v) % size, size, swap_axes)
+
+
+def baker_permutation(size, key, swap_axes=False):
+    """
+    一次离散面包师变换的像素置换（Fridrich 的离散化）
+    
+    分块序列 n_1..n_k 之和为 N 且都整除 N，q_i = N / n_i，N_i 为前面各块之和；
+    第 i 个竖条中的 (u, v) -> (q_i·(u - N_i) + v mod q_i, v div q_i + N_i)
+    """
+    if sum(key) != size or any(size % n for n in key):
+        raise ValueError(f"分块序列之和必须为 {size} 且每块都整除 {size}")
+    starts = np.cumsum((0,) + tuple(key))[:-1]
+    u, v = _coordinates(size, swap_axes)
+    strip = np.searchsorted(starts, u, side='right') - 1
+    start = starts[strip]
+    q = size // np.asarray(key, dtype=np.int64)[strip]
+    return _destination(q * (u - start) + v % q, v // q + start, size, swap_axes)
+
+
+def map_permutation(name, size, params, swap_axes=False):
+    """按映射名称生成一次变换的置换（params: arnold 为 (a, b)，baker 为分块序列）"""
+    if name == 'arnold':
+        return arnold_permutation(size, *params, swap_axes=swap_axes)
+    if name == 'baker':
+        return baker_permutation(size, params, swap_axes=swap_axes)
+    raise ValueError(f"不支持的映射: {name}")
+
+
+def arnold_period(size, a, b):
+    """Arnold 映射的周期：矩阵 [[1, a], [b, ab+1]] 模 N 的阶"""
+    if size == 1:
+        return 1
+    m = (1, a % size, b % size, (a * b + 1) % size)
+    p = m
+    period = 1
+    while p != (1, 0, 0, 1):
+        p = ((p[0] * m[0] + p[1] * m[2]) % size, (p[0] * m[1] + p[1] * m[3]) % size,
+             (p[2] * m[0] + p[3] * m[2]) % size, (p[2] * m[1] + p[3] * m[3]) % size)
+        period += 1
+    return period
+
+
+def permutation_period(perm):
+    """
+    置换的周期：各轮换长度的最小公倍数
+    
+    指针倍增：第 t 轮后 label[i] 为 i 之后 2^t 个位置中的最小下标，
+    ceil(log2 n) 轮后即为所在轮换的最小下标，按标记计数得到各轮换长度
+    """
+    label = np.arange(len(perm))
+    jump = perm.copy()
+    for _ in range(max(int(len(perm) - 1).bit_length(), 1)):
+        np.minimum(label, label[jump], out=label)
+        jump = jump[jump]
+    lengths = np.unique(np.bincount(label)[np.unique(label)])
+    return math.lcm(*lengths.tolist())
+
+
+def map_period(name, size, params, perm=None):
+    """映射的周期（Arnold 用矩阵的阶，其余按置换的轮换计算）"""
+    if name == 'arnold':
+        return arnold_period(size, *params)
+    return permutation_period(perm if perm is not None else map_permutation(name, size, params))
+
+
+def permutation_power(perm, exponent):
+    """置换的 exponent 次幂（平方求幂，O(log k) 次复合）"""
+    result = np.arange(len(perm))
+    base = perm
+    while exponent:
+        if exponent & 1:
+            result = base[result]
+        exponent >>= 1
+        if exponent:
+            base = base[base]
+    return result
+
+
+def _init_worker(scorer):
+    """进程池 initializer：评分器只传给每个子进程一次"""
+    global _worker_scorer
+    _worker_scorer = scorer
+
+
+def _scan_candidates(name, size, candidates, max_iterations, keep, block=1024, scorer=None):
+    """
+    进程池任务：每组参数在 1..min(周期-1, max_iterations) 次迭代中得分最好的 keep 个
+    
+    置乱图 = 正向迭代 k 次，原图下标 i 在置乱图中的位置即 p^k[i]；
+    只跟踪评分用到的采样下标，逐次迭代各做一次小规模的花式索引
+    
+    Args:
+        candidates: [(params, swap_axes)]
+    
+    Returns:
+        tuple: (评分的迭代总数, [(得分, 候选序号, 次数, 周期)] 按得分升序)
+    """
+    scorer = scorer or _worker_scorer
+    samples = scorer.samples['pixel']
+    best = []
+    scanned = 0
+    for index, (params, swap_axes) in enumerate(candidates):
+        perm = map_permutation(name, size, params, swap_axes)
+        period = map_period(name, size, params, perm)
+        limit = min(period - 1, max_iterations)
+        position = samples
+        for first in range(1, limit + 1, block):
+            count = min(block, limit + 1 - first)
+            where = np.empty((len(samples), count), dtype=np.int64)
+            for k in range(count):
+                position = perm[position]
+                where[:, k] = position
+            scores = scorer.score_sampled([where])
+            top = min(keep, count)
+            for k in np.argpartition(scores, top - 1)[:top].tolist():
+                entry = (float(scores[k]), index, first + k, period)
+                if len(best) < keep:
+                    heapq.heappush(best, (-entry[0], entry))
+                elif entry[0] < -best[0][0]:
+                    heapq.heapreplace(best, (-entry[0], entry))
+        scanned += max(limit, 0)
+    return scanned, sorted(entry for _, entry in best)
+
+
+class ChaoticMapScrambler(BaseCore):
+    """
+    混沌映射置乱器
+    
+    功能：
+    - Arnold 猫映射 / 离散面包师映射的正向置乱与还原（一次完成 k 次迭代）
+    - 自动检测映射周期
+    - 爆破 (a, b, 次数)：进程池并行，按下采样平滑度排名，可取消
+    """
+    
+    # 爆破时每个进程池任务的参数组数
+    TASK_CANDIDATES = 8
+    # 参数组数不超过该值时直接在当前进程扫描
+    INPROCESS_LIMIT = 8
+    # 保留的最佳结果个数
+    TOP_COUNT = 24
+    # 每组参数默认最多扫描的迭代次数（面包师映射的周期可能是天文数字）
+    MAX_ITERATIONS = 1 << 14
+    
+    def __init__(self):
+        super().__init__()
+        self.image = None
+        self.result = None
+    
+    def initialize(self):
+        """初始化处理器"""
+        self._initialized = True
+        print("✅ ChaoticMapScrambler 已初始化")
+    
+    def process(self, *args, **kwargs):
+        """
+        变换或爆破
+        
+        Args:
+            args[0]: 正方形图像，(N, N, 4) RGBA 或 (N, N) 灰度，uint8
+            kwargs['options']: 处理选项
+                - mode (str): 'scramble' 正向置乱 / 'restore' 还原 / 'search' 爆破，默认 'restore'
+                - map (str): MAPS 中的映射，默认 'arnold'
+                - params: arnold 为 (a, b)，baker 为分块序列；默认 (1, 1)
+                - swap_axes (bool): 交换行列坐标的顺序，默认 False
+                - iterations (int): 迭代次数（按周期取模），默认 1
+                - a_range / b_range (tuple): 爆破 Arnold 参数的闭区间，默认 (1, 8)
+                - swap (str): 爆破的坐标顺序 'both' / 'normal' / 'swapped'，默认 'both'
+                - max_iterations (int): 每组参数最多扫描的次数，默认 MAX_ITERATIONS（周期更短时扫描整个周期）
+                - top (int): 保留的最佳结果个数，默认 TOP_COUNT
+                - workers (int): 进程数，默认 CPU 核数
+        
+        Returns:
+            bool: 处理是否成功（爆破被取消也返回 True，result['cancelled'] 为 True）
+        """
+        if not self._initialized:
+            self.initialize()
+        
+        try:
+            self.reset_cancel()
+            image = args[0] if args else self.image
+            options = kwargs.get('options', {})
+            if image is None:
+                print("❌ 没有图像")
+                return False
+            if image.shape[0] != image.shape[1]:
+                print(f"❌ 混沌映射要求正方形图像，当前为 {image.shape[1]}x{image.shape[0]}")
+                return False
+            self.image = image
+            mode = options.get('mode', 'restore')
+            name = options.get('map', 'arnold')
+            if name not in MAPS:
+                print(f"❌ 不支持的映射: {name}")
+                return False
+            
+            if mode == 'search':
+                candidates = self.candidates(name, options)
+                workers = options.get('workers') or os.cpu_count() or 1
+                print(f"🔑 爆破 {MAPS[name]}: {len(candidates)} 组参数")
+                self.result = self.search(name, candidates, options.get('max_iterations'),
+                                          options.get('top') or self.TOP_COUNT, workers)
+                if self.result['ranking']:
+                    best = self.result['ranking'][0]
+                    print(f"✨ 完成: 最佳 {best['params']} 迭代 {best['iterations']} 次 "
+                          f"(周期 {best['period']}), 得分 {best['score']:.3f}")
+                return True
+            
+            params = tuple(options.get('params', (1, 1)))
+            swap_axes = options.get('swap_axes', False)
+            perm = map_permutation(name, len(image), params, swap_axes)
+            period = map_period(name, len(image), params, perm)
+            iterations = options.get('iterations', 1) % period
+            transformed = self.apply(perm, iterations, inverse=mode == 'restore')
+            self.result = {'image': transformed, 'period': period, 'iterations': iterations}
+            action = "还原" if mode == 'restore' else "置乱"
+            print(f"✨ {MAPS[name]} {action} {iterations} 次 (周期 {period})")
+            return True
+        
+        except Exception as e:
+            print(f"❌ 处理失败: {e}")
+            return False
+    
+    def cleanup(self):
+        """清理资源"""
+        self.cancel()
+        self.image = None
+        self.result = None
+        print("🧹 ChaoticMapScrambler 已清理")
+    
+    def get_result(self):
+        """获取处理结果"""
+        return self.result
+    
+    # ==================== 业务逻辑方法 ====================
+    
+    def apply(self, perm, iterations, inverse=False, image=None):
+        """
+        一次完成 iterations 次变换
+        
+        Args:
+            inverse (bool): True 为还原（花式索引），False 为正向置乱（散射写入）
+        """
+        image = self.image if image is None else image
+        power = permutation_power(perm, iterations)
+        pixels = image.reshape(len(perm), -1)
+        if inverse:
+            return pixels[power].reshape(image.shape)
+        output = np.empty_like(pixels)
+        output[power] = pixels
+        return output.reshape(image.shape)
+    
+    def restore(self, name, params, swap_axes, iterations):
+        """按参数还原当前图像（正向迭代了 iterations 次的置乱图）"""
+        perm = map_permutation(name, len(self.image), params, swap_axes)
+        return self.apply(perm, iterations, inverse=True)
+    
+    @staticmethod
+    def candidates(name, options):
+        """爆破的参数组 [(params, swap_axes)]"""
+        swaps = {'both': (False, True), 'normal': (False,), 'swapped': (True,)}[options.get('swap', 'both')]
+        if name == 'arnold':
+            a_lo, a_hi = options.get('a_range', (1, 8))
+            b_lo, b_hi = options.get('b_range', (1, 8))
+            grid = [(a, b) for a in range(a_lo, a_hi + 1) for b in range(b_lo, b_hi + 1)]
+        else:
+            grid = [tuple(options.get('params', ()))]
+        return [(params, swap_axes) for params in grid for swap_axes in swaps]
+    
+    def search(self, name, candidates, max_iterations, top, workers=1):
+        """
+        扫描全部参数组的每个迭代次数
+        
+        Returns:
+            dict: ranking [{'map', 'params', 'swap_axes', 'iterations', 'period', 'score'}],
+                  searched (参数组数), scanned (迭代总数), elapsed, rate (迭代/s), cancelled
+        """
+        size = len(self.image)
+        scorer = ShuffleScorer(self.image, ('pixel',))
+        max_iterations = max_iterations or self.MAX_ITERATIONS
+        best = []
+        searched = scanned = 0
+        started = time.perf_counter()
+        
+        def record(offset, chunk_result):
+            nonlocal best, searched, scanned
+            chunk_scanned, entries = chunk_result
+            best = sorted(best + [(score, offset + index, k, period) for score, index, k, period in entries])[:top]
+            scanned += chunk_scanned
+            searched += min(self.TASK_CANDIDATES, len(candidates) - offset)
+            elapsed = max(time.perf_counter() - started, 1e-9)
+            self.report_progress(searched, len(candidates), rate=scanned / elapsed,
+                                 ranking=self._ranking(name, candidates, best))
+        
+        chunks = range(0, len(candidates), self.TASK_CANDIDATES)
+        if len(candidates) <= self.INPROCESS_LIMIT or workers <= 1:
+            for offset in chunks:
+                if self.is_cancelled():
+                    break
+                record(offset, _scan_candidates(name, size, candidates[offset:offset + self.TASK_CANDIDATES],
+                                                max_iterations, top, scorer=scorer))
+        else:
+            context = multiprocessing.get_context('spawn')
+            with ProcessPoolExecutor(max_workers=workers, mp_context=context,
+                                     initializer=_init_worker, initargs=(scorer,)) as pool:
+                pending = {}
+                for offset in chunks:
+                    part = candidates[offset:offset + self.TASK_CANDIDATES]
+                    pending[pool.submit(_scan_candidates, name, size, part, max_iterations, top)] = offset
+                    # 只保留有限数量的在途任务
+                    if len(pending) < workers * 2:
+                        continue
+                    done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        record(pending.pop(future), future.result())
+                    if self.is_cancelled():
+                        break
+                if self.is_cancelled():
+                    for future in pending:
+                        future.cancel()
+                for future in pending:
+                    if not future.cancelled():
+                        record(pending[future], future.result())
+        
+        elapsed = time.perf_counter() - started
+        return {
+            'ranking': self._ranking(name, candidates, best),
+            'searched': searched,
+            'scanned': scanned,
+            'elapsed': elapsed,
+            'rate': scanned / elapsed if elapsed else 0.0,
+            'cancelled': self.is_cancelled(),
+        }
+    
+    @staticmethod
+    def _ranking(name, candidates, entries):
+        """[(得分, 候选序号, 次数, 周期)] -> 排名字典列表"""
+        return [{'map': name, 'params': candidates[index][0], 'swap_axes': candidates[index][1],
+                 'iterations': k, 'period': period, 'score': score}
+                for score, index, k, period in entries]
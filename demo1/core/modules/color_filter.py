@@ -0,0 +1,180 @@
+"""
+颜色滤镜处理器 - 以查找表 (LUT) 表示的反色、通道运算、随机色图等滤镜
+
+找隐藏内容时常用的滤镜（Stegsolve 的 Inversion / Xor / Random colour map / Gray bits 等）
+都可以写成查找表，用 np.take 一次作用于整个通道：
+- channel: 每个通道一张 256 项的表，输出 RGBA
+- single: 取一个通道查表，输出灰度
+- pair: 两个通道组成 16 位下标，查 65536 项的表，输出灰度（通道异或、相等等）
+- gray_bits: R==G 与 G==B 两张 pair 表的结果相与
+查找表只依赖滤镜本身（直方图均衡除外，按图像直方图生成），与像素数量无关。
+"""
+
+import numpy as np
+
+from ..base import BaseCore
+
+
+CHANNEL_NAMES = ('R', 'G', 'B', 'A')
+
+_IDENTITY = np.arange(256, dtype=np.uint8)
+_HIGH, _LOW = np.divmod(np.arange(65536, dtype=np.uint32), 256)
+# pair 表：高字节为第一个通道，低字节为第二个通道
+_PAIR_XOR = (_HIGH ^ _LOW).astype(np.uint8)
+_PAIR_EQUAL = np.where(_HIGH == _LOW, 255, 0).astype(np.uint8)
+_PAIR_DIFF = np.abs(_HIGH.astype(np.int32) - _LOW.astype(np.int32)).astype(np.uint8)
+
+
+def _channel_lut(rgb, alpha=None):
+    """RGB 三通道共用 rgb 表、A 通道使用 alpha 表（默认不变）的 (4, 256) 表"""
+    return np.stack([rgb, rgb, rgb, _IDENTITY if alpha is None else alpha])
+
+
+def build_filters(seed=0):
+    """
+    生成滤镜列表
+    
+    Args:
+        seed (int): 随机色图的种子，相同种子生成相同的色图
+    
+    Returns:
+        list: [{'name', 'kind', 'lut', 'channels'}, ...]
+    """
+    filters = [
+        {'name': "原图", 'kind': 'channel', 'lut': _channel_lut(_IDENTITY)},
+        {'name': "反色", 'kind': 'channel', 'lut': _channel_lut(255 - _IDENTITY)},
+        {'name': "完全不透明", 'kind': 'channel',
+         'lut': _channel_lut(_IDENTITY, np.full(256, 255, dtype=np.uint8))},
+    ]
+    for index, name in enumerate(CHANNEL_NAMES):
+        filters.append({'name': f"仅 {name} 通道", 'kind': 'single', 'lut': _IDENTITY, 'channels': (index,)})
+    filters += [
+        {'name': "最低位放大", 'kind': 'channel', 'lut': _channel_lut(((_IDENTITY & 1) * 255).astype(np.uint8))},
+        {'name': "低 2 位放大", 'kind': 'channel', 'lut': _channel_lut(((_IDENTITY & 3) * 85).astype(np.uint8))},
+        {'name': "低 4 位放大", 'kind': 'channel', 'lut': _channel_lut(((_IDENTITY & 15) * 17).astype(np.uint8))},
+        {'name': "高位清零 (x & 0x0F)", 'kind': 'channel', 'lut': _channel_lut(_IDENTITY & 0x0F)},
+        {'name': "直方图均衡", 'kind': 'equalize'},
+        {'name': "灰度位 (R=G=B)", 'kind': 'gray_bits'},
+    ]
+    for first, second in ((0, 1), (0, 2), (1, 2)):
+        a, b = CHANNEL_NAMES[first], CHANNEL_NAMES[second]
+        filters.append({'name': f"{a} ^ {b}", 'kind': 'pair', 'lut': _PAIR_XOR, 'channels': (first, second)})
+        filters.append({'name': f"|{a} - {b}|", 'kind': 'pair', 'lut': _PAIR_DIFF, 'channels': (first, second)})
+    rng = np.random.default_rng(seed)
+    for number in range(1, 4):
+        lut = np.stack([rng.permutation(256).astype(np.uint8) for _ in range(3)] + [_IDENTITY])
+        filters.append({'name': f"随机色图 {number}", 'kind': 'channel', 'lut': lut})
+    return filters
+
+
+class ColorFilterProcessor(BaseCore):
+    """
+    颜色滤镜处理器
+    
+    功能：
+    - 列出可用滤镜
+    - 对 RGBA 图像应用滤镜（apply_filter 无状态，可在多个线程中同时调用）
+    """
+    
+    def __init__(self, seed=0):
+        super().__init__()
+        self.filters = build_filters(seed)
+        self.result = None
+    
+    def initialize(self):
+        """初始化"""
+        self._initialized = True
+        print("✅ ColorFilterProcessor 已初始化")
+    
+    def process(self, *args, **kwargs):
+        """
+        应用滤镜
+        
+        Args:
+            args[0]: 图像数组，(H, W, 4) RGBA，uint8
+            kwargs['options']: 处理选项
+                - filter (int): 滤镜下标
+        
+        Returns:
+            bool: 处理是否成功
+        """
+        if not self._initialized:
+            self.initialize()
+        
+        try:
+            image = args[0] if args else None
+            options = kwargs.get('options', {})
+            if image is None or image.size == 0:
+                print("❌ 没有图像数据")
+                return False
+            index = options.get('filter', 0)
+            self.result = self.apply_filter(image, index)
+            print(f"✨ 滤镜完成: {self.filters[index]['name']}")
+            return True
+        
+        except Exception as e:
+            print(f"❌ 滤镜失败: {e}")
+            return False
+    
+    def cleanup(self):
+        """清理资源"""
+        self.result = None
+        print("🧹 ColorFilterProcessor 已清理")
+    
+    def get_result(self):
+        """获取滤镜结果"""
+        return self.result
+    
+    # ==================== 业务逻辑方法 ====================
+    
+    def filter_names(self):
+        """全部滤镜名称"""
+        return [item['name'] for item in self.filters]
+    
+    def apply_filter(self, image, index):
+        """
+        对 (H, W, 4) RGBA 图像应用第 index 个滤镜
+        
+        Returns:
+            np.ndarray: (H, W, 4) RGBA 或 (H, W) 灰度
+        """
+        spec = self.filters[index]
+        kind = spec['kind']
+        if kind == 'equalize':
+            spec = {'kind': 'channel', 'lut': self.equalize_lut(image)}
+            kind = 'channel'
+        
+        if kind == 'channel':
+            out = np.empty_like(image)
+            for channel in range(4):
+                np.take(spec['lut'][channel], image[..., channel], out=out[..., channel])
+            return out
+        if kind == 'single':
+            return np.take(spec['lut'], image[..., spec['channels'][0]])
+        if kind == 'pair':
+            return np.take(spec['lut'], self.pair_index(image, *spec['channels']))
+        if kind == 'gray_bits':
+            gray = np.take(_PAIR_EQUAL, self.pair_index(image, 0, 1))
+            gray &= np.take(_PAIR_EQUAL, self.pair_index(image, 1, 2))
+            return gray
+        raise ValueError(f"未知的滤镜类型: {kind}")
+    
+    @staticmethod
+    def pair_index(image, first, second):
+        """两个通道组成的 16 位下标 (first << 8) | second"""
+        index = image[..., first].astype(np.uint16)
+        index <<= 8
+        index |= image[..., second]
+        return index
+    
+    @staticmethod
+    def equalize_lut(image):
+        """按各通道直方图生成的均衡化查找表（A 通道不变）"""
+        luts = []
+        for channel in range(3):
+            hist = np.bincount(image[..., channel].ravel(), minlength=256)
+            cdf = np.cumsum(hist)
+            low = cdf[np.flatnonzero(hist)[0]]
+            span = max(int(cdf[-1] - low), 1)
+            luts.append(np.clip((cdf - low) * 255 // span, 0, 255).astype(np.uint8))
+        return np.stack(luts + [_IDENTITY])
@@ -1,6 +1,8 @@
 """
 数据处理核心逻辑
 """
+import mmap
+
 from ..base import BaseCore
 
 
@@ -9,8 +11,10 @@ class DataProcessor(BaseCore):
     
     def __init__(self):
         super().__init__()
+        self.file_path = None
         self.data = None
         self.result = None
+        self._file = None
     
     def initialize(self):
         """初始化数据处理器"""
@@ -18,13 +22,25 @@ class DataProcessor(BaseCore):
         print("数据处理器已初始化")
     
     def load_data(self, file_path):
-        """加载数据"""
+        """
+        加载数据
+        
+        文件以只读 mmap 方式映射，self.data 为可切片的字节缓冲区，
+        大文件不会被整体读入内存
+        """
         try:
-            # 这里添加你的数据加载逻辑
             print(f"正在加载数据: {file_path}")
-            self.data = file_path
+            self._close_buffer()
+            self._file = open(file_path, 'rb')
+            try:
+                self.data = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+            except ValueError:
+                # 空文件无法映射
+                self.data = b""
+            self.file_path = file_path
             return True
         except Exception as e:
+            self._close_buffer()
             print(f"加载数据失败: {e}")
             return False
     
@@ -40,19 +56,33 @@ class DataProcessor(BaseCore):
             print(f"处理选项: {options}")
             
             # 模拟处理
-            self.result = f"处理完成: {self.data}"
+            self.result = f"处理完成: {self.file_path}"
             return True
         except Exception as e:
             print(f"处理数据失败: {e}")
             return False
     
+    def get_buffer(self):
+        """获取已加载的字节缓冲区（mmap 或 bytes），未加载时返回 None"""
+        return self.data
+    
     def get_result(self):
         """获取处理结果"""
         return self.result
     
+    def _close_buffer(self):
+        """关闭映射和文件句柄"""
+        if isinstance(self.data, mmap.mmap):
+            self.data.close()
+        if self._file:
+            self._file.close()
+        self.data = None
+        self.file_path = None
+        self._file = None
+    
     def cleanup(self):
         """清理资源"""
-        self.data = None
+        self._close_buffer()
         self.result = None
         self._initialized = False
         print("数据处理器已清理")
@@ -0,0 +1,123 @@
+"""
+文件类型识别 - 按魔数 (magic bytes) 识别数据块中的文件
+
+用于隐写提取结果、解码结果等“来路不明”的字节：
+- identify_file_type: 判断数据开头是什么文件
+- find_signatures: 在数据中查找所有嵌入文件的起点（bytes.find，C 速度）
+- byte_entropy / printable_ratio: 判断数据更像随机噪声、文本还是压缩数据
+"""
+
+import numpy as np
+
+
+# (名称, 扩展名, 魔数, 魔数所在偏移)
+FILE_SIGNATURES = [
+    ('PNG 图像', 'png', b'\x89PNG\r\n\x1a\n', 0),
+    ('JPEG 图像', 'jpg', b'\xff\xd8\xff', 0),
+    ('GIF 图像', 'gif', b'GIF87a', 0),
+    ('GIF 图像', 'gif', b'GIF89a', 0),
+    ('BMP 图像', 'bmp', b'BM', 0),
+    ('TIFF 图像', 'tif', b'II*\x00', 0),
+    ('TIFF 图像', 'tif', b'MM\x00*', 0),
+    ('WebP 图像', 'webp', b'WEBP', 8),
+    ('PSD 图像', 'psd', b'8BPS', 0),
+    ('ICO 图标', 'ico', b'\x00\x00\x01\x00', 0),
+    ('ZIP 压缩包', 'zip', b'PK\x03\x04', 0),
+    ('RAR 压缩包', 'rar', b'Rar!\x1a\x07', 0),
+    ('7z 压缩包', '7z', b'7z\xbc\xaf\x27\x1c', 0),
+    ('GZIP 压缩', 'gz', b'\x1f\x8b\x08', 0),
+    ('BZIP2 压缩', 'bz2', b'BZh', 0),
+    ('XZ 压缩', 'xz', b'\xfd7zXZ\x00', 0),
+    ('TAR 归档', 'tar', b'ustar', 257),
+    ('PDF 文档', 'pdf', b'%PDF-', 0),
+    ('ELF 可执行文件', 'elf', b'\x7fELF', 0),
+    ('PE 可执行文件', 'exe', b'MZ', 0),
+    ('Java class', 'class', b'\xca\xfe\xba\xbe', 0),
+    ('SQLite 数据库', 'sqlite', b'SQLite format 3\x00', 0),
+    ('WAV 音频', 'wav', b'WAVE', 8),
+    ('AVI 视频', 'avi', b'AVI ', 8),
+    ('MP3 音频', 'mp3', b'ID3', 0),
+    ('FLAC 音频', 'flac', b'fLaC', 0),
+    ('OGG 音频', 'ogg', b'OggS', 0),
+    ('MP4 视频', 'mp4', b'ftyp', 4),
+    ('PGP 数据', 'asc', b'-----BEGIN PGP', 0),
+]
+
+# find_signatures 只查找足够长（不易误报）的魔数
+MIN_SEARCH_MAGIC = 4
+
+# 可打印字节：ASCII 可见字符与 \t \n \r
+_PRINTABLE = np.zeros(256, dtype=bool)
+_PRINTABLE[0x20:0x7f] = True
+_PRINTABLE[[0x09, 0x0a, 0x0d]] = True
+
+
+def identify_file_type(data):
+    """
+    按开头的魔数识别文件类型
+    
+    Args:
+        data: bytes / bytearray / memoryview
+    
+    Returns:
+        list: [(名称, 扩展名), ...]，按魔数长度从长到短排列；无法识别时为空
+    """
+    head = bytes(data[:512])
+    matches = [(len(magic), name, ext) for name, ext, magic, offset in FILE_SIGNATURES
+               if head[offset:offset + len(magic)] == magic]
+    matches.sort(reverse=True)
+    return [(name, ext) for _, name, ext in matches]
+
+
+def find_signatures(data, limit=64):
+    """
+    查找数据中所有嵌入文件的起点
+    
+    Returns:
+        list: [(文件起始偏移, 名称, 扩展名), ...]，按偏移排序，最多 limit 条
+    """
+    data = bytes(data)
+    hits = []
+    for name, ext, magic, offset in FILE_SIGNATURES:
+        if len(magic) < MIN_SEARCH_MAGIC:
+            continue
+        position = data.find(magic, offset)
+        while position != -1 and len(hits) < limit * 4:
+            hits.append((position - offset, name, ext))
+            position = data.find(magic, position + 1)
+    hits.sort()
+    return hits[:limit]
+
+
+def byte_entropy(data):
+    """字节的香农熵（比特/字节，0~8）；随机数据与压缩数据接近 8"""
+    array = np.frombuffer(data, dtype=np.uint8)
+    if array.size == 0:
+        return 0.0
+    counts = np.bincount(array, minlength=256)
+    prob = counts[counts > 0] / array.size
+    return float(-(prob * np.log2(prob)).sum())
+
+
+def printable_ratio(data):
+    """可打印字符所占比例"""
+    array = np.frombuffer(data, dtype=np.uint8)
+    if array.size == 0:
+        return 0.0
+    return float(_PRINTABLE[array].mean())
+
+
+def hexdump(data, base=0):
+    """
+    十六进制转储，每行 16 字节：偏移、十六进制、ASCII
+    
+    Returns:
+        str: 多行文本
+    """
+    lines = []
+    for start in range(0, len(data), 16):
+        row = bytes(data[start:start + 16])
+        hex_part = ' '.join(f"{b:02x}" for b in row)
+        text_part = ''.join(chr(b) if 0x20 <= b < 0x7f else '.' for b in row)
+        lines.append(f"{base + start:08x}  {hex_part:<47}  {text_part}")
+    return '\n'.join(lines)
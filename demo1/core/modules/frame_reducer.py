@@ -0,0 +1,344 @@
+"""
+多帧归约 - 对动画或图像序列逐块做差分、异或、最大 / 最小 / 中位数 / 平均叠加
+
+帧源只需提供 frame_count 与 frame(i)（返回 (H, W, 4) RGBA），AnimationDecoder 与
+ImageSequence 都满足。帧按块读入预分配的 (K, H, W, 3) 缓冲，沿帧轴做一次 NumPy 归约，
+再与累加器合并；块大小由内存上限决定，因此内存占用与帧数无关。
+
+中位数不能按块合并，改为逐像素统计 0~255 的出现次数：计数表按行带划分，
+表太大时分多遍读取帧，每遍只统计一个行带。
+"""
+
+import os
+import time
+
+import numpy as np
+
+from ..base import BaseCore
+from .png_codec import PngStreamReader
+
+
+# 归约方式
+REDUCTIONS = {
+    'diff': "相邻帧差分（最大值）",
+    'xor': "与首帧异或（按位或累计）",
+    'max': "逐像素最大值",
+    'min': "逐像素最小值",
+    'median': "逐像素中位数",
+    'mean': "逐像素平均",
+}
+
+# 单帧查看方式
+FRAME_VIEWS = {
+    'frame': "原始帧",
+    'diff': "与上一帧差分",
+    'xor': "与首帧异或",
+}
+
+# 结果增强方式
+ENHANCES = {
+    'none': "不增强",
+    'stretch': "拉伸到 0~255",
+    'binary': "非零置白",
+}
+
+
+def absolute_difference(a, b, out=None):
+    """uint8 的 |a - b|（不溢出）"""
+    high = np.maximum(a, b)
+    return np.subtract(high, np.minimum(a, b), out=out if out is not None else high)
+
+
+def enhance(image, mode):
+    """
+    增强差分类结果，使微小差异可见
+    
+    Args:
+        image: (H, W, 3) uint8
+        mode (str): ENHANCES 中的键
+    """
+    if mode == 'stretch':
+        peak = int(image.max(initial=0))
+        if 0 < peak < 255:
+            return (image.astype(np.uint16) * 255 // peak).astype(np.uint8)
+    elif mode == 'binary':
+        return np.where(image > 0, 255, 0).astype(np.uint8)
+    return image
+
+
+def to_rgba(image):
+    """(H, W, 3) → (H, W, 4)，Alpha 为 255"""
+    out = np.empty(image.shape[:2] + (4,), dtype=np.uint8)
+    out[..., :3] = image
+    out[..., 3] = 255
+    return out
+
+
+def decode_delays(delays, gif=True):
+    """
+    把帧延时当作数据解码
+    
+    GIF 延时以 1/100 秒存储，全部能被 10 整除时换算回原始值。
+    
+    Returns:
+        dict: values (原始取值), ascii (全部可打印时的字符), bits (恰好两种取值时，较小者为 0),
+              bytes / inverted (按位打包的字节及取反后的结果，高位在前)
+    """
+    values = list(delays)
+    if gif and values and all(value % 10 == 0 for value in values):
+        values = [value // 10 for value in values]
+    result = {'values': values, 'ascii': None, 'bits': None, 'bytes': None, 'inverted': None}
+    if values and all(32 <= value < 127 or value in (9, 10, 13) for value in values):
+        result['ascii'] = ''.join(chr(value) for value in values)
+    distinct = sorted(set(values))
+    if len(distinct) == 2:
+        bits = np.array([value == distinct[1] for value in values], dtype=np.uint8)
+        result['bits'] = ''.join(map(str, bits))
+        usable = len(bits) // 8 * 8
+        if usable:
+            result['bytes'] = np.packbits(bits[:usable]).tobytes()
+            result['inverted'] = np.packbits(1 - bits[:usable]).tobytes()
+    return result
+
+
+class ImageSequence:
+    """
+    图像序列帧源：按需读取文件，尺寸与第一帧不同的帧按左上角对齐裁剪或补零
+    
+    loader(path) 返回 (H, W) 灰度或 (H, W, 3/4) 数组；默认只支持 PNG（流式解码）
+    """
+    
+    def __init__(self, paths, loader=None):
+        if not paths:
+            raise ValueError("图像序列为空")
+        self.paths = list(paths)
+        self.loader = loader or self.load_png
+        first = self.frame(0, align=False)
+        self.height, self.width = first.shape[:2]
+    
+    @property
+    def frame_count(self):
+        """帧数"""
+        return len(self.paths)
+    
+    @staticmethod
+    def load_png(path):
+        """用流式 PNG 解码器读取整幅图像"""
+        if os.path.splitext(path)[1].lower() != '.png':
+            raise ValueError(f"默认只能读取 PNG: {os.path.basename(path)}")
+        with PngStreamReader(path) as reader:
+            return np.concatenate([strip for _, strip in reader.iter_strips(256)])
+    
+    def frame(self, index, align=True):
+        """第 index 帧的 RGBA 像素"""
+        image = np.asarray(self.loader(self.paths[index]))
+        if image.ndim == 2:
+            image = image[..., None].repeat(3, axis=2)
+        if image.shape[2] == 3:
+            image = to_rgba(image)
+        if not align or image.shape[:2] == (self.height, self.width):
+            return image
+        out = np.zeros((self.height, self.width, 4), dtype=np.uint8)
+        rows, cols = min(self.height, image.shape[0]), min(self.width, image.shape[1])
+        out[:rows, :cols] = image[:rows, :cols]
+        return out
+
+
+class FrameReducer(BaseCore):
+    """
+    多帧归约器
+    
+    功能：
+    - 相邻帧差分、与首帧异或、逐像素最大 / 最小 / 中位数 / 平均（按块流式计算，可取消）
+    - 单帧查看：原始帧、与上一帧差分、与首帧异或
+    - 帧延时解码
+    """
+    
+    # 默认内存上限（帧缓冲、中位数计数表各自不超过该值）
+    MEMORY_BYTES = 256 << 20
+    
+    def __init__(self):
+        super().__init__()
+        self.memory_bytes = self.MEMORY_BYTES
+        self.result = None
+    
+    def initialize(self):
+        """初始化处理器"""
+        self._initialized = True
+        print("✅ FrameReducer 已初始化")
+    
+    def process(self, *args, **kwargs):
+        """
+        对帧源做归约
+        
+        Args:
+            args[0]: 帧源（提供 frame_count 与 frame(i)）
+            kwargs['options']: 处理选项
+                - reduction (str): REDUCTIONS 中的键，默认 'diff'
+                - start / end / step (int): 参与归约的帧号范围 [start, end)，默认全部
+                - memory_mb (int): 内存上限（MB）
+        
+        Returns:
+            bool: 处理是否成功（被取消也返回 True，result['cancelled'] 为 True）
+        """
+        if not self._initialized:
+            self.initialize()
+        
+        try:
+            self.reset_cancel()
+            source = args[0] if args else None
+            options = kwargs.get('options', {})
+            if source is None or not source.frame_count:
+                print("❌ 没有可归约的帧")
+                return False
+            
+            reduction = options.get('reduction', 'diff')
+            if reduction not in REDUCTIONS:
+                raise ValueError(f"未知的归约方式: {reduction}")
+            self.memory_bytes = int(options.get('memory_mb', self.MEMORY_BYTES >> 20)) << 20
+            start = options.get('start', 0)
+            end = options.get('end') or source.frame_count
+            indices = list(range(start, min(end, source.frame_count), max(options.get('step', 1), 1)))
+            if not indices:
+                raise ValueError("帧范围为空")
+            print(f"🎞 {REDUCTIONS[reduction]}: {len(indices)} 帧")
+            self.result = self.reduce(source, reduction, indices)
+            print(f"✨ 完成: {self.result['frames']} 帧, 用时 {self.result['elapsed']:.2f}s, "
+                  f"{self.result['passes']} 遍")
+            return True
+        
+        except Exception as e:
+            print(f"❌ 处理失败: {e}")
+            return False
+    
+    def cleanup(self):
+        """清理资源"""
+        self.cancel()
+        self.result = None
+        print("🧹 FrameReducer 已清理")
+    
+    def get_result(self):
+        """获取处理结果"""
+        return self.result
+    
+    # ==================== 业务逻辑方法 ====================
+    
+    def reduce(self, source, reduction, indices):
+        """
+        归约指定的帧
+        
+        Returns:
+            dict: reduction, image ((H, W, 3) uint8), frames (实际参与的帧数), passes,
+                  elapsed, cancelled
+        """
+        started = time.perf_counter()
+        if reduction == 'median':
+            image, frames, passes = self._median(source, indices)
+        else:
+            image, frames = self._chunked(source, reduction, indices)
+            passes = 1
+        return {
+            'reduction': reduction, 'image': image, 'frames': frames, 'passes': passes,
+            'elapsed': time.perf_counter() - started, 'cancelled': self.is_cancelled(),
+        }
+    
+    def chunk_frames(self, height, width, copies=3):
+        """每块的帧数：帧缓冲与归约的临时数组（约 copies 份）不超过内存上限"""
+        return max(1, self.memory_bytes // (height * width * 3 * copies))
+    
+    def _chunked(self, source, reduction, indices):
+        """按块读帧，沿帧轴归约后与累加器合并"""
+        first = source.frame(indices[0])[..., :3]
+        height, width = first.shape[:2]
+        chunk = min(self.chunk_frames(height, width), len(indices))
+        buffer = np.empty((chunk, height, width, 3), dtype=np.uint8)
+        if reduction == 'mean':
+            accumulator = np.zeros((height, width, 3), dtype=np.uint64)
+        elif reduction in ('diff', 'xor'):
+            accumulator = np.zeros((height, width, 3), dtype=np.uint8)
+        else:
+            accumulator = first.copy()
+        previous = first.copy()
+        done = 0
+        
+        for start in range(0, len(indices), chunk):
+            if self.is_cancelled():
+                break
+            part = indices[start:start + chunk]
+            for k, index in enumerate(part):
+                buffer[k] = source.frame(index)[..., :3]
+            stack = buffer[:len(part)]
+            
+            if reduction == 'max':
+                np.maximum(accumulator, stack.max(axis=0), out=accumulator)
+            elif reduction == 'min':
+                np.minimum(accumulator, stack.min(axis=0), out=accumulator)
+            elif reduction == 'mean':
+                accumulator += stack.sum(axis=0, dtype=np.uint64)
+            elif reduction == 'xor':
+                np.bitwise_xor(stack, first, out=stack)
+                np.bitwise_or(accumulator, np.bitwise_or.reduce(stack, axis=0), out=accumulator)
+            else:
+                # 块内相邻帧的差分，再加上上一块最后一帧与本块第一帧的差分
+                np.maximum(accumulator, absolute_difference(previous, stack[0]), out=accumulator)
+                if len(part) > 1:
+                    diffs = absolute_difference(stack[1:], stack[:-1])
+                    np.maximum(accumulator, diffs.max(axis=0), out=accumulator)
+                previous[...] = stack[-1]
+            done += len(part)
+            self.report_progress(done, len(indices))
+        
+        if reduction == 'mean':
+            accumulator = (accumulator + done // 2) // max(done, 1)
+        return accumulator.astype(np.uint8), done
+    
+    def _median(self, source, indices):
+        """逐像素计数求中位数（较低的中位数）；计数表按行带划分，超出内存上限时分多遍"""
+        first = source.frame(indices[0])
+        height, width = first.shape[:2]
+        count = len(indices)
+        dtype = np.uint16 if count < 65536 else np.uint32
+        row_bytes = width * 3 * 256 * np.dtype(dtype).itemsize
+        band = max(1, min(height, self.memory_bytes // row_bytes))
+        passes = -(-height // band)
+        rank = (count + 1) // 2
+        image = np.zeros((height, width, 3), dtype=np.uint8)
+        done = 0
+        
+        for y0 in range(0, height, band):
+            y1 = min(y0 + band, height)
+            cells = (y1 - y0) * width * 3
+            # 按取值分行 (256, cells)：同一帧的自增集中在少数几行内连续推进，比按像素分行的访存局部性好得多
+            counts = np.zeros((256, cells), dtype=dtype)
+            flat = counts.reshape(-1)
+            positions = np.arange(cells, dtype=np.intp)
+            for index in indices:
+                if self.is_cancelled():
+                    return image, done, passes
+                values = source.frame(index)[y0:y1, :, :3].reshape(-1).astype(np.intp)
+                # 每个 (像素, 通道) 在一帧中恰好出现一次，下标不重复，可以直接自增
+                values *= cells
+                values += positions
+                flat[values] += 1
+                done += 1
+                self.report_progress(done, count * passes)
+            np.cumsum(counts, axis=0, out=counts)
+            image[y0:y1] = (counts >= rank).argmax(axis=0).reshape(y1 - y0, width, 3)
+        return image, count, passes
+    
+    def frame_view(self, source, index, view='frame'):
+        """
+        查看单帧
+        
+        Args:
+            view (str): FRAME_VIEWS 中的键
+        
+        Returns:
+            ndarray: (H, W, 3) uint8
+        """
+        current = source.frame(index)[..., :3]
+        if view == 'diff':
+            return absolute_difference(source.frame(max(index - 1, 0))[..., :3], current)
+        if view == 'xor':
+            return np.bitwise_xor(current, source.frame(0)[..., :3])
+        return np.array(current)
@@ -0,0 +1,370 @@
+"""
+哈希识别与字典攻击处理器
+
+支持 MD5 / SHA-1 / SHA-256 / SHA-512 / NTLM / CRC32。
+字典文件通过 mmap 按换行边界切块，块的 (起点, 终点) 交给进程池，
+子进程自行映射文件读取对应区间，字典内容不会整体读入内存或在进程间传输。
+"""
+
+import hashlib
+import mmap
+import multiprocessing
+import os
+import struct
+import time
+import zlib
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+
+from ..base import BaseCore
+
+
+# 十六进制长度 -> 可能的算法
+HASH_LENGTHS = {
+    8: ['crc32'],
+    32: ['md5', 'ntlm'],
+    40: ['sha1'],
+    64: ['sha256'],
+    128: ['sha512'],
+}
+
+ALGORITHMS = ['md5', 'sha1', 'sha256', 'sha512', 'ntlm', 'crc32']
+
+# 变形规则说明
+RULES = {
+    'case': "大小写变换",
+    'reverse': "反转",
+    'leet': "Leet 替换 (a→4 e→3 i→1 o→0 s→5)",
+    'digits': "追加数字 0-99",
+    'years': "追加年份 1970-2030",
+}
+
+# 每条规则使候选数量扩大的倍数，用于按规则缩小任务块
+RULE_FACTORS = {
+    'case': 4,
+    'reverse': 2,
+    'leet': 2,
+    'digits': 101,
+    'years': 62,
+}
+
+_LEET_TABLE = bytes.maketrans(b"aeiosAEIOS", b"4310543105")
+
+
+def identify_hash(text):
+    """
+    识别哈希类型
+    
+    支持纯十六进制、$NT$ 前缀以及 pwdump 格式 (user:rid:lm:nt:::)
+    
+    Returns:
+        tuple: (规范化的十六进制摘要, [可能的算法])，无法识别时算法列表为空
+    """
+    text = text.strip()
+    if text.count(':') >= 3:
+        text = text.split(':')[3]
+        return text.lower(), ['ntlm'] if len(text) == 32 else []
+    if text.upper().startswith('$NT$'):
+        return text[4:].lower(), ['ntlm']
+    try:
+        bytes.fromhex(text)
+    except ValueError:
+        return text, []
+    return text.lower(), list(HASH_LENGTHS.get(len(text), []))
+
+
+# MD4 各轮的 (消息下标, 循环左移位数)
+_MD4_ROUNDS = (
+    [(i + j, (3, 7, 11, 19)[j]) for i in (0, 4, 8, 12) for j in range(4)],
+    [(i + 4 * j, (3, 5, 9, 13)[j]) for i in range(4) for j in range(4)],
+    [(i + (0, 8, 4, 12)[j], (3, 9, 11, 15)[j]) for i in (0, 2, 1, 3) for j in range(4)],
+)
+
+
+def _md4(data):
+    """纯 Python MD4（OpenSSL 3 默认不再提供 md4）"""
+    message = data + b"\x80" + b"\x00" * ((55 - len(data)) % 64) + struct.pack("<Q", len(data) * 8)
+    h = [0x67452301, 0xefcdab89, 0x98badcfe, 0x10325476]
+    for offset in range(0, len(message), 64):
+        x = struct.unpack("<16I", message[offset:offset + 64])
+        a, b, c, d = h
+        for k, s in _MD4_ROUNDS[0]:
+            t = (a + ((b & c) | (~b & d)) + x[k]) & 0xffffffff
+            a, b, c, d = d, ((t << s) | (t >> (32 - s))) & 0xffffffff, b, c
+        for k, s in _MD4_ROUNDS[1]:
+            t = (a + ((b & c) | (b & d) | (c & d)) + x[k] + 0x5a827999) & 0xffffffff
+            a, b, c, d = d, ((t << s) | (t >> (32 - s))) & 0xffffffff, b, c
+        for k, s in _MD4_ROUNDS[2]:
+            t = (a + (b ^ c ^ d) + x[k] + 0x6ed9eba1) & 0xffffffff
+            a, b, c, d = d, ((t << s) | (t >> (32 - s))) & 0xffffffff, b, c
+        h = [(v + w) & 0xffffffff for v, w in zip(h, (a, b, c, d))]
+    return struct.pack("<4I", *h)
+
+
+def _ntlm(word):
+    """NTLM = MD4(UTF-16LE(password))"""
+    data = word.decode('utf-8', errors='replace').encode('utf-16-le')
+    try:
+        return hashlib.new('md4', data).digest()
+    except ValueError:
+        return _md4(data)
+
+
+HASH_FUNCTIONS = {
+    'md5': lambda w: hashlib.md5(w).digest(),
+    'sha1': lambda w: hashlib.sha1(w).digest(),
+    'sha256': lambda w: hashlib.sha256(w).digest(),
+    'sha512': lambda w: hashlib.sha512(w).digest(),
+    'ntlm': _ntlm,
+    'crc32': lambda w: zlib.crc32(w).to_bytes(4, 'big'),
+}
+
+
+def mangle(word, rules):
+    """按规则生成单词的变形（含原词），结果去重"""
+    variants = {word}
+    if 'case' in rules:
+        variants |= {word.lower(), word.upper(), word.capitalize(), word.swapcase()}
+    if 'reverse' in rules:
+        variants |= {v[::-1] for v in list(variants)}
+    if 'leet' in rules:
+        variants |= {v.translate(_LEET_TABLE) for v in list(variants)}
+    base = list(variants)
+    if 'digits' in rules:
+        variants.update(v + str(n).encode() for v in base for n in range(100))
+    if 'years' in rules:
+        variants.update(v + str(n).encode() for v in base for n in range(1970, 2031))
+    return variants
+
+
+# 子进程内缓存的字典映射：路径 -> ((大小, 修改时间), mmap)，避免每个块重复打开文件；
+# 文件被改写后标记不同，旧映射关闭后重新映射
+_worker_maps = {}
+
+
+def _crack_chunk(path, stamp, start, end, targets, rules):
+    """
+    子进程任务：对字典文件 [start, end) 区间内的单词计算哈希并比对
+    
+    Args:
+        stamp (tuple): 主进程映射文件时的 (大小, 修改时间 ns)
+        targets (dict): {算法: frozenset(摘要 bytes)}
+    
+    Returns:
+        tuple: ([(算法, 摘要 hex, 明文)], 计算的哈希数)
+    """
+    cached = _worker_maps.get(path)
+    if cached is None or cached[0] != stamp:
+        if cached is not None:
+            cached[1].close()
+        with open(path, 'rb') as f:
+            _worker_maps[path] = (stamp, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ))
+    return crack_words(_worker_maps[path][1][start:end], targets, rules)
+
+
+def crack_words(data, targets, rules):
+    """
+    对一段按换行分隔的字典数据计算哈希并比对
+    
+    Returns:
+        tuple: ([(算法, 摘要 hex, 明文)], 计算的哈希数)
+    """
+    words = data.split(b"\n")
+    found = []
+    hashed = 0
+    functions = [(algo, HASH_FUNCTIONS[algo], digests) for algo, digests in targets.items()]
+    for word in words:
+        word = word.rstrip(b"\r")
+        if not word:
+            continue
+        candidates = mangle(word, rules) if rules else (word,)
+        for candidate in candidates:
+            for algo, function, digests in functions:
+                digest = function(candidate)
+                if digest in digests:
+                    found.append((algo, digest.hex(), candidate.decode('utf-8', errors='replace')))
+            hashed += len(functions)
+    return found, hashed
+
+
+class HashCracker(BaseCore):
+    """
+    字典哈希破解器
+    
+    功能：
+    - 哈希类型识别
+    - 流式字典 + 进程池并行计算
+    - 规则变形、速度统计（H/s）、取消
+    """
+    
+    # 无规则时每个任务块的字节数，启用规则后按 RULE_FACTORS 缩小
+    CHUNK_SIZE = 1 << 20
+    # 最小块大小，保证取消与进度的响应粒度
+    MIN_CHUNK_SIZE = 1 << 12
+    # 小于该大小且不启用规则的字典直接在当前进程处理，省去进程池启动开销
+    INPROCESS_LIMIT = 1 << 20
+    
+    def __init__(self):
+        super().__init__()
+        self.targets = {}
+        self.result = None
+    
+    def initialize(self):
+        """初始化处理器"""
+        self._initialized = True
+        print("✅ HashCracker 已初始化")
+    
+    def process(self, *args, **kwargs):
+        """
+        执行字典攻击
+        
+        Args:
+            args[0] (list): 目标哈希字符串列表
+            kwargs['options']: 处理选项
+                - wordlist (str): 字典文件路径
+                - algorithm (str): 'auto' 或 ALGORITHMS 之一
+                - rules (list): RULES 中的规则名
+                - workers (int): 进程数，默认 CPU 核数
+        
+        Returns:
+            bool: 处理是否成功（被取消也返回 True，result['cancelled'] 为 True）
+        """
+        if not self._initialized:
+            self.initialize()
+        
+        try:
+            self.reset_cancel()
+            hashes = args[0] if args else []
+            options = kwargs.get('options', {})
+            wordlist = options['wordlist']
+            rules = frozenset(options.get('rules', []))
+            workers = options.get('workers') or os.cpu_count() or 1
+            
+            self.targets = self.build_targets(hashes, options.get('algorithm', 'auto'))
+            if not self.targets:
+                print("❌ 没有可识别的目标哈希")
+                return False
+            
+            print(f"🔑 目标: {sum(map(len, self.targets.values()))} 个, 字典: {wordlist}")
+            self.result = self.run_attack(wordlist, rules, workers)
+            print(f"✨ 完成: 破解 {len(self.result['found'])} 个, "
+                  f"{self.result['rate']:.0f} H/s")
+            return True
+        
+        except Exception as e:
+            print(f"❌ 处理失败: {e}")
+            return False
+    
+    def cleanup(self):
+        """清理资源"""
+        self.cancel()
+        self.targets = {}
+        self.result = None
+        self._initialized = False
+        print("🧹 HashCracker 已清理")
+    
+    # ==================== 业务逻辑方法 ====================
+    
+    def build_targets(self, hashes, algorithm='auto'):
+        """
+        将哈希字符串整理为 {算法: frozenset(摘要)}
+        
+        自动模式下，长度有歧义的哈希（如 32 位的 MD5 / NTLM）会同时加入所有候选算法
+        """
+        targets = {}
+        for text in hashes:
+            digest_hex, algorithms = identify_hash(text)
+            if algorithm != 'auto':
+                algorithms = [algorithm] if algorithm in algorithms else []
+            for algo in algorithms:
+                targets.setdefault(algo, set()).add(bytes.fromhex(digest_hex))
+        return {algo: frozenset(digests) for algo, digests in targets.items()}
+    
+    def chunk_size(self, rules):
+        """根据规则的扩展倍数计算块大小，使每块的计算量大致相同"""
+        factor = 1
+        for rule in rules:
+            factor *= RULE_FACTORS.get(rule, 1)
+        return max(self.CHUNK_SIZE // factor, self.MIN_CHUNK_SIZE)
+    
+    def iter_chunks(self, buffer, chunk_size=None):
+        """按换行边界切分字典，产生 (start, end)"""
+        chunk_size = chunk_size or self.CHUNK_SIZE
+        size = len(buffer)
+        start = 0
+        while start < size:
+            end = min(start + chunk_size, size)
+            if end < size:
+                newline = buffer.find(b"\n", end)
+                end = size if newline == -1 else newline + 1
+            yield start, end
+            start = end
+    
+    def run_attack(self, wordlist, rules, workers):
+        """在进程池中分块执行字典攻击，返回统计结果"""
+        remaining = set().union(*self.targets.values())
+        found = {}
+        hashed = 0
+        started = time.perf_counter()
+        
+        with open(wordlist, 'rb') as f:
+            stat = os.fstat(f.fileno())
+            size, stamp = stat.st_size, (stat.st_size, stat.st_mtime_ns)
+            buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) if size else b""
+        # 每次攻击重新映射，结束时关闭；当前进程处理时直接切片这份映射
+        try:
+            chunks = self.iter_chunks(buffer, self.chunk_size(rules))
+            
+            def record(chunk_found, chunk_hashed, end):
+                nonlocal hashed
+                hashed += chunk_hashed
+                for algo, digest_hex, word in chunk_found:
+                    found[digest_hex] = (algo, word)
+                    remaining.discard(bytes.fromhex(digest_hex))
+                elapsed = max(time.perf_counter() - started, 1e-9)
+                self.report_progress(end, size, rate=hashed / elapsed, found=len(found))
+            
+            if (size <= self.INPROCESS_LIMIT and not rules) or workers <= 1:
+                for start, end in chunks:
+                    if self.is_cancelled() or not remaining:
+                        break
+                    record(*crack_words(buffer[start:end], self.targets, rules), end)
+            else:
+                context = multiprocessing.get_context('spawn')
+                with ProcessPoolExecutor(max_workers=workers, mp_context=context) as pool:
+                    pending = {}
+                    done_bytes = 0
+                    for start, end in chunks:
+                        pending[pool.submit(_crack_chunk, wordlist, stamp, start, end,
+                                            self.targets, rules)] = end - start
+                        # 只保留有限数量的在途任务，避免一次性提交整个字典
+                        if len(pending) < workers * 2:
+                            continue
+                        done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                        for future in done:
+                            done_bytes += pending.pop(future)
+                            record(*future.result(), done_bytes)
+                        if self.is_cancelled() or not remaining:
+                            break
+                    if self.is_cancelled() or not remaining:
+                        for future in pending:
+                            future.cancel()
+                    for future in pending:
+                        if not future.cancelled():
+                            done_bytes += pending[future]
+                            record(*future.result(), done_bytes)
+        finally:
+            if isinstance(buffer, mmap.mmap):
+                buffer.close()
+        
+        elapsed = time.perf_counter() - started
+        return {
+            'found': found,
+            'hashed': hashed,
+            'elapsed': elapsed,
+            'rate': hashed / elapsed if elapsed else 0.0,
+            'cancelled': self.is_cancelled(),
+        }
+    
+    def get_result(self):
+        """获取处理结果"""
+        return self.result
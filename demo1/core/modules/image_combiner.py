@@ -0,0 +1,276 @@
+"""
+双图合成 - 对两幅图像逐像素做 XOR / ADD / SUB / AND / OR / 绝对差
+
+两幅图像先对齐：第二幅按偏移 (dx, dy) 放到第一幅上，只取重叠部分；
+灰度、RGB、16 位等输入统一换算为 8 位 RGBA。运算用 NumPy ufunc 直接写入结果缓冲
+（out=），ADD / SUB 按 uint8 回绕（与 Stegsolve 的 Image Combiner 相同）。
+
+通道掩码选择参与合成的通道（未选的颜色通道置 0，未选 Alpha 时置 255 以便查看），
+位掩码再与每个通道按位与，可以只看某几个位平面。
+
+任一输入为 TiledImage 或重叠部分超过 TILED_PIXELS 时结果写入新的 TiledImage：
+各块在线程池中读取、合成、写回，内存占用与图像大小无关。
+"""
+
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+from ..base import BaseCore
+from .tiled_image import TiledImage
+
+
+# 合成方式
+OPERATIONS = {
+    'xor': "XOR",
+    'add': "ADD（模 256）",
+    'sub': "SUB（A - B，模 256）",
+    'and': "AND",
+    'or': "OR",
+    'diff': "绝对差 |A - B|",
+}
+
+_UFUNCS = {
+    'xor': np.bitwise_xor,
+    'add': np.add,
+    'sub': np.subtract,
+    'and': np.bitwise_and,
+    'or': np.bitwise_or,
+}
+
+
+def to_rgba8(block, out):
+    """
+    把任意常见格式的像素块写成 8 位 RGBA
+    
+    Args:
+        block: (H, W) 灰度、(H, W, 2) 灰度 + Alpha、(H, W, 3) RGB 或 (H, W, 4) RGBA，uint8 / uint16
+        out: (H, W, 4) uint8 输出缓冲
+    """
+    if block.dtype != np.uint8:
+        block = (block >> 8).astype(np.uint8) if block.dtype == np.uint16 else block.astype(np.uint8)
+    if block.ndim == 2:
+        block = block[..., None]
+    channels = block.shape[2]
+    if channels == 4:
+        out[...] = block
+        return out
+    if channels == 3:
+        out[..., :3] = block[..., :3]
+    else:
+        out[..., :3] = block[..., :1]
+    out[..., 3] = block[..., -1] if channels == 2 else 255
+    return out
+
+
+def overlap(first_shape, second_shape, dx=0, dy=0):
+    """
+    第二幅图像放在 (dx, dy) 时的重叠区域
+    
+    Returns:
+        tuple: (y0, x0, height, width)，y0 / x0 为重叠区域在第一幅图像中的位置；
+               第二幅图像中对应位置为 (y0 - dy, x0 - dx)。没有重叠时高或宽为 0
+    """
+    y0, x0 = max(dy, 0), max(dx, 0)
+    y1 = min(first_shape[0], dy + second_shape[0])
+    x1 = min(first_shape[1], dx + second_shape[1])
+    return y0, x0, max(y1 - y0, 0), max(x1 - x0, 0)
+
+
+class ImageCombiner(BaseCore):
+    """
+    双图合成器
+    
+    示例:
+        combiner = ImageCombiner()
+        combiner.process(first, second, options={'operation': 'xor', 'channels': 'RGB'})
+        result = combiner.get_result()  # (H, W, 4) RGBA 或 TiledImage
+    """
+    
+    # 重叠部分超过该像素数时写入 TiledImage
+    TILED_PIXELS = 1 << 26
+    # 内存中合成时每个行带的像素数
+    BAND_PIXELS = 1 << 18
+    
+    def __init__(self):
+        super().__init__()
+        self.result = None
+        self.region = None
+        self.elapsed = 0.0
+        self.workers = os.cpu_count() or 1
+    
+    def initialize(self):
+        """初始化处理器"""
+        self._initialized = True
+        print("✅ ImageCombiner 已初始化")
+    
+    def process(self, *args, **kwargs):
+        """
+        合成两幅图像
+        
+        Args:
+            args[0], args[1]: 图像 A、B，ndarray 或 TiledImage
+            kwargs['options']: 合成选项
+                - operation (str): OPERATIONS 之一
+                - offset (tuple): B 相对 A 的偏移 (dx, dy)，默认 (0, 0)
+                - channels (str): 参与合成的通道，'RGBA' 的子集，默认 'RGB'
+                - bit_mask (int | tuple): 位掩码，整数作用于全部通道，也可以按 RGBA 分别给出
+                - tiled (bool): 强制 / 禁止分块输出，默认按大小自动选择
+                - workers (int): 分块处理的线程数，默认为 CPU 核数
+        
+        Returns:
+            bool: 处理是否成功（被取消时返回 False）
+        """
+        if not self._initialized:
+            self.initialize()
+        
+        try:
+            if len(args) < 2 or args[0] is None or args[1] is None:
+                print("❌ 需要两幅图像")
+                return False
+            first, second = args[0], args[1]
+            options = kwargs.get('options', {})
+            operation = options.get('operation', 'xor')
+            if operation not in OPERATIONS:
+                print(f"❌ 未知的合成方式: {operation}")
+                return False
+            dx, dy = options.get('offset', (0, 0))
+            region = overlap(first.shape, second.shape, dx, dy)
+            if not region[2] or not region[3]:
+                print("❌ 两幅图像没有重叠部分")
+                return False
+            
+            self.reset_cancel()
+            self.workers = options.get('workers') or os.cpu_count() or 1
+            mask = self.channel_mask(options.get('channels', 'RGB'), options.get('bit_mask', 0xFF))
+            keep_alpha = 'A' not in options.get('channels', 'RGB').upper()
+            tiled = options.get('tiled')
+            if tiled is None:
+                tiled = (isinstance(first, TiledImage) or isinstance(second, TiledImage) or
+                         region[2] * region[3] > self.TILED_PIXELS)
+            start = time.perf_counter()
+            print(f"🔀 双图合成: {OPERATIONS[operation]}, 重叠 {region[3]}x{region[2]}, 偏移 ({dx}, {dy})")
+            
+            if tiled:
+                result = self._combine_tiled(first, second, region, (dx, dy), operation, mask, keep_alpha)
+            else:
+                result = self._combine_bands(first, second, region, (dx, dy), operation, mask, keep_alpha)
+            if result is None:
+                print("⏹️ 合成已取消")
+                return False
+            self.result = result
+            self.region = region
+            self.elapsed = time.perf_counter() - start
+            print(f"✨ 合成完成: {region[3]}x{region[2]}, 用时 {self.elapsed:.2f}s")
+            return True
+        
+        except Exception as e:
+            print(f"❌ 合成失败: {e}")
+            return False
+    
+    def cleanup(self):
+        """清理资源"""
+        self.result = None
+        self.region = None
+        self._initialized = False
+        print("🧹 ImageCombiner 已清理")
+    
+    # ==================== 业务逻辑方法 ====================
+    
+    @staticmethod
+    def channel_mask(channels='RGB', bit_mask=0xFF):
+        """通道掩码与位掩码合并为 (4,) uint8 的 RGBA 掩码"""
+        bits = [bit_mask] * 4 if isinstance(bit_mask, int) else list(bit_mask)
+        channels = channels.upper()
+        return np.array([bits[index] & 0xFF if name in channels else 0
+                         for index, name in enumerate('RGBA')], dtype=np.uint8)
+    
+    def combine(self, first, second, region, offset, operation, mask, keep_alpha=True, out=None):
+        """
+        合成重叠区域（或其中一块）
+        
+        Args:
+            first, second: 整幅像素数组（ndarray 或 TiledImage 的 memmap）
+            region (tuple): (y0, x0, height, width)，在第一幅图像中的位置
+            offset (tuple): 第二幅图像的偏移 (dx, dy)
+            mask: channel_mask 的结果
+            keep_alpha (bool): Alpha 不参与合成时置 255
+            out: (height, width, 4) uint8 输出缓冲，默认新建
+        
+        Returns:
+            np.ndarray: (height, width, 4) RGBA
+        """
+        y0, x0, height, width = region
+        dx, dy = offset
+        if out is None:
+            out = np.empty((height, width, 4), dtype=np.uint8)
+        to_rgba8(first[y0:y0 + height, x0:x0 + width], out)
+        other = second[y0 - dy:y0 - dy + height, x0 - dx:x0 - dx + width]
+        if other.dtype != np.uint8 or other.ndim != 3 or other.shape[2] != 4:
+            other = to_rgba8(other, np.empty_like(out))
+        elif operation == 'diff':
+            other = np.array(other)
+        if operation == 'diff':
+            high = np.maximum(out, other)
+            np.minimum(out, other, out=other)
+            np.subtract(high, other, out=out)
+        else:
+            _UFUNCS[operation](out, other, out=out)
+        if (mask != 0xFF).any():
+            np.bitwise_and(out, mask, out=out)
+        if keep_alpha:
+            out[..., 3] = 255
+        return out
+    
+    def _combine_bands(self, first, second, region, offset, operation, mask, keep_alpha):
+        """按行带合成到内存数组，每带的中间数组能留在缓存中（取消时返回 None）"""
+        y0, x0, height, width = region
+        first, second = self._pixels(first), self._pixels(second)
+        out = np.empty((height, width, 4), dtype=np.uint8)
+        rows = max(self.BAND_PIXELS // width, 1)
+        for top in range(0, height, rows):
+            bottom = min(top + rows, height)
+            self.combine(first, second, (y0 + top, x0, bottom - top, width), offset, operation, mask,
+                         keep_alpha, out=out[top:bottom])
+            if self.is_cancelled():
+                return None
+            self.report_progress(bottom, height)
+        return out
+    
+    def _combine_tiled(self, first, second, region, offset, operation, mask, keep_alpha):
+        """逐块合成到新的 TiledImage（取消时返回 None）"""
+        y0, x0, height, width = region
+        source = first if isinstance(first, TiledImage) else second
+        directory = os.path.dirname(source.path) if isinstance(source, TiledImage) and source.path else None
+        store = TiledImage.create(height, width, 4, directory)
+        first_pixels, second_pixels = self._pixels(first), self._pixels(second)
+        tiles = list(store.tiles())
+        
+        def work(tile):
+            if self.is_cancelled():
+                return
+            ty0, ty1, tx0, tx1 = tile
+            block = (y0 + ty0, x0 + tx0, ty1 - ty0, tx1 - tx0)
+            self.combine(first_pixels, second_pixels, block, offset, operation, mask, keep_alpha,
+                         out=store.pixels[ty0:ty1, tx0:tx1])
+        
+        # 工作线程只负责计算，进度在调用线程中按完成顺序汇报
+        with ThreadPoolExecutor(self.workers) as pool:
+            for done, _ in enumerate(pool.map(work, tiles), 1):
+                self.report_progress(done, len(tiles))
+        if self.is_cancelled():
+            store.close()
+            return None
+        store.flush()
+        return store
+    
+    @staticmethod
+    def _pixels(image):
+        """ndarray 原样返回，TiledImage 返回其像素映射"""
+        return image.pixels if isinstance(image, TiledImage) else image
+    
+    def get_result(self):
+        """获取结果"""
+        return self.result
@@ -0,0 +1,701 @@
+"""
+图像处理器 - 灰度化 / 二值化 / 边缘检测 / 模糊 / 锐化 / 旋转 / 缩放
+
+图像统一表示为 uint8 的 NumPy 数组：彩色为 (H, W, 4) 的 RGBA，灰度为 (H, W)。
+与 QImage 之间的零拷贝转换在界面层完成（vievs.widgets.image_array），
+这里不依赖 Qt。
+
+所有运算均为向量化 NumPy 实现，并按行分带处理：
+- 每带约 BAND_PIXELS 个像素，避免为整幅图分配临时数组；带内再按 CACHE_ELEMENTS
+  切成小段计算，中间数组能留在 L2 缓存中
+- 邻域滤波的带在上下左右带有 halo（边缘复制），因此分带结果与整图计算一致
+- 各带在线程池中并行（NumPy 运算释放 GIL），每带开始前检查取消，
+  进度在主调线程中按完成顺序上报
+
+输入为 TiledImage（内存映射的超大图像）时改为分块处理：各块带 halo 读取、
+在线程池中并行计算、逐块写回新的 TiledImage，同时在途的块数有上限，
+因此内存占用与图像大小无关。
+"""
+
+import math
+import os
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+
+import numpy as np
+
+from ..base import BaseCore
+from .tiled_image import TiledImage
+
+
+# 灰度化权重 (ITU-R BT.601)，定点 8 位小数
+GRAY_WEIGHTS = (77, 150, 29)
+
+# 处理类型，与 ImageModuleUI 的下拉框顺序一致
+OPERATIONS = ('grayscale', 'binarize', 'edge', 'blur', 'sharpen', 'rotate', 'scale')
+
+# 各处理类型的参数默认值
+DEFAULT_PARAMS = {
+    'binarize': 0,      # 阈值，0 表示 Otsu 自动阈值
+    'blur': 3,          # 模糊半径（像素）
+    'sharpen': 100,     # 锐化强度（百分比）
+    'rotate': 90,       # 顺时针旋转角度
+    'scale': 50,        # 缩放比例（百分比）
+}
+
+
+class ImageProcessor(BaseCore):
+    """
+    图像处理器
+    
+    功能：
+    - 灰度化、Otsu / 固定阈值二值化
+    - Sobel 边缘检测（可分离卷积）
+    - 积分图盒式模糊（耗时与半径无关）
+    - 拉普拉斯锐化
+    - 任意角度旋转、缩放（最近邻，保持像素值不变，适合隐写分析）
+    """
+    
+    # 每个处理带的像素数
+    BAND_PIXELS = 1 << 20
+    # 带内每段处理的数组元素数（约 L2 缓存大小）
+    CACHE_ELEMENTS = 1 << 18
+    
+    def __init__(self):
+        super().__init__()
+        self.image = None
+        self.result = None
+        self.threshold = None
+        self.workers = os.cpu_count() or 1
+    
+    def initialize(self):
+        """初始化处理器"""
+        self._initialized = True
+        print("✅ ImageProcessor 已初始化")
+    
+    def process(self, *args, **kwargs):
+        """
+        处理图像
+        
+        Args:
+            args[0]: 图像数组，(H, W, 4) RGBA 或 (H, W) 灰度，uint8；
+                     也可以是 TiledImage，此时结果同样是 TiledImage
+            kwargs['options']: 处理选项
+                - operation (str): OPERATIONS 之一
+                - param (int): 处理参数，含义见 DEFAULT_PARAMS，可选
+                - workers (int): 分带 / 分块处理的线程数，默认为 CPU 核数
+        
+        Returns:
+            bool: 处理是否成功（被取消时返回 False）
+        """
+        if not self._initialized:
+            self.initialize()
+        
+        try:
+            image = args[0] if args else None
+            options = kwargs.get('options', {})
+            operation = options.get('operation', 'grayscale')
+            param = options.get('param')
+            if param is None:
+                param = DEFAULT_PARAMS.get(operation, 0)
+            if image is None or 0 in image.shape[:2]:
+                print("❌ 没有图像数据")
+                return False
+            if operation not in OPERATIONS:
+                print(f"❌ 未知的处理类型: {operation}")
+                return False
+            
+            self.reset_cancel()
+            self.image = image
+            self.threshold = None
+            print(f"🖼️ 图像处理: {operation}, {image.shape[1]}x{image.shape[0]}, 参数: {param}")
+            
+            self.workers = options.get('workers') or os.cpu_count() or 1
+            if isinstance(image, TiledImage):
+                result = self._process_tiled(image, operation, param)
+            else:
+                result = self.apply(image, operation, param)
+            
+            if result is None:
+                print("⏹️ 处理已取消")
+                return False
+            self.result = result
+            print(f"✨ 处理完成: {result.shape[1]}x{result.shape[0]}")
+            return True
+        
+        except Exception as e:
+            print(f"❌ 处理失败: {e}")
+            return False
+    
+    def cleanup(self):
+        """清理资源"""
+        self.image = None
+        self.result = None
+        self._initialized = False
+        print("🧹 ImageProcessor 已清理")
+    
+    # ==================== 业务逻辑方法 ====================
+    
+    def apply(self, image, operation, param):
+        """对内存中的图像执行一种处理（不打印日志，批量处理的子进程直接调用）"""
+        if operation == 'grayscale':
+            return self.to_gray(image)
+        if operation == 'binarize':
+            return self.binarize(image, param)
+        if operation == 'edge':
+            return self.sobel(image)
+        if operation == 'blur':
+            return self.box_blur(image, param)
+        if operation == 'sharpen':
+            return self.sharpen(image, param)
+        if operation == 'rotate':
+            return self.rotate(image, param)
+        return self.scale(image, param / 100.0)
+    
+    def to_gray(self, image):
+        """灰度化，灰度图原样返回"""
+        if image.ndim == 2:
+            return image
+        out = np.empty(image.shape[:2], dtype=np.uint8)
+        
+        def work(y0, y1):
+            out[y0:y1] = self._gray_block(image[y0:y1])
+        
+        return out if self._run_bands(self._bands(image), work) else None
+    
+    def otsu_threshold(self, gray):
+        """Otsu 自动阈值"""
+        return self._otsu_from_histogram(np.bincount(gray.ravel(), minlength=256))
+    
+    def binarize(self, image, threshold=0):
+        """
+        二值化：灰度 > threshold 为 255，否则为 0
+        
+        threshold 为 0 时使用 Otsu 自动阈值（保存在 self.threshold）
+        """
+        gray = self.to_gray(image)
+        if gray is None:
+            return None
+        self.threshold = threshold or self.otsu_threshold(gray)
+        out = np.empty_like(gray)
+        for y0, y1 in self._bands(gray):
+            out[y0:y1] = self._threshold_block(gray[y0:y1], self.threshold)
+        return out
+    
+    def sobel(self, image):
+        """Sobel 边缘检测，返回 |Gx| + |Gy|（截断到 255）的灰度图"""
+        gray = self.to_gray(image)
+        if gray is None:
+            return None
+        return self._filter(gray, 1, self._sobel_kernel)
+    
+    def box_blur(self, image, radius=3):
+        """盒式模糊，半径为 0 时返回副本"""
+        radius = max(int(radius), 0)
+        if radius == 0:
+            return image.copy()
+        return self._filter(image, radius, self._blur_kernel(radius, image.shape[2:]))
+    
+    def sharpen(self, image, amount=100):
+        """拉普拉斯锐化，彩色图只处理 RGB，Alpha 通道保持不变"""
+        return self._filter(image, 1, self._sharpen_kernel(amount))
+    
+    def rotate(self, image, angle=90):
+        """
+        顺时针旋转 angle 度
+        
+        90 的整数倍直接用 np.rot90；其他角度画布扩大到能容纳整幅图，
+        按输出行做逆映射（最近邻），超出原图的区域透明。
+        每行落在原图内的是一段连续区间：先解析求出（略放宽），只对这一段计算坐标，
+        再只在两端各几个像素上做越界判断确定精确端点，画布四角的空白与区间内部
+        都不需要逐像素掩码。RGBA 像素按 uint32 视图整体取值，每个像素只需一次 gather
+        """
+        angle = angle % 360
+        if angle % 90 == 0:
+            return np.ascontiguousarray(np.rot90(image, -int(angle // 90)))
+        
+        height, width = image.shape[:2]
+        rad = math.radians(angle)
+        cos, sin = math.cos(rad), math.sin(rad)
+        out_h, out_w = self._rotated_size(height, width, angle)
+        pixels = self._pixel_view(np.ascontiguousarray(image)).reshape(-1)
+        out = np.zeros((out_h, out_w), dtype=pixels.dtype)
+        
+        # 逆映射：输出坐标逆时针旋转 angle 回到原图；加 0.5 后截断即为四舍五入
+        dx = np.arange(out_w, dtype=np.float32) - np.float32((out_w - 1) / 2)
+        col_x = dx * np.float32(cos) + np.float32((width - 1) / 2 + 0.5)
+        col_y = dx * np.float32(-sin) + np.float32((height - 1) / 2 + 0.5)
+        starts, stops = self._rotation_spans(height, width, out_h, out_w, cos, sin)
+        sin32, cos32, center = np.float32(sin), np.float32(cos), np.float32((out_h - 1) / 2)
+        
+        def work(y0, y1):
+            for y in range(y0, y1):
+                start, stop = starts[y], stops[y]
+                if start >= stop:
+                    continue
+                dy = np.float32(y) - center
+                sx = col_x[start:stop] + dy * sin32
+                sy = col_y[start:stop] + dy * cos32
+                # 源坐标沿行单调，落在原图内的像素是连续的一段
+                count = stop - start
+                edge = min(count, 8)
+                head = self._inside(sx[:edge], sy[:edge], width, height)
+                tail = self._inside(sx[count - edge:], sy[count - edge:], width, height)
+                if not (head[-1] and tail[0]):
+                    head = tail = self._inside(sx, sy, width, height)
+                    if not head.any():
+                        continue
+                first, last = int(head.argmax()), count - int(tail[::-1].argmax())
+                index = sy[first:last].astype(np.intp)
+                index *= width
+                index += sx[first:last].astype(np.intp)
+                out[y, start + first:start + last] = pixels.take(index)
+        
+        if not self._run_bands(self._bands(out), work):
+            return None
+        return out.view(np.uint8).reshape((out_h, out_w) + image.shape[2:])
+    
+    def scale(self, image, factor=0.5):
+        """
+        按比例缩放（最近邻）
+        
+        行、列的源索引分别计算，用两次 np.take 完成，不产生整幅坐标网格
+        """
+        height, width = image.shape[:2]
+        out_h = max(int(round(height * factor)), 1)
+        out_w = max(int(round(width * factor)), 1)
+        rows = ((np.arange(out_h) + 0.5) * (height / out_h)).astype(np.intp)
+        cols = ((np.arange(out_w) + 0.5) * (width / out_w)).astype(np.intp)
+        out = np.empty((out_h, out_w) + image.shape[2:], dtype=np.uint8)
+        
+        def work(y0, y1):
+            np.take(image[rows[y0:y1]], cols, axis=1, out=out[y0:y1])
+        
+        return out if self._run_bands(self._bands(out), work) else None
+    
+    @staticmethod
+    def _rotated_size(height, width, angle):
+        """旋转后能容纳整幅图的画布尺寸 (out_h, out_w)"""
+        if angle % 180 == 0:
+            return height, width
+        if angle % 90 == 0:
+            return width, height
+        rad = math.radians(angle)
+        cos, sin = abs(math.cos(rad)), abs(math.sin(rad))
+        return (int(math.ceil(width * sin + height * cos)),
+                int(math.ceil(width * cos + height * sin)))
+    
+    @staticmethod
+    def _inside(sx, sy, width, height):
+        """源坐标是否落在原图内"""
+        return (sx >= 0) & (sx < width) & (sy >= 0) & (sy < height)
+    
+    @staticmethod
+    def _rotation_spans(height, width, out_h, out_w, cos, sin):
+        """
+        旋转画布每行落在原图内的列区间 [start, stop)
+        
+        源坐标沿行是列号的线性函数，两个方向的约束各给出一个区间，取交集后
+        向两侧各放宽 2 个像素，边缘像素仍由 float32 的逐点判断决定
+        
+        Returns:
+            tuple: (starts, stops)，长度为 out_h 的整数数组
+        """
+        dy = np.arange(out_h) - (out_h - 1) / 2
+        lower = np.full(out_h, -np.inf)
+        upper = np.full(out_h, np.inf)
+        # sx = dx * cos + dy * sin + (width - 1) / 2 + 0.5，sy = -dx * sin + dy * cos + (height - 1) / 2 + 0.5
+        for slope, offset, limit in ((cos, dy * sin + (width - 1) / 2 + 0.5, width),
+                                     (-sin, dy * cos + (height - 1) / 2 + 0.5, height)):
+            if abs(slope) < 1e-12:
+                outside = (offset < 0) | (offset >= limit)
+                lower[outside], upper[outside] = np.inf, -np.inf
+                continue
+            first, last = -offset / slope, (limit - offset) / slope
+            lower = np.maximum(lower, np.minimum(first, last))
+            upper = np.minimum(upper, np.maximum(first, last))
+        center = (out_w - 1) / 2
+        with np.errstate(invalid='ignore'):
+            starts = np.clip(np.floor(lower + center) - 2, 0, out_w)
+            stops = np.clip(np.ceil(upper + center) + 3, 0, out_w)
+        return np.nan_to_num(starts).astype(np.intp), np.nan_to_num(stops).astype(np.intp)
+    
+    # ==================== 分块处理 (TiledImage) ====================
+    
+    def _process_tiled(self, store, operation, param):
+        """对分块存储执行处理，返回新的 TiledImage（取消时返回 None）"""
+        if operation == 'grayscale':
+            return self._map_tiles(store, 0, self._gray_block, channels=1)
+        if operation == 'binarize':
+            self.threshold = param or self._tiled_threshold(store)
+            if self.threshold is None:
+                return None
+            threshold = self.threshold
+            return self._map_tiles(
+                store, 0, lambda block: self._threshold_block(self._gray_block(block), threshold), channels=1)
+        if operation == 'edge':
+            return self._map_tiles(store, 1, lambda block: self._sobel_kernel(self._gray_block(block)), channels=1)
+        if operation == 'blur':
+            radius = max(int(param), 0)
+            kernel = self._blur_kernel(radius, store.pixels.shape[2:]) if radius else (lambda block: block)
+            return self._map_tiles(store, radius, kernel)
+        if operation == 'sharpen':
+            return self._map_tiles(store, 1, self._sharpen_kernel(param))
+        if operation == 'rotate':
+            return self._rotate_tiled(store, param % 360)
+        return self._scale_tiled(store, param / 100.0)
+    
+    def _run_tiles(self, tiles, work, collect=None):
+        """
+        在线程池中并行执行 work(tile)
+        
+        同时在途的块数不超过线程数的两倍，已完成块的结果交给 collect（主调线程中调用）。
+        
+        Returns:
+            bool: 是否全部完成（被取消时为 False）
+        """
+        total, done = len(tiles), 0
+        limit = self.workers * 2
+        with ThreadPoolExecutor(self.workers) as pool:
+            pending = set()
+            for index, tile in enumerate(tiles):
+                if self.is_cancelled():
+                    break
+                pending.add(pool.submit(work, tile))
+                if len(pending) < limit and index + 1 < total:
+                    continue
+                finished, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    result = future.result()
+                    if collect:
+                        collect(result)
+                    done += 1
+                self.report_progress(done, total)
+            for future in pending:
+                result = future.result()
+                if collect:
+                    collect(result)
+                done += 1
+        self.report_progress(done, total)
+        return not self.is_cancelled()
+    
+    def _map_tiles(self, store, halo, kernel, channels=None):
+        """逐块 out[tile] = kernel(带 halo 的块)，输出尺寸与输入相同"""
+        out = store.like(channels=channels)
+        
+        def work(tile):
+            y0, y1, x0, x1 = tile
+            out.write_block(y0, x0, kernel(store.read_block(y0, y1, x0, x1, halo)))
+        
+        if not self._run_tiles(list(store.tiles()), work):
+            out.close()
+            return None
+        out.flush()
+        return out
+    
+    def _tiled_threshold(self, store):
+        """逐块累计灰度直方图后求 Otsu 阈值"""
+        hist = np.zeros(256, dtype=np.int64)
+        
+        def work(tile):
+            return np.bincount(self._gray_block(store.read_block(*tile)).ravel(), minlength=256)
+        
+        def collect(part):
+            hist[:] += part
+        
+        if not self._run_tiles(list(store.tiles()), work, collect):
+            return None
+        return self._otsu_from_histogram(hist)
+    
+    def _map_coordinates(self, store, out_h, out_w, source_of):
+        """
+        逐块逆映射（最近邻）
+        
+        source_of(ys, xs) 对输出块的行、列坐标返回源坐标 (sy, sx) 与有效掩码
+        （None 表示全部有效）；源像素通过内存映射按需读取
+        """
+        pixels = self._pixel_view(store.pixels)
+        out = store.like(out_h, out_w)
+        out_pixels = self._pixel_view(out.pixels)
+        
+        def work(tile):
+            y0, y1, x0, x1 = tile
+            ys = np.arange(y0, y1)[:, None]
+            xs = np.arange(x0, x1)[None, :]
+            sy, sx, inside = source_of(ys, xs)
+            if inside is None:
+                out_pixels[y0:y1, x0:x1] = pixels[sy, sx]
+            else:
+                block = np.zeros((y1 - y0, x1 - x0), dtype=pixels.dtype)
+                block[inside] = pixels[sy[inside], sx[inside]]
+                out_pixels[y0:y1, x0:x1] = block
+        
+        if not self._run_tiles(list(out.tiles()), work):
+            out.close()
+            return None
+        out.flush()
+        return out
+    
+    def _rotate_tiled(self, store, angle):
+        """分块旋转：90 的整数倍为精确的整数映射，其他角度与 rotate 相同"""
+        height, width = store.height, store.width
+        out_h, out_w = self._rotated_size(height, width, angle)
+        
+        if angle % 90 == 0:
+            quarter = int(angle // 90)
+            
+            def source_of(ys, xs):
+                ys, xs = np.broadcast_arrays(ys, xs)
+                if quarter == 0:
+                    return ys, xs, None
+                if quarter == 1:
+                    return height - 1 - xs, ys, None
+                if quarter == 2:
+                    return height - 1 - ys, width - 1 - xs, None
+                return xs, width - 1 - ys, None
+        else:
+            # 与 rotate 使用相同的 float32 计算顺序，分块结果与整图结果一致
+            rad = math.radians(angle)
+            cos, sin = np.float32(math.cos(rad)), np.float32(math.sin(rad))
+            
+            def source_of(ys, xs):
+                dx = xs.astype(np.float32) - np.float32((out_w - 1) / 2)
+                dy = ys.astype(np.float32) - np.float32((out_h - 1) / 2)
+                fx = (dx * cos + np.float32((width - 1) / 2 + 0.5)) + dy * sin
+                fy = (dx * -sin + np.float32((height - 1) / 2 + 0.5)) + dy * cos
+                inside = (fx >= 0) & (fx < width) & (fy >= 0) & (fy < height)
+                return fy.astype(np.intp), fx.astype(np.intp), inside
+        
+        return self._map_coordinates(store, out_h, out_w, source_of)
+    
+    def _scale_tiled(self, store, factor):
+        """分块缩放（最近邻），与 scale 的采样位置相同"""
+        height, width = store.height, store.width
+        out_h = max(int(round(height * factor)), 1)
+        out_w = max(int(round(width * factor)), 1)
+        rows = ((np.arange(out_h) + 0.5) * (height / out_h)).astype(np.intp)
+        cols = ((np.arange(out_w) + 0.5) * (width / out_w)).astype(np.intp)
+        
+        def source_of(ys, xs):
+            return rows[ys], cols[xs], None
+        
+        return self._map_coordinates(store, out_h, out_w, source_of)
+    
+    def get_result(self):
+        """获取处理结果数组"""
+        return self.result
+    
+    # ==================== 块处理核 ====================
+    # 邻域滤波的核接收四周各扩展 halo 像素的块，返回去掉 halo 后的结果；
+    # 整幅图分带处理与分块存储 (TiledImage) 的逐块处理共用这些核
+    
+    @staticmethod
+    def _gray_block(block):
+        """BT.601 定点灰度化"""
+        if block.ndim == 2:
+            return block
+        gray = block[..., 0] * np.uint16(GRAY_WEIGHTS[0])
+        gray += block[..., 1] * np.uint16(GRAY_WEIGHTS[1])
+        gray += block[..., 2] * np.uint16(GRAY_WEIGHTS[2])
+        gray += np.uint16(128)
+        gray >>= 8
+        return gray.astype(np.uint8)
+    
+    @staticmethod
+    def _threshold_block(gray, threshold):
+        """灰度 > threshold 为 255"""
+        return np.multiply(gray > threshold, np.uint8(255), dtype=np.uint8)
+    
+    @staticmethod
+    def _otsu_from_histogram(hist):
+        """由灰度直方图求 Otsu 阈值：最大化类间方差"""
+        hist = np.asarray(hist, dtype=np.float64)
+        weight = np.cumsum(hist)
+        mean = np.cumsum(hist * np.arange(256))
+        total, total_mean = weight[-1], mean[-1]
+        background = weight
+        foreground = total - weight
+        with np.errstate(divide='ignore', invalid='ignore'):
+            between = (total_mean * background - mean * total) ** 2 / (background * foreground)
+        between[~np.isfinite(between)] = 0
+        return int(between.argmax())
+    
+    @staticmethod
+    def _sobel_kernel(p):
+        """
+        Sobel（halo 1，输入灰度）
+        
+        3x3 核分解为 [1 2 1]ᵀ·[-1 0 1] 与 [-1 0 1]ᵀ·[1 2 1]，
+        每个方向只需两次一维切片运算
+        """
+        p = p.astype(np.int16)
+        smooth = p[:-2] + 2 * p[1:-1] + p[2:]
+        gx = smooth[:, 2:] - smooth[:, :-2]
+        diff = p[2:] - p[:-2]
+        gy = diff[:, :-2] + 2 * diff[:, 1:-1] + diff[:, 2:]
+        np.abs(gx, out=gx)
+        np.abs(gy, out=gy)
+        gx += gy
+        return np.minimum(gx, 255).astype(np.uint8)
+    
+    def _blur_kernel(self, radius, tail):
+        """
+        盒式模糊核（halo radius），tail 为通道维度 () 或 (4,)
+        
+        可分离的两次一维窗口和：
+        - 水平方向用倍增法，log2(窗口宽度) 次错位切片相加，与半径几乎无关；
+          每次只处理 CACHE_ELEMENTS 个元素左右的几行，临时数组留在缓存中
+        - 竖直方向逐行维护滑动窗口和（加入新行、移出旧行），与半径无关，
+          每行求和后立即做除法写出 uint8，不保留整带的 uint32 和
+        结果与积分图四角相减完全相同，但只用到连续内存上的整数运算
+        """
+        size = 2 * radius + 1
+        channels = tail[0] if tail else 1
+        # 水平窗口和不超过 size * 255 时用 uint16，减少一半内存带宽
+        dtype = np.uint16 if size * 255 < 1 << 16 else np.uint32
+        area, half = np.uint32(size * size), np.uint32(size * size // 2)
+        
+        def kernel(p):
+            rows, cols = p.shape[0] - 2 * radius, p.shape[1] - 2 * radius
+            flat = p.reshape(p.shape[0], -1)
+            horizontal = np.empty((p.shape[0], cols * channels), dtype=dtype)
+            step = max(self.CACHE_ELEMENTS // flat.shape[1], 1)
+            for y in range(0, p.shape[0], step):
+                horizontal[y:y + step] = self._window_sum(flat[y:y + step].astype(dtype), size, channels)
+            
+            out = np.empty((rows, cols * channels), dtype=np.uint8)
+            # 四舍五入的整数除法：窗口和预先加上 half（除以常数由 NumPy 转为乘法）
+            running = horizontal[:size].sum(axis=0, dtype=np.uint32)
+            running += half
+            quotient = np.empty_like(running)
+            for y in range(rows):
+                if y:
+                    running += horizontal[y + size - 1]
+                    running -= horizontal[y - 1]
+                np.floor_divide(running, area, out=quotient)
+                out[y] = quotient
+            return out.reshape((rows, cols) + tuple(tail))
+        
+        return kernel
+    
+    @staticmethod
+    def _window_sum(flat, size, channels):
+        """
+        沿行计算连续 size 个像素的窗口和（同一通道相隔 channels 个元素）
+        
+        span 个像素的部分和每轮倍增，按 size 的二进制位累加到结果中
+        """
+        width = flat.shape[1] - (size - 1) * channels
+        result = None
+        offset, span, partial = 0, 1, flat
+        while size:
+            if size & 1:
+                part = partial[:, offset * channels:offset * channels + width]
+                if result is None:
+                    result = part.copy()
+                else:
+                    result += part
+                offset += span
+            size >>= 1
+            if size:
+                length = partial.shape[1] - span * channels
+                partial = partial[:, :length] + partial[:, span * channels:span * channels + length]
+                span *= 2
+        return result
+    
+    def _sharpen_kernel(self, amount):
+        """
+        拉普拉斯锐化核（halo 1）：out = p + amount% * (4p - 上 - 下 - 左 - 右)
+        
+        按 CACHE_ELEMENTS 分段，uint8 输入直接参与 int16 的原地运算，不复制整块
+        """
+        factor = np.float32(amount / 100.0)
+        
+        def kernel(p):
+            rows, cols = p.shape[0] - 2, p.shape[1] - 2
+            out = np.empty((rows, cols) + p.shape[2:], dtype=np.uint8)
+            step = max(self.CACHE_ELEMENTS // p[0].size, 1)
+            for y0 in range(0, rows, step):
+                y1 = min(y0 + step, rows)
+                q = p[y0:y1 + 2]
+                center = q[1:-1, 1:-1]
+                laplace = np.multiply(center, np.int16(4), dtype=np.int16)
+                laplace -= q[:-2, 1:-1]
+                laplace -= q[2:, 1:-1]
+                laplace -= q[1:-1, :-2]
+                laplace -= q[1:-1, 2:]
+                if amount != 100:
+                    laplace = (laplace * factor).astype(np.int16)
+                laplace += center
+                np.clip(laplace, 0, 255, out=laplace)
+                out[y0:y1] = laplace
+                if out.ndim == 3 and out.shape[2] == 4:
+                    out[y0:y1, :, 3] = center[..., 3]
+            return out
+        
+        return kernel
+    
+    # ==================== 分带处理 ====================
+    
+    @staticmethod
+    def _pixel_view(image):
+        """RGBA 图像的 uint32 视图（每个像素一个元素），灰度图原样返回"""
+        if image.ndim == 3 and image.shape[2] == 4:
+            return image.view(np.uint32).reshape(image.shape[:2])
+        return image
+    
+    def _bands(self, image, halo=0):
+        """按行分带，产生 (y0, y1)；带高至少为 halo 的 8 倍，重复计算的 halo 行不超过八分之一"""
+        height, width = image.shape[:2]
+        rows = max(self.BAND_PIXELS // max(width, 1), 16, 8 * halo)
+        for y0 in range(0, height, rows):
+            yield y0, min(y0 + rows, height)
+    
+    def _run_bands(self, bands, work):
+        """
+        在线程池中并行执行 work(y0, y1)
+        
+        每带开始前检查取消；进度在主调线程中按带的顺序上报（与 SpectrumAnalyzer 相同）
+        
+        Returns:
+            bool: 是否全部完成（被取消时为 False）
+        """
+        bands = list(bands)
+        total = bands[-1][1] if bands else 0
+        
+        def run(band):
+            if not self.is_cancelled():
+                work(*band)
+            return band[1]
+        
+        if self.workers <= 1 or len(bands) <= 1:
+            for band in bands:
+                self.report_progress(run(band), total)
+            return not self.is_cancelled()
+        with ThreadPoolExecutor(min(self.workers, len(bands))) as pool:
+            for done in pool.map(run, bands):
+                self.report_progress(done, total)
+        return not self.is_cancelled()
+    
+    def _filter(self, image, halo, kernel):
+        """
+        带 halo 的分带邻域滤波
+        
+        kernel 接收四周各扩展 halo 像素（边缘复制）的块，返回去掉 halo 后的结果
+        
+        Returns:
+            np.ndarray: 与输入同尺寸的结果，被取消时返回 None
+        """
+        height = image.shape[0]
+        out = np.empty_like(image)
+        pad_cols = ((halo, halo),) + ((0, 0),) * (image.ndim - 2)
+        
+        def work(y0, y1):
+            top, bottom = max(y0 - halo, 0), min(y1 + halo, height)
+            block = np.pad(
+                image[top:bottom],
+                ((halo - (y0 - top), halo - (bottom - y1)),) + pad_cols,
+                mode='edge',
+            )
+            out[y0:y1] = kernel(block)
+        
+        return out if self._run_bands(self._bands(image, halo), work) else None
@@ -0,0 +1,415 @@
+"""
+拼图还原处理器 - 把打乱的等大图块重新拼成原图
+
+1. 边缘特征：每块取四条边的最外两行 / 列。i 在 j 左边的不相似度采用
+   预测式度量：i 的右边按梯度外推一列应与 j 的左边一致，反之亦然，
+       D_R[i, j] = ||2·R1_i - R2_i - L1_j||² + ||2·L1_j - L2_j - R1_i||²
+   把 [外推列, 边缘列] 拼成一个向量 X_i、[边缘列, 外推列] 拼成 Y_j 后即 ||X_i - Y_j||²，
+   展开为 |X|² + |Y|² - 2·X·Yᵀ，整块不相似度矩阵就是一次矩阵乘法（BLAS）
+2. 不相似度矩阵按行分块在线程池中计算，每块只保留每行、每列最小的 K 个，
+   完整的 N×N 矩阵不会同时存在（10000 块时完整矩阵约 800 MB）
+3. 贪心放置：从“最佳伙伴”（互为最近邻）最多的图块开始，反复选择
+   与已放置邻居匹配度最高的 (空位, 图块) 放入，空位必须保持在 行×列 的范围内
+"""
+
+import heapq
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+from ..base import BaseCore
+
+
+# 相对方向：'R' 为 i 在 j 左边，'D' 为 i 在 j 上边
+DIRECTIONS = ('R', 'D')
+
+# 空位的四个邻居：(行偏移, 列偏移, 方向, 邻居是否在前)
+# 邻居在前表示 D[邻居, 候选]，否则为 D[候选, 邻居]
+_NEIGHBORS = ((0, -1, 'R', True), (0, 1, 'R', False), (-1, 0, 'D', True), (1, 0, 'D', False))
+
+
+def smallest_k(dist, k, axis=1, group=None):
+    """
+    每行（axis=1）或每列（axis=0）最小的 k 个元素，按升序排列
+    
+    先按 group 个元素一组求组内最小值，最小值最小的 k 组必然包含最小的 k 个元素，
+    只在这 k 组中做 argpartition，比对整行 / 整列 argpartition 快
+    
+    Returns:
+        tuple: (下标, 值)，形状均为 (行数或列数, k)
+    """
+    group = group or (128 if axis == 1 else 16)
+    view = dist if axis == 1 else dist.T
+    count, length = view.shape
+    grouped = length // group * group
+    if grouped // group <= k:
+        part = np.argpartition(view, k - 1, axis=1)[:, :k]
+    else:
+        if axis == 1:
+            mins = dist[:, :grouped].reshape(count, -1, group).min(axis=2)
+        else:
+            # 按列时沿行分组，逐行取 minimum，保持连续访问
+            mins = dist[:grouped].reshape(-1, group, count).min(axis=1).T
+        groups = np.argpartition(mins, k - 1, axis=1)[:, :k]
+        candidates = (groups[:, :, None] * group + np.arange(group)).reshape(count, -1)
+        if grouped < length:
+            tail = np.broadcast_to(np.arange(grouped, length), (count, length - grouped))
+            candidates = np.concatenate([candidates, tail], axis=1)
+        values = np.take_along_axis(view, candidates, axis=1)
+        part = np.take_along_axis(candidates, np.argpartition(values, k - 1, axis=1)[:, :k], axis=1)
+    values = np.take_along_axis(view, part, axis=1)
+    order = np.argsort(values, axis=1)
+    return np.take_along_axis(part, order, axis=1), np.take_along_axis(values, order, axis=1)
+
+
+def split_grid(image, rows, cols):
+    """
+    把图像按 rows × cols 网格切成等大的块（除不尽的右 / 下边缘裁掉）
+    
+    Returns:
+        np.ndarray: (N, 块高, 块宽[, C])，按行优先排列
+    """
+    height, width = image.shape[:2]
+    tile_h, tile_w = height // rows, width // cols
+    if tile_h == 0 or tile_w == 0:
+        raise ValueError(f"图像 {width}x{height} 无法切成 {rows}x{cols} 块")
+    grid = image[:rows * tile_h, :cols * tile_w].reshape(rows, tile_h, cols, tile_w, *image.shape[2:])
+    return np.ascontiguousarray(grid.swapaxes(1, 2).reshape(rows * cols, tile_h, tile_w, *image.shape[2:]))
+
+
+def assemble(tiles, order):
+    """
+    按 (行, 列) 的图块下标表拼出整幅图像
+    
+    Args:
+        tiles: (N, 块高, 块宽[, C])
+        order: (rows, cols) int 数组
+    """
+    rows, cols = order.shape
+    tile_h, tile_w = tiles.shape[1:3]
+    grid = tiles[order.ravel()].reshape(rows, cols, tile_h, tile_w, *tiles.shape[3:])
+    return np.ascontiguousarray(grid.swapaxes(1, 2).reshape(rows * tile_h, cols * tile_w, *tiles.shape[3:]))
+
+
+def grid_shape(count, aspect=1.0):
+    """把 count 块排成 行×列 时最接近给定宽高比（列 / 行）的因数分解"""
+    best = (1, count)
+    for rows in range(1, int(count ** 0.5) + 1):
+        if count % rows:
+            continue
+        for shape in ((rows, count // rows), (count // rows, rows)):
+            if abs(np.log(shape[1] / shape[0] / aspect)) < abs(np.log(best[1] / best[0] / aspect)):
+                best = shape
+    return best
+
+
+class JigsawSolver(BaseCore):
+    """
+    拼图还原处理器
+    
+    功能：
+    - 网格切分 / 按下标表拼合
+    - 全部图块对、两个相对方向的不相似度（分块矩阵乘法，线程池并行）
+    - 基于最佳伙伴的贪心放置
+    """
+    
+    # 每行 / 每列保留的最近邻个数
+    TOP_K = 8
+    # 不相似度矩阵每块的元素数上限（float32，约 64 MB）
+    BLOCK_ELEMENTS = 1 << 24
+    # 同时受多个已放置邻居约束的空位略微优先
+    NEIGHBOR_BONUS = 0.05
+    
+    def __init__(self):
+        super().__init__()
+        self.workers = os.cpu_count() or 1
+        self.features = {}
+        self.top = {}
+        self.result = None
+    
+    def initialize(self):
+        """初始化处理器"""
+        self._initialized = True
+        print("✅ JigsawSolver 已初始化")
+    
+    def process(self, *args, **kwargs):
+        """
+        还原拼图
+        
+        Args:
+            args[0]: 图块数组，(N, 块高, 块宽, 4) RGBA 或 (N, 块高, 块宽) 灰度，uint8
+            kwargs['options']: 处理选项
+                - rows / cols (int): 拼合后的行数、列数，rows × cols 必须等于 N；
+                  省略时取最接近正方形的分解
+                - workers (int): 计算不相似度的线程数，默认为 CPU 核数
+        
+        Returns:
+            bool: 处理是否成功（被取消时返回 False）
+        """
+        if not self._initialized:
+            self.initialize()
+        
+        try:
+            tiles = args[0] if args else None
+            options = kwargs.get('options', {})
+            if tiles is None or len(tiles) < 2:
+                print("❌ 至少需要两个图块")
+                return False
+            count = len(tiles)
+            rows, cols = options.get('rows'), options.get('cols')
+            if not rows or not cols:
+                rows, cols = grid_shape(count)
+            if rows * cols != count:
+                print(f"❌ {rows}x{cols} 与图块数 {count} 不符")
+                return False
+            
+            self.reset_cancel()
+            self.workers = options.get('workers') or os.cpu_count() or 1
+            print(f"🧩 拼图还原: {count} 块, {rows}x{cols}, 块大小 {tiles.shape[2]}x{tiles.shape[1]}")
+            
+            self.features = self.edge_features(tiles)
+            self.top = {}
+            for step, direction in enumerate(DIRECTIONS):
+                top = self.nearest_neighbors(*self.features[direction], step)
+                if top is None:
+                    print("⏹️ 拼图还原已取消")
+                    return False
+                self.top[direction] = top
+            
+            order = self.place(rows, cols)
+            if order is None:
+                print("⏹️ 拼图还原已取消")
+                return False
+            self.result = {
+                'order': order,
+                'image': assemble(tiles, order),
+                'buddies': self.best_buddy_ratio(order),
+            }
+            print(f"✨ 拼图完成: 最佳伙伴比例 {self.result['buddies']:.1%}")
+            return True
+        
+        except Exception as e:
+            print(f"❌ 拼图还原失败: {e}")
+            return False
+    
+    def cleanup(self):
+        """清理资源"""
+        self.features = {}
+        self.top = {}
+        self.result = None
+        print("🧹 JigsawSolver 已清理")
+    
+    def get_result(self):
+        """获取处理结果：{'order', 'image', 'buddies'}"""
+        return self.result
+    
+    # ==================== 业务逻辑方法 ====================
+    
+    @staticmethod
+    def edge_features(tiles):
+        """
+        每个方向的 (X, Y) 特征矩阵，使 D[i, j] = ||X_i - Y_j||²
+        
+        Returns:
+            dict: {'R': (X, Y), 'D': (X, Y)}，均为 (N, 特征长度) float32
+        """
+        if tiles.ndim == 3:
+            tiles = tiles[..., None]
+        # 全部图块都相同的通道（如不透明图像的 Alpha）不提供信息，去掉以缩短特征
+        varying = [c for c in range(tiles.shape[3]) if tiles[..., c].min() != tiles[..., c].max()]
+        data = tiles[..., varying or [0]].astype(np.float32)
+        count = len(data)
+        
+        def pair(first, second, last, before):
+            # first / second 为 j 一侧最外两列，last / before 为 i 一侧最外两列
+            x = np.concatenate([(2 * last - before).reshape(count, -1), last.reshape(count, -1)], axis=1)
+            y = np.concatenate([first.reshape(count, -1), (2 * first - second).reshape(count, -1)], axis=1)
+            return x, y
+        
+        def edges(axis):
+            size = data.shape[axis]
+            take = lambda index: np.take(data, index, axis=axis)
+            return take(0), take(min(1, size - 1)), take(size - 1), take(max(size - 2, 0))
+        
+        return {'R': pair(*edges(2)), 'D': pair(*edges(1))}
+    
+    def nearest_neighbors(self, x, y, step=0):
+        """
+        分块计算 D = |X|² + |Y|² - 2·X·Yᵀ，保留每行、每列最小的 K 个
+        
+        Returns:
+            dict: row_index / row_value 为 (N, K)，D[i] 中最小的 K 个（升序）；
+                  col_index / col_value 为 (N, K)，D[:, j] 中最小的 K 个（升序）；
+                  取消时返回 None
+        """
+        count = len(x)
+        k = min(self.TOP_K, count - 1)
+        x_norm = np.einsum('ij,ij->i', x, x)
+        y_norm = np.einsum('ij,ij->i', y, y)
+        rows = max(min(self.BLOCK_ELEMENTS // count, count), k)
+        blocks = [(start, min(start + rows, count)) for start in range(0, count, rows)]
+        
+        row_index = np.empty((count, k), dtype=np.int64)
+        row_value = np.empty((count, k), dtype=np.float32)
+        col_index = np.zeros((0, count), dtype=np.int64)
+        col_value = np.zeros((0, count), dtype=np.float32)
+        
+        def work(block):
+            start, end = block
+            if self.is_cancelled():
+                return None
+            dist = x[start:end] @ y.T
+            dist *= -2
+            dist += x_norm[start:end, None]
+            dist += y_norm[None, :]
+            local = np.arange(end - start)
+            dist[local, local + start] = np.inf  # 图块不能与自身相邻
+            
+            top_rows = smallest_k(dist, k, axis=1)
+            indices, values = smallest_k(dist, min(k, end - start), axis=0)
+            return block, top_rows, (indices.T + start, values.T)
+        
+        total = len(blocks) * len(DIRECTIONS)
+        with ThreadPoolExecutor(self.workers) as pool:
+            for index, done in enumerate(pool.map(work, blocks)):
+                if done is None or self.is_cancelled():
+                    return None
+                (start, end), (indices, values), (c_indices, c_values) = done
+                row_index[start:end], row_value[start:end] = indices, values
+                # 合并列方向的候选，只保留最小的 K 个
+                col_index = np.concatenate([col_index, c_indices])
+                col_value = np.concatenate([col_value, c_values])
+                if len(col_index) > k:
+                    keep = np.argpartition(col_value, k - 1, axis=0)[:k]
+                    col_index = np.take_along_axis(col_index, keep, axis=0)
+                    col_value = np.take_along_axis(col_value, keep, axis=0)
+                self.report_progress(step * len(blocks) + index + 1, total)
+        
+        order = np.argsort(col_value, axis=0)
+        return {
+            'row_index': row_index,
+            'row_value': np.maximum(row_value, 0),
+            'col_index': np.take_along_axis(col_index, order, axis=0).T.copy(),
+            'col_value': np.maximum(np.take_along_axis(col_value, order, axis=0), 0).T.copy(),
+        }
+    
+    def pair_dissimilarity(self, direction, first, second):
+        """D[first, second]（first / second 可以是下标数组）"""
+        x, y = self.features[direction]
+        diff = x[first] - y[second]
+        return np.einsum('...j,...j->...', diff, diff)
+    
+    def best_buddies(self, direction):
+        """互为最近邻的 (i, j) 对：j 是 i 的最佳右 / 下邻居，且 i 是 j 的最佳左 / 上邻居"""
+        top = self.top[direction]
+        first = np.arange(len(top['row_index']))
+        second = top['row_index'][:, 0]
+        mutual = top['col_index'][second, 0] == first
+        return first[mutual], second[mutual]
+    
+    def best_buddy_ratio(self, order):
+        """排列中相邻且互为最佳伙伴的比例（拼合质量的粗略估计）"""
+        hits = pairs = 0
+        for direction, (a, b) in (('R', (order[:, :-1], order[:, 1:])), ('D', (order[:-1], order[1:]))):
+            first, second = self.best_buddies(direction)
+            buddy = np.full(len(order.ravel()), -1)
+            buddy[first] = second
+            hits += int((buddy[a.ravel()] == b.ravel()).sum())
+            pairs += a.size
+        return hits / max(pairs, 1)
+    
+    def place(self, rows, cols):
+        """
+        贪心放置
+        
+        堆中保存 (得分, 空位, 图块)；空位的得分是候选图块与各已放置邻居的
+        归一化不相似度（除以该邻居在此方向上的次优值）的平均。
+        候选来自邻居的 K 近邻，用完后再对全部未放置的图块计算。
+        
+        Returns:
+            np.ndarray: (rows, cols) 图块下标表；取消时返回 None
+        """
+        count = rows * cols
+        placed = {}  # (行, 列) -> 图块
+        used = np.zeros(count, dtype=bool)
+        bounds = [0, 0, 0, 0]  # 最小行, 最大行, 最小列, 最大列
+        heap, versions, serial = [], {}, 0
+        
+        # 归一化：邻居在前时用其行方向次优值，在后时用列方向次优值
+        scale = {}
+        for direction in DIRECTIONS:
+            top = self.top[direction]
+            second = min(1, top['row_value'].shape[1] - 1)
+            scale[direction, True] = top['row_value'][:, second] + 1e-6
+            scale[direction, False] = top['col_value'][:, second] + 1e-6
+        
+        def fits(r, c):
+            return (max(bounds[1], r) - min(bounds[0], r) < rows and
+                    max(bounds[3], c) - min(bounds[2], c) < cols)
+        
+        def score_slot(slot):
+            """为空位挑选最佳候选并入堆"""
+            nonlocal serial
+            r, c = slot
+            neighbors = [(placed[r + dr, c + dc], direction, before)
+                         for dr, dc, direction, before in _NEIGHBORS if (r + dr, c + dc) in placed]
+            candidates = set()
+            for piece, direction, before in neighbors:
+                top = self.top[direction]
+                candidates.update((top['row_index'] if before else top['col_index'])[piece].tolist())
+            candidates = np.fromiter(candidates, dtype=np.int64)
+            candidates = candidates[~used[candidates]]
+            if candidates.size == 0:
+                candidates = np.flatnonzero(~used)
+            if candidates.size == 0:
+                return
+            total = np.zeros(candidates.size, dtype=np.float32)
+            for piece, direction, before in neighbors:
+                value = (self.pair_dissimilarity(direction, piece, candidates) if before
+                         else self.pair_dissimilarity(direction, candidates, piece))
+                total += value / scale[direction, before][piece]
+            total /= len(neighbors)
+            best = int(np.argmin(total))
+            versions[slot] = versions.get(slot, 0) + 1
+            serial += 1
+            score = float(total[best]) - self.NEIGHBOR_BONUS * (len(neighbors) - 1)
+            heapq.heappush(heap, (score, serial, slot, int(candidates[best]), versions[slot]))
+        
+        def put(slot, piece):
+            r, c = slot
+            placed[slot] = piece
+            used[piece] = True
+            bounds[:] = [min(bounds[0], r), max(bounds[1], r), min(bounds[2], c), max(bounds[3], c)]
+            for dr, dc, _, _ in _NEIGHBORS:
+                near = (r + dr, c + dc)
+                if near not in placed and fits(*near):
+                    score_slot(near)
+        
+        # 种子：最佳伙伴最多的图块
+        buddies = np.zeros(count, dtype=np.int64)
+        for direction in DIRECTIONS:
+            first, second = self.best_buddies(direction)
+            np.add.at(buddies, first, 1)
+            np.add.at(buddies, second, 1)
+        put((0, 0), int(np.argmax(buddies)))
+        
+        while len(placed) < count:
+            if not heap:
+                raise RuntimeError("没有可放置的空位")
+            _, _, slot, piece, version = heapq.heappop(heap)
+            if slot in placed or version != versions[slot] or not fits(*slot):
+                continue
+            if used[piece]:
+                score_slot(slot)
+                continue
+            put(slot, piece)
+            if len(placed) % 256 == 0:
+                self.report_progress(len(placed), count, stage='place')
+                if self.is_cancelled():
+                    return None
+        
+        order = np.empty((rows, cols), dtype=np.int64)
+        for (r, c), piece in placed.items():
+            order[r - bounds[0], c - bounds[2]] = piece
+        return order
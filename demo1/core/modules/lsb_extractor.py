@@ -0,0 +1,274 @@
+"""
+LSB 数据提取处理器 - 按指定通道、位、遍历顺序提取图像中隐藏的比特流
+
+提取全部为向量化 NumPy 运算：
+- 按行 / 按列遍历只是对像素数组取不同的视图，按块切片后一次选出通道
+- (像素, 通道, 位) 三维比特数组按 C 顺序展开即为比特流顺序，np.packbits 打包
+- 扫描模式对常见组合各提取一小段前缀，在线程池中并行打分
+  （文件魔数、可打印文本、熵），按得分排序
+"""
+
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+from ..base import BaseCore
+from .file_signature import (FILE_SIGNATURES, identify_file_type, find_signatures,
+                             byte_entropy, printable_ratio)
+
+
+# 通道字母 -> RGBA 数组中的下标
+CHANNEL_INDEX = {'R': 0, 'G': 1, 'B': 2, 'A': 3}
+
+# 遍历顺序与位序
+ORDERS = ('row', 'column')
+BIT_ORDERS = ('msb', 'lsb')
+
+# 扫描模式尝试的通道组合与位组合（位按提取顺序排列，如 (1, 0) 表示先取第 1 位再取第 0 位）
+SWEEP_CHANNELS = ('R', 'G', 'B', 'A', 'RGB', 'BGR', 'RGBA', 'ABGR')
+SWEEP_BITS = ((0,), (1,), (2,), (3,), (1, 0), (2, 1, 0))
+
+# 魔数长度 -> 识别得分（越长越不可能是巧合）
+_MAGIC_LENGTHS = {(name, ext): len(magic) for name, ext, magic, _ in FILE_SIGNATURES}
+
+
+def parse_channels(text):
+    """解析通道字符串，如 'RGB' / 'bgr'，返回下标列表"""
+    text = text.strip().upper()
+    if not text or any(ch not in CHANNEL_INDEX for ch in text):
+        raise ValueError(f"无效的通道: {text!r}（只能由 R G B A 组成）")
+    return [CHANNEL_INDEX[ch] for ch in text]
+
+
+def parse_bits(text):
+    """解析位字符串，如 '0' / '1,0' / '7-4'，返回提取顺序的位列表"""
+    bits = []
+    for part in text.replace(' ', '').split(','):
+        if not part:
+            continue
+        first, sep, last = part.partition('-')
+        if sep:
+            step = 1 if int(last) >= int(first) else -1
+            bits.extend(range(int(first), int(last) + step, step))
+        else:
+            bits.append(int(part))
+    if not bits or any(not 0 <= bit <= 7 for bit in bits):
+        raise ValueError(f"无效的位: {text!r}（取值 0-7）")
+    return bits
+
+
+def score_candidate(data):
+    """
+    为提取出的数据打分：文件魔数 > 可打印文本 > 低熵结构化数据
+    
+    Returns:
+        dict: types, entropy, printable, score
+    """
+    types = identify_file_type(data)
+    entropy = byte_entropy(data)
+    printable = printable_ratio(data[:64])
+    magic = max((_MAGIC_LENGTHS[t] for t in types), default=0)
+    # 全 0 / 全 1 等退化数据熵接近 0，不能算作“有结构”
+    structure = 8.0 - entropy if entropy >= 1.0 else 0.0
+    score = magic * 2 + printable ** 4 * 8 + structure
+    return {'types': types, 'entropy': entropy, 'printable': printable, 'score': score}
+
+
+class LsbExtractor(BaseCore):
+    """
+    LSB 数据提取处理器
+    
+    功能：
+    - 按通道顺序、位组合、行 / 列优先、MSB / LSB 位序提取比特流
+    - 识别提取结果中的文件类型
+    - 并行扫描常见组合并按得分排序
+    """
+    
+    # 每块处理的像素数（必须是 8 的倍数，保证每块打包后的字节可以直接拼接）
+    CHUNK_PIXELS = 1 << 18
+    # 扫描模式每个组合提取的字节数
+    SWEEP_BYTES = 1 << 14
+    # 在提取结果中查找嵌入文件的范围
+    SIGNATURE_SCAN_BYTES = 1 << 20
+    
+    def __init__(self):
+        super().__init__()
+        self.result = None
+        self.file_types = []
+        self.signatures = []
+    
+    def initialize(self):
+        """初始化"""
+        self._initialized = True
+        print("✅ LsbExtractor 已初始化")
+    
+    def process(self, *args, **kwargs):
+        """
+        提取或扫描
+        
+        Args:
+            args[0]: 图像数组，(H, W, 4) RGBA，uint8
+            kwargs['options']: 处理选项
+                - mode (str): 'extract'（默认）或 'sweep'
+                - channels (str): 通道顺序，如 'RGB'
+                - bits (list): 提取顺序的位列表，如 [0] / [1, 0]
+                - order (str): 'row' 行优先 / 'column' 列优先
+                - bit_order (str): 'msb' 每字节先写高位 / 'lsb' 先写低位
+                - limit (int): 最多提取的字节数，可选
+                - workers (int): 扫描线程数，默认为 CPU 核数
+        
+        Returns:
+            bool: 处理是否成功（被取消时返回 False）
+        """
+        if not self._initialized:
+            self.initialize()
+        
+        try:
+            image = args[0] if args else None
+            options = kwargs.get('options', {})
+            if image is None or image.size == 0:
+                print("❌ 没有图像数据")
+                return False
+            if image.ndim == 2:
+                image = np.repeat(image[:, :, None], 4, axis=2)
+            
+            self.reset_cancel()
+            self.file_types = []
+            self.signatures = []
+            if options.get('mode') == 'sweep':
+                result = self.sweep(image, workers=options.get('workers'))
+                if result is not None:
+                    print(f"✨ 扫描完成: {len(result)} 个组合")
+            else:
+                channels = parse_channels(options.get('channels', 'RGB'))
+                bits = list(options.get('bits', [0]))
+                result = self.extract(image, channels, bits, options.get('order', 'row'),
+                                      options.get('bit_order', 'msb'), options.get('limit'))
+                if result is not None:
+                    self.file_types = identify_file_type(result)
+                    self.signatures = find_signatures(result[:self.SIGNATURE_SCAN_BYTES])
+                    print(f"✨ 提取完成: {len(result)} 字节")
+            if result is None:
+                print("⚠️ 提取已取消")
+                return False
+            self.result = result
+            return True
+        
+        except Exception as e:
+            print(f"❌ LSB 提取失败: {e}")
+            return False
+    
+    def cleanup(self):
+        """清理资源"""
+        self.result = None
+        print("🧹 LsbExtractor 已清理")
+    
+    def get_result(self):
+        """提取模式返回 bytes，扫描模式返回排序后的组合列表"""
+        return self.result
+    
+    # ==================== 业务逻辑方法 ====================
+    
+    def pixel_chunks(self, image, order, pixels):
+        """
+        按遍历顺序产生前 pixels 个像素，每块 (P, 4)
+        
+        行优先直接切 reshape 后的视图；列优先按列带转置，只复制用到的列。
+        除最后一块外每块的像素数都是 8 的倍数。
+        """
+        height, width = image.shape[:2]
+        if order == 'row':
+            flat = image.reshape(-1, image.shape[2])
+            for start in range(0, pixels, self.CHUNK_PIXELS):
+                yield flat[start:min(start + self.CHUNK_PIXELS, pixels)]
+            return
+        columns = -(-pixels // height)
+        band = max(self.CHUNK_PIXELS // height // 8 * 8, 8)
+        remaining = pixels
+        for x0 in range(0, columns, band):
+            chunk = image[:, x0:min(x0 + band, columns)].transpose(1, 0, 2).reshape(-1, image.shape[2])
+            yield chunk[:remaining]
+            remaining -= chunk.shape[0]
+    
+    def extract(self, image, channels, bits, order='row', bit_order='msb', limit=None):
+        """
+        提取比特流
+        
+        Args:
+            channels (list): 通道下标（按提取顺序）
+            bits (list): 位（按提取顺序）
+            limit (int): 最多提取的字节数，None 为整幅图像
+        
+        Returns:
+            bytes: 提取结果；取消时返回 None
+        """
+        if order not in ORDERS or bit_order not in BIT_ORDERS:
+            raise ValueError(f"无效的顺序: {order} / {bit_order}")
+        height, width = image.shape[:2]
+        bits_per_pixel = len(channels) * len(bits)
+        pixels = height * width
+        if limit:
+            pixels = min(pixels, -(-limit * 8 // bits_per_pixel))
+        shifts = np.array(bits, dtype=np.uint8)
+        bitorder = 'big' if bit_order == 'msb' else 'little'
+        
+        parts, done = [], 0
+        for chunk in self.pixel_chunks(image, order, pixels):
+            selected = chunk[:, channels]
+            stream = (selected[:, :, None] >> shifts) & 1
+            parts.append(np.packbits(stream.reshape(-1), bitorder=bitorder).tobytes())
+            done += chunk.shape[0]
+            self.report_progress(done, pixels)
+            if self.is_cancelled():
+                return None
+        data = b''.join(parts)
+        return data[:limit] if limit else data
+    
+    def sweep_combinations(self):
+        """扫描模式的全部组合 (通道, 位, 遍历顺序, 位序)"""
+        return [(channels, bits, order, bit_order)
+                for order in ORDERS
+                for channels in SWEEP_CHANNELS
+                for bits in SWEEP_BITS
+                for bit_order in BIT_ORDERS]
+    
+    def sweep(self, image, sample=None, workers=None):
+        """
+        扫描常见组合，按得分从高到低排序
+        
+        每种遍历顺序只切出一次前缀像素并展开为 (像素, 4, 8) 比特数组，
+        各组合从中选取通道和位后打包，在线程池中并行打分
+        
+        Returns:
+            list: [{'channels', 'bits', 'order', 'bit_order', 'types', 'entropy',
+                    'printable', 'score', 'preview'}, ...]；取消时返回 None
+        """
+        sample = sample or self.SWEEP_BYTES
+        height, width = image.shape[:2]
+        pixels = min(height * width, sample * 8)
+        shifts = np.arange(8, dtype=np.uint8)
+        planes = {}
+        for order in ORDERS:
+            prefix = np.concatenate(list(self.pixel_chunks(image, order, pixels)))
+            planes[order] = (prefix[:, :, None] >> shifts) & 1
+        
+        def evaluate(combo):
+            channels, bits, order, bit_order = combo
+            if self.is_cancelled():
+                return None
+            stream = planes[order][:, parse_channels(channels)][:, :, list(bits)].reshape(-1)[:sample * 8]
+            data = np.packbits(stream, bitorder='big' if bit_order == 'msb' else 'little').tobytes()
+            return {'channels': channels, 'bits': list(bits), 'order': order, 'bit_order': bit_order,
+                    **score_candidate(data), 'preview': data[:64]}
+        
+        combos = self.sweep_combinations()
+        results = []
+        with ThreadPoolExecutor(workers or os.cpu_count() or 1) as pool:
+            for index, result in enumerate(pool.map(evaluate, combos)):
+                results.append(result)
+                self.report_progress(index + 1, len(combos))
+        if self.is_cancelled():
+            return None
+        results.sort(key=lambda item: item['score'], reverse=True)
+        return results
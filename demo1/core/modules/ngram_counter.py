@@ -0,0 +1,191 @@
+"""
+n-gram 频率统计 - 可分块增量更新
+
+统计单位可以是字节或 Unicode 码位，n-gram 均打包成整数索引后用 np.bincount 计数：
+- 字节：每个符号 8 位，直接累加到 256**n 长度的稠密计数数组（计数表比块大时用 np.add.at 原地累加）
+- 码位：每个分块先压缩到块内稠密字母表计数，再按 21 位全局键合并到累计结果
+
+因此可以对流式读取的超大文件逐块更新。
+"""
+
+import numpy as np
+
+
+class NgramCounter:
+    """
+    n-gram 计数器
+    
+    示例:
+        counter = NgramCounter(max_n=3, unit='byte')
+        for chunk in chunks:
+            counter.update(chunk)
+        counter.table(2, limit=20)
+    """
+    
+    # 码位模式下全局键中每个符号占用的位数（覆盖全部 Unicode 码位）
+    CHAR_BITS = 21
+    # 单次内部处理的最大符号数，限制临时数组的内存
+    BLOCK_SIZE = 1 << 23
+    # 稠密计数数组的最大长度，超过后改用排序计数
+    BINCOUNT_LIMIT = 1 << 22
+    
+    def __init__(self, max_n=3, unit='byte'):
+        """
+        Args:
+            max_n (int): 统计的最大 n
+            unit (str): 'byte' 按字节统计，'char' 按码位统计
+        """
+        self.max_n = max_n
+        self.unit = unit
+        self.symbol_bits = self.CHAR_BITS if unit == 'char' else 8
+        self.reset()
+    
+    def reset(self):
+        """清空统计结果"""
+        if self.unit == 'char':
+            self._keys = [np.empty(0, dtype=np.int64) for _ in range(self.max_n)]
+            self._counts = [np.empty(0, dtype=np.int64) for _ in range(self.max_n)]
+        else:
+            self._dense = [np.zeros(1 << (8 * n), dtype=np.int64) for n in range(1, self.max_n + 1)]
+        self._tail = np.empty(0, dtype=np.int32)
+        self.totals = [0] * self.max_n
+    
+    def update(self, chunk):
+        """
+        追加一个数据块
+        
+        分块边界上的 n-gram 通过保留上一块末尾 max_n - 1 个符号来正确统计。
+        
+        Args:
+            chunk: bytes / mmap 切片（unit='byte'）或 str（unit='char'）
+        """
+        codes = self._to_codes(chunk)
+        for start in range(0, codes.size, self.BLOCK_SIZE):
+            self._update_block(codes[start:start + self.BLOCK_SIZE])
+    
+    def _to_codes(self, chunk):
+        """将数据块转换为符号数组"""
+        if self.unit == 'char':
+            if not isinstance(chunk, str):
+                chunk = bytes(chunk).decode('utf-8', errors='replace')
+            return np.frombuffer(chunk.encode('utf-32-le'), dtype='<u4')
+        return np.frombuffer(chunk, dtype=np.uint8)
+    
+    def _update_block(self, codes):
+        """统计一个符号块"""
+        if codes.size == 0:
+            return
+        seq = np.concatenate([self._tail, codes.astype(np.int32)])
+        skip = self._tail.size
+        
+        if self.unit == 'char':
+            # 块内稠密字母表：present 为出现标记，lut 将符号映射到 0..A-1
+            present = np.bincount(seq) > 0
+            alphabet = np.flatnonzero(present)
+            symbols = (np.cumsum(present) - 1).astype(np.int32)[seq]
+        else:
+            alphabet, symbols = None, seq
+        
+        for n in range(1, self.max_n + 1):
+            # 起点 < skip - n + 1 的 n-gram 已在上一块中统计过
+            start = max(skip - n + 1, 0)
+            if seq.size - start < n:
+                continue
+            if alphabet is None:
+                packed = self._pack(symbols[start:], n, 256, np.int32)
+                dense = self._dense[n - 1]
+                if dense.size > packed.size:
+                    # 计数表比块大（字节三元组为 2**24 项）时直接累加到同一个数组，
+                    # 不再为每块分配与计数表同样大的 bincount 结果
+                    np.add.at(dense, packed, 1)
+                else:
+                    dense += np.bincount(packed, minlength=dense.size)
+            else:
+                keys, counts = self._count_block(symbols[start:], n, alphabet)
+                self._merge(n, keys, counts)
+            self.totals[n - 1] += int(seq.size - start - n + 1)
+        
+        self._tail = seq[seq.size - min(self.max_n - 1, seq.size):]
+    
+    @staticmethod
+    def _pack(symbols, n, base, dtype=np.int64):
+        """将符号序列中的所有 n-gram 打包为整数索引"""
+        length = symbols.size - n + 1
+        packed = symbols[:length].astype(dtype)
+        for k in range(1, n):
+            packed *= base
+            packed += symbols[k:k + length]
+        return packed
+    
+    def _count_block(self, dense, n, alphabet):
+        """对块内稠密符号序列计数，返回 (全局键, 计数)"""
+        size = alphabet.size
+        packed = self._pack(dense, n, size)
+        
+        if size ** n <= self.BINCOUNT_LIMIT:
+            counts = np.bincount(packed, minlength=size ** n)
+            local_keys = np.flatnonzero(counts)
+            counts = counts[local_keys]
+        else:
+            local_keys, counts = np.unique(packed, return_counts=True)
+        
+        # 局部键按位拆回符号，再以固定位宽打包为全局键
+        keys = np.zeros(local_keys.size, dtype=np.int64)
+        for k in range(n):
+            digit = (local_keys // size ** (n - 1 - k)) % size
+            keys |= alphabet[digit] << (self.CHAR_BITS * (n - 1 - k))
+        return keys, counts.astype(np.int64)
+    
+    def _merge(self, n, keys, counts):
+        """合并到累计结果"""
+        if self._keys[n - 1].size == 0:
+            self._keys[n - 1], self._counts[n - 1] = keys, counts
+            return
+        all_keys = np.concatenate([self._keys[n - 1], keys])
+        merged, inverse = np.unique(all_keys, return_inverse=True)
+        self._keys[n - 1] = merged
+        self._counts[n - 1] = np.bincount(
+            inverse, weights=np.concatenate([self._counts[n - 1], counts]),
+            minlength=merged.size,
+        ).astype(np.int64)
+    
+    def decode(self, key, n):
+        """将全局键还原为 n-gram（bytes 或 str）"""
+        mask = (1 << self.symbol_bits) - 1
+        symbols = [(int(key) >> (self.symbol_bits * (n - 1 - k))) & mask for k in range(n)]
+        if self.unit == 'char':
+            return "".join(map(chr, symbols))
+        return bytes(symbols)
+    
+    def table(self, n, limit=None):
+        """
+        获取按频次降序排列的 n-gram 表
+        
+        Returns:
+            list: [(gram, count, frequency), ...]
+        """
+        keys, counts = self._nonzero(n)
+        order = np.argsort(-counts, kind='stable')[:limit]
+        total = max(self.totals[n - 1], 1)
+        return [(self.decode(keys[i], n), int(counts[i]), float(counts[i] / total)) for i in order]
+    
+    def distinct(self, n):
+        """不同 n-gram 的数量"""
+        return int(self._nonzero(n)[0].size)
+    
+    def _nonzero(self, n):
+        """返回出现过的 (键, 计数)"""
+        if self.unit == 'char':
+            return self._keys[n - 1], self._counts[n - 1]
+        keys = np.flatnonzero(self._dense[n - 1])
+        return keys, self._dense[n - 1][keys]
+
+
+def format_gram(gram):
+    """将 n-gram 转换为便于显示的文本（转义控制字符与空白）"""
+    if isinstance(gram, bytes):
+        gram = "".join(chr(b) if 0x20 <= b < 0x7f else f"\\x{b:02x}" for b in gram)
+    return "".join(
+        "␣" if ch == " " else ch if ch.isprintable() else ch.encode('unicode_escape').decode('ascii')
+        for ch in gram
+    )
@@ -0,0 +1,343 @@
+"""
+流式 PNG 编解码 - 按行带解码/编码，内存占用与图像高度无关
+
+解码：IDAT 数据分块送入 zlib 解压器，每凑够一个行带就反滤波输出。
+- 行带内只有 None / Sub / Up 滤波时逐行向量化处理（Sub 即按像素的前缀和）
+- 含 Average / Paeth 时，每个字节依赖左、上、左上三个已恢复的字节，
+  按反对角线推进（wavefront）：把行带错位排列，使同一条反对角线上的
+  像素落在同一个连续切片中，每一步一次向量运算恢复整条对角线；
+  行带再按列分块，错位缓冲的大小只与行带高度有关
+
+编码：每行使用 Sub 滤波，zlib 流式压缩后按固定大小切分 IDAT。
+
+支持 8 / 16 位的灰度、灰度+Alpha、RGB、RGBA 与 8 位调色板图像，不支持隔行扫描。
+"""
+
+import struct
+import zlib
+
+import numpy as np
+
+
+PNG_SIGNATURE = b'\x89PNG\r\n\x1a\n'
+
+# 颜色类型 → 每像素样本数
+COLOR_CHANNELS = {0: 1, 2: 3, 3: 1, 4: 2, 6: 4}
+
+# 滤波类型
+FILTER_NONE, FILTER_SUB, FILTER_UP, FILTER_AVERAGE, FILTER_PAETH = range(5)
+
+
+def read_chunk_header(f):
+    """读取块头，返回 (length, type)；文件结束返回 (0, b"")"""
+    header = f.read(8)
+    if len(header) < 8:
+        return 0, b""
+    length, chunk_type = struct.unpack('>I4s', header)
+    return length, chunk_type
+
+
+def write_chunk(f, chunk_type, data):
+    """写入一个带 CRC 的块"""
+    f.write(struct.pack('>I', len(data)))
+    f.write(chunk_type)
+    f.write(data)
+    f.write(struct.pack('>I', zlib.crc32(data, zlib.crc32(chunk_type))))
+
+
+class PngStreamReader:
+    """
+    流式 PNG 读取器
+    
+    示例:
+        with PngStreamReader(path) as reader:
+            for y0, rows in reader.iter_strips(256):
+                store[y0:y0 + len(rows)] = rows
+    """
+    
+    # 每次从 IDAT 读取的字节数
+    READ_SIZE = 1 << 20
+    # wavefront 反滤波的列块宽度
+    WAVEFRONT_COLUMNS = 1024
+    # 为 False 时把无效的滤波类型当作 None 处理（按猜测的尺寸预览时，错位的行首字节不再中断解码）
+    strict = True
+    
+    def __init__(self, file_path, size=None):
+        """
+        Args:
+            file_path (str): PNG 文件路径
+            size (tuple): 可选的 (宽, 高)，覆盖 IHDR 中记录的尺寸（尝试修复被篡改的宽高时使用）
+        """
+        self.file = open(file_path, 'rb')
+        try:
+            self._read_header()
+            if size is not None:
+                self.width, self.height = size
+                self.stride = self.width * self.bpp
+        except Exception:
+            self.file.close()
+            raise
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, *exc):
+        self.close()
+    
+    def close(self):
+        """关闭文件"""
+        self.file.close()
+    
+    def _read_header(self):
+        """读取 IDAT 之前的块：IHDR / PLTE / tRNS"""
+        if self.file.read(8) != PNG_SIGNATURE:
+            raise ValueError("不是 PNG 文件")
+        palette = None
+        transparency = None
+        while True:
+            length, chunk_type = read_chunk_header(self.file)
+            if not chunk_type:
+                raise ValueError("PNG 缺少 IDAT")
+            if chunk_type == b'IDAT':
+                self._idat_left = length
+                break
+            data = self.file.read(length)
+            self.file.read(4)
+            if chunk_type == b'IHDR':
+                (self.width, self.height, self.bit_depth, self.color_type,
+                 _, _, self.interlace) = struct.unpack('>IIBBBBB', data)
+            elif chunk_type == b'PLTE':
+                palette = np.frombuffer(data, dtype=np.uint8).reshape(-1, 3)
+            elif chunk_type == b'tRNS':
+                transparency = np.frombuffer(data, dtype=np.uint8)
+        
+        if self.color_type not in COLOR_CHANNELS:
+            raise ValueError(f"不支持的颜色类型: {self.color_type}")
+        if self.interlace:
+            raise ValueError("不支持隔行扫描的 PNG")
+        if self.bit_depth not in (8, 16) or (self.color_type == 3 and self.bit_depth != 8):
+            raise ValueError(f"不支持的位深: {self.bit_depth}")
+        
+        self.samples = COLOR_CHANNELS[self.color_type]
+        self.bpp = self.samples * self.bit_depth // 8
+        self.stride = self.width * self.bpp
+        # 灰度图输出单通道，其余统一输出 RGBA
+        self.channels = 1 if self.color_type == 0 else 4
+        
+        self.palette = None
+        if self.color_type == 3:
+            if palette is None:
+                raise ValueError("调色板图像缺少 PLTE")
+            lut = np.zeros((256, 4), dtype=np.uint8)
+            lut[:, 3] = 255
+            lut[:len(palette), :3] = palette
+            if transparency is not None:
+                lut[:len(transparency), 3] = transparency
+            self.palette = lut
+    
+    def _iter_idat(self):
+        """依次产生 IDAT 数据片段"""
+        while True:
+            while self._idat_left:
+                piece = self.file.read(min(self._idat_left, self.READ_SIZE))
+                if not piece:
+                    return
+                self._idat_left -= len(piece)
+                yield piece
+            self.file.read(4)
+            length, chunk_type = read_chunk_header(self.file)
+            if chunk_type != b'IDAT':
+                return
+            self._idat_left = length
+    
+    def iter_strips(self, rows_per_strip=256):
+        """
+        逐带解码
+        
+        Yields:
+            (y0, ndarray): 行带起始行号与像素，(rows, W) 灰度或 (rows, W, 4) RGBA
+        """
+        row_bytes = self.stride + 1
+        strip_bytes = row_bytes * rows_per_strip
+        decompressor = zlib.decompressobj()
+        pending = bytearray()
+        previous = np.zeros((self.width, self.bpp), dtype=np.uint8)
+        y0 = 0
+        
+        def take(count):
+            nonlocal previous, y0
+            raw = np.frombuffer(bytes(pending[:count * row_bytes]), dtype=np.uint8)
+            del pending[:count * row_bytes]
+            raw = raw.reshape(count, row_bytes)
+            rows = self._unfilter(raw[:, 0], raw[:, 1:].reshape(count, self.width, self.bpp), previous)
+            previous = rows[-1]
+            strip = y0, self._convert(rows)
+            y0 += count
+            return strip
+        
+        for piece in self._iter_idat():
+            pending += decompressor.decompress(piece)
+            while len(pending) >= strip_bytes and y0 + rows_per_strip <= self.height:
+                yield take(rows_per_strip)
+        pending += decompressor.flush()
+        while y0 < self.height:
+            count = min(rows_per_strip, self.height - y0, len(pending) // row_bytes)
+            if count <= 0:
+                raise ValueError(f"PNG 数据不完整: 只有 {y0} / {self.height} 行")
+            yield take(count)
+    
+    # ==================== 反滤波 ====================
+    
+    def _unfilter(self, filters, data, previous):
+        """
+        恢复一个行带
+        
+        Args:
+            filters: (rows,) 每行的滤波类型
+            data: (rows, W, bpp) 滤波后的字节
+            previous: (W, bpp) 上一行恢复后的字节
+        """
+        if filters.max(initial=0) > FILTER_PAETH:
+            if self.strict:
+                raise ValueError(f"无效的滤波类型: {filters.max()}")
+            filters = np.where(filters > FILTER_PAETH, FILTER_NONE, filters)
+        if (filters >= FILTER_AVERAGE).any():
+            return self._unfilter_wavefront(filters, data, previous)
+        
+        rows = np.empty_like(data)
+        for y, filter_type in enumerate(filters):
+            above = rows[y - 1] if y else previous
+            if filter_type == FILTER_SUB:
+                np.cumsum(data[y], axis=0, dtype=np.uint8, out=rows[y])
+            elif filter_type == FILTER_UP:
+                np.add(data[y], above, out=rows[y])
+            else:
+                rows[y] = data[y]
+        return rows
+    
+    def _unfilter_wavefront(self, filters, data, previous):
+        """
+        按反对角线恢复行带（支持全部滤波类型）
+        
+        列块内第 r 行的第 i 列放在错位缓冲的位置 (i + r + 1, r + 1)，上一行
+        (previous) 放在第 0 列、不错位。于是第 k 步要恢复的像素都位于 k 行，
+        它们的左、上、左上分别在 (k-1, r+1)、(k-1, r)、(k-2, r)。
+        每个列块最左一列是上一块已恢复的最后一列（首块为 0）。
+        """
+        count, width, bpp = data.shape
+        block = self.WAVEFRONT_COLUMNS
+        # 左侧补一列 0，使第 c0 列恰好是列块 [c0, c1) 左边已恢复的那一列
+        rows = np.zeros((count, width + 1, bpp), dtype=np.uint8)
+        above = np.zeros((width + 1, bpp), dtype=np.uint8)
+        above[1:] = previous
+        # 每种滤波的行掩码（乘法选择）与前缀计数（判断一段行中是否出现该滤波）
+        masks = {kind: (filters == kind).astype(np.int16)[:, None]
+                 for kind in (FILTER_SUB, FILTER_UP, FILTER_AVERAGE, FILTER_PAETH)}
+        counts = {kind: np.concatenate([[0], np.cumsum(mask[:, 0])]) for kind, mask in masks.items()}
+        
+        for c0 in range(0, width, block):
+            cols = min(block, width - c0)
+            steps = cols + count + 1
+            recon = np.zeros((steps + 1, count + 1, bpp), dtype=np.int16)
+            source = np.zeros((steps + 1, count + 1, bpp), dtype=np.int16)
+            recon[:cols + 1, 0] = above[c0:c0 + cols + 1]
+            for r in range(count):
+                recon[r + 1, r + 1] = rows[r, c0]
+                source[r + 2:r + 2 + cols, r + 1] = data[r, c0:c0 + cols]
+            
+            for k in range(2, steps):
+                lo, hi = max(0, k - 1 - cols), min(count - 1, k - 2)
+                if lo > hi:
+                    continue
+                a = recon[k - 1, lo + 1:hi + 2]
+                b = recon[k - 1, lo:hi + 1]
+                value = source[k, lo + 1:hi + 2].copy()
+                for kind in (FILTER_SUB, FILTER_UP, FILTER_AVERAGE, FILTER_PAETH):
+                    present = counts[kind][hi + 1] - counts[kind][lo]
+                    if not present:
+                        continue
+                    if kind == FILTER_SUB:
+                        predict = a
+                    elif kind == FILTER_UP:
+                        predict = b
+                    elif kind == FILTER_AVERAGE:
+                        predict = a + b
+                        predict >>= 1
+                    else:
+                        predict = self._paeth(a, b, recon[k - 2, lo:hi + 1])
+                    # 整段都是同一种滤波时不需要掩码
+                    if present < hi - lo + 1:
+                        predict = predict * masks[kind][lo:hi + 1]
+                    value += predict
+                value &= 0xFF
+                recon[k, lo + 1:hi + 2] = value
+            
+            for r in range(count):
+                rows[r, c0 + 1:c0 + cols + 1] = recon[r + 2:r + 2 + cols, r + 1]
+        return rows[:, 1:]
+    
+    @staticmethod
+    def _paeth(a, b, c):
+        """Paeth 预测（int16），pa / pb / pc 分别为 p 到 a / b / c 的距离，p = a + b - c"""
+        pa = b - c
+        pb = a - c
+        pc = pa + pb
+        np.abs(pa, out=pa)
+        np.abs(pb, out=pb)
+        np.abs(pc, out=pc)
+        b_or_c = np.where(pb <= pc, b, c)
+        np.minimum(pb, pc, out=pb)
+        return np.where(pa <= pb, a, b_or_c)
+    
+    def _convert(self, rows):
+        """恢复后的字节 → 输出像素（16 位取高字节，调色板查表，补 Alpha）"""
+        samples = rows.reshape(rows.shape[0], self.width, -1)
+        if self.bit_depth == 16:
+            samples = samples[..., ::2]
+        if self.color_type == 0:
+            return np.ascontiguousarray(samples[..., 0])
+        if self.color_type == 3:
+            return self.palette[samples[..., 0]]
+        out = np.empty(samples.shape[:2] + (4,), dtype=np.uint8)
+        if self.color_type == 4:
+            out[..., :3] = samples[..., :1]
+            out[..., 3] = samples[..., 1]
+        else:
+            out[..., :self.samples] = samples
+            if self.samples == 3:
+                out[..., 3] = 255
+        return out
+
+
+def write_png(file_path, width, height, channels, strips, level=6):
+    """
+    流式写出 8 位 PNG
+    
+    Args:
+        channels (int): 1 为灰度，4 为 RGBA
+        strips: 依次产生 (rows, W) 或 (rows, W, 4) 像素的可迭代对象
+        level (int): zlib 压缩级别
+    """
+    color_type = 0 if channels == 1 else 6
+    idat_size = 1 << 20
+    compressor = zlib.compressobj(level)
+    buffer = bytearray()
+    with open(file_path, 'wb') as f:
+        f.write(PNG_SIGNATURE)
+        write_chunk(f, b'IHDR', struct.pack('>IIBBBBB', width, height, 8, color_type, 0, 0, 0))
+        for strip in strips:
+            strip = strip.reshape(strip.shape[0], width, channels)
+            # Sub 滤波：每个字节减去左侧同一通道的字节
+            filtered = np.empty((strip.shape[0], width * channels + 1), dtype=np.uint8)
+            filtered[:, 0] = FILTER_SUB
+            body = filtered[:, 1:].reshape(strip.shape)
+            body[:, 0] = strip[:, 0]
+            np.subtract(strip[:, 1:], strip[:, :-1], out=body[:, 1:])
+            buffer += compressor.compress(filtered.tobytes())
+            while len(buffer) >= idat_size:
+                write_chunk(f, b'IDAT', bytes(buffer[:idat_size]))
+                del buffer[:idat_size]
+        buffer += compressor.flush()
+        for start in range(0, len(buffer), idat_size):
+            write_chunk(f, b'IDAT', bytes(buffer[start:start + idat_size]))
+        write_chunk(f, b'IEND', b"")
@@ -0,0 +1,532 @@
+"""
+PNG 结构分析 - 在文件的内存映射上逐块检查，不解码图像
+
+- 块：按长度字段跳转，CRC 用 zlib.crc32 直接在 memoryview 切片上计算（不复制数据）；
+  按类型名各字母的大小写位区分关键 / 辅助、公有 / 私有块，列出未知块
+- 文本：tEXt / zTXt / iTXt 解出关键字与内容（压缩文本最多解出 TEXT_LIMIT 字节）
+- IEND 之后的数据：报告偏移、大小，并按魔数识别附加的文件
+- IDAT：zlib.decompressobj 增量解压，输入按 INFLATE_INPUT 切片送入、每次最多输出 INFLATE_OUTPUT 字节，
+  只按行跨度做步长切片取出每行开头的滤波类型字节，不保留像素数据；隔行扫描按 Adam7 各遍的行宽分段
+
+异常（CRC 错误、块越界或超长、压缩流结束后仍有 IDAT、解压大小与 IHDR 不符等）汇总在 anomalies 中。
+只遍历块时耗时与块数成正比，100 MB 的文件也只需几十毫秒（主要是计算 CRC）。
+"""
+
+import mmap
+import os
+import struct
+import time
+import zlib
+
+import numpy as np
+
+from ..base import BaseCore
+from .file_signature import identify_file_type
+from .png_codec import PNG_SIGNATURE, COLOR_CHANNELS
+from .png_crc_solver import ADAM7_PASSES
+
+
+# PNG 规范允许的最大块长度
+MAX_CHUNK_LENGTH = (1 << 31) - 1
+
+# 规范及常见扩展中的块类型
+KNOWN_CHUNKS = {
+    b'IHDR': "图像头", b'PLTE': "调色板", b'IDAT': "图像数据", b'IEND': "结束",
+    b'tRNS': "透明度", b'cHRM': "色度", b'gAMA': "伽马", b'iCCP': "ICC 配置",
+    b'sBIT': "有效位数", b'sRGB': "sRGB", b'cICP': "编码无关码点", b'mDCV': "母版显示色域",
+    b'cLLI': "内容亮度", b'tEXt': "文本", b'zTXt': "压缩文本", b'iTXt': "国际化文本",
+    b'bKGD': "背景色", b'hIST': "直方图", b'pHYs': "物理尺寸", b'sPLT': "建议调色板",
+    b'eXIf': "Exif", b'tIME': "修改时间", b'acTL': "APNG 动画控制", b'fcTL': "APNG 帧控制",
+    b'fdAT': "APNG 帧数据", b'oFFs': "偏移", b'pCAL': "像素校准", b'sCAL': "物理比例",
+    b'gIFg': "GIF 控制扩展", b'gIFx': "GIF 应用扩展", b'sTER': "立体图像", b'dSIG': "数字签名",
+}
+
+TEXT_CHUNKS = (b'tEXt', b'zTXt', b'iTXt')
+
+FILTER_NAMES = ('None', 'Sub', 'Up', 'Average', 'Paeth')
+
+# 位深度 → 合法的颜色类型
+_VALID_DEPTHS = {0: (1, 2, 4, 8, 16), 2: (8, 16), 3: (1, 2, 4, 8), 4: (8, 16), 6: (8, 16)}
+
+
+def chunk_flags(chunk_type):
+    """
+    类型名四个字母第 5 位（小写）的含义
+    
+    Returns:
+        dict: critical (关键块), private (私有块), reserved (保留位被置位，不合规), safe_to_copy
+    """
+    return {
+        'critical': not chunk_type[0] & 0x20,
+        'private': bool(chunk_type[1] & 0x20),
+        'reserved': bool(chunk_type[2] & 0x20),
+        'safe_to_copy': bool(chunk_type[3] & 0x20),
+    }
+
+
+def scanline_segments(width, height, bits_per_pixel, interlace=0):
+    """
+    解压后数据中的扫描行分段
+    
+    Returns:
+        list: [(起始偏移, 行跨度（含滤波字节）, 行数, 遍号), ...]；不隔行时只有一段，遍号为 0；
+              空的 Adam7 遍不占字节，不列出
+    """
+    if not interlace:
+        passes = [(width, height, 0)]
+    else:
+        passes = [((width + dx - 1 - x0) // dx, (height + dy - 1 - y0) // dy, index + 1)
+                  for index, (x0, y0, dx, dy) in enumerate(ADAM7_PASSES)]
+    segments, start = [], 0
+    for pass_width, pass_height, index in passes:
+        if pass_width <= 0 or pass_height <= 0:
+            continue
+        stride = 1 + (pass_width * bits_per_pixel + 7) // 8
+        segments.append((start, stride, pass_height, index))
+        start += stride * pass_height
+    return segments
+
+
+def inflate_limited(data, limit):
+    """
+    解压 zlib 数据，最多输出 limit 字节
+    
+    Returns:
+        tuple: (解压结果, 是否被截断)
+    """
+    decompressor = zlib.decompressobj()
+    output = decompressor.decompress(data, limit)
+    return output, bool(decompressor.unconsumed_tail) or not decompressor.eof
+
+
+def parse_text_chunk(chunk_type, data, limit):
+    """
+    解析 tEXt / zTXt / iTXt
+    
+    Args:
+        data: 块数据（bytes / memoryview）
+        limit (int): 文本最多保留的字节数
+    
+    Returns:
+        dict: keyword, text, compressed, language, translated, truncated, error（解析失败的原因，正常为 None）
+    """
+    text = {'keyword': "", 'text': "", 'compressed': chunk_type == b'zTXt', 'language': "",
+            'translated': "", 'truncated': False, 'error': None}
+    head = bytes(data[:80])
+    separator = head.find(b'\x00')
+    if separator < 1:
+        text['error'] = "缺少关键字或关键字超过 79 字节"
+        return text
+    text['keyword'] = head[:separator].decode('latin-1')
+    body = data[separator + 1:]
+    try:
+        if chunk_type == b'tEXt':
+            raw, text['truncated'] = bytes(body[:limit]), len(body) > limit
+            text['text'] = raw.decode('latin-1')
+        elif chunk_type == b'zTXt':
+            if len(body) < 1 or body[0] != 0:
+                raise ValueError("未知的压缩方法")
+            raw, text['truncated'] = inflate_limited(body[1:], limit)
+            text['text'] = raw.decode('latin-1')
+        else:
+            if len(body) < 2:
+                raise ValueError("数据过短")
+            compressed, method = body[0], body[1]
+            rest = bytes(body[2:2 + limit + 1024]) if not compressed else body[2:]
+            language_end = bytes(rest[:1024]).find(b'\x00')
+            translated_end = bytes(rest[:2048]).find(b'\x00', language_end + 1)
+            if language_end < 0 or translated_end < 0:
+                raise ValueError("缺少语言标签或翻译关键字")
+            text['language'] = bytes(rest[:language_end]).decode('ascii', 'replace')
+            text['translated'] = bytes(rest[language_end + 1:translated_end]).decode('utf-8', 'replace')
+            payload = rest[translated_end + 1:]
+            text['compressed'] = bool(compressed)
+            if compressed:
+                if method != 0:
+                    raise ValueError("未知的压缩方法")
+                raw, text['truncated'] = inflate_limited(payload, limit)
+            else:
+                raw, text['truncated'] = bytes(payload[:limit]), len(body) - 2 > limit + 1024
+            text['text'] = raw.decode('utf-8', 'replace')
+    except (ValueError, zlib.error) as e:
+        text['error'] = str(e)
+    return text
+
+
+class PngInspector(BaseCore):
+    """
+    PNG 结构分析器
+    
+    示例:
+        inspector = PngInspector()
+        inspector.process("suspect.png", options={'inflate': True})
+        report = inspector.get_result()
+        for anomaly in report['anomalies']:
+            print(anomaly['message'])
+    """
+    
+    # 文本块最多解出的字节数
+    TEXT_LIMIT = 1 << 16
+    # 超过该长度的辅助块视为可疑（IDAT / fdAT 除外）
+    LARGE_CHUNK = 1 << 20
+    # IDAT 解压时每次送入的输入字节数与最多输出的字节数
+    INFLATE_INPUT = 1 << 18
+    INFLATE_OUTPUT = 1 << 20
+    # 行数不超过该值时保留每行的滤波类型，否则只统计直方图
+    ROW_LIMIT = 1 << 24
+    # IEND 之后的数据预览的字节数
+    PREVIEW_BYTES = 64
+    # 每遍历多少个块报告一次进度
+    PROGRESS_CHUNKS = 4096
+    
+    def __init__(self):
+        super().__init__()
+        self.result = None
+    
+    def initialize(self):
+        """初始化处理器"""
+        self._initialized = True
+        print("✅ PngInspector 已初始化")
+    
+    def process(self, *args, **kwargs):
+        """
+        分析 PNG 文件结构
+        
+        Args:
+            args[0] (str): PNG 文件路径
+            kwargs['options']: 分析选项
+                - inflate (bool): 是否解压 IDAT 检查扫描行，默认 True
+        
+        Returns:
+            bool: 分析是否成功（被取消时返回 False）
+        """
+        if not self._initialized:
+            self.initialize()
+        
+        try:
+            file_path = args[0] if args else None
+            options = kwargs.get('options', {})
+            if not file_path or not os.path.isfile(file_path):
+                print(f"❌ 文件不存在: {file_path}")
+                return False
+            
+            self.reset_cancel()
+            report = self.inspect(file_path, options.get('inflate', True))
+            if report is None:
+                print("⏹️ 分析已取消")
+                return False
+            self.result = report
+            errors = sum(anomaly['level'] == 'error' for anomaly in report['anomalies'])
+            print(f"✨ PNG 结构: {len(report['chunks'])} 个块, {len(report['anomalies'])} 处异常"
+                  f"（{errors} 处错误）, 用时 {report['elapsed'] * 1000:.0f} ms")
+            return True
+        
+        except Exception as e:
+            print(f"❌ PNG 结构分析失败: {e}")
+            return False
+    
+    def cleanup(self):
+        """清理资源"""
+        self.cancel()
+        self.result = None
+        self._initialized = False
+        print("🧹 PngInspector 已清理")
+    
+    # ==================== 业务逻辑方法 ====================
+    
+    def inspect(self, file_path, inflate=True):
+        """
+        遍历块并（可选）检查 IDAT（取消时返回 None）
+        
+        Returns:
+            dict: path, size, chunks, counts (类型 → 个数), ihdr, texts, trailing, idat,
+                  anomalies ([{level, offset, message}, ...]), walk_elapsed, elapsed
+        """
+        started = time.perf_counter()
+        with open(file_path, 'rb') as f:
+            size = os.fstat(f.fileno()).st_size
+            if size < 8:
+                raise ValueError("文件过小，不是 PNG 文件")
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                report = {'path': file_path, 'size': size, 'chunks': [], 'counts': {}, 'ihdr': None,
+                          'texts': [], 'trailing': None, 'idat': None, 'anomalies': []}
+                view = memoryview(mm)
+                try:
+                    if not self._walk(view, report):
+                        return None
+                    report['walk_elapsed'] = time.perf_counter() - started
+                    if inflate and report['ihdr'] and report['counts'].get('IDAT'):
+                        report['idat'] = self._inflate(view, report)
+                        if report['idat'] is None:
+                            return None
+                finally:
+                    view.release()
+        report['anomalies'].sort(key=lambda anomaly: (anomaly['offset'] is None, anomaly['offset'] or 0))
+        report['elapsed'] = time.perf_counter() - started
+        return report
+    
+    @staticmethod
+    def _flag(report, level, offset, message):
+        report['anomalies'].append({'level': level, 'offset': offset, 'message': message})
+    
+    def _walk(self, view, report):
+        """逐块检查，填充 report（取消时返回 False）"""
+        size = len(view)
+        flag = self._flag
+        if view[:8] != PNG_SIGNATURE:
+            if view[12:16] != b'IHDR':
+                raise ValueError("不是 PNG 文件")
+            flag(report, 'error', 0, "文件签名被篡改")
+        
+        chunks, counts = report['chunks'], report['counts']
+        offset, end, previous, idat_closed = 8, None, None, False
+        while offset + 8 <= size:
+            length, raw_type = struct.unpack_from('>I4s', view, offset)
+            if not raw_type.isalpha():
+                flag(report, 'error', offset, f"块类型 {raw_type!r} 无效，之后的结构无法解析")
+                break
+            chunk_type = raw_type.decode('ascii')
+            if length > MAX_CHUNK_LENGTH:
+                flag(report, 'error', offset, f"{chunk_type} 的长度 {length:,} 超过规范上限 2³¹-1")
+                break
+            data_end = offset + 8 + length
+            flags = chunk_flags(raw_type)
+            chunk = {'index': len(chunks), 'offset': offset, 'length': length, 'type': chunk_type,
+                     'crc': None, 'actual_crc': None, 'crc_ok': False, 'known': raw_type in KNOWN_CHUNKS,
+                     'note': KNOWN_CHUNKS.get(raw_type, "未知"), **flags}
+            chunks.append(chunk)
+            counts[chunk_type] = counts.get(chunk_type, 0) + 1
+            if data_end + 4 > size:
+                flag(report, 'error', offset, f"{chunk_type} 声明 {length:,} 字节，超出文件末尾（文件被截断）")
+                end = size
+                break
+            chunk['crc'] = struct.unpack_from('>I', view, data_end)[0]
+            chunk['actual_crc'] = zlib.crc32(view[offset + 4:data_end])
+            chunk['crc_ok'] = chunk['crc'] == chunk['actual_crc']
+            if not chunk['crc_ok']:
+                flag(report, 'error', offset, f"{chunk_type} 的 CRC 错误：记录 {chunk['crc']:08X}，"
+                                              f"实际 {chunk['actual_crc']:08X}")
+            self._check_chunk(view, report, chunk, raw_type, offset + 8, previous, idat_closed)
+            if raw_type == b'IDAT':
+                idat_closed = False
+            elif previous == b'IDAT':
+                idat_closed = True
+            previous = raw_type
+            offset = data_end + 4
+            if raw_type == b'IEND':
+                end = offset
+                break
+            if len(chunks) % self.PROGRESS_CHUNKS == 0:
+                if self.is_cancelled():
+                    return False
+                self.report_progress(offset, size, stage='chunks')
+        
+        if not counts.get('IHDR'):
+            flag(report, 'error', None, "缺少 IHDR")
+        if not counts.get('IDAT'):
+            flag(report, 'error', None, "没有 IDAT")
+        if end is None or not counts.get('IEND'):
+            flag(report, 'error', None, "缺少 IEND")
+        if end is None:
+            end = offset
+        if end < size:
+            head = view[end:end + self.PREVIEW_BYTES]
+            kinds = identify_file_type(head)
+            report['trailing'] = {'offset': end, 'size': size - end, 'preview': bytes(head),
+                                  'kinds': kinds}
+            described = f"，开头像 {kinds[0][0]}" if kinds else ""
+            flag(report, 'warning', end, f"结构结束后还有 {size - end:,} 字节数据{described}")
+            head.release()
+        self.report_progress(size, size, stage='chunks')
+        return True
+    
+    def _check_chunk(self, view, report, chunk, raw_type, data_offset, previous, idat_closed):
+        """按类型检查单个块的内容与位置"""
+        flag, offset, length, name = self._flag, chunk['offset'], chunk['length'], chunk['type']
+        if chunk['reserved']:
+            flag(report, 'error', offset, f"{name} 的保留位被置位（第三个字母应为大写）")
+        if not chunk['known']:
+            level = 'error' if chunk['critical'] else 'warning'
+            flag(report, level, offset, f"未知的{'关键' if chunk['critical'] else '辅助'}块 {name}，"
+                                        f"{length:,} 字节")
+        elif length > self.LARGE_CHUNK and raw_type not in (b'IDAT', b'fdAT'):
+            flag(report, 'warning', offset, f"{name} 长达 {length:,} 字节，可能夹带数据")
+        
+        if raw_type == b'IHDR':
+            if chunk['index'] != 0:
+                flag(report, 'error', offset, "IHDR 不是第一个块" if report['ihdr'] is None else "IHDR 重复出现")
+            if length != 13:
+                flag(report, 'error', offset, f"IHDR 长度应为 13，实际为 {length}")
+            elif report['ihdr'] is None:
+                report['ihdr'] = self._parse_ihdr(view, report, data_offset)
+        elif raw_type == b'IDAT':
+            if idat_closed:
+                flag(report, 'error', offset, "IDAT 不连续：中间夹有其他块")
+        elif raw_type == b'IEND':
+            if length:
+                flag(report, 'warning', offset, f"IEND 应为空，实际带有 {length:,} 字节数据")
+        elif raw_type == b'PLTE':
+            if length % 3 or not 3 <= length <= 768:
+                flag(report, 'error', offset, f"PLTE 长度 {length} 不是 3 的倍数或超出 1~256 项")
+            if report['counts'].get('IDAT'):
+                flag(report, 'error', offset, "PLTE 出现在 IDAT 之后")
+        elif raw_type in TEXT_CHUNKS:
+            text = parse_text_chunk(raw_type, view[data_offset:data_offset + length], self.TEXT_LIMIT)
+            text.update(type=name, offset=offset)
+            report['texts'].append(text)
+            if text['error']:
+                flag(report, 'warning', offset, f"{name} 解析失败: {text['error']}")
+        if previous is None and raw_type != b'IHDR':
+            flag(report, 'error', offset, f"第一个块是 {name} 而不是 IHDR")
+    
+    def _parse_ihdr(self, view, report, data_offset):
+        """解析 IHDR 并检查取值范围"""
+        width, height, bit_depth, color_type, compression, filter_method, interlace = \
+            struct.unpack_from('>IIBBBBB', view, data_offset)
+        ihdr = {'width': width, 'height': height, 'bit_depth': bit_depth, 'color_type': color_type,
+                'compression': compression, 'filter_method': filter_method, 'interlace': interlace,
+                'bits_per_pixel': None}
+        offset = data_offset - 8
+        if not width or not height or width > MAX_CHUNK_LENGTH or height > MAX_CHUNK_LENGTH:
+            self._flag(report, 'error', offset, f"IHDR 的尺寸 {width}x{height} 无效")
+        if bit_depth not in _VALID_DEPTHS.get(color_type, ()):
+            self._flag(report, 'error', offset, f"IHDR 的颜色类型 {color_type} 与位深度 {bit_depth} 不匹配")
+        else:
+            ihdr['bits_per_pixel'] = COLOR_CHANNELS[color_type] * bit_depth
+        if compression or filter_method or interlace > 1:
+            self._flag(report, 'error', offset, f"IHDR 的压缩 / 滤波 / 隔行方法无效 "
+                                                f"({compression}, {filter_method}, {interlace})")
+        return ihdr
+    
+    def _inflate(self, view, report):
+        """
+        增量解压 IDAT，统计每行的滤波类型（取消时返回 None）
+        
+        Returns:
+            dict: chunks, compressed, decompressed, expected, complete (压缩流是否正常结束),
+                  zlib ({window, level})，counts ((256,) 各滤波字节的行数), rows (每行滤波类型的
+                  uint8 数组，行数超过 ROW_LIMIT 时为 None), invalid_rows, extra_idat (压缩流结束后
+                  剩余的 IDAT 字节数), extra_offset, extra_output (超出 IHDR 所需的解压字节数)
+        """
+        ihdr = report['ihdr']
+        flag = self._flag
+        idat = [chunk for chunk in report['chunks'] if chunk['type'] == 'IDAT' and chunk['crc'] is not None]
+        compressed = sum(chunk['length'] for chunk in idat)
+        segments = []
+        if ihdr['bits_per_pixel'] and ihdr['width'] and ihdr['height'] and ihdr['interlace'] <= 1:
+            segments = scanline_segments(ihdr['width'], ihdr['height'], ihdr['bits_per_pixel'],
+                                         ihdr['interlace'])
+        expected = sum(stride * rows for _, stride, rows, _ in segments)
+        row_total = sum(rows for _, _, rows, _ in segments)
+        rows = np.zeros(row_total, dtype=np.uint8) if row_total <= self.ROW_LIMIT else None
+        counts = np.zeros(256, dtype=np.int64)
+        invalid_rows = 0
+        bases = np.cumsum([0] + [segment[2] for segment in segments]).tolist()
+        
+        decompressor = zlib.decompressobj()
+        produced = consumed = 0
+        extra_idat, extra_offset = 0, None
+        first_invalid = None
+        
+        def scan(output):
+            """取出 output 中落在行首的滤波字节"""
+            nonlocal produced, invalid_rows, first_invalid
+            start, stop = produced, produced + len(output)
+            produced = stop
+            if start >= expected:
+                return
+            block = np.frombuffer(output, dtype=np.uint8)
+            for index, (segment_start, stride, segment_rows, _) in enumerate(segments):
+                segment_end = segment_start + stride * segment_rows
+                if segment_end <= start or segment_start >= stop:
+                    continue
+                first = max(0, -(-(start - segment_start) // stride))
+                last = min(segment_rows, -(-(stop - segment_start) // stride))
+                if first >= last:
+                    continue
+                values = block[segment_start + first * stride - start::stride][:last - first]
+                counts[:] += np.bincount(values, minlength=256)
+                if rows is not None:
+                    rows[bases[index] + first:bases[index] + last] = values
+                bad = np.flatnonzero(values > 4)
+                if bad.size:
+                    invalid_rows += int(bad.size)
+                    if first_invalid is None:
+                        first_invalid = (index, first + int(bad[0]), int(values[bad[0]]))
+        
+        try:
+            for number, chunk in enumerate(idat):
+                data_offset = chunk['offset'] + 8
+                for position in range(0, chunk['length'], self.INFLATE_INPUT):
+                    if decompressor.eof:
+                        break
+                    piece = view[data_offset + position:data_offset + min(position + self.INFLATE_INPUT,
+                                                                          chunk['length'])]
+                    data = piece
+                    while data:
+                        scan(decompressor.decompress(data, self.INFLATE_OUTPUT))
+                        data = decompressor.unconsumed_tail
+                    piece.release()
+                    if decompressor.eof:
+                        extra_idat += len(decompressor.unused_data)
+                        extra_idat += chunk['length'] - min(position + self.INFLATE_INPUT, chunk['length'])
+                        if extra_idat:
+                            extra_offset = chunk['offset']
+                        break
+                    consumed += min(self.INFLATE_INPUT, chunk['length'] - position)
+                    if self.is_cancelled():
+                        return None
+                    self.report_progress(consumed, compressed, stage='idat')
+                if decompressor.eof:
+                    later = idat[number + 1:]
+                    if later:
+                        extra_idat += sum(other['length'] for other in later)
+                        if extra_offset is None:
+                            extra_offset = later[0]['offset']
+                    break
+            if not decompressor.eof:
+                flag(report, 'error', None, "IDAT 压缩流不完整（没有正常结束）")
+        except zlib.error as e:
+            flag(report, 'error', None, f"IDAT 解压失败（已解出 {produced:,} 字节）: {e}")
+        
+        if extra_idat:
+            flag(report, 'error', extra_offset, f"压缩流结束后还有 {extra_idat:,} 字节 IDAT 数据")
+        if segments and produced < expected:
+            flag(report, 'error', None, f"解压得到 {produced:,} 字节，少于 IHDR 所需的 {expected:,} 字节")
+        elif segments and produced > expected:
+            flag(report, 'error', None, f"解压得到 {produced:,} 字节，比 IHDR 所需多出 "
+                                        f"{produced - expected:,} 字节")
+        if first_invalid is not None:
+            index, row, value = first_invalid
+            where = f"第 {segments[index][3]} 遍第 {row} 行" if ihdr['interlace'] else f"第 {row} 行"
+            flag(report, 'error', None, f"{invalid_rows:,} 行的滤波类型无效，首次出现在{where}（值 {value}）")
+        
+        head = bytes(view[idat[0]['offset'] + 8:idat[0]['offset'] + 10]) if idat else b""
+        zlib_info = None
+        if len(head) == 2:
+            zlib_info = {'window': 1 << ((head[0] >> 4) + 8), 'level': head[1] >> 6}
+        self.report_progress(compressed, compressed, stage='idat')
+        return {'chunks': len(idat), 'compressed': compressed, 'decompressed': produced,
+                'expected': expected if segments else None, 'complete': decompressor.eof,
+                'zlib': zlib_info, 'counts': counts, 'rows': rows, 'invalid_rows': invalid_rows,
+                'extra_idat': extra_idat, 'extra_offset': extra_offset,
+                'extra_output': max(produced - expected, 0) if segments else 0}
+    
+    def chunk_data(self, file_path, chunk):
+        """读取某个块的数据（导出用）"""
+        with open(file_path, 'rb') as f:
+            f.seek(chunk['offset'] + 8)
+            return f.read(chunk['length'])
+    
+    def trailing_data(self, file_path):
+        """读取结构结束后的附加数据"""
+        trailing = self.result and self.result['trailing']
+        if not trailing:
+            return b""
+        with open(file_path, 'rb') as f:
+            f.seek(trailing['offset'])
+            return f.read(trailing['size'])
+    
+    def get_result(self):
+        """获取结果"""
+        return self.result
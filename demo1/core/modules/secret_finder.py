@@ -0,0 +1,229 @@
+"""
+Flag / 密钥搜索服务 - 在所有已加载数据与处理结果中查找敏感内容
+
+规则在设置时逐条编译为独立的正则，对 mmap 缓冲区按块扫描，
+相邻块之间保留重叠区，跨块的匹配不会丢失也不会重复上报；
+比重叠区更长的匹配（如大段 base64）会从起点扩大窗口补全。
+"""
+
+import re
+import threading
+
+from ..base import BaseCore
+
+
+# 默认规则: (名称, 正则)
+DEFAULT_PATTERNS = [
+    ('flag', r'(?i:flag)\{[^}\n]{0,256}\}'),
+    ('ctf', r'(?i:ctf)\{[^}\n]{0,256}\}'),
+    ('jwt', r'eyJ[A-Za-z0-9_-]{4,}\.eyJ[A-Za-z0-9_-]{4,}\.[A-Za-z0-9_-]*'),
+    ('key_header', r'-----BEGIN [A-Z0-9 ]{0,32}(?:PRIVATE KEY|PUBLIC KEY|CERTIFICATE)-----'),
+    ('aws_key', r'AKIA[0-9A-Z]{16}'),
+    ('base64', r'[A-Za-z0-9+/]{24,}={0,2}'),
+]
+
+
+def parse_patterns(text):
+    """
+    解析规则文本，每行一条 “名称: 正则”，# 开头为注释
+    
+    Returns:
+        list: [(name, regex), ...]
+    """
+    patterns = []
+    for line in text.splitlines():
+        line = line.strip()
+        if not line or line.startswith('#'):
+            continue
+        name, sep, regex = line.partition(':')
+        if not sep:
+            name, regex = f"rule{len(patterns) + 1}", line
+        patterns.append((name.strip(), regex.strip()))
+    return patterns
+
+
+def format_patterns(patterns):
+    """将规则列表格式化为可编辑文本"""
+    return "\n".join(f"{name}: {regex}" for name, regex in patterns)
+
+
+class SecretFinder(BaseCore):
+    """
+    多规则搜索服务
+    
+    数据源（已加载文件、各模块的处理结果）通过 add_source 注册并立即扫描；
+    修改规则后调用 process() 重新扫描全部数据源。
+    """
+    
+    # 每次扫描的块大小
+    CHUNK_SIZE = 1 << 22
+    # 块间重叠字节数，更长的匹配由 _extend_match 补全
+    OVERLAP = 4096
+    # 每个数据源最多记录的匹配数
+    MAX_MATCHES = 10000
+    
+    def __init__(self):
+        super().__init__()
+        self.patterns = []
+        self.matcher = []
+        self.sources = {}
+        self.matches = {}
+        self._lock = threading.RLock()
+    
+    def initialize(self):
+        """初始化，载入默认规则"""
+        if not self.patterns:
+            self.set_patterns(DEFAULT_PATTERNS)
+        self._initialized = True
+        print("✅ SecretFinder 已初始化")
+    
+    def set_patterns(self, patterns):
+        """
+        设置规则并逐条编译（不合并为交替正则）
+        
+        Python 的 re 对 “a|b|c” 形式的大正则无法做前缀跳跃，每个位置都要尝试
+        全部分支；各规则单独编译、单独扫描时，带字面前缀或字符集前缀的规则可以在 C 层
+        快速跳过不可能匹配的位置，整体比单个交替正则快一个数量级。
+        
+        Args:
+            patterns (list): [(name, regex), ...]
+        
+        Returns:
+            list: 编译失败的规则说明，为空表示全部成功
+        """
+        errors = []
+        matcher = []
+        for name, regex in patterns:
+            try:
+                matcher.append((name, re.compile(regex.encode('utf-8'))))
+            except re.error as e:
+                errors.append(f"{name}: {e}")
+        
+        with self._lock:
+            self.patterns = [(name, regex.pattern.decode('utf-8')) for name, regex in matcher]
+            self.matcher = matcher
+        return errors
+    
+    def process(self, *args, **kwargs):
+        """
+        使用当前规则重新扫描全部数据源
+        
+        Returns:
+            bool: 处理是否成功
+        """
+        if not self._initialized:
+            self.initialize()
+        
+        try:
+            with self._lock:
+                sources = list(self.sources.items())
+            for name, data in sources:
+                self.scan_source(name, data)
+            print(f"✨ 扫描完成: {len(sources)} 个数据源")
+            return True
+        except Exception as e:
+            print(f"❌ 扫描失败: {e}")
+            return False
+    
+    def cleanup(self):
+        """清理资源"""
+        with self._lock:
+            self.sources = {}
+            self.matches = {}
+        self._initialized = False
+        print("🧹 SecretFinder 已清理")
+    
+    # ==================== 业务逻辑方法 ====================
+    
+    def add_source(self, name, data):
+        """
+        注册（或替换）数据源并立即扫描
+        
+        Args:
+            name (str): 数据源名称，如 “文件: a.bin”、“文本处理”
+            data: bytes / mmap / str
+        
+        Returns:
+            list: 该数据源的匹配列表
+        """
+        if not self._initialized:
+            self.initialize()
+        if isinstance(data, str):
+            data = data.encode('utf-8')
+        with self._lock:
+            self.sources[name] = data
+        return self.scan_source(name, data)
+    
+    def remove_source(self, name):
+        """移除数据源及其匹配"""
+        with self._lock:
+            self.sources.pop(name, None)
+            self.matches.pop(name, None)
+    
+    def scan_source(self, name, data):
+        """扫描单个数据源，结果替换该数据源原有的匹配"""
+        with self._lock:
+            matcher = self.matcher
+        try:
+            found = self.scan_buffer(data, matcher, name)
+        except ValueError:
+            # mmap 已被关闭（文件已卸载）
+            self.remove_source(name)
+            return []
+        with self._lock:
+            if name in self.sources:
+                self.matches[name] = found
+        return found
+    
+    def scan_buffer(self, data, matcher, source=""):
+        """
+        分块扫描缓冲区
+        
+        块 [start, end) 的扫描范围延伸 OVERLAP 字节，只接受起点落在本块内的匹配；
+        匹配一直延伸到扫描范围末尾时可能被截断，从其起点扩大窗口重新匹配；
+        每条规则在下一块从自己上一个匹配的结束位置继续，避免同一段内容被重复上报。
+        """
+        found = []
+        size = len(data)
+        resume = [0] * len(matcher)
+        for start in range(0, size, self.CHUNK_SIZE):
+            end = min(start + self.CHUNK_SIZE, size)
+            block = data[start:min(end + self.OVERLAP, size)]
+            for index, (rule, regex) in enumerate(matcher):
+                for match in regex.finditer(block, max(resume[index] - start, 0)):
+                    if match.start() >= end - start:
+                        break
+                    offset = start + match.start()
+                    if match.end() == len(block) and start + len(block) < size:
+                        match = self._extend_match(data, regex, offset, size) or match
+                    found.append({
+                        'source': source,
+                        'offset': offset,
+                        'rule': rule,
+                        'text': match.group().decode('utf-8', errors='replace'),
+                    })
+                    resume[index] = offset + len(match.group())
+            if len(found) >= self.MAX_MATCHES:
+                break
+        found.sort(key=lambda m: m['offset'])
+        return found[:self.MAX_MATCHES]
+    
+    def _extend_match(self, data, regex, offset, size):
+        """
+        从 offset 处重新匹配，窗口逐次翻倍，直到匹配在窗口内结束或到达数据末尾
+        
+        Returns:
+            re.Match: 相对 offset 的完整匹配，失败时为 None
+        """
+        window = self.OVERLAP * 2
+        while True:
+            stop = min(offset + window, size)
+            match = regex.match(data[offset:stop])
+            if match is None or match.end() < stop - offset or stop == size:
+                return match
+            window *= 2
+    
+    def get_result(self):
+        """获取全部匹配，按数据源与偏移排序"""
+        with self._lock:
+            return [m for name in sorted(self.matches) for m in self.matches[name]]
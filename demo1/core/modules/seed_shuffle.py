@@ -0,0 +1,646 @@
+"""
+种子置乱爆破 - 枚举 PRNG 种子，还原按种子打乱的行列 / 像素 / 图块
+
+常见出题方式：random.seed(key) 后 shuffle 下标列表，再按打乱后的下标搬运像素。
+逐个种子调用 random.shuffle 是纯 Python 循环，百万级种子不可行，因此：
+1. MT19937 按种子向量化：状态为 (624, S) 的 uint32 矩阵，播种
+   （Python 的 init_by_array / RandomState 的 init_genrand）、旋转与输出调和
+   都是对 S 个种子同时进行的整行运算
+2. Fisher-Yates 洗牌按步向量化：每一步每个种子取一个有界随机数，拒绝采样造成的
+   消耗差异由每个种子各自的读指针处理
+   （Python: getrandbits(k) 取高位、r < n；RandomState: 与掩码取低位、r <= i）
+3. 评分只看下采样的视图：两行之间的差异与列的置乱无关（反之亦然），预先对采样的
+   列算出行间距离矩阵，每个种子的得分只是抽样相邻对的一次查表求平均
+4. 种子区间切块交给进程池，每块只返回得分最好的若干个，主进程合并后随进度推送
+"""
+
+import heapq
+import multiprocessing
+import os
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+
+import numpy as np
+
+from ..base import BaseCore
+from .jigsaw_solver import JigsawSolver, split_grid, assemble
+
+
+# 置乱方式：名称 -> (说明, 依次洗牌的维度)
+# 维度 'x' 为列下标 (长度 宽)，'y' 为行下标 (长度 高)，'pixel' 为全部像素，'block' 为图块
+SCHEMES = {
+    'cols_rows': ("先打乱列、再打乱行", ('x', 'y')),
+    'rows_cols': ("先打乱行、再打乱列", ('y', 'x')),
+    'rows': ("只打乱行", ('y',)),
+    'cols': ("只打乱列", ('x',)),
+    'pixels': ("打乱全部像素", ('pixel',)),
+    'blocks': ("打乱图块", ('block',)),
+}
+
+# 伪随机数生成器：名称 -> 说明
+PRNGS = {
+    'python': "Python random (seed + shuffle)",
+    'numpy': "NumPy RandomState (seed + permutation / shuffle)",
+    'numpy_generator': "NumPy Generator (default_rng + permutation，逐个种子)",
+}
+
+# 置换的方向：gather 为 置乱[i] = 原图[p[i]]，scatter 为 置乱[p[i]] = 原图[i]
+DIRECTIONS = ('gather', 'scatter')
+
+_N, _M = 624, 397
+_MATRIX_A = 0x9908B0DF
+_UPPER, _LOWER = 0x80000000, 0x7FFFFFFF
+# 旋转按依赖关系分段：每段只读取未更新的旧值或前面各段已更新的新值
+_TWIST_SEGMENTS = ((0, 227), (227, 454), (454, 623), (623, 624))
+
+# RandomState 置换总长超过该值时逐个种子调用库函数（C 实现的洗牌比逐步向量化更快）
+VECTOR_LIMIT = 4096
+
+# 子进程中的评分器（由进程池的 initializer 设置）
+_worker_scorer = None
+
+
+def _init_genrand(seeds):
+    """init_genrand：RandomState(seed) 的播种，返回 (624, S) 状态"""
+    state = np.empty((_N, len(seeds)), dtype=np.uint32)
+    state[0] = seeds
+    for i in range(1, _N):
+        prev = state[i - 1]
+        state[i] = 1812433253 * (prev ^ (prev >> 30)) + i
+    return state
+
+
+def _init_by_array(seeds):
+    """init_by_array([seed])：Python random.seed(seed) 的播种（0 <= seed < 2**32）"""
+    base = _init_genrand(np.array([19650218], dtype=np.uint32))
+    state = np.repeat(base, len(seeds), axis=1)
+    i = 1
+    for _ in range(_N):
+        prev = state[i - 1]
+        state[i] = (state[i] ^ ((prev ^ (prev >> 30)) * 1664525)) + seeds
+        i += 1
+        if i >= _N:
+            state[0] = state[_N - 1]
+            i = 1
+    for _ in range(_N - 1):
+        prev = state[i - 1]
+        state[i] = (state[i] ^ ((prev ^ (prev >> 30)) * 1566083941)) - i
+        i += 1
+        if i >= _N:
+            state[0] = state[_N - 1]
+            i = 1
+    state[0] = _UPPER
+    return state
+
+
+def _twist(state):
+    """原地生成下一组 624 个状态字"""
+    for lo, hi in _TWIST_SEGMENTS:
+        nxt = (lo + 1) % _N
+        src = (lo + _M) % _N
+        y = state[lo:hi] & _UPPER
+        y |= state[nxt:nxt + hi - lo] & _LOWER
+        odd = y & 1
+        odd *= _MATRIX_A
+        y >>= 1
+        y ^= odd
+        np.bitwise_xor(state[src:src + hi - lo], y, out=state[lo:hi])
+
+
+def _temper(y, out):
+    """输出调和（结果写入 out）"""
+    t = y >> 11
+    np.bitwise_xor(y, t, out=out)
+    np.left_shift(out, 7, out=t)
+    t &= 0x9D2C5680
+    out ^= t
+    np.left_shift(out, 15, out=t)
+    t &= 0xEFC60000
+    out ^= t
+    np.right_shift(out, 18, out=t)
+    out ^= t
+
+
+class _MersenneBatch:
+    """
+    S 个 MT19937 输出流
+    
+    输出按 (字序号, 种子) 存放，每个种子一个读指针（直接存扁平下标，前进一个字即加 S）；
+    已被所有种子读过的字在补充时丢弃，缓冲区只保留读指针之间的窗口
+    """
+    
+    def __init__(self, state):
+        self.state = state
+        self.count = state.shape[1]
+        self.words = np.empty((0, self.count), dtype=np.uint32)
+        self.flat = np.arange(self.count)
+        # 所有种子都至少还能再读的字数（下界）
+        self.available = 0
+    
+    def _refill(self):
+        """丢弃已读完的字，再旋转生成 624 个字"""
+        consumed = int(self.flat.min()) // self.count
+        remaining = len(self.words) - consumed
+        words = np.empty((remaining + _N, self.count), dtype=np.uint32)
+        words[:remaining] = self.words[consumed:]
+        _twist(self.state)
+        _temper(self.state, words[remaining:])
+        self.words = words
+        self.flat -= consumed * self.count
+        self.available = len(self.words) - int(self.flat.max()) // self.count
+    
+    def _take(self, index=None):
+        """读取每个种子（或 index 指定的种子）的下一个字"""
+        if self.available < 1:
+            self._refill()
+        self.available -= 1
+        if index is None:
+            values = self.words.ravel()[self.flat]
+            self.flat += self.count
+        else:
+            values = self.words.ravel()[self.flat[index]]
+            self.flat[index] += self.count
+        return values
+    
+    def below(self, n, high_bits):
+        """
+        每个种子一个 [0, n) 的随机数
+        
+        Args:
+            high_bits (bool): True 为 Python 的 getrandbits(n.bit_length()) 取高位，
+                              False 为 RandomState 的掩码取低位
+        """
+        if high_bits:
+            shift = 32 - n.bit_length()
+            values = self._take() >> shift
+        else:
+            mask = (1 << (n - 1).bit_length()) - 1
+            values = self._take() & mask
+        bad = np.flatnonzero(values >= n)
+        while bad.size:
+            redraw = self._take(bad)
+            values[bad] = redraw >> shift if high_bits else redraw & mask
+            bad = bad[values[bad] >= n]
+        return values
+
+
+def batch_permutations(prng, seeds, lengths):
+    """
+    一批种子依次洗牌得到的置换（与逐个种子调用库函数的结果完全一致）
+    
+    Args:
+        prng (str): PRNGS 中的名称
+        seeds: uint32 数组 (S,)
+        lengths: 依次洗牌的列表长度
+    
+    Returns:
+        list: 每个长度一个 (n, S) int32 数组，第 s 列为种子 seeds[s] 的置换
+    """
+    count = len(seeds)
+    perms = [np.empty((n, count), dtype=np.int32) for n in lengths]
+    if prng == 'numpy_generator' or (prng == 'numpy' and sum(lengths) > VECTOR_LIMIT):
+        factory = np.random.default_rng if prng == 'numpy_generator' else np.random.RandomState
+        # 按种子逐行填写后整体转置，避免逐列的跨步写入
+        rows = [np.empty((count, n), dtype=np.int32) for n in lengths]
+        for index, seed in enumerate(seeds.tolist()):
+            rng = factory(seed)
+            for row, n in zip(rows, lengths):
+                row[index] = rng.permutation(n)
+        for perm, row in zip(perms, rows):
+            perm[:] = row.T
+        return perms
+    
+    high_bits = prng == 'python'
+    stream = _MersenneBatch(_init_by_array(seeds) if high_bits else _init_genrand(seeds))
+    columns = np.arange(count)
+    for perm, n in zip(perms, lengths):
+        perm[:] = np.arange(n, dtype=np.int32)[:, None]
+        flat = perm.ravel()
+        for i in range(n - 1, 0, -1):
+            swap = stream.below(i + 1, high_bits) * count + columns
+            current = perm[i].copy()
+            perm[i] = flat[swap]
+            flat[swap] = current
+    return perms
+
+
+def reference_permutations(prng, seed, lengths):
+    """直接调用库函数得到单个种子的置换（用于还原图像）"""
+    if prng == 'python':
+        rng = random.Random(seed)
+        perms = []
+        for n in lengths:
+            values = list(range(n))
+            rng.shuffle(values)
+            perms.append(np.array(values, dtype=np.intp))
+        return perms
+    rng = np.random.RandomState(seed) if prng == 'numpy' else np.random.default_rng(seed)
+    return [rng.permutation(n) for n in lengths]
+
+
+def inverse_permutations(perms):
+    """
+    按列求逆置换：inverse[p[i]] = i
+    
+    先转成每个种子一行，使每个种子的散射写入落在连续的一段内存中
+    """
+    count, columns = perms.shape
+    rows = np.ascontiguousarray(perms.T)
+    target = rows + (np.arange(columns, dtype=np.intp) * count)[:, None]
+    inverse = np.empty((columns, count), dtype=perms.dtype)
+    inverse.ravel()[target.ravel()] = np.tile(np.arange(count, dtype=perms.dtype), columns)
+    return inverse.T
+
+
+def _distance_matrix(x, y):
+    """行向量两两之间的均方根距离 (len(x), len(y)) float32：|x|² + |y|² - 2·x·yᵀ"""
+    squared = np.einsum('ij,ij->i', x, x)[:, None] + np.einsum('ij,ij->i', y, y)[None, :] - 2 * (x @ y.T)
+    np.maximum(squared, 0, out=squared)
+    return np.sqrt(squared / max(x.shape[1], 1), dtype=np.float32)
+
+
+def _spread(count, limit):
+    """[0, count) 中均匀抽取的最多 limit 个不重复下标"""
+    return np.unique(np.linspace(0, count - 1, min(count, limit)).astype(np.intp))
+
+
+class ShuffleScorer:
+    """
+    下采样视图上的平滑度评分（只含 NumPy 数组，可 pickle 后交给子进程）
+    
+    每个维度的得分为抽样相邻对的平均距离除以随机两项的平均距离，
+    随机置换约为 1，越接近 0 越平滑；总分取各维度的平均
+    """
+    
+    # 每个维度抽样的相邻对数
+    PAIRS = 256
+    # 行 / 列距离使用的采样列 / 行数
+    FEATURES = 64
+    # 距离矩阵的最大边长
+    MAX_LINES = 4096
+    
+    def __init__(self, image, axes, block_size=None):
+        """
+        Args:
+            image: (H, W[, C]) uint8
+            axes: 依次洗牌的维度（SCHEMES 中的元组）
+            block_size (tuple): 'block' 维度的 (块宽, 块高)
+        """
+        if image.ndim == 2:
+            image = image[..., None]
+        # 整幅图都相同的通道（如不透明图像的 Alpha）不参与评分
+        varying = [c for c in range(image.shape[2]) if image[..., c].min() != image[..., c].max()]
+        data = image[..., varying or [0]].astype(np.float32)
+        height, width = data.shape[:2]
+        self.axes = tuple(axes)
+        self.lookups = {}
+        for axis in self.axes:
+            if axis in ('x', 'y'):
+                lines = data if axis == 'y' else data.swapaxes(0, 1)
+                count = lines.shape[0]
+                if count > self.MAX_LINES:
+                    raise ValueError(f"{'高' if axis == 'y' else '宽'} {count} 超过 {self.MAX_LINES}")
+                features = lines[:, _spread(lines.shape[1], self.FEATURES)].reshape(count, -1)
+                table = _distance_matrix(features, features)
+                first = _spread(count - 1, self.PAIRS) if count > 1 else np.empty(0, np.intp)
+                self.lookups[axis] = [(table, first, first + 1, self._baseline(table))]
+            elif axis == 'block':
+                block_w, block_h = block_size
+                rows, cols = height // block_h, width // block_w
+                tiles = split_grid(data, rows, cols)
+                if len(tiles) > self.MAX_LINES:
+                    raise ValueError(f"图块数 {len(tiles)} 超过 {self.MAX_LINES}")
+                features = JigsawSolver.edge_features(tiles)
+                index = np.arange(rows * cols).reshape(rows, cols)
+                self.lookups[axis] = []
+                for direction, left, right in (('R', index[:, :-1], index[:, 1:]),
+                                               ('D', index[:-1], index[1:])):
+                    if not left.size:
+                        continue
+                    table = _distance_matrix(*features[direction])
+                    pick = _spread(left.size, self.PAIRS)
+                    self.lookups[axis].append((table, left.ravel()[pick], right.ravel()[pick],
+                                               self._baseline(table)))
+            else:
+                pixels = data.reshape(height * width, -1)
+                ys, xs = _spread(max(height - 1, 1), 32), _spread(max(width - 1, 1), 32)
+                first = (ys[:, None] * width + xs).ravel()
+                pairs = []
+                if width > 1:
+                    pairs.append((first, first + 1))
+                if height > 1:
+                    pairs.append((first, first + width))
+                rng = np.random.default_rng(0)
+                a, b = rng.integers(0, len(pixels), (2, 4096))
+                baseline = max(float(np.abs(pixels[a] - pixels[b]).mean()), 1e-6)
+                self.lookups[axis] = [(pixels, left, right, baseline) for left, right in pairs]
+        if not any(self.lookups.values()):
+            raise ValueError("图像太小，无法评分")
+        # 每个维度评分用到的原图下标（升序去重），查表的下标改为在其中的序号
+        self.samples = {}
+        for axis, lookups in self.lookups.items():
+            samples = np.unique(np.concatenate([np.empty(0, np.intp)] + [np.concatenate(pair[1:3])
+                                                                         for pair in lookups]))
+            self.samples[axis] = samples
+            self.lookups[axis] = [(table, np.searchsorted(samples, left), np.searchsorted(samples, right),
+                                   baseline) for table, left, right, baseline in lookups]
+    
+    @staticmethod
+    def _baseline(table):
+        """随机两项的平均距离（去掉对角线）"""
+        count = len(table)
+        if count < 2:
+            return 1.0
+        return max(float((table.sum(dtype=np.float64) - np.trace(table)) / (count * (count - 1))), 1e-6)
+    
+    def score(self, perms, direction):
+        """
+        一批候选置换的得分
+        
+        Args:
+            perms: 每个维度一个 (n, S) 置换数组（与 axes 对应）
+            direction (str): 'gather' 或 'scatter'
+        
+        Returns:
+            np.ndarray: (S,) float32，越小越平滑
+        """
+        wheres = []
+        for axis, perm in zip(self.axes, perms):
+            # 原图第 k 项在置乱图中的位置，只取评分用到的下标
+            where = inverse_permutations(perm) if direction == 'gather' else perm
+            wheres.append(where[self.samples[axis]])
+        return self.score_sampled(wheres)
+    
+    def score_sampled(self, wheres):
+        """
+        只知道评分用到的原图下标在置乱图中的位置时的得分
+        
+        Args:
+            wheres: 每个维度一个 (len(samples[axis]), S) 数组，
+                    第 j 行为原图下标 samples[axis][j] 在置乱图中的位置
+        
+        Returns:
+            np.ndarray: (S,) float32，越小越平滑
+        """
+        total, parts = 0.0, 0
+        for axis, where in zip(self.axes, wheres):
+            for table, left, right, baseline in self.lookups[axis]:
+                if table.ndim == 2 and axis != 'pixel':
+                    values = table[where[left], where[right]]
+                else:
+                    values = np.abs(table[where[left]] - table[where[right]]).mean(axis=2)
+                total = total + values.mean(axis=0) / baseline
+                parts += 1
+        return (total / max(parts, 1)).astype(np.float32)
+
+
+def _init_worker(scorer):
+    """进程池 initializer：评分器只传给每个子进程一次"""
+    global _worker_scorer
+    _worker_scorer = scorer
+
+
+def _search_chunk(prng, lengths, start, end, keep, batch, scorer=None):
+    """
+    进程池任务：种子 [start, end) 中得分最好的 keep 个
+    
+    Returns:
+        list: [(得分, 种子, 方向)]，按得分升序
+    """
+    scorer = scorer or _worker_scorer
+    best = []
+    for first in range(start, end, batch):
+        seeds = np.arange(first, min(first + batch, end), dtype=np.int64).astype(np.uint32)
+        perms = batch_permutations(prng, seeds, lengths)
+        for direction in DIRECTIONS:
+            scores = scorer.score(perms, direction)
+            count = min(keep, len(scores))
+            for index in np.argpartition(scores, count - 1)[:count].tolist():
+                entry = (float(scores[index]), int(seeds[index]), direction)
+                if len(best) < keep:
+                    heapq.heappush(best, (-entry[0], entry))
+                elif entry[0] < -best[0][0]:
+                    heapq.heapreplace(best, (-entry[0], entry))
+    return sorted(entry for _, entry in best)
+
+
+class SeedShuffleSolver(BaseCore):
+    """
+    种子置乱爆破器
+    
+    功能：
+    - 在种子区间内复现 Python random / NumPy 的洗牌置换（按种子向量化）
+    - 对两种置换方向的还原结果做下采样平滑度评分
+    - 进程池并行、可取消，排名随进度推送
+    - 按种子还原完整图像
+    """
+    
+    # 每批同时模拟的种子数上限
+    MAX_BATCH = 4096
+    # 每批置换数组的元素数上限（决定较长置换时的批大小）
+    BATCH_ELEMENTS = 1 << 24
+    # 每个进程池任务处理的置换元素数（种子数 × 置换长度）
+    TASK_ELEMENTS = 1 << 23
+    # 保留的最佳种子个数
+    TOP_COUNT = 24
+    
+    def __init__(self):
+        super().__init__()
+        self.image = None
+        self.scheme = 'cols_rows'
+        self.prng = 'python'
+        self.block_size = (16, 16)
+        self.result = None
+    
+    def initialize(self):
+        """初始化处理器"""
+        self._initialized = True
+        print("✅ SeedShuffleSolver 已初始化")
+    
+    def process(self, *args, **kwargs):
+        """
+        爆破种子
+        
+        Args:
+            args[0]: 置乱后的图像，(H, W, 4) RGBA 或 (H, W) 灰度，uint8
+            kwargs['options']: 处理选项
+                - scheme (str): SCHEMES 中的置乱方式，默认 'cols_rows'
+                - prng (str): PRNGS 中的生成器，默认 'python'
+                - seed_range (tuple): 种子范围 (最小, 最大)，闭区间，默认 (0, 65535)
+                - block_size (tuple): 'blocks' 方式的 (块宽, 块高)，默认 (16, 16)
+                - top (int): 保留的最佳种子个数，默认 TOP_COUNT
+                - workers (int): 进程数，默认 CPU 核数
+        
+        Returns:
+            bool: 处理是否成功（被取消也返回 True，result['cancelled'] 为 True）
+        """
+        if not self._initialized:
+            self.initialize()
+        
+        try:
+            self.reset_cancel()
+            image = args[0] if args else self.image
+            options = kwargs.get('options', {})
+            if image is None:
+                print("❌ 没有图像")
+                return False
+            self.image = image
+            self.scheme = options.get('scheme', 'cols_rows')
+            self.prng = options.get('prng', 'python')
+            self.block_size = tuple(options.get('block_size', (16, 16)))
+            if self.scheme not in SCHEMES or self.prng not in PRNGS:
+                print(f"❌ 不支持的置乱方式或生成器: {self.scheme} / {self.prng}")
+                return False
+            seed_range = self.check_range(options.get('seed_range', (0, 0xFFFF)))
+            workers = options.get('workers') or os.cpu_count() or 1
+            top = options.get('top') or self.TOP_COUNT
+            
+            print(f"🎲 种子爆破: {SCHEMES[self.scheme][0]}, {PRNGS[self.prng]}, "
+                  f"种子 {seed_range[0]}-{seed_range[1]}")
+            self.result = self.search(seed_range, top, workers)
+            if self.result['ranking']:
+                best = self.result['ranking'][0]
+                print(f"✨ 完成: 最佳种子 {best['seed']} ({best['direction']}), 得分 {best['score']:.3f}, "
+                      f"{self.result['rate']:,.0f} 种子/s")
+            return True
+        
+        except Exception as e:
+            print(f"❌ 处理失败: {e}")
+            return False
+    
+    def cleanup(self):
+        """清理资源"""
+        self.cancel()
+        self.image = None
+        self.result = None
+        print("🧹 SeedShuffleSolver 已清理")
+    
+    def get_result(self):
+        """获取处理结果"""
+        return self.result
+    
+    # ==================== 业务逻辑方法 ====================
+    
+    @staticmethod
+    def check_range(value_range):
+        """检查并规范化种子闭区间（32 位无符号）"""
+        lo, hi = (int(v) for v in value_range)
+        if not 0 <= lo <= hi <= 0xFFFFFFFF:
+            raise ValueError(f"无效的种子范围: {lo}-{hi}")
+        return lo, hi
+    
+    @property
+    def axes(self):
+        """当前置乱方式依次洗牌的维度"""
+        return SCHEMES[self.scheme][1]
+    
+    def working_image(self):
+        """参与还原的图像（图块方式裁掉除不尽的右 / 下边缘）"""
+        if self.scheme != 'blocks':
+            return self.image
+        block_w, block_h = self.block_size
+        height, width = self.image.shape[:2]
+        if width < block_w or height < block_h:
+            raise ValueError(f"图像 {width}x{height} 小于块大小 {block_w}x{block_h}")
+        return self.image[:height // block_h * block_h, :width // block_w * block_w]
+    
+    def lengths(self):
+        """依次洗牌的列表长度"""
+        height, width = self.working_image().shape[:2]
+        sizes = {'x': width, 'y': height, 'pixel': width * height,
+                 'block': (width // self.block_size[0]) * (height // self.block_size[1])}
+        return [sizes[axis] for axis in self.axes]
+    
+    def search(self, seed_range, top, workers=1):
+        """
+        在种子区间内搜索得分最好的 top 个 (种子, 方向)
+        
+        Returns:
+            dict: ranking [{'seed', 'direction', 'score'}], searched, elapsed, rate, cancelled
+        """
+        lengths = self.lengths()
+        scorer = ShuffleScorer(self.working_image(), self.axes, self.block_size)
+        start, end = seed_range[0], seed_range[1] + 1
+        total = end - start
+        elements = max(sum(lengths), 1)
+        batch = max(min(self.MAX_BATCH, self.BATCH_ELEMENTS // elements), 1)
+        task_size = max(self.TASK_ELEMENTS // elements // batch, 1) * batch
+        
+        best = []
+        searched = 0
+        started = time.perf_counter()
+        
+        def record(entries, size):
+            nonlocal best, searched
+            best = sorted(best + entries)[:top]
+            searched += size
+            elapsed = max(time.perf_counter() - started, 1e-9)
+            self.report_progress(searched, total, rate=searched / elapsed, ranking=self._ranking(best))
+        
+        if total <= task_size or workers <= 1:
+            # 进程内逐批搜索，保证取消与进度的响应粒度
+            for s in range(start, end, batch):
+                if self.is_cancelled():
+                    break
+                e = min(s + batch, end)
+                record(_search_chunk(self.prng, lengths, s, e, top, batch, scorer), e - s)
+        else:
+            context = multiprocessing.get_context('spawn')
+            with ProcessPoolExecutor(max_workers=workers, mp_context=context,
+                                     initializer=_init_worker, initargs=(scorer,)) as pool:
+                pending = {}
+                for s in range(start, end, task_size):
+                    e = min(s + task_size, end)
+                    pending[pool.submit(_search_chunk, self.prng, lengths, s, e, top, batch)] = e - s
+                    # 只保留有限数量的在途任务，避免一次性提交整个范围
+                    if len(pending) < workers * 2:
+                        continue
+                    done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        record(future.result(), pending.pop(future))
+                    if self.is_cancelled():
+                        break
+                if self.is_cancelled():
+                    for future in pending:
+                        future.cancel()
+                for future in pending:
+                    if not future.cancelled():
+                        record(future.result(), pending[future])
+        
+        elapsed = time.perf_counter() - started
+        return {
+            'ranking': self._ranking(best),
+            'searched': searched,
+            'elapsed': elapsed,
+            'rate': searched / elapsed if elapsed else 0.0,
+            'cancelled': self.is_cancelled(),
+        }
+    
+    @staticmethod
+    def _ranking(entries):
+        """[(得分, 种子, 方向)] -> 排名字典列表"""
+        return [{'seed': seed, 'direction': direction, 'score': score} for score, seed, direction in entries]
+    
+    def unscramble(self, seed, direction):
+        """
+        按种子与方向还原完整图像（逆置换用花式索引一次搬运）
+        
+        Returns:
+            np.ndarray: 还原后的图像，形状与 working_image() 相同
+        """
+        image = self.working_image()
+        perms = reference_permutations(self.prng, seed, self.lengths())
+        for axis, perm in zip(self.axes, perms):
+            where = np.argsort(perm) if direction == 'gather' else perm
+            if axis == 'y':
+                image = image[where]
+            elif axis == 'x':
+                image = image[:, where]
+            elif axis == 'pixel':
+                image = image.reshape(-1, *image.shape[2:])[where].reshape(image.shape)
+            else:
+                block_w, block_h = self.block_size
+                rows, cols = image.shape[0] // block_h, image.shape[1] // block_w
+                image = assemble(split_grid(image, rows, cols), where.reshape(rows, cols))
+        return image
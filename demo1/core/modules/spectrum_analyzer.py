@@ -0,0 +1,495 @@
+"""
+频域分析 - FFT 幅度 / 相位谱、原图与水印图的频域差分、分块 DCT 系数提取
+
+每个通道按 float32 取出后用 numpy.fft.rfft2 变换，得到 complex64 的半谱 (H, W//2 + 1)；
+实数图像的频谱共轭对称，显示整幅频谱时由半谱镜像补全，再移到中心。
+半谱按 (图像, 通道) 缓存，总字节数有上限；双图差分时两幅图的半谱都已缓存则直接相减，
+否则对空间差分做一次变换（FFT 是线性的，结果相同）。
+
+NumPy 的 FFT 在计算时释放 GIL，RGB 差分的三个通道在线程池中并行变换。
+大图（整幅变换的内存超过 MEMORY_BYTES）改为行列分离的分块变换：先按行带做 rfft，
+再按列带做 fft，中间只有一个行带 / 列带的临时数组；半谱本身超过上限时放到临时文件映射中。
+
+分块 DCT 只计算需要的一两个系数（c = D[u] · B · D[v]），按块行分带，不需要整幅系数数组。
+"""
+
+import math
+import os
+import random
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+from ..base import BaseCore
+from .image_processor import GRAY_WEIGHTS
+
+
+# 分析方式
+MODES = {
+    'spectrum': "单图频谱",
+    'difference': "双图频域差分（盲水印）",
+    'dct': "分块 DCT 系数",
+}
+
+# 通道
+CHANNELS = {
+    'gray': "灰度",
+    'red': "R",
+    'green': "G",
+    'blue': "B",
+    'alpha': "Alpha",
+}
+
+# 频谱显示方式
+SPECTRA = {
+    'magnitude': "幅度谱（对数）",
+    'phase': "相位谱",
+}
+
+# DCT 系数取比特的方式
+DCT_BITS = {
+    'sign': "系数符号（> 0 为 1）",
+    'compare': "两系数比较（c1 > c2 为 1）",
+}
+
+_CHANNEL_INDEX = {'red': 0, 'green': 1, 'blue': 2, 'alpha': 3}
+
+
+def channel_rows(image, channel, y0=0, y1=None):
+    """
+    取出一个通道的若干行，返回 float32 (rows, W)
+    
+    灰度图像任何通道都返回灰度；没有 Alpha 的图像 Alpha 为 255。
+    """
+    rows = image[y0:y1]
+    if rows.ndim == 2:
+        return rows.astype(np.float32)
+    if channel == 'gray':
+        weights = np.array(GRAY_WEIGHTS, dtype=np.float32) / 256
+        return rows[..., :3].astype(np.float32) @ weights
+    index = _CHANNEL_INDEX[channel]
+    if index >= rows.shape[2]:
+        return np.full(rows.shape[:2], 255, dtype=np.float32)
+    return rows[..., index].astype(np.float32)
+
+
+def dct_matrix(size):
+    """正交 DCT-II 变换矩阵，行为基向量"""
+    n = np.arange(size)
+    matrix = np.cos(np.pi * (2 * n[None, :] + 1) * n[:, None] / (2 * size)) * math.sqrt(2 / size)
+    matrix[0] /= math.sqrt(2)
+    return matrix.astype(np.float32)
+
+
+def unshuffle(image, seed):
+    """
+    还原 BlindWaterMark 的随机置乱：上半部分的行、全部列按 random.seed(seed) 打乱
+    
+    Returns:
+        与 image 同形状的数组，下半部分为 0
+    """
+    height, width = image.shape[:2]
+    rng = random.Random(seed)
+    rows, cols = list(range(height // 2)), list(range(width))
+    rng.shuffle(rows)
+    rng.shuffle(cols)
+    out = np.zeros_like(image)
+    out[np.ix_(rows, cols)] = image[:height // 2]
+    return out
+
+
+class _SpectrumCache:
+    """按 (图像, 通道) 缓存半谱的 LRU，按字节数限制，可在工作线程中使用"""
+    
+    def __init__(self, max_bytes):
+        self.max_bytes = max_bytes
+        self.total_bytes = 0
+        self._items = OrderedDict()
+        self._lock = threading.Lock()
+    
+    def get(self, key):
+        with self._lock:
+            if key not in self._items:
+                return None
+            self._items.move_to_end(key)
+            return self._items[key]
+    
+    def put(self, key, spectrum):
+        if isinstance(spectrum, np.memmap) or spectrum.nbytes > self.max_bytes:
+            return
+        with self._lock:
+            old = self._items.pop(key, None)
+            if old is not None:
+                self.total_bytes -= old.nbytes
+            self._items[key] = spectrum
+            self.total_bytes += spectrum.nbytes
+            while self.total_bytes > self.max_bytes:
+                _, evicted = self._items.popitem(last=False)
+                self.total_bytes -= evicted.nbytes
+    
+    def discard(self, image_key):
+        with self._lock:
+            for key in [key for key in self._items if key[0] == image_key]:
+                self.total_bytes -= self._items.pop(key).nbytes
+    
+    def clear(self):
+        with self._lock:
+            self._items.clear()
+            self.total_bytes = 0
+    
+    def info(self):
+        """(缓存的半谱数, 字节数)，两者一致"""
+        with self._lock:
+            return len(self._items), self.total_bytes
+    
+    def __len__(self):
+        with self._lock:
+            return len(self._items)
+
+
+class SpectrumAnalyzer(BaseCore):
+    """
+    频域分析器
+    
+    功能：
+    - 单图：各通道的对数幅度谱 / 相位谱（移到中心）
+    - 双图：(水印图 - 原图) 频谱的实部除以强度，可按种子还原 BlindWaterMark 的置乱
+    - 分块 DCT：取每块的一个系数生成系数图，按符号或两系数比较提取比特
+    
+    示例:
+        analyzer = SpectrumAnalyzer()
+        key = analyzer.add_image(rgba)
+        analyzer.process(key, options={'mode': 'spectrum', 'channel': 'gray'})
+        image = analyzer.get_result()['image']
+    """
+    
+    # 半谱缓存的总字节数
+    CACHE_BYTES = 256 << 20
+    # 变换的内存上限：整幅变换超过时改用分块变换，半谱本身超过时放到临时文件映射中
+    MEMORY_BYTES = 256 << 20
+    # 分块变换中每个行带 / 列带的字节数
+    BAND_BYTES = 16 << 20
+    
+    def __init__(self):
+        super().__init__()
+        self.images = {}
+        self.result = None
+        self.workers = os.cpu_count() or 1
+        self.cache = _SpectrumCache(self.CACHE_BYTES)
+        self._next_key = 0
+    
+    def initialize(self):
+        """初始化处理器"""
+        self._initialized = True
+        print("✅ SpectrumAnalyzer 已初始化")
+    
+    def process(self, *args, **kwargs):
+        """
+        频域分析
+        
+        Args:
+            args[0]: add_image 返回的图像键，或直接传入图像数组（(H, W, 4) RGBA 或 (H, W) 灰度）
+            kwargs['options']: 分析选项
+                - mode (str): MODES 之一
+                - channel (str): CHANNELS 之一；差分时还可以为 'rgb'（三个通道合成彩色结果）
+                - spectrum (str): SPECTRA 之一（mode 为 spectrum 时）
+                - reference: 原图的键或数组（mode 为 difference 时，args[0] 为水印图）
+                - alpha (float): 水印强度，默认 3
+                - seed (int): 置乱种子，None 表示不还原
+                - normalize (bool): 差分结果拉伸到 0~255，默认 False（取绝对值后截断）
+                - block (int): DCT 块边长，默认 8
+                - coefficient (tuple): 取出的系数 (u, v)，默认 (0, 1)
+                - bits (str): DCT_BITS 之一，默认 sign
+                - compare (tuple): 比较的第二个系数（bits 为 compare 时）
+                - workers (int): 线程数，默认为 CPU 核数
+        
+        Returns:
+            bool: 处理是否成功（被取消时返回 False）
+        """
+        if not self._initialized:
+            self.initialize()
+        
+        try:
+            options = kwargs.get('options', {})
+            mode = options.get('mode', 'spectrum')
+            if mode not in MODES:
+                print(f"❌ 未知的分析方式: {mode}")
+                return False
+            key = self._key_of(args[0] if args else None)
+            self.reset_cancel()
+            self.workers = options.get('workers') or os.cpu_count() or 1
+            channel = options.get('channel', 'gray')
+            start = time.perf_counter()
+            
+            if mode == 'spectrum':
+                result = self.spectrum_view(key, channel, options.get('spectrum', 'magnitude'))
+                result = None if result is None else {'image': result}
+            elif mode == 'difference':
+                reference = self._key_of(options.get('reference'))
+                result = self.difference(reference, key, channel, options.get('alpha', 3.0),
+                                         options.get('seed'), options.get('normalize', False))
+                result = None if result is None else {'image': result}
+            else:
+                result = self.block_dct(key, channel, options.get('block', 8),
+                                        options.get('coefficient', (0, 1)), options.get('bits', 'sign'),
+                                        options.get('compare', (1, 0)))
+            
+            if result is None:
+                print("⏹️ 频域分析已取消")
+                return False
+            result.update(mode=mode, channel=channel, elapsed=time.perf_counter() - start)
+            self.result = result
+            image = result['image']
+            print(f"🌀 {MODES[mode]}: {image.shape[1]}x{image.shape[0]}, 用时 {result['elapsed']:.2f}s")
+            return True
+        
+        except Exception as e:
+            print(f"❌ 频域分析失败: {e}")
+            return False
+    
+    def cleanup(self):
+        """清理资源"""
+        self.images.clear()
+        self.cache.clear()
+        self.result = None
+        self._initialized = False
+        print("🧹 SpectrumAnalyzer 已清理")
+    
+    # ==================== 业务逻辑方法 ====================
+    
+    def add_image(self, image):
+        """登记一幅图像，返回用于分析和缓存的键"""
+        if image is None or 0 in image.shape[:2]:
+            raise ValueError("没有图像数据")
+        self._next_key += 1
+        self.images[self._next_key] = image
+        return self._next_key
+    
+    def remove_image(self, key):
+        """移除图像及其缓存的半谱"""
+        self.images.pop(key, None)
+        self.cache.discard(key)
+    
+    def _key_of(self, source):
+        """图像键原样返回，数组已登记时返回原有的键，否则登记后返回新键"""
+        if isinstance(source, np.ndarray):
+            for key, image in self.images.items():
+                if image is source:
+                    return key
+            return self.add_image(source)
+        if source not in self.images:
+            raise ValueError("没有图像数据")
+        return source
+    
+    def half_spectrum(self, key, channel):
+        """
+        一个通道的半谱 complex64 (H, W//2 + 1)，命中缓存时直接返回
+        
+        Returns:
+            np.ndarray，被取消时为 None
+        """
+        cached = self.cache.get((key, channel))
+        if cached is not None:
+            return cached
+        image = self.images[key]
+        spectrum = self._rfft2(lambda y0, y1: channel_rows(image, channel, y0, y1), *image.shape[:2])
+        if spectrum is not None:
+            self.cache.put((key, channel), spectrum)
+        return spectrum
+    
+    def spectrum_view(self, key, channel, kind='magnitude'):
+        """
+        移到中心的整幅频谱 (H, W) uint8
+        
+        Args:
+            kind (str): magnitude 为 log(1 + |F|) 按最大值缩放，phase 为 [-π, π] 线性映射
+        """
+        spectrum = self.half_spectrum(key, channel)
+        if spectrum is None:
+            return None
+        width = self.images[key].shape[1]
+        if kind == 'phase':
+            convert = self._phase_to_bytes
+        else:
+            peak = self._band_max(spectrum, lambda band: np.log1p(np.abs(band)))
+            scale = 255 / peak if peak > 0 else 0
+            
+            def convert(band):
+                return (np.log1p(np.abs(band)) * scale).astype(np.uint8)
+        
+        return np.fft.fftshift(self._expand(spectrum, width, convert))
+    
+    def difference(self, original, marked, channel='gray', alpha=3.0, seed=None, normalize=False):
+        """
+        频域差分提取水印：Re(F(水印图) - F(原图)) / alpha
+        
+        两幅图尺寸不同时按左上角对齐取重叠部分；channel 为 'rgb' 时三个通道合成彩色结果。
+        
+        Returns:
+            (H, W) 或 (H, W, 3) uint8，被取消时为 None
+        """
+        if channel == 'rgb':
+            with ThreadPoolExecutor(min(self.workers, 3)) as pool:
+                planes = list(pool.map(lambda name: self.difference(original, marked, name, alpha,
+                                                                    seed, normalize),
+                                       ('red', 'green', 'blue')))
+            return None if any(plane is None for plane in planes) else np.stack(planes, axis=2)
+        
+        first, second = self.images[original], self.images[marked]
+        height = min(first.shape[0], second.shape[0])
+        width = min(first.shape[1], second.shape[1])
+        if first.shape[:2] == second.shape[:2]:
+            spectra = [self.cache.get((original, channel)), self.cache.get((marked, channel))]
+        else:
+            spectra = [None, None]
+        if spectra[0] is not None and spectra[1] is not None:
+            spectrum = spectra[1] - spectra[0]
+        else:
+            def rows(y0, y1):
+                return (channel_rows(second[:height, :width], channel, y0, y1) -
+                        channel_rows(first[:height, :width], channel, y0, y1))
+            
+            spectrum = self._rfft2(rows, height, width)
+            if spectrum is None:
+                return None
+        
+        alpha = alpha or 1.0
+        if normalize:
+            peak = self._band_max(spectrum, lambda band: np.abs(band.real))
+            scale = 255 / peak if peak > 0 else 0
+        else:
+            scale = 1 / abs(alpha)
+        
+        def convert(band):
+            return np.minimum(np.abs(band.real) * scale, 255).astype(np.uint8)
+        
+        image = self._expand(spectrum, width, convert)
+        return image if seed is None else unshuffle(image, seed)
+    
+    def block_dct(self, key, channel='gray', block=8, coefficient=(0, 1), bits='sign', compare=(1, 0)):
+        """
+        分块 DCT 系数提取
+        
+        Args:
+            block (int): 块边长，图像右侧 / 下方不足一块的部分忽略
+            coefficient (tuple): 每块取出的系数 (u, v)，u 为垂直频率
+            bits (str): sign 按系数符号取比特，compare 按 c1 > c2 取比特
+            compare (tuple): 比较的第二个系数
+        
+        Returns:
+            dict: image (块行 x 块列 uint8 系数图，绝对值拉伸), values (float32 系数),
+                  bits (比特串，按块行优先), bytes (打包后的字节，高位在前)；被取消时为 None
+        """
+        image = self.images[key]
+        rows, cols = image.shape[0] // block, image.shape[1] // block
+        if not rows or not cols:
+            raise ValueError(f"图像小于一个 {block}x{block} 块")
+        matrix = dct_matrix(block)
+        pairs = [coefficient] + ([compare] if bits == 'compare' else [])
+        values = np.empty((len(pairs), rows, cols), dtype=np.float32)
+        band_rows = max(1, self.BAND_BYTES // (image.shape[1] * block * 4))
+        for r0 in range(0, rows, band_rows):
+            r1 = min(r0 + band_rows, rows)
+            blocks = channel_rows(image[:, :cols * block], channel, r0 * block, r1 * block)
+            blocks = blocks.reshape(r1 - r0, block, cols, block)
+            for index, (u, v) in enumerate(pairs):
+                values[index, r0:r1] = np.einsum('i,aibj,j->ab', matrix[u], blocks, matrix[v])
+            if self.is_cancelled():
+                return None
+            self.report_progress(r1, rows, stage='dct')
+        
+        coefficients = values[0]
+        ones = coefficients > 0 if bits == 'sign' else coefficients > values[1]
+        flat = ones.ravel().astype(np.uint8)
+        peak = float(np.abs(coefficients).max(initial=0))
+        preview = (np.abs(coefficients) * (255 / peak if peak > 0 else 0)).astype(np.uint8)
+        return {'image': preview, 'values': coefficients, 'bits': ''.join('01'[bit] for bit in flat),
+                'bytes': np.packbits(flat[:len(flat) // 8 * 8]).tobytes(), 'blocks': (rows, cols)}
+    
+    def cache_info(self):
+        """(缓存的半谱数, 字节数)"""
+        return self.cache.info()
+    
+    def _rfft2(self, rows_of, height, width):
+        """
+        二维实数 FFT；rows_of(y0, y1) 返回 float32 行带
+        
+        整幅变换的临时数组约为半谱的两倍，不超过 MEMORY_BYTES 时整幅变换，否则行列分离分块变换。
+        """
+        half_width = width // 2 + 1
+        nbytes = height * half_width * 8
+        if nbytes * 2 <= self.MEMORY_BYTES:
+            return np.fft.rfft2(rows_of(0, height))
+        
+        if nbytes > self.MEMORY_BYTES:
+            spectrum = np.memmap(tempfile.TemporaryFile(prefix='spectrum_'), dtype=np.complex64,
+                                 mode='w+', shape=(height, half_width))
+        else:
+            spectrum = np.empty((height, half_width), dtype=np.complex64)
+        band_rows = max(1, self.BAND_BYTES // (half_width * 8))
+        band_cols = max(64, self.BAND_BYTES // (height * 8))
+        row_bands = [(y0, min(y0 + band_rows, height)) for y0 in range(0, height, band_rows)]
+        col_bands = [(x0, min(x0 + band_cols, half_width)) for x0 in range(0, half_width, band_cols)]
+        total = len(row_bands) + len(col_bands)
+        
+        def row_pass(band):
+            if self.is_cancelled():
+                return
+            y0, y1 = band
+            spectrum[y0:y1] = np.fft.rfft(rows_of(y0, y1), axis=1)
+        
+        def column_pass(band):
+            if self.is_cancelled():
+                return
+            x0, x1 = band
+            spectrum[:, x0:x1] = np.fft.fft(spectrum[:, x0:x1], axis=0)
+        
+        # 进度在当前线程中按完成顺序报告，工作线程只做变换
+        with ThreadPoolExecutor(self.workers) as pool:
+            done = 0
+            for _ in pool.map(row_pass, row_bands):
+                done += 1
+                self.report_progress(done, total, stage='fft')
+            for _ in pool.map(column_pass, col_bands):
+                done += 1
+                self.report_progress(done, total, stage='fft')
+        return None if self.is_cancelled() else spectrum
+    
+    def _band_rows(self, spectrum):
+        """按 BAND_BYTES 划分半谱的行带"""
+        step = max(1, self.BAND_BYTES // (spectrum.shape[1] * 8))
+        return [(y0, min(y0 + step, spectrum.shape[0])) for y0 in range(0, spectrum.shape[0], step)]
+    
+    def _band_max(self, spectrum, measure):
+        """按行带求 measure(半谱) 的最大值"""
+        return max(float(measure(spectrum[y0:y1]).max(initial=0)) for y0, y1 in self._band_rows(spectrum))
+    
+    def _expand(self, spectrum, width, convert):
+        """
+        由半谱按共轭对称补全整幅 (H, W) uint8：F[u, v] = conj(F[-u, -v])
+        
+        convert(band) 把复数行带转换为 uint8，按行带调用，不生成整幅浮点数组。
+        """
+        height, half_width = spectrum.shape
+        out = np.empty((height, width), dtype=np.uint8)
+        mirror_rows = -np.arange(height) % height
+        mirror_cols = width - np.arange(half_width, width)
+        for y0, y1 in self._band_rows(spectrum):
+            out[y0:y1, :half_width] = convert(spectrum[y0:y1])
+            if width > half_width:
+                mirrored = spectrum[mirror_rows[y0:y1]][:, mirror_cols]
+                out[y0:y1, half_width:] = convert(np.conj(mirrored))
+        return out
+    
+    @staticmethod
+    def _phase_to_bytes(band):
+        """相位 [-π, π] → 0~255"""
+        return ((np.angle(band) + np.pi) * (255 / (2 * np.pi))).astype(np.uint8)
+    
+    def get_result(self):
+        """获取结果"""
+        return self.result
@@ -4,7 +4,12 @@
 这个处理器展示如何在 core 层实现纯业务逻辑
 """
 
+import codecs
+import mmap
+
 from ..base import BaseCore
+from .ngram_counter import NgramCounter, format_gram
+from .unicode_stego import UnicodeStegoScanner
 
 
 class TextProcessor(BaseCore):
@@ -14,14 +19,22 @@ class TextProcessor(BaseCore):
     功能：
     - 文本转换（大写、小写、首字母大写）
     - 文本统计（字符数、单词数、行数）
-    - 文本分析
+    - 文本分析（单字/双字/三字频率）
+    - 隐写检测（零宽字符、同形字、标签字符、变体选择符）
     """
     
+    # 分析结果中每种 n-gram 列出的条目数
+    TABLE_LIMIT = 20
+    # 流式分析文件时每次读取的字节数
+    FILE_CHUNK_SIZE = 1 << 24
+    
     def __init__(self):
         super().__init__()
         self.input_text = None
         self.result = None
         self.statistics = {}
+        self.frequency = None
+        self.stego = None
     
     def initialize(self):
         """初始化处理器"""
@@ -35,7 +48,8 @@ class TextProcessor(BaseCore):
         Args:
             args[0] (str): 输入文本
             kwargs['options']: 处理选项
-                - mode: 'upper', 'lower', 'title', 'analyze'
+                - mode: 'upper', 'lower', 'title', 'analyze', 'stego'
+                - unit: 频率分析单位，'char'（默认）或 'byte'
         
         Returns:
             bool: 处理是否成功
@@ -60,7 +74,9 @@ class TextProcessor(BaseCore):
             elif mode == 'title':
                 self.result = self.to_title()
             elif mode == 'analyze':
-                self.result = self.analyze_text()
+                self.result = self.analyze_text(options.get('unit', 'char'))
+            elif mode == 'stego':
+                self.result = self.detect_stego()
             else:
                 self.result = self.input_text
             
@@ -79,6 +95,8 @@ class TextProcessor(BaseCore):
         self.input_text = None
         self.result = None
         self.statistics = {}
+        self.frequency = None
+        self.stego = None
         self._initialized = False
         print("🧹 TextProcessor 已清理")
     
@@ -96,14 +114,102 @@ class TextProcessor(BaseCore):
         """首字母大写"""
         return self.input_text.title()
     
-    def analyze_text(self):
-        """分析文本"""
-        analysis = []
-        analysis.append(f"原文: {self.input_text}")
-        analysis.append(f"大写: {self.input_text.upper()}")
-        analysis.append(f"小写: {self.input_text.lower()}")
-        analysis.append(f"首字母大写: {self.input_text.title()}")
-        return "\n".join(analysis)
+    def analyze_text(self, unit='char'):
+        """分析文本：统计单字、双字、三字频率"""
+        self.frequency = NgramCounter(max_n=3, unit=unit)
+        text = self.input_text if unit == 'char' else self.input_text.encode('utf-8')
+        self.frequency.update(text)
+        return self.format_frequency_report()
+    
+    def detect_stego(self):
+        """检测文本中的 Unicode 隐写并尝试解码"""
+        self.stego = UnicodeStegoScanner()
+        self.stego.update(self.input_text)
+        self.stego.decode()
+        return self.stego.format_report()
+    
+    def analyze_file(self, file_path, unit='byte', mode='analyze'):
+        """
+        流式分析文件的 n-gram 频率，mode='stego' 时改为流式隐写检测
+        
+        文件通过 mmap 分块送入计数器，内存占用与文件大小无关。
+        按字符统计时使用增量 UTF-8 解码，多字节字符跨块也能正确处理。
+        每块报告一次进度并检查取消；统计完成后才替换原有结果。
+        
+        Returns:
+            bool: 处理是否成功（被取消时返回 False）
+        """
+        if not self._initialized:
+            self.initialize()
+        
+        try:
+            print(f"📂 分析文件: {file_path}")
+            self.reset_cancel()
+            if mode == 'stego':
+                scanner = UnicodeStegoScanner()
+                unit = 'char'
+                update = scanner.update
+            else:
+                counter = NgramCounter(max_n=3, unit=unit)
+                update = counter.update
+            decoder = codecs.getincrementaldecoder('utf-8')(errors='replace')
+            with open(file_path, 'rb') as f:
+                try:
+                    buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+                except ValueError:
+                    buffer = b""
+                try:
+                    size = len(buffer)
+                    for start in range(0, size, self.FILE_CHUNK_SIZE):
+                        if self.is_cancelled():
+                            print("⏹️ 文件分析已取消")
+                            return False
+                        chunk = buffer[start:start + self.FILE_CHUNK_SIZE]
+                        update(decoder.decode(chunk) if unit == 'char' else chunk)
+                        self.report_progress(min(start + self.FILE_CHUNK_SIZE, size), size)
+                    if unit == 'char':
+                        update(decoder.decode(b"", final=True))
+                finally:
+                    if isinstance(buffer, mmap.mmap):
+                        buffer.close()
+            
+            if mode == 'stego':
+                self.stego = scanner
+            else:
+                self.frequency = counter
+            self.input_text = None
+            self.statistics = {}
+            if mode == 'stego':
+                self.stego.decode()
+                self.result = self.stego.format_report()
+            else:
+                self.result = self.format_frequency_report()
+            print("✨ 处理完成")
+            return True
+        
+        except Exception as e:
+            print(f"❌ 处理失败: {e}")
+            return False
+    
+    def get_frequency_table(self, n, limit=None):
+        """获取 n-gram 频率表 [(gram, count, frequency), ...]"""
+        if not self.frequency:
+            return []
+        return self.frequency.table(n, limit)
+    
+    def format_frequency_report(self):
+        """将频率统计格式化为文本报告"""
+        names = {1: "单字", 2: "双字", 3: "三字"}
+        report = []
+        for n in range(1, self.frequency.max_n + 1):
+            report.append(
+                f"【{names.get(n, f'{n}-gram')}频率】 总数: {self.frequency.totals[n - 1]}  "
+                f"种类: {self.frequency.distinct(n)}"
+            )
+            for rank, (gram, count, freq) in enumerate(self.get_frequency_table(n, self.TABLE_LIMIT), 1):
+                report.append(f"{rank:>4}. {format_gram(gram):<16} {count:>12}  {freq:8.4%}")
+            report.append("")
+        return "\n".join(report)
     
     def calculate_statistics(self):
         """计算统计信息"""
@@ -0,0 +1,217 @@
+"""
+分块图像存储 - 解码到内存映射的原始像素文件，按块读写
+
+超过内存的大图（扫描件、拼接地图）不能整幅解码为数组。TiledImage 把像素
+保存在临时目录下的原始文件中并用 np.memmap 访问，处理器按块读取（邻域
+滤波附带 halo）、按块写回结果，常驻内存只与块大小和并发数有关。
+
+像素布局与 ImageProcessor 一致：灰度为 (H, W)，彩色为 (H, W, 4) RGBA。
+"""
+
+import os
+import tempfile
+import weakref
+
+import numpy as np
+
+from .png_codec import PngStreamReader, write_png
+
+
+def _remove_file(path):
+    """删除临时像素文件（存储被回收时调用）"""
+    try:
+        os.remove(path)
+    except OSError:
+        pass
+
+
+class TiledImage:
+    """
+    内存映射的分块图像
+    
+    示例:
+        store = TiledImage.from_png("huge.png")
+        for y0, y1, x0, x1 in store.tiles():
+            block = store.read_block(y0, y1, x0, x1, halo=2)
+        store.save_png("out.png")
+        store.close()
+    """
+    
+    # 默认块边长（像素）
+    TILE_SIZE = 1024
+    # 解码 / 编码时每个行带的字节数
+    STRIP_BYTES = 1 << 24
+    
+    def __init__(self, pixels, path=None):
+        """
+        Args:
+            pixels (np.ndarray): 像素数组（通常为 np.memmap）
+            path (str): 临时像素文件路径，不为 None 时关闭存储会删除该文件
+        """
+        self.pixels = pixels
+        self.path = path
+        self._finalizer = weakref.finalize(self, _remove_file, path) if path else None
+    
+    @classmethod
+    def create(cls, height, width, channels=4, directory=None):
+        """在临时目录中创建空白存储"""
+        fd, path = tempfile.mkstemp(suffix='.raw', prefix='tiled_', dir=directory)
+        os.close(fd)
+        shape = (height, width) if channels == 1 else (height, width, channels)
+        return cls(np.memmap(path, dtype=np.uint8, mode='w+', shape=shape), path)
+    
+    @classmethod
+    def from_array(cls, array, directory=None):
+        """把内存中的数组复制到新存储"""
+        channels = 1 if array.ndim == 2 else array.shape[2]
+        store = cls.create(array.shape[0], array.shape[1], channels, directory)
+        for y0, y1 in store.strips():
+            store.pixels[y0:y1] = array[y0:y1]
+        return store
+    
+    @classmethod
+    def from_png(cls, file_path, directory=None):
+        """流式解码 PNG 到新存储，不会一次性解码整幅图像"""
+        with PngStreamReader(file_path) as reader:
+            store = cls.create(reader.height, reader.width, reader.channels, directory)
+            try:
+                for y0, rows in reader.iter_strips(store.strip_rows()):
+                    store.pixels[y0:y0 + rows.shape[0]] = rows
+            except Exception:
+                store.close()
+                raise
+        return store
+    
+    @classmethod
+    def from_netpbm(cls, file_path, directory=None):
+        """
+        打开二进制 PGM (P5) / PPM (P6)
+        
+        P5 直接映射原文件（不复制）；P6 按行带转换为 RGBA 存储
+        """
+        with open(file_path, 'rb') as f:
+            header = f.read(512)
+        fields, offset = [], 0
+        while len(fields) < 4:
+            while offset < len(header) and header[offset:offset + 1].isspace():
+                offset += 1
+            if header[offset:offset + 1] == b'#':
+                offset = header.index(b'\n', offset)
+                continue
+            end = offset
+            while end < len(header) and not header[end:end + 1].isspace():
+                end += 1
+            fields.append(header[offset:end])
+            offset = end
+        magic, width, height, maxval = fields[0], int(fields[1]), int(fields[2]), int(fields[3])
+        offset += 1
+        if magic not in (b'P5', b'P6') or maxval > 255:
+            raise ValueError("只支持 8 位二进制 PGM (P5) / PPM (P6)")
+        
+        if magic == b'P5':
+            return cls(np.memmap(file_path, dtype=np.uint8, mode='r', offset=offset, shape=(height, width)))
+        source = np.memmap(file_path, dtype=np.uint8, mode='r', offset=offset, shape=(height, width, 3))
+        store = cls.create(height, width, 4, directory)
+        for y0, y1 in store.strips():
+            store.pixels[y0:y1, :, :3] = source[y0:y1]
+            store.pixels[y0:y1, :, 3] = 255
+        del source
+        return store
+    
+    # ==================== 属性 ====================
+    
+    @property
+    def shape(self):
+        return self.pixels.shape
+    
+    @property
+    def height(self):
+        return self.pixels.shape[0]
+    
+    @property
+    def width(self):
+        return self.pixels.shape[1]
+    
+    @property
+    def channels(self):
+        return 1 if self.pixels.ndim == 2 else self.pixels.shape[2]
+    
+    @property
+    def nbytes(self):
+        return self.pixels.nbytes
+    
+    def like(self, height=None, width=None, channels=None):
+        """在同一目录中创建同类型的空白存储（用作处理结果）"""
+        directory = os.path.dirname(self.path) if self.path else None
+        return TiledImage.create(height or self.height, width or self.width,
+                                 channels or self.channels, directory)
+    
+    # ==================== 分块访问 ====================
+    
+    def strip_rows(self):
+        """每个行带约 STRIP_BYTES 字节时的行数"""
+        row_bytes = max(self.width * self.channels, 1)
+        return max(self.STRIP_BYTES // row_bytes, 1)
+    
+    def strips(self):
+        """按行带产生 (y0, y1)"""
+        rows = self.strip_rows()
+        for y0 in range(0, self.height, rows):
+            yield y0, min(y0 + rows, self.height)
+    
+    def tiles(self, tile_size=None):
+        """按块产生 (y0, y1, x0, x1)，行优先"""
+        size = tile_size or self.TILE_SIZE
+        for y0 in range(0, self.height, size):
+            for x0 in range(0, self.width, size):
+                yield y0, min(y0 + size, self.height), x0, min(x0 + size, self.width)
+    
+    def read_block(self, y0, y1, x0, x1, halo=0):
+        """
+        读取 [y0, y1) x [x0, x1) 并在四周各扩展 halo 像素
+        
+        图像内的 halo 读取真实像素，超出边界的部分复制边缘像素，
+        结果与整幅图边缘复制填充后再切片完全相同
+        """
+        top, bottom = max(y0 - halo, 0), min(y1 + halo, self.height)
+        left, right = max(x0 - halo, 0), min(x1 + halo, self.width)
+        block = np.array(self.pixels[top:bottom, left:right])
+        if not halo:
+            return block
+        pad = ((halo - (y0 - top), halo - (bottom - y1)),
+               (halo - (x0 - left), halo - (right - x1))) + ((0, 0),) * (block.ndim - 2)
+        return np.pad(block, pad, mode='edge')
+    
+    def write_block(self, y0, x0, block):
+        """把块写回存储"""
+        self.pixels[y0:y0 + block.shape[0], x0:x0 + block.shape[1]] = block
+    
+    def thumbnail(self, max_width, max_height):
+        """
+        等间隔采样的缩略图（只读取被采样的行，不加载整幅图像）
+        
+        Returns:
+            np.ndarray: 连续内存的小图
+        """
+        step = max(-(-self.width // max_width), -(-self.height // max_height), 1)
+        rows = range(0, self.height, step)
+        out = np.empty((len(rows), -(-self.width // step)) + self.pixels.shape[2:], dtype=np.uint8)
+        for index, y in enumerate(rows):
+            out[index] = self.pixels[y, ::step]
+        return out
+    
+    def save_png(self, file_path, level=6):
+        """按行带流式写出 PNG"""
+        write_png(file_path, self.width, self.height, self.channels,
+                  (self.pixels[y0:y1] for y0, y1 in self.strips()), level)
+    
+    def flush(self):
+        """把修改写回磁盘"""
+        if isinstance(self.pixels, np.memmap) and self.pixels.mode != 'r':
+            self.pixels.flush()
+    
+    def close(self):
+        """释放映射并删除临时文件"""
+        self.pixels = np.zeros((0, 0) + self.pixels.shape[2:], dtype=np.uint8)
+        if self._finalizer:
+            self._finalizer()
@@ -0,0 +1,354 @@
+"""
+Unicode 文本隐写检测 - 零宽字符 / 同形字 / 标签字符 / 变体选择符
+
+扫描时把文本按块编码为 UTF-32 码位数组，用覆盖全部 Unicode 码位的查找表
+（相当于 str.translate 的向量化版本）一次得到每个字符的类别，只有可疑字符的
+位置被保留下来，因此扫描速度与普通文本的长度基本成线性、接近内存带宽。
+
+扫描结束后从收集到的隐藏符号流中尝试常见编码方式：
+- 零宽字符：2 种字符按二进制、4 种字符按四进制（全部符号分配一次性矩阵解码），
+  3 种字符时其中一种作为分隔符
+- 标签字符 U+E0020-E007F 直接对应 ASCII
+- 变体选择符 U+FE00-FE0F / U+E0100-E01EF 对应字节 0-255
+- 同形字：拉丁字母位置为 0，被替换为西里尔/希腊同形字的位置为 1
+"""
+
+from itertools import permutations
+
+import numpy as np
+
+
+# 字符类别，CARRIER（可被同形字替换的拉丁字母）之后的类别均视为可疑
+NORMAL = 0
+CARRIER = 1
+ZERO_WIDTH = 2
+BIDI = 3
+TAG = 4
+VARIATION = 5
+HOMOGLYPH = 6
+PRIVATE = 7
+SPACE = 8
+
+CATEGORY_NAMES = {
+    ZERO_WIDTH: "零宽字符",
+    BIDI: "双向控制符",
+    TAG: "标签字符",
+    VARIATION: "变体选择符",
+    HOMOGLYPH: "同形字",
+    PRIVATE: "私用区",
+    SPACE: "特殊空白",
+}
+
+# 零宽隐写常用的字符（包括 330k 工具使用的 U+202C 与不可见数学运算符 U+2061-U+2064）；
+# 归为零宽类别的码位必须都在这里，符号表才能把每个字符映射到序号
+ZERO_WIDTH_ALPHABET = [0x200B, 0x200C, 0x200D, 0x200E, 0x200F, 0x202C, 0x2060, 0xFEFF, 0x180E,
+                       0x2061, 0x2062, 0x2063, 0x2064]
+
+# 西里尔 / 希腊同形字 -> 对应的拉丁字母
+HOMOGLYPHS = {
+    0x0430: 'a', 0x0441: 'c', 0x0435: 'e', 0x043E: 'o', 0x0440: 'p', 0x0445: 'x',
+    0x0443: 'y', 0x0456: 'i', 0x0458: 'j', 0x0455: 's', 0x0501: 'd', 0x04BB: 'h',
+    0x0410: 'A', 0x0412: 'B', 0x0421: 'C', 0x0415: 'E', 0x041D: 'H', 0x0406: 'I',
+    0x0408: 'J', 0x041A: 'K', 0x041C: 'M', 0x041E: 'O', 0x0420: 'P', 0x0405: 'S',
+    0x0422: 'T', 0x0425: 'X', 0x04AE: 'Y',
+    0x0391: 'A', 0x0392: 'B', 0x0395: 'E', 0x0396: 'Z', 0x0397: 'H', 0x0399: 'I',
+    0x039A: 'K', 0x039C: 'M', 0x039D: 'N', 0x039F: 'O', 0x03A1: 'P', 0x03A4: 'T',
+    0x03A5: 'Y', 0x03A7: 'X', 0x03BF: 'o', 0x03BD: 'v',
+}
+
+
+def _build_tables():
+    """构建码位 -> 类别、码位 -> 零宽符号序号两张查找表"""
+    category = np.zeros(0x110000, dtype=np.uint8)
+    category[[ord(c) for c in set(HOMOGLYPHS.values())]] = CARRIER
+    category[list(HOMOGLYPHS)] = HOMOGLYPH
+    category[0xE000:0xF900] = PRIVATE
+    category[0xF0000:0x110000] = PRIVATE
+    category[[0x00A0, 0x202F, 0x205F, 0x3000]] = SPACE
+    category[0x2000:0x200B] = SPACE
+    category[0x202A:0x202F] = BIDI
+    category[0x2066:0x206A] = BIDI
+    category[0xFE00:0xFE10] = VARIATION
+    category[0xE0100:0xE01F0] = VARIATION
+    category[0xE0000:0xE0080] = TAG
+    category[ZERO_WIDTH_ALPHABET] = ZERO_WIDTH
+    
+    symbol = np.full(0x110000, 255, dtype=np.uint8)
+    symbol[ZERO_WIDTH_ALPHABET] = np.arange(len(ZERO_WIDTH_ALPHABET))
+    return category, symbol
+
+
+CATEGORY_TABLE, SYMBOL_TABLE = _build_tables()
+
+# ASCII 载体字母，纯 ASCII 文本用 bytes.translate 删除后按长度差计数
+_CARRIER_BYTES = "".join(sorted(set(HOMOGLYPHS.values()))).encode('ascii')
+
+# 可打印字节（用于给候选解码结果打分），>= 0x80 视为 UTF-8 多字节的一部分
+_PRINTABLE = np.zeros(256, dtype=np.float32)
+_PRINTABLE[0x20:0x7F] = 1.0
+_PRINTABLE[[0x09, 0x0A, 0x0D]] = 1.0
+_PRINTABLE[0x80:] = 0.5
+
+
+def _score(data):
+    """候选结果的可读性评分 (0-1)"""
+    if not len(data):
+        return 0.0
+    return float(_PRINTABLE[np.frombuffer(data, dtype=np.uint8)].mean())
+
+
+def _pack_digits(digits, base):
+    """
+    将数字矩阵按高位在前打包为字节
+    
+    Args:
+        digits (ndarray): (候选数, 符号数) 的数字矩阵，base 为 2 或 4
+    
+    Returns:
+        ndarray: (候选数, 字节数) uint8
+    """
+    per_byte = 8 if base == 2 else 4
+    count = digits.shape[1] // per_byte * per_byte
+    grouped = digits[:, :count].reshape(digits.shape[0], -1, per_byte).astype(np.uint16)
+    weights = base ** np.arange(per_byte - 1, -1, -1, dtype=np.uint16)
+    return (grouped @ weights).astype(np.uint8)
+
+
+class UnicodeStegoScanner:
+    """
+    Unicode 隐写扫描器，可分块增量更新
+    
+    示例:
+        scanner = UnicodeStegoScanner()
+        for chunk in chunks:
+            scanner.update(chunk)
+        scanner.decode()
+        print(scanner.format_report())
+    """
+    
+    # 单次编码为 UTF-32 的字符数，限制临时数组的内存
+    BLOCK_SIZE = 1 << 22
+    # 每类隐藏符号最多保留的数量
+    MAX_SYMBOLS = 1 << 20
+    # 报告中列出的候选数
+    MAX_CANDIDATES = 5
+    
+    def __init__(self):
+        self.reset()
+    
+    def reset(self):
+        """清空扫描结果"""
+        self.length = 0
+        self.counts = np.zeros(SPACE + 1, dtype=np.int64)
+        self.first_offset = {}
+        self.codepoints = {}
+        self._zero_width = []
+        self._tags = []
+        self._variations = []
+        self._homoglyph_bits = []
+        self._carriers = 0
+        self.candidates = []
+    
+    def update(self, text):
+        """追加一个文本块"""
+        if text.isascii():
+            # 纯 ASCII 文本不可能含可疑码位，只需统计载体字母数
+            data = text.encode('ascii')
+            carriers = len(data) - len(data.translate(None, _CARRIER_BYTES))
+            self.length += len(data)
+            self._carriers += carriers
+            self.counts[CARRIER] += carriers
+            return
+        for start in range(0, len(text), self.BLOCK_SIZE):
+            self._scan_block(text[start:start + self.BLOCK_SIZE])
+    
+    def _scan_block(self, text):
+        """
+        扫描一个文本块，只保留可疑字符
+        
+        普通文本只经过一次查表和两次比较计数，不产生与文本等长的位置数组
+        """
+        try:
+            data = text.encode('utf-32-le')
+        except UnicodeEncodeError:
+            data = text.encode('utf-32-le', errors='surrogatepass')
+        codes = np.frombuffer(data, dtype='<u4')
+        categories = CATEGORY_TABLE[codes]
+        offset = self.length
+        carriers_before = self._carriers
+        self.length += codes.size
+        carrier_mask = categories == CARRIER
+        self._carriers += int(np.count_nonzero(carrier_mask))
+        self.counts[CARRIER] += self._carriers - carriers_before
+        
+        positions = np.flatnonzero(categories > CARRIER)
+        if positions.size == 0:
+            return
+        found = categories[positions]
+        cps = codes[positions]
+        self.counts += np.bincount(found, minlength=self.counts.size)
+        
+        for category in np.unique(found):
+            mask = found == category
+            self.first_offset.setdefault(int(category), offset + int(positions[mask][0]))
+            values, numbers = np.unique(cps[mask], return_counts=True)
+            table = self.codepoints.setdefault(int(category), {})
+            for value, number in zip(values.tolist(), numbers.tolist()):
+                table[value] = table.get(value, 0) + number
+        
+        self._collect(self._zero_width, SYMBOL_TABLE[cps[found == ZERO_WIDTH]])
+        self._collect(self._tags, cps[found == TAG])
+        self._collect(self._variations, cps[found == VARIATION])
+        
+        # 同形字流只记录每个同形字在“载体字母序列”（拉丁字母与同形字）中的序号
+        homoglyphs = positions[found == HOMOGLYPH]
+        if homoglyphs.size:
+            preceding = np.searchsorted(np.flatnonzero(carrier_mask), homoglyphs)
+            indices = carriers_before + preceding + np.arange(homoglyphs.size)
+            self._collect(self._homoglyph_bits, indices)
+            self._carriers += homoglyphs.size
+    
+    def _collect(self, store, values):
+        """保存符号，总数不超过 MAX_SYMBOLS"""
+        room = self.MAX_SYMBOLS - sum(map(len, store))
+        if values.size and room > 0:
+            store.append(values[:room])
+    
+    def count(self, category):
+        """某一类字符的数量"""
+        return int(self.counts[category])
+    
+    # ==================== 解码 ====================
+    
+    def decode(self):
+        """
+        对收集到的各个符号流尝试全部编码方式
+        
+        Returns:
+            list: 候选 [{'scheme', 'data', 'text', 'score'}]，按评分降序
+        """
+        candidates = []
+        candidates += self.decode_zero_width()
+        candidates += self.decode_tags()
+        candidates += self.decode_variations()
+        candidates += self.decode_homoglyphs()
+        candidates = [c for c in candidates if c['data']]
+        for candidate in candidates:
+            candidate['text'] = candidate['data'].decode('utf-8', errors='replace')
+            candidate['score'] = _score(candidate['data'])
+        candidates.sort(key=lambda c: c['score'], reverse=True)
+        self.candidates = candidates
+        return candidates
+    
+    def decode_zero_width(self):
+        """零宽字符流：所有符号分配方式组成矩阵一次解码"""
+        if not self._zero_width:
+            return []
+        stream = np.concatenate(self._zero_width)
+        present = np.unique(stream)
+        names = "/".join(f"U+{ZERO_WIDTH_ALPHABET[s]:04X}" for s in present)
+        digits = np.searchsorted(present, stream).astype(np.uint8)
+        k = present.size
+        
+        candidates = []
+        if k in (2, 4):
+            orders = np.array(list(permutations(range(k))), dtype=np.uint8)
+            decoded = _pack_digits(orders[:, digits], k)
+            for order, row in zip(orders, decoded):
+                mapping = ",".join(str(d) for d in order)
+                candidates.append({
+                    'scheme': f"零宽 {k} 进制 [{names} → {mapping}]",
+                    'data': row.tobytes(),
+                })
+        if k == 3:
+            for separator in range(3):
+                data_symbols = [s for s in range(3) if s != separator]
+                for one in data_symbols:
+                    text = self._decode_separated(digits, separator, one)
+                    candidates.append({
+                        'scheme': f"零宽分隔 [分隔符 U+{ZERO_WIDTH_ALPHABET[present[separator]]:04X}, "
+                                  f"1 = U+{ZERO_WIDTH_ALPHABET[present[one]]:04X}]",
+                        'data': text.encode('utf-8'),
+                    })
+        return candidates
+    
+    def _decode_separated(self, digits, separator, one):
+        """分隔符模式：两个分隔符之间的二进制串为一个字符的码位"""
+        is_separator = digits == separator
+        keep = ~is_separator
+        segment = np.cumsum(is_separator)[keep]
+        if segment.size == 0:
+            return ""
+        bits = (digits[keep] == one).astype(np.float64)
+        # 每个符号在所属段内距段尾的位数
+        lengths = np.bincount(segment)
+        rank = np.arange(segment.size) - np.searchsorted(segment, segment)
+        exponent = lengths[segment] - rank - 1
+        values = np.bincount(segment, weights=bits * np.exp2(np.minimum(exponent, 30)))
+        values = values[lengths > 0]
+        valid = (values > 0) & (values <= 0x10FFFF) & (lengths[lengths > 0] <= 21)
+        return "".join(map(chr, values[valid].astype(np.int64).tolist()))
+    
+    def decode_tags(self):
+        """标签字符：U+E0020-E007F 对应 ASCII"""
+        if not self._tags:
+            return []
+        values = np.concatenate(self._tags) - 0xE0000
+        values = values[(values >= 0x20) & (values < 0x7F)]
+        return [{'scheme': "标签字符 (U+E00xx → ASCII)", 'data': values.astype(np.uint8).tobytes()}]
+    
+    def decode_variations(self):
+        """变体选择符：U+FE00-FE0F → 0-15，U+E0100-E01EF → 16-255"""
+        if not self._variations:
+            return []
+        values = np.concatenate(self._variations).astype(np.int64)
+        values = np.where(values < 0xE0100, values - 0xFE00, values - 0xE0100 + 16)
+        return [{'scheme': "变体选择符 (VS → 字节)", 'data': values.astype(np.uint8).tobytes()}]
+    
+    def decode_homoglyphs(self):
+        """
+        同形字：按载体字母顺序，拉丁字母为 0、同形字为 1
+        
+        同形字多于拉丁字母时（正常的西里尔/希腊文本）不解码
+        """
+        homoglyphs = self.count(HOMOGLYPH)
+        if not homoglyphs or homoglyphs * 2 > self._carriers:
+            return []
+        indices = np.concatenate(self._homoglyph_bits)
+        length = min(self._carriers, int(indices[-1]) + 8 - int(indices[-1]) % 8)
+        bits = np.zeros(length, dtype=np.uint8)
+        bits[indices[indices < length]] = 1
+        data = np.packbits(bits).tobytes()
+        return [
+            {'scheme': "同形字 (替换 = 1)", 'data': data},
+            {'scheme': "同形字 (替换 = 0)", 'data': bytes(b ^ 0xFF for b in data)},
+        ]
+    
+    # ==================== 报告 ====================
+    
+    def format_report(self):
+        """将扫描与解码结果格式化为文本报告"""
+        report = [f"【隐写扫描】 共 {self.length} 个字符"]
+        flagged = False
+        for category, name in CATEGORY_NAMES.items():
+            count = self.count(category)
+            if not count:
+                continue
+            flagged = True
+            codepoints = sorted(self.codepoints.get(category, {}).items(), key=lambda item: -item[1])
+            detail = ", ".join(f"U+{cp:04X}×{n}" for cp, n in codepoints[:8])
+            if len(codepoints) > 8:
+                detail += ", ..."
+            report.append(f"  ⚠️ {name}: {count} 个 (首次出现于 {self.first_offset[category]}) {detail}")
+        if not flagged:
+            report.append("  ✅ 未发现可疑码位")
+        
+        if self.candidates:
+            report.append("")
+            report.append("【候选解码】")
+            for rank, candidate in enumerate(self.candidates[:self.MAX_CANDIDATES], 1):
+                text = candidate['text']
+                preview = text[:200] + ("..." if len(text) > 200 else "")
+                report.append(f"{rank:>4}. [{candidate['score']:.0%}] {candidate['scheme']}")
+                report.append(f"      {preview!r}")
+        return "\n".join(report)
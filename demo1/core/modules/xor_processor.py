@@ -0,0 +1,340 @@
+"""
+XOR 分析处理器 - 重复密钥 XOR 的密钥恢复
+
+作用于 DataProcessor 加载的字节缓冲区（mmap / bytes），全部计算均为 NumPy 向量化：
+- 密钥长度估计：归一化汉明距离或重合指数，所有候选长度一次算出
+- 逐字节求解：256 个候选值通过一次广播矩阵乘法同时打分
+- 已知明文：用 crib（如 flag{、PK\\x03\\x04）在所有偏移处按候选密钥长度推导密钥字节，
+  与统计求解的其余字节组合后按整体似然打分
+"""
+
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+from ..base import BaseCore
+
+
+# 每个字节值的置位数
+_POPCOUNT = np.unpackbits(np.arange(256, dtype=np.uint8)[:, None], axis=1).sum(1).astype(np.uint8)
+
+# _XOR_TABLE[key, c] = c ^ key，即密文字节 c 在候选密钥 key 下的明文
+_XOR_TABLE = np.bitwise_xor.outer(np.arange(256, dtype=np.uint8), np.arange(256, dtype=np.uint8))
+
+
+def _build_text_weights():
+    """英文文本的字节对数频率表"""
+    freq = {
+        'e': 12.7, 't': 9.1, 'a': 8.2, 'o': 7.5, 'i': 7.0, 'n': 6.7, 's': 6.3,
+        'h': 6.1, 'r': 6.0, 'd': 4.3, 'l': 4.0, 'c': 2.8, 'u': 2.8, 'm': 2.4,
+        'w': 2.4, 'f': 2.2, 'g': 2.0, 'y': 2.0, 'p': 1.9, 'b': 1.5, 'v': 1.0,
+        'k': 0.8, 'j': 0.15, 'x': 0.15, 'q': 0.1, 'z': 0.07,
+    }
+    prob = np.full(256, 1e-6)
+    prob[0x20:0x7f] = 0.05               # 其他可打印字符
+    prob[[0x09, 0x0a, 0x0d]] = 0.3       # 制表/换行
+    prob[0x30:0x3a] = 0.2                # 数字
+    for ch, p in freq.items():
+        prob[ord(ch)] = p
+        prob[ord(ch.upper())] = p * 0.1
+    prob[0x20] = 15.0                    # 空格
+    prob /= prob.sum()
+    return np.log(prob)
+
+
+def _build_binary_weights():
+    """二进制数据的字节对数频率表（0x00 与 0xFF 占主导）"""
+    prob = np.full(256, 0.5)
+    prob[0x00] = 60.0
+    prob[0xff] = 6.0
+    prob[0x20:0x7f] = 1.0
+    prob /= prob.sum()
+    return np.log(prob)
+
+
+SCORING_WEIGHTS = {
+    'text': _build_text_weights(),
+    'binary': _build_binary_weights(),
+}
+
+
+class XorProcessor(BaseCore):
+    """
+    重复密钥 XOR 分析处理器
+    
+    功能：
+    - 估计密钥长度（hamming / ic）
+    - 统计法逐字节求解密钥
+    - 已知明文 (crib) 恢复密钥
+    - 用恢复出的密钥解密整个缓冲区
+    """
+    
+    # 密钥长度估计使用的采样字节数
+    SAMPLE_SIZE = 1 << 18
+    # 已知明文搜索每批处理的偏移数
+    CRIB_CHUNK = 1 << 20
+    # 已知明文恢复保留的最高分候选密钥数
+    CRIB_TOP = 32
+    # 自动估计长度时，已知明文恢复尝试的候选长度数
+    CRIB_LENGTHS = 4
+    # 选择密钥长度时允许与最优得分的相对差距（相对于中位数），避免选中真实长度的倍数
+    LENGTH_TOLERANCE = 0.25
+    
+    def __init__(self):
+        super().__init__()
+        self.buffer = None
+        self.result = None
+    
+    def initialize(self):
+        """初始化处理器"""
+        self._initialized = True
+        print("✅ XorProcessor 已初始化")
+    
+    def process(self, *args, **kwargs):
+        """
+        分析 XOR 加密的缓冲区
+        
+        Args:
+            args[0]: 字节缓冲区（bytes / mmap / memoryview）
+            kwargs['options']: 处理选项
+                - max_key_length (int): 候选密钥最大长度，默认 32
+                - method (str): 'hamming' 或 'ic'
+                - key_length (int): 指定密钥长度，0 表示自动估计
+                - scoring (str): 'text' 或 'binary'
+                - crib (bytes): 已知明文片段，可选
+        
+        Returns:
+            bool: 处理是否成功
+        """
+        if not self._initialized:
+            self.initialize()
+        
+        try:
+            self.buffer = args[0] if args else b""
+            options = kwargs.get('options', {})
+            data = np.frombuffer(self.buffer, dtype=np.uint8)
+            if data.size < 2:
+                print("❌ 数据过短，无法分析")
+                return False
+            
+            max_len = options.get('max_key_length', 32)
+            method = options.get('method', 'hamming')
+            scoring = options.get('scoring', 'text')
+            crib = options.get('crib', b"")
+            
+            print(f"🔐 XOR 分析: {data.size} 字节, 方法: {method}")
+            
+            lengths = self.estimate_key_length(data, max_len, method)
+            key_length = options.get('key_length') or lengths[0][0]
+            key, confidence = self.solve_key(data, key_length, scoring)
+            
+            # 选中的可能是真实长度的倍数，求得的密钥会自我重复
+            period = self._minimal_period(key)
+            if period < len(key):
+                key_length, key, confidence = period, key[:period], confidence[:period]
+            
+            if options.get('key_length'):
+                crib_lengths = [options['key_length']]
+            else:
+                crib_lengths = [key_length] + [length for length, _ in lengths[:self.CRIB_LENGTHS]]
+            
+            self.result = {
+                'key_lengths': lengths,
+                'key_length': key_length,
+                'key': key,
+                'confidence': confidence,
+                'crib_keys': self.recover_from_crib(data, crib, crib_lengths, scoring) if crib else [],
+            }
+            print(f"✨ 分析完成, 密钥: {key.hex()}")
+            return True
+        
+        except Exception as e:
+            print(f"❌ 处理失败: {e}")
+            return False
+    
+    def cleanup(self):
+        """清理资源"""
+        self.buffer = None
+        self.result = None
+        self._initialized = False
+        print("🧹 XorProcessor 已清理")
+    
+    # ==================== 业务逻辑方法 ====================
+    
+    def estimate_key_length(self, data, max_len=32, method='hamming'):
+        """
+        估计密钥长度
+        
+        对采样数据构造 (n, max_len + 1) 的滑动窗口视图，一次性得到
+        data[i] ^ data[i + k] 对所有 k 的结果：
+        - hamming: 平均置位数 / 8，越小越可能
+        - ic: 相等字节的比例，越大越可能
+        
+        Returns:
+            list: [(key_length, score), ...]，按可能性从高到低排列，
+                  score 统一为越大越好
+        """
+        sample = data[:self.SAMPLE_SIZE]
+        max_len = max(1, min(max_len, sample.size // 2))
+        windows = sliding_window_view(sample, max_len + 1)
+        diff = windows[:, 1:] ^ windows[:, :1]
+        
+        if method == 'ic':
+            scores = (diff == 0).mean(axis=0)
+        else:
+            scores = -_POPCOUNT[diff].mean(axis=0) / 8.0
+        
+        # 真实长度的倍数得分相近，取容差范围内最短的长度放在首位
+        best = scores.max()
+        spread = best - np.median(scores)
+        preferred = int(np.flatnonzero(scores >= best - self.LENGTH_TOLERANCE * spread)[0])
+        order = [preferred] + [k for k in np.argsort(-scores, kind='stable') if k != preferred]
+        return [(int(k) + 1, float(scores[k])) for k in order]
+    
+    def solve_key(self, data, key_length, scoring='text'):
+        """
+        按列统计字节直方图并求解每个密钥字节
+        
+        counts 为 (key_length, 256) 的列直方图，与 weights[c ^ key] 构成的
+        (256, 256) 表做一次矩阵乘法即得到所有列、所有候选值的得分。
+        
+        Returns:
+            tuple: (key bytes, 每个密钥字节的平均对数似然)
+        """
+        scores = self.column_scores(data, key_length, scoring)
+        key = scores.argmax(axis=1).astype(np.uint8)
+        column_sizes = np.maximum((data.size - np.arange(key_length) + key_length - 1) // key_length, 1)
+        confidence = scores.max(axis=1) / column_sizes
+        return key.tobytes(), confidence.tolist()
+    
+    def column_scores(self, data, key_length, scoring='text'):
+        """
+        每列每个候选密钥字节的对数似然
+        
+        Returns:
+            np.ndarray: (key_length, 256)，scores[c, k] 为位置模 key_length 等于 c
+            的全部字节用 k 解密后的对数似然之和
+        """
+        weights = SCORING_WEIGHTS.get(scoring, SCORING_WEIGHTS['text'])
+        offsets = np.arange(key_length, dtype=np.intp) * 256
+        full = data.size - data.size % key_length
+        counts = np.bincount(
+            (data[:full].reshape(-1, key_length) + offsets).ravel(),
+            minlength=key_length * 256,
+        )
+        tail = data[full:]
+        counts += np.bincount(tail + offsets[:tail.size], minlength=key_length * 256)
+        counts = counts.reshape(key_length, 256).astype(np.float64)
+        return counts @ weights[_XOR_TABLE].T
+    
+    def recover_from_crib(self, data, crib, key_lengths, scoring='text'):
+        """
+        已知明文恢复密钥
+        
+        对每个候选长度 L，假设 crib 位于偏移 i，则 data[i+t] ^ crib[t] 就是第
+        (i+t) % L 个密钥字节。crib 比 L 长时先要求推导出的密钥流以 L 为周期
+        （(data[i+t] ^ data[i+t+L]) 等于 crib[t] ^ crib[t+L]）；其余未覆盖的
+        密钥字节取统计求解的结果。候选密钥的得分是整个缓冲区解密后的平均
+        对数似然，可由列得分表 column_scores 对所有偏移一次向量化算出，
+        最终保留得分最高的 CRIB_TOP 个，而不是最先出现的若干个。
+        
+        Args:
+            data (np.ndarray): uint8 缓冲区
+            crib (bytes): 已知明文
+            key_lengths (list): 候选密钥长度（指定的或估计的）
+            scoring (str): 'text' 或 'binary'
+        
+        Returns:
+            list: [{'offset', 'key', 'score'}, ...]，按得分从高到低排列
+        """
+        crib = np.frombuffer(bytes(crib), dtype=np.uint8)
+        m = crib.size
+        if m < 1 or data.size < m:
+            return []
+        
+        candidates = {}
+        for length in dict.fromkeys(key_lengths):
+            if self.is_cancelled():
+                break
+            scores = self.column_scores(data, length, scoring)
+            best = scores.argmax(axis=1)
+            base = scores.max(axis=1)
+            flat = scores.ravel()
+            covered = min(m, length)
+            expected = crib[:m - length] ^ crib[length:] if m > length else None
+            
+            for start in range(0, data.size - m + 1, self.CRIB_CHUNK):
+                block = data[start:start + self.CRIB_CHUNK + m - 1]
+                offsets = np.arange(block.size - m + 1)
+                if expected is not None:
+                    pairs = block[:-length] ^ block[length:]
+                    for t in range(expected.size):
+                        offsets = offsets[pairs[offsets + t] == expected[t]]
+                if not offsets.size:
+                    continue
+                
+                # 用 crib 推导的密钥字节替换统计结果后，总得分的增量
+                gain = np.zeros(offsets.size)
+                for t in range(covered):
+                    column = (start + offsets + t) % length
+                    gain += flat[column * 256 + (block[offsets + t] ^ crib[t])] - base[column]
+                
+                top = offsets
+                if offsets.size > self.CRIB_TOP:
+                    top = offsets[np.argpartition(-gain, self.CRIB_TOP)[:self.CRIB_TOP]]
+                for idx in top.tolist():
+                    offset = start + idx
+                    key = best.astype(np.uint8)
+                    positions = (offset + np.arange(covered)) % length
+                    key[positions] = block[idx:idx + covered] ^ crib[:covered]
+                    score = float(scores[np.arange(length), key].sum()) / data.size
+                    key = key.tobytes()
+                    key = key[:self._minimal_period(key)]
+                    if key not in candidates or candidates[key]['score'] < score:
+                        candidates[key] = {'offset': offset, 'key': key, 'score': score}
+            
+            if len(candidates) > self.CRIB_TOP:
+                ranked = sorted(candidates.values(), key=lambda c: c['score'], reverse=True)
+                candidates = {c['key']: c for c in ranked[:self.CRIB_TOP]}
+        
+        return sorted(candidates.values(), key=lambda c: c['score'], reverse=True)
+    
+    def buffer_closed(self):
+        """
+        分析的缓冲区是否已失效
+        
+        缓冲区通常是 DataProcessor 的 mmap，加载其他文件时会被关闭
+        """
+        return bool(getattr(self.buffer, 'closed', False))
+    
+    def release_buffer(self):
+        """丢弃缓冲区与基于它的分析结果"""
+        self.buffer = None
+        self.result = None
+    
+    def decrypt(self, data=None, key=None):
+        """
+        用密钥解密整个缓冲区，返回 bytes
+        
+        Raises:
+            ValueError: 缓冲区已失效或尚未分析
+        """
+        if data is None:
+            if self.buffer_closed():
+                self.release_buffer()
+            if self.buffer is None:
+                raise ValueError("原数据已关闭（可能加载了其他文件），请重新分析")
+        data = np.frombuffer(self.buffer if data is None else data, dtype=np.uint8)
+        key = self.result['key'] if key is None else key
+        if not key:
+            return data.tobytes()
+        return (data ^ np.resize(np.frombuffer(key, dtype=np.uint8), data.size)).tobytes()
+    
+    @staticmethod
+    def _minimal_period(key):
+        """密钥的最小重复周期"""
+        n = len(key)
+        return next(q for q in range(1, n + 1) if n % q == 0 and key == key[:q] * (n // q))
+    
+    def get_result(self):
+        """获取处理结果"""
+        return self.result
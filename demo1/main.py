@@ -9,11 +9,15 @@ from PySide6 import QtCore, QtGui
 import qtmodern.styles
 import qtmodern.windows
 from core import DataProcessor
+from vievs.widgets import StatusService
 
 
 class MainWindow(QMainWindow):
     """主窗口"""
     
+    # 数据发布信号: (来源名称, 数据)，加载文件或模块产生结果时发出
+    data_published = QtCore.Signal(str, object)
+    
     MIN_WIDTH = 750
     MIN_HEIGHT = 500
     
@@ -105,7 +109,9 @@ class MainWindow(QMainWindow):
     def create_statusbar(self):
         """创建状态栏"""
         self.statusbar = self.statusBar()
-        self.statusbar.showMessage("就绪")
+        # 模块日志统一经由 status 限频刷新到状态栏
+        self.status = StatusService(self.statusbar, self)
+        self.status.show_message("就绪")
     
     def connect_signals(self):
         """连接信号槽"""
@@ -150,7 +156,9 @@ class MainWindow(QMainWindow):
         try:
             success = self.data_processor.load_data(file_path)
             if success:
-                self.statusbar.showMessage(f"已加载: {os.path.basename(file_path)}")
+                self.status.show_message(f"已加载: {os.path.basename(file_path)}")
+                self.publish_data(f"文件: {os.path.basename(file_path)}",
+                                  self.data_processor.get_buffer())
             else:
                 QMessageBox.warning(self, "警告", "加载文件失败！")
         except Exception as e:
@@ -160,10 +168,15 @@ class MainWindow(QMainWindow):
         """保存文件"""
         try:
             # 这里添加保存逻辑
-            self.statusbar.showMessage("文件保存成功")
+            self.status.show_message("文件保存成功")
         except Exception as e:
             QMessageBox.critical(self, "错误", f"保存文件时出错: {e}")
     
+    def publish_data(self, source, data):
+        """发布数据（已加载文件或模块处理结果），供全局搜索等模块订阅"""
+        if data:
+            self.data_published.emit(source, data)
+    
     def closeEvent(self, event):
         """关闭事件"""
         # 清理资源
@@ -230,17 +243,33 @@ class MainWindow(QMainWindow):
         """加载模块 - 双层结构"""
         from vievs.modules.text_module import TextModuleUI
         from vievs.modules.image_module import ImageModuleUI
-        from core import TextProcessor
+        from vievs.modules.xor_module import XorModuleUI
+        from vievs.modules.search_module import SearchModuleUI
+        from vievs.modules.hash_module import HashModuleUI
+        from vievs.modules.stego_module import StegoModuleUI
+        from vievs.modules.filter_module import FilterModuleUI
+        from vievs.modules.brute_module import BruteModuleUI
+        from vievs.modules.gif_module import GifModuleUI
+        from vievs.modules.frame_module import FrameModuleUI
+        from vievs.modules.frequency_module import FrequencyModuleUI
+        from vievs.modules.spectrum_module import SpectrumModuleUI
+        from vievs.modules.combine_module import CombineModuleUI
+        from vievs.modules.png_module import PngModuleUI
+        from core import (TextProcessor, XorProcessor, SecretFinder, HashCracker, ImageProcessor,
+                          BitPlaneProcessor, LsbExtractor, ColorFilterProcessor, PngDimensionSolver,
+                          JigsawSolver, SeedShuffleSolver, ChaoticMapScrambler, AnimationDecoder,
+                          FrameReducer, ColorFrequencyAnalyzer, SpectrumAnalyzer,
+                          ImageCombiner, BatchImageProcessor, PngInspector)
         
         # ========== 1. 图像处理分类 ==========
         self.add_category('图像处理', 0)
         
         # 1.1 区块处理
-        image_ui = ImageModuleUI(self)
+        image_ui = ImageModuleUI(self, ImageProcessor(), JigsawSolver(), BatchImageProcessor())
         self.add_module('图像处理', '区块处理', image_ui)
         
         # 1.2 单帧图处理
-        single_frame_ui = self._create_placeholder("🎯 单帧图处理")
+        single_frame_ui = FrameModuleUI(self, FrameReducer(), AnimationDecoder())
         self.add_module('图像处理', '单帧图处理', single_frame_ui)
         
         # 1.3 双重编码编码
@@ -255,15 +284,28 @@ class MainWindow(QMainWindow):
         tool_ui = self._create_placeholder("🔧 除工具条")
         self.add_module('图像处理', '除工具条', tool_ui)
         
+        # 1.6 滤镜浏览
+        filter_ui = FilterModuleUI(self, ColorFilterProcessor())
+        self.add_module('图像处理', '滤镜浏览', filter_ui)
+        
+        # 1.7 频域分析
+        spectrum_ui = SpectrumModuleUI(self, SpectrumAnalyzer())
+        self.add_module('图像处理', '频域分析', spectrum_ui)
+        
+        # 1.8 双图合成
+        combine_ui = CombineModuleUI(self, ImageCombiner())
+        self.add_module('图像处理', '双图合成', combine_ui)
+        
         # ========== 2. 物理处理分类 ==========
         self.add_category('物理处理', 1)
         
         # 2.1 ImageSteganography
-        steg_ui = self._create_placeholder("🔍 ImageSteganography")
+        steg_ui = StegoModuleUI(self, BitPlaneProcessor(), LsbExtractor())
         self.add_module('物理处理', 'ImageSteganography', steg_ui)
         
         # 2.2 BruteForceImage
-        brute_ui = self._create_placeholder("🔑 BruteForceImage")
+        brute_ui = BruteModuleUI(self, PngDimensionSolver(), SeedShuffleSolver(),
+                                 ChaoticMapScrambler())
         self.add_module('物理处理', 'BruteForceImage', brute_ui)
         
         # ========== 3. 文本处理分类 ==========
@@ -274,20 +316,36 @@ class MainWindow(QMainWindow):
         text_ui = TextModuleUI(self, text_processor)
         self.add_module('文本处理', '文本处理', text_ui)
         
+        # 3.2 哈希破解
+        hash_ui = HashModuleUI(self, HashCracker())
+        self.add_module('文本处理', '哈希破解', hash_ui)
+        
         # ========== 4. 文件处理分类 ==========
         self.add_category('文件处理', 3)
         
         # 4.1 FrequencyColor
-        freq_ui = self._create_placeholder("🎨 FrequencyColor")
+        freq_ui = FrequencyModuleUI(self, ColorFrequencyAnalyzer())
         self.add_module('文件处理', 'FrequencyColor', freq_ui)
         
+        # 4.2 XOR分析
+        xor_ui = XorModuleUI(self, XorProcessor())
+        self.add_module('文件处理', 'XOR分析', xor_ui)
+        
+        # 4.3 全局搜索
+        search_ui = SearchModuleUI(self, SecretFinder())
+        self.add_module('文件处理', '全局搜索', search_ui)
+        
         # ========== 5. 块是处理分类 ==========
         self.add_category('块是处理', 4)
         
         # 5.1 GIF
-        gif_ui = self._create_placeholder("🎬 GIF")
+        gif_ui = GifModuleUI(self, AnimationDecoder())
         self.add_module('块是处理', 'GIF', gif_ui)
         
+        # 5.2 PNG结构
+        png_ui = PngModuleUI(self, PngInspector())
+        self.add_module('块是处理', 'PNG结构', png_ui)
+        
         # ========== 6. 关于分类 ==========
         self.add_category('关于', 5)
         
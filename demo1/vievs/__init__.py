@@ -1,9 +1,15 @@
 from .base_view import BaseView
 from .modules.text_module import TextModuleUI
 from .modules.image_module import ImageModuleUI
+from .modules.xor_module import XorModuleUI
+from .modules.search_module import SearchModuleUI
+from .modules.hash_module import HashModuleUI
 
 __all__ = [
     'BaseView',
     'TextModuleUI',
-    'ImageModuleUI'
+    'ImageModuleUI',
+    'XorModuleUI',
+    'SearchModuleUI',
+    'HashModuleUI'
 ]
\ No newline at end of file
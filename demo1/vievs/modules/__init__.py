@@ -3,5 +3,20 @@
 """
 from .text_module.text_module_ui import TextModuleUI
 from .image_module.image_module_ui import ImageModuleUI
+from .xor_module.xor_module_ui import XorModuleUI
+from .search_module.search_module_ui import SearchModuleUI
+from .hash_module.hash_module_ui import HashModuleUI
+from .stego_module.stego_module_ui import StegoModuleUI
+from .filter_module.filter_module_ui import FilterModuleUI
+from .brute_module.brute_module_ui import BruteModuleUI
+from .gif_module.gif_module_ui import GifModuleUI
+from .frame_module.frame_module_ui import FrameModuleUI
+from .frequency_module.frequency_module_ui import FrequencyModuleUI
+from .spectrum_module.spectrum_module_ui import SpectrumModuleUI
+from .combine_module.combine_module_ui import CombineModuleUI
+from .png_module.png_module_ui import PngModuleUI
 
-__all__ = ['TextModuleUI', 'ImageModuleUI']
+__all__ = ['TextModuleUI', 'ImageModuleUI', 'XorModuleUI', 'SearchModuleUI', 'HashModuleUI', 'StegoModuleUI',
+           'FilterModuleUI', 'BruteModuleUI', 'GifModuleUI', 'FrameModuleUI',
+           'FrequencyModuleUI', 'SpectrumModuleUI',
+           'CombineModuleUI', 'PngModuleUI']
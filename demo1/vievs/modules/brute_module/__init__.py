@@ -0,0 +1,6 @@
+"""
+图像爆破模块
+"""
+from .brute_module_ui import BruteModuleUI
+
+__all__ = ['BruteModuleUI']
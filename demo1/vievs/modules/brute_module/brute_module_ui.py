@@ -0,0 +1,1184 @@
+# -*- coding: utf-8 -*-
+"""
+图像爆破模块UI - 对应 core.PngDimensionSolver / core.SeedShuffleSolver / core.ChaoticMapScrambler
+
+- PNG 宽高：按 IHDR 中记录的 CRC 求出范围内全部满足的宽高（后台线程驱动进程池），
+  候选按 IDAT 解压大小排序；选中候选后按该尺寸惰性解码缩略预览，可保存修复后的文件
+- 种子置乱：枚举种子复现 random / NumPy 的洗牌并评分，排名缩略图随进度实时刷新
+- 混沌映射：Arnold / 面包师映射的置乱、还原与周期检测，爆破 (a, b, 次数) 并按平滑度排名
+"""
+
+import os
+
+from PySide6.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QPushButton,
+                               QLabel, QGroupBox, QComboBox, QSpinBox, QLineEdit,
+                               QFormLayout, QFileDialog, QProgressBar, QTableWidget,
+                               QTableWidgetItem, QHeaderView, QTabWidget, QListWidget,
+                               QListWidgetItem, QCheckBox)
+from PySide6.QtCore import Qt, QThreadPool, QSize
+from PySide6.QtGui import QImage, QPixmap, QIcon
+
+from vievs.widgets import LogView, TaskWorker, array_to_qimage, qimage_to_array
+from core.modules.seed_shuffle import SCHEMES, PRNGS
+from core.modules.chaotic_map import MAPS, parse_key, map_period
+
+
+# 搜索范围预设：名称 -> 宽、高范围（None 表示使用文件中记录的值）
+RANGE_PRESETS = {
+    "仅修复高度": (None, (1, 0xFFFFFFFF)),
+    "仅修复宽度": ((1, 0xFFFFFFFF), None),
+    "宽高均未知 (≤ 65535)": ((1, 0xFFFF), (1, 0xFFFF)),
+    "宽高均未知 (完整 32 位)": ((0, 0xFFFFFFFF), (0, 0xFFFFFFFF)),
+}
+
+
+def parse_number(text):
+    """解析十进制或 0x 开头的十六进制整数"""
+    return int(text.strip().replace('_', ''), 0)
+
+
+class BruteModuleUI(QWidget):
+    """图像爆破模块UI（PNG 宽高 CRC 修复 + 种子置乱爆破）"""
+    
+    # 预览区域的最大尺寸
+    PREVIEW_SIZE = (480, 360)
+    # 预览解码的最大边长
+    PREVIEW_SIDE = 1024
+    # 种子排名缩略图的边长
+    THUMBNAIL_SIZE = 128
+    
+    def __init__(self, parent=None, processor=None, shuffler=None, scrambler=None):
+        super().__init__(parent)
+        self.parent_window = parent
+        self.processor = processor  # PngDimensionSolver 实例
+        self.shuffler = shuffler  # SeedShuffleSolver 实例
+        self.scrambler = scrambler  # ChaoticMapScrambler 实例
+        self.thread_pool = QThreadPool.globalInstance()
+        self.status = getattr(parent, 'status', None)  # MainWindow 的 StatusService
+        self.file_path = None
+        self.candidates = []
+        self._preview_request = None  # 最近一次请求预览的尺寸，过期的预览结果丢弃
+        self._searching = False
+        
+        self.shuffle_image = None
+        self.ranking = []
+        self._shuffle_job = 0  # 每次搜索递增，过期的缩略图结果丢弃
+        self._thumbnails = {}  # (种子, 方向) -> QImage
+        self._pending_thumbnails = set()
+        self._shuffle_request = None  # 最近一次请求大图预览的 (种子, 方向)
+        
+        self.chaos_image = None
+        self.chaos_output = None  # 当前显示的变换结果
+        self.chaos_ranking = []
+        self._chaos_request = None  # 最近一次请求的还原参数，过期的结果丢弃
+        
+        for core in (self.processor, self.shuffler, self.scrambler):
+            if core:
+                core.initialize()
+        
+        self.init_ui()
+        self.connect_signals()
+    
+    def init_ui(self):
+        """初始化界面"""
+        main_layout = QVBoxLayout(self)
+        main_layout.setContentsMargins(20, 15, 20, 15)
+        main_layout.setSpacing(12)
+        
+        self.tabs = QTabWidget()
+        self.tabs.addTab(self._create_png_page(), "📐 PNG 宽高")
+        self.tabs.addTab(self._create_shuffle_page(), "🎲 种子置乱")
+        self.tabs.addTab(self._create_chaos_page(), "🌀 混沌映射")
+        main_layout.addWidget(self.tabs, 1)
+        
+        # 日志输出
+        log_group = QGroupBox("📋 处理日志")
+        log_layout = QVBoxLayout()
+        
+        self.log_view = LogView()
+        self.log_view.setMaximumHeight(120)
+        log_layout.addWidget(self.log_view)
+        
+        log_group.setLayout(log_layout)
+        main_layout.addWidget(log_group)
+        
+        self.log("✅ 图像爆破模块已加载", "success")
+        self.log("💡 提示: 加载 CRC 校验失败的 PNG，按记录的 CRC 爆破被篡改的宽 / 高；"
+                 "或在种子置乱页枚举打乱像素所用的随机种子")
+    
+    def _create_png_page(self):
+        """PNG 宽高修复页"""
+        page = QWidget()
+        main_layout = QVBoxLayout(page)
+        main_layout.setContentsMargins(0, 0, 0, 0)
+        
+        # 文件选择区域
+        file_group = QGroupBox("📁 PNG 文件")
+        file_layout = QVBoxLayout()
+        
+        path_layout = QHBoxLayout()
+        self.file_label = QLabel("未选择文件")
+        path_layout.addWidget(self.file_label)
+        self.btn_browse = QPushButton("📁 浏览...")
+        self.btn_browse.setMaximumWidth(100)
+        path_layout.addWidget(self.btn_browse)
+        file_layout.addLayout(path_layout)
+        
+        self.header_label = QLabel("")
+        self.header_label.setTextInteractionFlags(Qt.TextSelectableByMouse)
+        file_layout.addWidget(self.header_label)
+        
+        file_group.setLayout(file_layout)
+        main_layout.addWidget(file_group)
+        
+        # 搜索范围
+        options_group = QGroupBox("⚙️ 搜索范围 (闭区间，支持 0x 十六进制)")
+        options_layout = QFormLayout()
+        
+        self.preset_combo = QComboBox()
+        self.preset_combo.addItems(list(RANGE_PRESETS))
+        options_layout.addRow("预设:", self.preset_combo)
+        
+        self.range_edits = {}
+        for name, label in (('width', "宽度:"), ('height', "高度:")):
+            range_layout = QHBoxLayout()
+            low, high = QLineEdit("1"), QLineEdit("65535")
+            range_layout.addWidget(low)
+            range_layout.addWidget(QLabel("~"))
+            range_layout.addWidget(high)
+            self.range_edits[name] = (low, high)
+            options_layout.addRow(label, range_layout)
+        
+        self.workers_spin = QSpinBox()
+        self.workers_spin.setRange(1, 64)
+        self.workers_spin.setValue(os.cpu_count() or 1)
+        options_layout.addRow("进程数:", self.workers_spin)
+        
+        options_group.setLayout(options_layout)
+        main_layout.addWidget(options_group)
+        
+        # 操作按钮
+        button_layout = QHBoxLayout()
+        
+        self.btn_start = QPushButton("🚀 开始爆破")
+        self.btn_start.setMinimumHeight(35)
+        self.btn_cancel = QPushButton("⏹ 取消")
+        self.btn_cancel.setMinimumHeight(35)
+        self.btn_cancel.setEnabled(False)
+        self.btn_save = QPushButton("💾 保存修复后的 PNG")
+        self.btn_save.setMinimumHeight(35)
+        
+        button_layout.addStretch()
+        button_layout.addWidget(self.btn_start)
+        button_layout.addWidget(self.btn_cancel)
+        button_layout.addWidget(self.btn_save)
+        main_layout.addLayout(button_layout)
+        
+        # 进度
+        progress_layout = QHBoxLayout()
+        self.progress_bar = QProgressBar()
+        self.progress_bar.setRange(0, 1000)
+        progress_layout.addWidget(self.progress_bar)
+        self.rate_label = QLabel("")
+        self.rate_label.setMinimumWidth(200)
+        progress_layout.addWidget(self.rate_label)
+        main_layout.addLayout(progress_layout)
+        
+        # 候选 + 预览
+        result_group = QGroupBox("✨ 候选尺寸 (选中即预览)")
+        result_layout = QHBoxLayout()
+        
+        self.result_table = QTableWidget(0, 3)
+        self.result_table.setHorizontalHeaderLabels(["宽", "高", "IDAT 大小"])
+        self.result_table.horizontalHeader().setSectionResizeMode(QHeaderView.Stretch)
+        self.result_table.setEditTriggers(QTableWidget.NoEditTriggers)
+        self.result_table.setSelectionBehavior(QTableWidget.SelectRows)
+        self.result_table.setSelectionMode(QTableWidget.SingleSelection)
+        self.result_table.setMaximumWidth(360)
+        result_layout.addWidget(self.result_table)
+        
+        preview_layout = QVBoxLayout()
+        self.preview_label = QLabel("未选择候选")
+        self.preview_label.setAlignment(Qt.AlignCenter)
+        self.preview_label.setMinimumHeight(240)
+        preview_layout.addWidget(self.preview_label, 1)
+        self.preview_info = QLabel("")
+        preview_layout.addWidget(self.preview_info)
+        result_layout.addLayout(preview_layout, 1)
+        
+        result_group.setLayout(result_layout)
+        main_layout.addWidget(result_group, 1)
+        return page
+    
+    def _create_shuffle_page(self):
+        """种子置乱爆破页：选项、排名缩略图、选中结果的大图"""
+        page = QWidget()
+        page_layout = QVBoxLayout(page)
+        page_layout.setContentsMargins(0, 0, 0, 0)
+        
+        file_layout = QHBoxLayout()
+        self.shuffle_file_label = QLabel("未选择图像")
+        file_layout.addWidget(self.shuffle_file_label, 1)
+        self.btn_shuffle_browse = QPushButton("📁 浏览...")
+        self.btn_shuffle_browse.setMaximumWidth(100)
+        file_layout.addWidget(self.btn_shuffle_browse)
+        page_layout.addLayout(file_layout)
+        
+        options_group = QGroupBox("⚙️ 置乱方式与种子范围 (闭区间，支持 0x 十六进制)")
+        options_layout = QFormLayout()
+        
+        self.scheme_combo = QComboBox()
+        for key, (label, _) in SCHEMES.items():
+            self.scheme_combo.addItem(label, key)
+        options_layout.addRow("置乱方式:", self.scheme_combo)
+        
+        self.prng_combo = QComboBox()
+        for key, label in PRNGS.items():
+            self.prng_combo.addItem(label, key)
+        options_layout.addRow("随机数生成器:", self.prng_combo)
+        
+        seed_layout = QHBoxLayout()
+        self.seed_low_edit, self.seed_high_edit = QLineEdit("0"), QLineEdit("65535")
+        seed_layout.addWidget(self.seed_low_edit)
+        seed_layout.addWidget(QLabel("~"))
+        seed_layout.addWidget(self.seed_high_edit)
+        options_layout.addRow("种子:", seed_layout)
+        
+        block_layout = QHBoxLayout()
+        self.block_w_spin, self.block_h_spin = QSpinBox(), QSpinBox()
+        for spin in (self.block_w_spin, self.block_h_spin):
+            spin.setRange(1, 4096)
+            spin.setValue(16)
+            block_layout.addWidget(spin)
+        block_layout.addStretch()
+        options_layout.addRow("块大小 (宽, 高):", block_layout)
+        
+        self.shuffle_workers_spin = QSpinBox()
+        self.shuffle_workers_spin.setRange(1, 64)
+        self.shuffle_workers_spin.setValue(os.cpu_count() or 1)
+        options_layout.addRow("进程数:", self.shuffle_workers_spin)
+        
+        options_group.setLayout(options_layout)
+        page_layout.addWidget(options_group)
+        
+        button_layout = QHBoxLayout()
+        self.btn_shuffle_start = QPushButton("🚀 开始爆破")
+        self.btn_shuffle_start.setMinimumHeight(35)
+        self.btn_shuffle_cancel = QPushButton("⏹ 取消")
+        self.btn_shuffle_cancel.setMinimumHeight(35)
+        self.btn_shuffle_cancel.setEnabled(False)
+        self.btn_shuffle_save = QPushButton("💾 保存还原图像")
+        self.btn_shuffle_save.setMinimumHeight(35)
+        button_layout.addStretch()
+        button_layout.addWidget(self.btn_shuffle_start)
+        button_layout.addWidget(self.btn_shuffle_cancel)
+        button_layout.addWidget(self.btn_shuffle_save)
+        page_layout.addLayout(button_layout)
+        
+        progress_layout = QHBoxLayout()
+        self.shuffle_progress_bar = QProgressBar()
+        self.shuffle_progress_bar.setRange(0, 1000)
+        progress_layout.addWidget(self.shuffle_progress_bar)
+        self.shuffle_rate_label = QLabel("")
+        self.shuffle_rate_label.setMinimumWidth(200)
+        progress_layout.addWidget(self.shuffle_rate_label)
+        page_layout.addLayout(progress_layout)
+        
+        # 排名缩略图 + 选中结果
+        result_layout = QHBoxLayout()
+        self.gallery = QListWidget()
+        self.gallery.setViewMode(QListWidget.IconMode)
+        self.gallery.setIconSize(QSize(self.THUMBNAIL_SIZE, self.THUMBNAIL_SIZE))
+        self.gallery.setResizeMode(QListWidget.Adjust)
+        self.gallery.setMovement(QListWidget.Static)
+        self.gallery.setSpacing(6)
+        result_layout.addWidget(self.gallery, 1)
+        
+        shuffle_preview_layout = QVBoxLayout()
+        self.shuffle_preview_label = QLabel("未选择结果")
+        self.shuffle_preview_label.setAlignment(Qt.AlignCenter)
+        self.shuffle_preview_label.setMinimumSize(320, 240)
+        shuffle_preview_layout.addWidget(self.shuffle_preview_label, 1)
+        self.shuffle_info_label = QLabel("")
+        shuffle_preview_layout.addWidget(self.shuffle_info_label)
+        result_layout.addLayout(shuffle_preview_layout, 1)
+        page_layout.addLayout(result_layout, 1)
+        
+        self.on_scheme_changed()
+        return page
+    
+    def _create_chaos_page(self):
+        """混沌映射页：单次变换 / 周期检测，以及 (a, b, 次数) 爆破"""
+        page = QWidget()
+        page_layout = QVBoxLayout(page)
+        page_layout.setContentsMargins(0, 0, 0, 0)
+        
+        file_layout = QHBoxLayout()
+        self.chaos_file_label = QLabel("未选择图像（要求正方形）")
+        file_layout.addWidget(self.chaos_file_label, 1)
+        self.btn_chaos_browse = QPushButton("📁 浏览...")
+        self.btn_chaos_browse.setMaximumWidth(100)
+        file_layout.addWidget(self.btn_chaos_browse)
+        page_layout.addLayout(file_layout)
+        
+        options_layout = QHBoxLayout()
+        
+        # 单次变换
+        transform_group = QGroupBox("🔀 变换")
+        transform_layout = QFormLayout()
+        self.map_combo = QComboBox()
+        for key, label in MAPS.items():
+            self.map_combo.addItem(label, key)
+        transform_layout.addRow("映射:", self.map_combo)
+        
+        params_layout = QHBoxLayout()
+        self.map_a_spin, self.map_b_spin = QSpinBox(), QSpinBox()
+        for label, spin in (("a", self.map_a_spin), ("b", self.map_b_spin)):
+            spin.setRange(0, 1 << 20)
+            spin.setValue(1)
+            params_layout.addWidget(QLabel(label))
+            params_layout.addWidget(spin)
+        transform_layout.addRow("Arnold 参数:", params_layout)
+        
+        self.baker_key_edit = QLineEdit()
+        self.baker_key_edit.setPlaceholderText("如 64,128,64（之和为边长，每块整除边长）")
+        transform_layout.addRow("面包师分块:", self.baker_key_edit)
+        
+        self.swap_axes_check = QCheckBox("交换行列坐标")
+        transform_layout.addRow("", self.swap_axes_check)
+        
+        self.iterations_spin = QSpinBox()
+        self.iterations_spin.setRange(0, 2 ** 31 - 1)
+        self.iterations_spin.setValue(1)
+        transform_layout.addRow("迭代次数:", self.iterations_spin)
+        
+        transform_buttons = QHBoxLayout()
+        self.btn_chaos_scramble = QPushButton("🔀 置乱")
+        self.btn_chaos_restore = QPushButton("↩️ 还原")
+        self.btn_chaos_period = QPushButton("🔁 周期")
+        for button in (self.btn_chaos_scramble, self.btn_chaos_restore, self.btn_chaos_period):
+            transform_buttons.addWidget(button)
+        transform_layout.addRow(transform_buttons)
+        transform_group.setLayout(transform_layout)
+        options_layout.addWidget(transform_group)
+        
+        # 参数爆破
+        search_group = QGroupBox("🔑 爆破 (a, b, 次数)")
+        search_layout = QFormLayout()
+        self.chaos_range_spins = {}
+        for name in ('a', 'b'):
+            range_layout = QHBoxLayout()
+            low, high = QSpinBox(), QSpinBox()
+            for spin, value in ((low, 1), (high, 8)):
+                spin.setRange(0, 4096)
+                spin.setValue(value)
+                range_layout.addWidget(spin)
+            range_layout.insertWidget(1, QLabel("~"))
+            self.chaos_range_spins[name] = (low, high)
+            search_layout.addRow(f"{name} 范围:", range_layout)
+        
+        self.swap_combo = QComboBox()
+        self.swap_combo.addItem("两种坐标顺序", 'both')
+        self.swap_combo.addItem("默认 (列, 行)", 'normal')
+        self.swap_combo.addItem("交换 (行, 列)", 'swapped')
+        search_layout.addRow("坐标顺序:", self.swap_combo)
+        
+        self.max_iterations_spin = QSpinBox()
+        self.max_iterations_spin.setRange(1, 1 << 24)
+        self.max_iterations_spin.setValue(self.scrambler.MAX_ITERATIONS if self.scrambler else 1 << 14)
+        search_layout.addRow("最多次数:", self.max_iterations_spin)
+        
+        self.chaos_workers_spin = QSpinBox()
+        self.chaos_workers_spin.setRange(1, 64)
+        self.chaos_workers_spin.setValue(os.cpu_count() or 1)
+        search_layout.addRow("进程数:", self.chaos_workers_spin)
+        
+        search_buttons = QHBoxLayout()
+        self.btn_chaos_search = QPushButton("🚀 开始爆破")
+        self.btn_chaos_cancel = QPushButton("⏹ 取消")
+        self.btn_chaos_cancel.setEnabled(False)
+        search_buttons.addWidget(self.btn_chaos_search)
+        search_buttons.addWidget(self.btn_chaos_cancel)
+        search_layout.addRow(search_buttons)
+        search_group.setLayout(search_layout)
+        options_layout.addWidget(search_group)
+        page_layout.addLayout(options_layout)
+        
+        progress_layout = QHBoxLayout()
+        self.chaos_progress_bar = QProgressBar()
+        self.chaos_progress_bar.setRange(0, 1000)
+        progress_layout.addWidget(self.chaos_progress_bar)
+        self.chaos_rate_label = QLabel("")
+        self.chaos_rate_label.setMinimumWidth(200)
+        progress_layout.addWidget(self.chaos_rate_label)
+        page_layout.addLayout(progress_layout)
+        
+        # 排名 + 结果
+        result_layout = QHBoxLayout()
+        self.chaos_table = QTableWidget(0, 5)
+        self.chaos_table.setHorizontalHeaderLabels(["参数", "交换", "次数", "周期", "得分"])
+        self.chaos_table.horizontalHeader().setSectionResizeMode(QHeaderView.Stretch)
+        self.chaos_table.setEditTriggers(QTableWidget.NoEditTriggers)
+        self.chaos_table.setSelectionBehavior(QTableWidget.SelectRows)
+        self.chaos_table.setSelectionMode(QTableWidget.SingleSelection)
+        self.chaos_table.setMaximumWidth(420)
+        result_layout.addWidget(self.chaos_table)
+        
+        chaos_preview_layout = QVBoxLayout()
+        self.chaos_preview_label = QLabel("未加载图像")
+        self.chaos_preview_label.setAlignment(Qt.AlignCenter)
+        self.chaos_preview_label.setMinimumSize(320, 240)
+        chaos_preview_layout.addWidget(self.chaos_preview_label, 1)
+        info_layout = QHBoxLayout()
+        self.chaos_info_label = QLabel("")
+        info_layout.addWidget(self.chaos_info_label, 1)
+        self.btn_chaos_save = QPushButton("💾 保存结果")
+        info_layout.addWidget(self.btn_chaos_save)
+        chaos_preview_layout.addLayout(info_layout)
+        result_layout.addLayout(chaos_preview_layout, 1)
+        page_layout.addLayout(result_layout, 1)
+        
+        self.on_map_changed()
+        return page
+    
+    def connect_signals(self):
+        """连接信号槽"""
+        self.btn_browse.clicked.connect(self.on_browse_clicked)
+        self.preset_combo.currentTextChanged.connect(self.apply_preset)
+        self.btn_start.clicked.connect(self.on_start_clicked)
+        self.btn_cancel.clicked.connect(self.on_cancel_clicked)
+        self.btn_save.clicked.connect(self.on_save_clicked)
+        self.result_table.currentCellChanged.connect(self.on_candidate_selected)
+        
+        self.btn_shuffle_browse.clicked.connect(self.on_shuffle_browse_clicked)
+        self.scheme_combo.currentIndexChanged.connect(self.on_scheme_changed)
+        self.btn_shuffle_start.clicked.connect(self.on_shuffle_start_clicked)
+        self.btn_shuffle_cancel.clicked.connect(self.on_shuffle_cancel_clicked)
+        self.btn_shuffle_save.clicked.connect(self.on_shuffle_save_clicked)
+        self.gallery.currentRowChanged.connect(self.on_ranking_selected)
+        
+        self.btn_chaos_browse.clicked.connect(self.on_chaos_browse_clicked)
+        self.map_combo.currentIndexChanged.connect(self.on_map_changed)
+        self.btn_chaos_scramble.clicked.connect(self.on_chaos_scramble_clicked)
+        self.btn_chaos_restore.clicked.connect(self.on_chaos_restore_clicked)
+        self.btn_chaos_period.clicked.connect(self.on_chaos_period_clicked)
+        self.btn_chaos_search.clicked.connect(self.on_chaos_search_clicked)
+        self.btn_chaos_cancel.clicked.connect(self.on_chaos_cancel_clicked)
+        self.btn_chaos_save.clicked.connect(self.on_chaos_save_clicked)
+        self.chaos_table.currentCellChanged.connect(self.on_chaos_candidate_selected)
+    
+    def on_browse_clicked(self):
+        """浏览文件"""
+        file_path, _ = QFileDialog.getOpenFileName(
+            self, "选择 PNG 文件", "", "PNG图像 (*.png);;所有文件 (*)"
+        )
+        if file_path:
+            self.load_file(file_path)
+    
+    def load_file(self, file_path):
+        """读取 IHDR 与 IDAT 解压大小，显示 CRC 校验结果"""
+        if self._searching:
+            self.log("⚠️ 正在爆破，请先取消或等待完成", "warning")
+            return False
+        try:
+            header = self.processor.load(file_path)
+        except (OSError, ValueError) as e:
+            self.log(f"❌ 无法读取 PNG: {e}", "error")
+            return False
+        self.file_path = file_path
+        self.file_label.setText(os.path.basename(file_path))
+        self.set_candidates([])
+        
+        crc_state = "✅ 一致" if self.processor.crc_matches() else "❌ 不一致（宽高可能被篡改）"
+        data_state = "" if self.processor.data_complete else "（压缩流不完整，不按大小排序）"
+        self.header_label.setText(
+            f"记录尺寸: {header['width']}x{header['height']} | 位深 {header['bit_depth']} | "
+            f"颜色类型 {header['color_type']} | 隔行 {header['interlace']}\n"
+            f"CRC: 记录 {header['crc']:08X} / 计算 {header['actual_crc']:08X} {crc_state} | "
+            f"IDAT 解压 {self.processor.data_size:,} 字节{data_state}")
+        self.log(f"📁 已选择: {os.path.basename(file_path)} ({header['width']}x{header['height']}), "
+                 f"CRC {crc_state}", "success" if self.processor.crc_matches() else "warning")
+        self.apply_preset(self.preset_combo.currentText())
+        return True
+    
+    def apply_preset(self, name):
+        """按预设填写宽高范围（固定的维度取文件中记录的值）"""
+        header = self.processor.header if self.processor else None
+        for key, value_range in zip(('width', 'height'), RANGE_PRESETS[name]):
+            if value_range is None:
+                stored = header[key] if header else 1
+                value_range = (stored, stored)
+            low, high = self.range_edits[key]
+            low.setText(str(value_range[0]))
+            high.setText(str(value_range[1]))
+    
+    def search_range(self, key):
+        """读取某个维度的闭区间"""
+        low, high = self.range_edits[key]
+        return parse_number(low.text()), parse_number(high.text())
+    
+    def on_start_clicked(self):
+        """开始爆破"""
+        if not self.processor:
+            return
+        if not self.file_path:
+            self.log("⚠️ 请先选择 PNG 文件", "warning")
+            return
+        try:
+            width_range = self.processor.check_range(self.search_range('width'))
+            height_range = self.processor.check_range(self.search_range('height'))
+        except ValueError as e:
+            self.log(f"⚠️ {e}", "warning")
+            return
+        
+        options = {
+            'width_range': width_range,
+            'height_range': height_range,
+            'workers': self.workers_spin.value(),
+        }
+        self.set_searching(True)
+        self.progress_bar.setValue(0)
+        self.set_candidates([])
+        self.log(f"🚀 开始爆破: 宽 {width_range[0]}~{width_range[1]}, 高 {height_range[0]}~{height_range[1]}")
+        
+        worker = TaskWorker(self.processor.process, self.file_path, options=options)
+        self.processor.set_progress_callback(worker.signals.progress.emit)
+        worker.signals.progress.connect(self.on_progress)
+        worker.signals.finished.connect(self.on_search_finished)
+        worker.signals.failed.connect(self.on_search_failed)
+        if self.status:
+            total = min(width_range[1] - width_range[0], height_range[1] - height_range[0]) + 1
+            self.status.begin_job("宽高爆破", total=total)
+        self.thread_pool.start(worker)
+    
+    def set_searching(self, searching):
+        """爆破期间禁止更换文件，否则求解器会在中途读到新文件的 IHDR"""
+        self._searching = searching
+        self.btn_start.setEnabled(not searching)
+        self.btn_cancel.setEnabled(searching)
+        self.btn_browse.setEnabled(not searching)
+    
+    def on_cancel_clicked(self):
+        """取消爆破"""
+        if self.processor:
+            self.processor.cancel()
+            self.btn_cancel.setEnabled(False)
+            self.log("⏹ 正在取消...")
+    
+    def on_progress(self, progress):
+        """更新进度"""
+        total = progress['total'] or 1
+        self.progress_bar.setValue(int(progress['current'] * 1000 / total))
+        self.rate_label.setText(f"{progress['rate'] / 1e6:,.1f} M/s  候选 {progress['found']:,}")
+        if self.status:
+            self.status.update_progress(progress['current'], progress['total'], rate=progress['rate'])
+    
+    def on_search_finished(self, success):
+        """爆破结束：填充候选表并预览第一个候选"""
+        self.set_searching(False)
+        if self.status:
+            self.status.end_job()
+        result = self.processor.get_result()
+        if not success or not result:
+            self.log("❌ 爆破失败", "error")
+            return
+        
+        self.rate_label.setText(f"{result['rate'] / 1e6:,.1f} M/s  候选 {result['count']:,}")
+        state = "⏹ 已取消" if result['cancelled'] else "✨ 完成"
+        self.log(f"{state}: 搜索 {result['searched']:,} 个取值, 用时 {result['elapsed']:.2f}s, "
+                 f"候选 {result['count']:,} 个, 其中 {len(result['matched'])} 个与 IDAT 大小一致",
+                 "warning" if result['cancelled'] else "success")
+        if result['truncated']:
+            self.log(f"⚠️ 候选过多，只列出 {len(result['candidates'])} 个，可缩小搜索范围", "warning")
+        if not result['cancelled']:
+            self.progress_bar.setValue(self.progress_bar.maximum())
+        self.set_candidates(result['candidates'])
+        
+        if result['matched'] and self.parent_window and hasattr(self.parent_window, 'publish_data'):
+            text = "\n".join(f"{width}x{height}" for width, height in result['matched'])
+            self.parent_window.publish_data("宽高爆破", text)
+    
+    def on_search_failed(self, error):
+        """爆破出错"""
+        self.set_searching(False)
+        if self.status:
+            self.status.end_job()
+        self.log(f"❌ 爆破失败: {error}", "error")
+    
+    def set_candidates(self, candidates):
+        """填充候选表（选中第一行时自动预览）"""
+        self.candidates = candidates
+        self.result_table.setRowCount(len(candidates))
+        for row, candidate in enumerate(candidates):
+            self.result_table.setItem(row, 0, QTableWidgetItem(str(candidate['width'])))
+            self.result_table.setItem(row, 1, QTableWidgetItem(str(candidate['height'])))
+            self.result_table.setItem(row, 2, QTableWidgetItem("✅ 一致" if candidate['size_match'] else "—"))
+        if candidates:
+            self.result_table.setCurrentCell(0, 0)
+        else:
+            self._preview_request = None
+            self.preview_label.setText("未选择候选")
+            self.preview_info.setText("")
+    
+    def current_candidate(self):
+        """当前选中的候选尺寸 (宽, 高)"""
+        row = self.result_table.currentRow()
+        if not 0 <= row < len(self.candidates):
+            return None
+        return self.candidates[row]['width'], self.candidates[row]['height']
+    
+    def on_candidate_selected(self, row, *_):
+        """选中候选：后台按该尺寸解码预览"""
+        size = self.current_candidate()
+        if size is None or size == self._preview_request:
+            return
+        self._preview_request = size
+        self.preview_label.setText("⏳ 解码中...")
+        worker = TaskWorker(self._render_preview, size)
+        worker.signals.finished.connect(self.on_preview_ready)
+        worker.signals.failed.connect(self.on_preview_failed)
+        self.thread_pool.start(worker)
+    
+    def _render_preview(self, size):
+        """按候选尺寸解码缩略预览（工作线程）；流式解码不支持的格式整体交给 Qt 解码"""
+        preview, rows = self.processor.render_preview(*size, max_side=self.PREVIEW_SIDE,
+                                                      cancelled=lambda: size != self._preview_request)
+        if preview is None:
+            image = QImage.fromData(self.processor.patched_bytes(*size))
+            rows = image.height()
+        else:
+            image = array_to_qimage(preview)
+        if image.isNull():
+            return size, None, 0
+        width, height = self.PREVIEW_SIZE
+        return size, image.scaled(width, height, Qt.KeepAspectRatio, Qt.SmoothTransformation), rows
+    
+    def on_preview_ready(self, rendered):
+        """显示预览（丢弃过期的结果）"""
+        size, image, rows = rendered
+        if size != self._preview_request:
+            return
+        if image is None:
+            self.preview_label.setText("❌ 无法按此尺寸解码")
+            self.preview_info.setText("")
+            return
+        self.preview_label.setPixmap(QPixmap.fromImage(image))
+        self.preview_info.setText(f"{size[0]}x{size[1]} | 已解码 {rows:,} / {size[1]:,} 行")
+    
+    def on_preview_failed(self, error):
+        """预览出错"""
+        self.preview_label.setText("❌ 无法按此尺寸解码")
+        self.preview_info.setText("")
+        self.log(f"⚠️ 预览失败: {error}", "warning")
+    
+    def on_save_clicked(self):
+        """按选中的候选尺寸保存修复后的 PNG"""
+        size = self.current_candidate()
+        if size is None:
+            self.log("⚠️ 请先选择候选尺寸！", "warning")
+            return
+        file_path, _ = QFileDialog.getSaveFileName(
+            self, "保存修复后的 PNG", "", "PNG图像 (*.png);;所有文件 (*)"
+        )
+        if not file_path:
+            return
+        try:
+            self.processor.save_patched(file_path, *size)
+            self.log(f"💾 已保存到: {file_path} ({size[0]}x{size[1]})", "success")
+        except OSError as e:
+            self.log(f"❌ 保存失败: {e}", "error")
+    
+    # ==================== 种子置乱 ====================
+    
+    def on_shuffle_browse_clicked(self):
+        """选择置乱后的图像"""
+        file_path, _ = QFileDialog.getOpenFileName(
+            self, "选择置乱后的图像", "", "图像文件 (*.png *.bmp *.jpg *.jpeg *.gif);;所有文件 (*)"
+        )
+        if file_path:
+            self.load_shuffle_image(file_path)
+    
+    def load_shuffle_image(self, file_path):
+        """读取置乱后的图像（RGBA）"""
+        image = QImage(file_path)
+        if image.isNull():
+            self.log(f"❌ 无法读取图像: {file_path}", "error")
+            return False
+        self.shuffle_image = qimage_to_array(image.convertToFormat(QImage.Format_RGBA8888))
+        self.shuffle_file_label.setText(f"{os.path.basename(file_path)} ({image.width()}x{image.height()})")
+        self.set_ranking([])
+        self.log(f"📁 已选择置乱图像: {os.path.basename(file_path)} ({image.width()}x{image.height()})", "success")
+        return True
+    
+    def on_scheme_changed(self, *_):
+        """块大小只对图块置乱有效"""
+        blocks = self.scheme_combo.currentData() == 'blocks'
+        self.block_w_spin.setEnabled(blocks)
+        self.block_h_spin.setEnabled(blocks)
+    
+    def on_shuffle_start_clicked(self):
+        """开始种子爆破"""
+        if not self.shuffler:
+            return
+        if self.shuffle_image is None:
+            self.log("⚠️ 请先选择置乱后的图像", "warning")
+            return
+        try:
+            seed_range = self.shuffler.check_range((parse_number(self.seed_low_edit.text()),
+                                                    parse_number(self.seed_high_edit.text())))
+        except ValueError as e:
+            self.log(f"⚠️ {e}", "warning")
+            return
+        
+        options = {
+            'scheme': self.scheme_combo.currentData(),
+            'prng': self.prng_combo.currentData(),
+            'seed_range': seed_range,
+            'block_size': (self.block_w_spin.value(), self.block_h_spin.value()),
+            'workers': self.shuffle_workers_spin.value(),
+        }
+        self._shuffle_job += 1
+        self.set_ranking([])
+        self.btn_shuffle_start.setEnabled(False)
+        self.btn_shuffle_cancel.setEnabled(True)
+        self.shuffle_progress_bar.setValue(0)
+        self.log(f"🚀 开始种子爆破: {self.scheme_combo.currentText()}, {self.prng_combo.currentText()}, "
+                 f"种子 {seed_range[0]}~{seed_range[1]}")
+        
+        worker = TaskWorker(self.shuffler.process, self.shuffle_image, options=options)
+        self.shuffler.set_progress_callback(worker.signals.progress.emit)
+        worker.signals.progress.connect(self.on_shuffle_progress)
+        worker.signals.finished.connect(self.on_shuffle_finished)
+        worker.signals.failed.connect(self.on_shuffle_failed)
+        if self.status:
+            self.status.begin_job("种子爆破", total=seed_range[1] - seed_range[0] + 1, unit="种子")
+        self.thread_pool.start(worker)
+    
+    def on_shuffle_cancel_clicked(self):
+        """取消种子爆破"""
+        if self.shuffler:
+            self.shuffler.cancel()
+            self.btn_shuffle_cancel.setEnabled(False)
+            self.log("⏹ 正在取消...")
+    
+    def on_shuffle_progress(self, progress):
+        """更新进度，排名变化时刷新缩略图"""
+        total = progress['total'] or 1
+        self.shuffle_progress_bar.setValue(int(progress['current'] * 1000 / total))
+        self.shuffle_rate_label.setText(f"{progress['rate']:,.0f} 种子/s  已搜索 {progress['current']:,}")
+        if self.status:
+            self.status.update_progress(progress['current'], progress['total'], rate=progress['rate'])
+        self.set_ranking(progress['ranking'])
+    
+    def on_shuffle_finished(self, success):
+        """种子爆破结束"""
+        self.btn_shuffle_start.setEnabled(True)
+        self.btn_shuffle_cancel.setEnabled(False)
+        if self.status:
+            self.status.end_job()
+        result = self.shuffler.get_result()
+        if not success or not result:
+            self.log("❌ 种子爆破失败", "error")
+            return
+        
+        self.set_ranking(result['ranking'])
+        state = "⏹ 已取消" if result['cancelled'] else "✨ 完成"
+        self.log(f"{state}: 搜索 {result['searched']:,} 个种子, 用时 {result['elapsed']:.2f}s, "
+                 f"{result['rate']:,.0f} 种子/s", "warning" if result['cancelled'] else "success")
+        if not result['cancelled']:
+            self.shuffle_progress_bar.setValue(self.shuffle_progress_bar.maximum())
+        if result['ranking']:
+            best = result['ranking'][0]
+            self.log(f"🏆 最佳种子: {best['seed']} ({best['direction']}), 得分 {best['score']:.3f}", "success")
+            if self.parent_window and hasattr(self.parent_window, 'publish_data'):
+                self.parent_window.publish_data("种子爆破", str(best['seed']))
+    
+    def on_shuffle_failed(self, error):
+        """种子爆破出错"""
+        self.btn_shuffle_start.setEnabled(True)
+        self.btn_shuffle_cancel.setEnabled(False)
+        if self.status:
+            self.status.end_job()
+        self.log(f"❌ 种子爆破失败: {error}", "error")
+    
+    def set_ranking(self, ranking):
+        """刷新排名缩略图（排名不变时不重建），缺少的缩略图交给工作线程还原"""
+        keys = [(entry['seed'], entry['direction']) for entry in ranking]
+        if keys and keys == [(entry['seed'], entry['direction']) for entry in self.ranking]:
+            return
+        self.ranking = ranking
+        selected = self.current_ranking()
+        self.gallery.blockSignals(True)
+        self.gallery.clear()
+        for rank, entry in enumerate(ranking, 1):
+            item = QListWidgetItem(f"#{rank} 种子 {entry['seed']}\n{entry['direction']} {entry['score']:.3f}")
+            thumbnail = self._thumbnails.get((entry['seed'], entry['direction']))
+            if thumbnail is not None:
+                item.setIcon(QIcon(QPixmap.fromImage(thumbnail)))
+            self.gallery.addItem(item)
+        self.gallery.blockSignals(False)
+        
+        if not ranking:
+            self._thumbnails = {}
+            self._pending_thumbnails = set()
+            self._shuffle_request = None
+            self.shuffle_preview_label.setText("未选择结果")
+            self.shuffle_info_label.setText("")
+            return
+        # 保持之前选中的结果，否则选中第一名
+        row = keys.index(selected) if selected in keys else 0
+        self.gallery.setCurrentRow(row)
+        self.on_ranking_selected(row)
+        
+        missing = [key for key in keys if key not in self._thumbnails and key not in self._pending_thumbnails]
+        if missing:
+            self._pending_thumbnails.update(missing)
+            worker = TaskWorker(self._render_thumbnails, self._shuffle_job, missing)
+            worker.signals.finished.connect(self.on_thumbnails_ready)
+            worker.signals.failed.connect(self.on_shuffle_preview_failed)
+            self.thread_pool.start(worker)
+    
+    def _render_thumbnails(self, job, keys):
+        """按种子还原并缩小成缩略图（工作线程）"""
+        size = self.THUMBNAIL_SIZE
+        thumbnails = {}
+        for seed, direction in keys:
+            if job != self._shuffle_job:
+                break
+            image = array_to_qimage(self.shuffler.unscramble(seed, direction))
+            thumbnails[(seed, direction)] = image.scaled(size, size, Qt.KeepAspectRatio, Qt.SmoothTransformation)
+        return job, thumbnails
+    
+    def on_thumbnails_ready(self, rendered):
+        """填入缩略图（丢弃上一次搜索的结果）"""
+        job, thumbnails = rendered
+        if job != self._shuffle_job:
+            return
+        self._thumbnails.update(thumbnails)
+        self._pending_thumbnails.difference_update(thumbnails)
+        for row, entry in enumerate(self.ranking):
+            thumbnail = thumbnails.get((entry['seed'], entry['direction']))
+            if thumbnail is not None:
+                self.gallery.item(row).setIcon(QIcon(QPixmap.fromImage(thumbnail)))
+    
+    def current_ranking(self):
+        """当前选中的 (种子, 方向)"""
+        row = self.gallery.currentRow()
+        if not 0 <= row < len(self.ranking):
+            return None
+        return self.ranking[row]['seed'], self.ranking[row]['direction']
+    
+    def on_ranking_selected(self, row):
+        """选中排名：后台还原完整图像显示大图"""
+        key = self.current_ranking()
+        if key is None or key == self._shuffle_request:
+            return
+        self._shuffle_request = key
+        self.shuffle_preview_label.setText("⏳ 还原中...")
+        worker = TaskWorker(self._render_unscrambled, key)
+        worker.signals.finished.connect(self.on_shuffle_preview_ready)
+        worker.signals.failed.connect(self.on_shuffle_preview_failed)
+        self.thread_pool.start(worker)
+    
+    def _render_unscrambled(self, key):
+        """按种子还原完整图像（工作线程）"""
+        image = array_to_qimage(self.shuffler.unscramble(*key))
+        width, height = self.PREVIEW_SIZE
+        return key, image.scaled(width, height, Qt.KeepAspectRatio, Qt.SmoothTransformation)
+    
+    def on_shuffle_preview_ready(self, rendered):
+        """显示还原结果（丢弃过期的结果）"""
+        key, image = rendered
+        if key != self._shuffle_request:
+            return
+        entry = next((e for e in self.ranking if (e['seed'], e['direction']) == key), None)
+        self.shuffle_preview_label.setPixmap(QPixmap.fromImage(image))
+        self.shuffle_info_label.setText(f"种子 {key[0]} | {key[1]}"
+                                        + (f" | 得分 {entry['score']:.3f}" if entry else ""))
+    
+    def on_shuffle_preview_failed(self, error):
+        """还原出错"""
+        self.log(f"⚠️ 还原失败: {error}", "warning")
+    
+    def on_shuffle_save_clicked(self):
+        """保存选中种子的完整还原图像"""
+        key = self.current_ranking()
+        if key is None:
+            self.log("⚠️ 请先选择一个种子！", "warning")
+            return
+        file_path, _ = QFileDialog.getSaveFileName(
+            self, "保存还原图像", f"seed_{key[0]}.png", "PNG图像 (*.png);;所有文件 (*)"
+        )
+        if not file_path:
+            return
+        if array_to_qimage(self.shuffler.unscramble(*key)).save(file_path):
+            self.log(f"💾 已保存到: {file_path} (种子 {key[0]}, {key[1]})", "success")
+        else:
+            self.log(f"❌ 保存失败: {file_path}", "error")
+    
+    # ==================== 混沌映射 ====================
+    
+    def on_chaos_browse_clicked(self):
+        """选择正方形图像"""
+        file_path, _ = QFileDialog.getOpenFileName(
+            self, "选择图像", "", "图像文件 (*.png *.bmp *.jpg *.jpeg *.gif);;所有文件 (*)"
+        )
+        if file_path:
+            self.load_chaos_image(file_path)
+    
+    def load_chaos_image(self, file_path):
+        """读取图像（RGBA），非正方形时拒绝"""
+        image = QImage(file_path)
+        if image.isNull():
+            self.log(f"❌ 无法读取图像: {file_path}", "error")
+            return False
+        if image.width() != image.height():
+            self.log(f"⚠️ 混沌映射要求正方形图像，当前为 {image.width()}x{image.height()}", "warning")
+            return False
+        self.chaos_image = qimage_to_array(image.convertToFormat(QImage.Format_RGBA8888))
+        size = image.width()
+        self.chaos_file_label.setText(f"{os.path.basename(file_path)} ({size}x{size})")
+        if not self.baker_key_edit.text():
+            self.baker_key_edit.setText(f"{size // 2},{size - size // 2}" if size % 2 == 0 else str(size))
+        self.set_chaos_ranking([])
+        self.show_chaos_output(self.chaos_image, "原图")
+        self.log(f"📁 已选择: {os.path.basename(file_path)} ({size}x{size})", "success")
+        return True
+    
+    def on_map_changed(self, *_):
+        """Arnold 参数与面包师分块只对各自的映射有效；面包师映射只扫描给定分块的迭代次数"""
+        arnold = self.map_combo.currentData() == 'arnold'
+        self.map_a_spin.setEnabled(arnold)
+        self.map_b_spin.setEnabled(arnold)
+        self.baker_key_edit.setEnabled(not arnold)
+        for low, high in self.chaos_range_spins.values():
+            low.setEnabled(arnold)
+            high.setEnabled(arnold)
+    
+    def chaos_params(self):
+        """当前映射的参数：Arnold 为 (a, b)，面包师为分块序列"""
+        if self.map_combo.currentData() == 'arnold':
+            return self.map_a_spin.value(), self.map_b_spin.value()
+        return parse_key(self.baker_key_edit.text())
+    
+    def _start_chaos(self, options, finished):
+        """在工作线程中运行一次 ChaoticMapScrambler.process"""
+        if not self.scrambler:
+            return False
+        if self.chaos_image is None:
+            self.log("⚠️ 请先选择正方形图像", "warning")
+            return False
+        try:
+            options = {'map': self.map_combo.currentData(), 'params': self.chaos_params(), **options}
+        except ValueError as e:
+            self.log(f"⚠️ {e}", "warning")
+            return False
+        self.set_chaos_busy(True)
+        worker = TaskWorker(self.scrambler.process, self.chaos_image, options=options)
+        self.scrambler.set_progress_callback(worker.signals.progress.emit)
+        worker.signals.progress.connect(self.on_chaos_progress)
+        worker.signals.finished.connect(finished)
+        worker.signals.failed.connect(self.on_chaos_failed)
+        self.thread_pool.start(worker)
+        return True
+    
+    def set_chaos_busy(self, busy, searching=False):
+        """运行期间禁用变换与爆破按钮"""
+        for button in (self.btn_chaos_scramble, self.btn_chaos_restore, self.btn_chaos_period,
+                       self.btn_chaos_search):
+            button.setEnabled(not busy)
+        self.btn_chaos_cancel.setEnabled(busy and searching)
+    
+    def on_chaos_scramble_clicked(self):
+        """正向置乱"""
+        options = {'mode': 'scramble', 'swap_axes': self.swap_axes_check.isChecked(),
+                   'iterations': self.iterations_spin.value()}
+        self._start_chaos(options, self.on_chaos_transformed)
+    
+    def on_chaos_restore_clicked(self):
+        """还原（按置乱迭代的次数逆变换）"""
+        options = {'mode': 'restore', 'swap_axes': self.swap_axes_check.isChecked(),
+                   'iterations': self.iterations_spin.value()}
+        self._start_chaos(options, self.on_chaos_transformed)
+    
+    def on_chaos_transformed(self, success):
+        """显示变换结果"""
+        self.set_chaos_busy(False)
+        result = self.scrambler.get_result()
+        if not success or not result or 'image' not in result:
+            self.log("❌ 变换失败", "error")
+            return
+        self._chaos_request = None
+        self.chaos_table.clearSelection()
+        info = f"迭代 {result['iterations']} 次 (按周期 {result['period']} 取模)"
+        self.show_chaos_output(result['image'], info)
+        self.log(f"✨ 变换完成: {info}", "success")
+    
+    def on_chaos_period_clicked(self):
+        """检测当前参数的周期（后台计算，面包师映射要标记整幅图的轮换）"""
+        if self.chaos_image is None:
+            self.log("⚠️ 请先选择正方形图像", "warning")
+            return
+        try:
+            params = self.chaos_params()
+        except ValueError as e:
+            self.log(f"⚠️ {e}", "warning")
+            return
+        worker = TaskWorker(map_period, self.map_combo.currentData(), len(self.chaos_image), params)
+        worker.signals.finished.connect(self.on_period_ready)
+        worker.signals.failed.connect(self.on_chaos_failed)
+        self.thread_pool.start(worker)
+    
+    def on_period_ready(self, period):
+        """显示周期"""
+        self.log(f"🔁 {self.map_combo.currentText()} {self.chaos_params()} 的周期: {period:,}", "success")
+    
+    def on_chaos_search_clicked(self):
+        """爆破 (a, b, 次数)"""
+        options = {
+            'mode': 'search',
+            'a_range': tuple(spin.value() for spin in self.chaos_range_spins['a']),
+            'b_range': tuple(spin.value() for spin in self.chaos_range_spins['b']),
+            'swap': self.swap_combo.currentData(),
+            'max_iterations': self.max_iterations_spin.value(),
+            'workers': self.chaos_workers_spin.value(),
+        }
+        self.set_chaos_ranking([])
+        self.chaos_progress_bar.setValue(0)
+        if not self._start_chaos(options, self.on_chaos_search_finished):
+            return
+        self.set_chaos_busy(True, searching=True)
+        self.log(f"🚀 开始爆破 {self.map_combo.currentText()}")
+        if self.status:
+            self.status.begin_job("混沌映射爆破", total=0)
+    
+    def on_chaos_cancel_clicked(self):
+        """取消爆破"""
+        if self.scrambler:
+            self.scrambler.cancel()
+            self.btn_chaos_cancel.setEnabled(False)
+            self.log("⏹ 正在取消...")
+    
+    def on_chaos_progress(self, progress):
+        """更新爆破进度与排名"""
+        total = progress['total'] or 1
+        self.chaos_progress_bar.setValue(int(progress['current'] * 1000 / total))
+        self.chaos_rate_label.setText(f"{progress['rate']:,.0f} 次/s  参数组 {progress['current']}/{progress['total']}")
+        if self.status:
+            self.status.update_progress(progress['current'], progress['total'], rate=progress['rate'])
+        self.set_chaos_ranking(progress['ranking'])
+    
+    def on_chaos_search_finished(self, success):
+        """爆破结束"""
+        self.set_chaos_busy(False)
+        if self.status:
+            self.status.end_job()
+        result = self.scrambler.get_result()
+        if not success or not result or 'ranking' not in result:
+            self.log("❌ 爆破失败", "error")
+            return
+        self.set_chaos_ranking(result['ranking'])
+        state = "⏹ 已取消" if result['cancelled'] else "✨ 完成"
+        self.log(f"{state}: {result['searched']} 组参数, 评分 {result['scanned']:,} 次迭代, "
+                 f"用时 {result['elapsed']:.2f}s", "warning" if result['cancelled'] else "success")
+        if not result['cancelled']:
+            self.chaos_progress_bar.setValue(self.chaos_progress_bar.maximum())
+        if result['ranking']:
+            best = result['ranking'][0]
+            self.log(f"🏆 最佳: 参数 {best['params']}, 迭代 {best['iterations']} 次 (周期 {best['period']}), "
+                     f"得分 {best['score']:.3f}", "success")
+            if self.parent_window and hasattr(self.parent_window, 'publish_data'):
+                self.parent_window.publish_data(
+                    "混沌映射爆破", f"{best['map']} {best['params']} swap={best['swap_axes']} k={best['iterations']}")
+    
+    def on_chaos_failed(self, error):
+        """混沌映射任务出错"""
+        self.set_chaos_busy(False)
+        if self.status:
+            self.status.end_job()
+        self.log(f"❌ 混沌映射失败: {error}", "error")
+    
+    def set_chaos_ranking(self, ranking):
+        """填充排名表（选中第一行时自动还原）"""
+        if ranking and ranking == self.chaos_ranking:
+            return
+        self.chaos_ranking = ranking
+        self.chaos_table.blockSignals(True)
+        self.chaos_table.setRowCount(len(ranking))
+        for row, entry in enumerate(ranking):
+            params = entry['params']
+            cells = (",".join(map(str, params)), "✓" if entry['swap_axes'] else "",
+                     str(entry['iterations']), f"{entry['period']:,}", f"{entry['score']:.3f}")
+            for column, text in enumerate(cells):
+                self.chaos_table.setItem(row, column, QTableWidgetItem(text))
+        self.chaos_table.blockSignals(False)
+        if ranking:
+            self.chaos_table.setCurrentCell(0, 0)
+            self.on_chaos_candidate_selected(0)
+    
+    def on_chaos_candidate_selected(self, row, *_):
+        """选中排名：后台按该参数还原"""
+        if not 0 <= row < len(self.chaos_ranking):
+            return
+        entry = self.chaos_ranking[row]
+        key = (entry['map'], tuple(entry['params']), entry['swap_axes'], entry['iterations'])
+        if key == self._chaos_request:
+            return
+        self._chaos_request = key
+        worker = TaskWorker(self._restore_candidate, key)
+        worker.signals.finished.connect(self.on_chaos_candidate_ready)
+        worker.signals.failed.connect(self.on_chaos_failed)
+        self.thread_pool.start(worker)
+    
+    def _restore_candidate(self, key):
+        """按排名中的参数还原（工作线程）"""
+        return key, self.scrambler.restore(*key)
+    
+    def on_chaos_candidate_ready(self, restored):
+        """显示还原结果（丢弃过期的结果）"""
+        key, image = restored
+        if key != self._chaos_request:
+            return
+        name, params, swap_axes, iterations = key
+        self.show_chaos_output(image, f"{MAPS[name]} {params}{' 交换' if swap_axes else ''} 还原 {iterations} 次")
+    
+    def show_chaos_output(self, image, info):
+        """显示变换结果并记为可保存的当前结果"""
+        self.chaos_output = image
+        width, height = self.PREVIEW_SIZE
+        pixmap = QPixmap.fromImage(array_to_qimage(image))
+        self.chaos_preview_label.setPixmap(pixmap.scaled(width, height, Qt.KeepAspectRatio, Qt.FastTransformation))
+        self.chaos_info_label.setText(info)
+    
+    def on_chaos_save_clicked(self):
+        """保存当前显示的结果"""
+        if self.chaos_output is None:
+            self.log("⚠️ 没有可保存的结果！", "warning")
+            return
+        file_path, _ = QFileDialog.getSaveFileName(
+            self, "保存结果", "", "PNG图像 (*.png);;所有文件 (*)"
+        )
+        if not file_path:
+            return
+        if array_to_qimage(self.chaos_output).save(file_path):
+            self.log(f"💾 已保存到: {file_path}", "success")
+        else:
+            self.log(f"❌ 保存失败: {file_path}", "error")
+    
+    def log(self, message, level="info"):
+        """输出日志"""
+        self.log_view.append(message, level)
+        
+        # 更新状态栏
+        if self.parent_window and hasattr(self.parent_window, 'status'):
+            self.parent_window.status.show_message(message)
+    
+    def cleanup(self):
+        """清理资源"""
+        if self.processor:
+            self.processor.cleanup()
+        if self.shuffler:
+            self._shuffle_job += 1
+            self.shuffler.cleanup()
+        if self.scrambler:
+            self.scrambler.cleanup()
@@ -0,0 +1,6 @@
+"""
+双图合成模块
+"""
+from .combine_module_ui import CombineModuleUI
+
+__all__ = ['CombineModuleUI']
@@ -0,0 +1,389 @@
+# -*- coding: utf-8 -*-
+"""
+双图合成模块UI - 对应 core.ImageCombiner
+
+两幅图像各解码一次后常驻（超大图像解码到 TiledImage），切换合成方式、偏移或掩码时
+只重新合成，不重新读取文件。内存中的图像改动选项后自动合成（合成中再次改动只保留最新一次），
+分块模式需要点击按钮，结果写入新的分块存储并可流式保存为 PNG。
+"""
+
+import os
+
+from PySide6.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QPushButton,
+                               QLabel, QGroupBox, QComboBox, QSpinBox, QCheckBox,
+                               QFormLayout, QFileDialog, QProgressBar)
+from PySide6.QtCore import Qt, QThreadPool
+from PySide6.QtGui import QImage, QImageReader, QPixmap
+
+from vievs.widgets import LogView, TaskWorker, array_to_qimage, qimage_to_array, load_tiled_image
+from core.modules.image_combiner import OPERATIONS, overlap
+from core.modules.tiled_image import TiledImage
+
+
+class CombineModuleUI(QWidget):
+    """双图合成模块UI"""
+    
+    # 预览区域的最大尺寸
+    PREVIEW_SIZE = (560, 420)
+    # 超过该像素数的图像使用分块模式加载
+    TILED_PIXELS = 1 << 26
+    
+    def __init__(self, parent=None, processor=None):
+        super().__init__(parent)
+        self.parent_window = parent
+        self.processor = processor  # ImageCombiner 实例
+        self.thread_pool = QThreadPool.globalInstance()
+        self.status = getattr(parent, 'status', None)  # MainWindow 的 StatusService
+        self.images = {'first': None, 'second': None}  # ndarray 或 TiledImage
+        self.result = None
+        self.running = False
+        self._pending = False  # 合成中选项又改变，结束后再合成一次
+        
+        if self.processor:
+            self.processor.initialize()
+        
+        self.init_ui()
+        self.connect_signals()
+    
+    def init_ui(self):
+        """初始化界面"""
+        main_layout = QVBoxLayout(self)
+        main_layout.setContentsMargins(20, 15, 20, 15)
+        main_layout.setSpacing(12)
+        
+        # 文件选择区域
+        file_group = QGroupBox("📁 图像文件")
+        file_layout = QFormLayout()
+        self.file_labels = {}
+        self.browse_buttons = {}
+        for slot, title in (('first', "图像 A:"), ('second', "图像 B:")):
+            row = QHBoxLayout()
+            self.file_labels[slot] = QLabel("未选择文件")
+            row.addWidget(self.file_labels[slot], 1)
+            self.browse_buttons[slot] = QPushButton("📁 浏览...")
+            self.browse_buttons[slot].setMaximumWidth(100)
+            row.addWidget(self.browse_buttons[slot])
+            file_layout.addRow(title, row)
+        file_group.setLayout(file_layout)
+        main_layout.addWidget(file_group)
+        
+        # 合成选项
+        options_group = QGroupBox("⚙️ 合成选项")
+        options_layout = QHBoxLayout()
+        
+        form = QFormLayout()
+        self.operation_combo = QComboBox()
+        for key, name in OPERATIONS.items():
+            self.operation_combo.addItem(name, key)
+        form.addRow("方式:", self.operation_combo)
+        offset_layout = QHBoxLayout()
+        self.dx_spin = QSpinBox()
+        self.dy_spin = QSpinBox()
+        for spin in (self.dx_spin, self.dy_spin):
+            spin.setRange(-100000, 100000)
+            offset_layout.addWidget(spin)
+        form.addRow("B 的偏移 (x, y):", offset_layout)
+        options_layout.addLayout(form)
+        
+        mask_form = QFormLayout()
+        channel_layout = QHBoxLayout()
+        self.channel_checks = {}
+        for name in 'RGBA':
+            check = QCheckBox(name)
+            check.setChecked(name != 'A')
+            channel_layout.addWidget(check)
+            self.channel_checks[name] = check
+        mask_form.addRow("通道:", channel_layout)
+        self.mask_spin = QSpinBox()
+        self.mask_spin.setRange(0, 0xFF)
+        self.mask_spin.setValue(0xFF)
+        self.mask_spin.setDisplayIntegerBase(16)
+        self.mask_spin.setPrefix("0x")
+        mask_form.addRow("位掩码:", self.mask_spin)
+        options_layout.addLayout(mask_form)
+        
+        options_group.setLayout(options_layout)
+        main_layout.addWidget(options_group)
+        
+        # 按钮区域
+        button_layout = QHBoxLayout()
+        self.btn_combine = QPushButton("🔀 合成")
+        self.btn_combine.setMinimumHeight(36)
+        button_layout.addWidget(self.btn_combine)
+        self.btn_cancel = QPushButton("⏹ 取消")
+        self.btn_cancel.setEnabled(False)
+        self.btn_cancel.setMinimumHeight(36)
+        button_layout.addWidget(self.btn_cancel)
+        self.btn_save = QPushButton("💾 保存结果")
+        self.btn_save.setMinimumHeight(36)
+        button_layout.addWidget(self.btn_save)
+        main_layout.addLayout(button_layout)
+        
+        self.progress_bar = QProgressBar()
+        self.progress_bar.setRange(0, 1000)
+        main_layout.addWidget(self.progress_bar)
+        
+        # 结果预览
+        self.preview_label = QLabel("未合成")
+        self.preview_label.setAlignment(Qt.AlignCenter)
+        self.preview_label.setMinimumHeight(240)
+        main_layout.addWidget(self.preview_label, 1)
+        self.info_label = QLabel("")
+        main_layout.addWidget(self.info_label)
+        
+        # 日志输出
+        log_group = QGroupBox("📋 处理日志")
+        log_layout = QVBoxLayout()
+        
+        self.log_view = LogView()
+        self.log_view.setMaximumHeight(100)
+        log_layout.addWidget(self.log_view)
+        
+        log_group.setLayout(log_layout)
+        main_layout.addWidget(log_group)
+        
+        self.log("✅ 双图合成模块已加载", "success")
+        self.log("💡 提示: 两幅几乎相同的图像做 XOR / 绝对差，隐藏的差异会直接显现")
+    
+    def connect_signals(self):
+        """连接信号槽"""
+        self.browse_buttons['first'].clicked.connect(lambda: self.on_browse_clicked('first'))
+        self.browse_buttons['second'].clicked.connect(lambda: self.on_browse_clicked('second'))
+        self.operation_combo.currentIndexChanged.connect(self.on_options_changed)
+        self.dx_spin.valueChanged.connect(self.on_options_changed)
+        self.dy_spin.valueChanged.connect(self.on_options_changed)
+        self.mask_spin.valueChanged.connect(self.on_options_changed)
+        for check in self.channel_checks.values():
+            check.toggled.connect(self.on_options_changed)
+        self.btn_combine.clicked.connect(self.on_combine_clicked)
+        self.btn_cancel.clicked.connect(self.on_cancel_clicked)
+        self.btn_save.clicked.connect(self.on_save_clicked)
+    
+    # ==================== 图像 ====================
+    
+    def on_browse_clicked(self, slot):
+        """浏览文件"""
+        file_path, _ = QFileDialog.getOpenFileName(
+            self,
+            "选择图像 A" if slot == 'first' else "选择图像 B",
+            "",
+            "图像文件 (*.png *.bmp *.gif *.jpg *.jpeg *.tif *.tiff *.pgm *.ppm);;所有文件 (*)"
+        )
+        if file_path:
+            self.load_image(file_path, slot)
+    
+    def load_image(self, file_path, slot):
+        """在后台解码图像；超大图像解码到分块存储"""
+        self.log(f"⏳ 读取中: {os.path.basename(file_path)}")
+        self.browse_buttons[slot].setEnabled(False)
+        worker = TaskWorker(self._decode, slot, file_path)
+        worker.signals.finished.connect(self.on_image_loaded)
+        worker.signals.failed.connect(self.on_load_failed)
+        self.thread_pool.start(worker)
+    
+    def _decode(self, slot, file_path):
+        """解码图像（工作线程）"""
+        size = QImageReader(file_path).size()
+        if size.isValid() and size.width() * size.height() > self.TILED_PIXELS:
+            return slot, file_path, load_tiled_image(file_path)
+        image = QImage(file_path)
+        if image.isNull():
+            raise ValueError(f"无法读取图像: {os.path.basename(file_path)}")
+        return slot, file_path, qimage_to_array(image.convertToFormat(QImage.Format_RGBA8888))
+    
+    def on_image_loaded(self, loaded):
+        """图像解码完成：替换该位置的图像并自动合成"""
+        slot, file_path, image = loaded
+        self.browse_buttons[slot].setEnabled(True)
+        previous, self.images[slot] = self.images[slot], image
+        self._release(previous)
+        mode = " (分块模式)" if isinstance(image, TiledImage) else ""
+        self.file_labels[slot].setText(f"{os.path.basename(file_path)} ({image.shape[1]}x{image.shape[0]}){mode}")
+        self.log(f"📁 已载入: {os.path.basename(file_path)}{mode}")
+        self.on_options_changed()
+    
+    def on_load_failed(self, error):
+        """图像读取失败"""
+        for button in self.browse_buttons.values():
+            button.setEnabled(True)
+        self.log(f"❌ 读取失败: {error}", "error")
+    
+    def _release(self, *arrays):
+        """关闭不再使用的分块存储，删除其临时文件"""
+        for array in arrays:
+            if isinstance(array, TiledImage) and array is not self.result and \
+                    all(array is not image for image in self.images.values()):
+                array.close()
+    
+    # ==================== 合成 ====================
+    
+    def has_images(self):
+        """两幅图像都已载入"""
+        return all(image is not None for image in self.images.values())
+    
+    def is_tiled(self):
+        """任一输入为分块存储时需要手动合成"""
+        return any(isinstance(image, TiledImage) for image in self.images.values())
+    
+    def current_options(self):
+        """收集合成选项"""
+        return {
+            'operation': self.operation_combo.currentData(),
+            'offset': (self.dx_spin.value(), self.dy_spin.value()),
+            'channels': ''.join(name for name, check in self.channel_checks.items() if check.isChecked()),
+            'bit_mask': self.mask_spin.value(),
+        }
+    
+    def on_options_changed(self, *_):
+        """选项改变：内存中的图像自动重新合成"""
+        if not self.has_images() or self.is_tiled():
+            return
+        if self.running:
+            self._pending = True
+            return
+        self.start_combine()
+    
+    def on_combine_clicked(self):
+        """开始合成"""
+        if not self.has_images():
+            self.log("⚠️ 请先载入两幅图像", "warning")
+            return
+        if self.running:
+            return
+        self.start_combine()
+    
+    def start_combine(self):
+        """在线程池中合成"""
+        options = self.current_options()
+        first, second = self.images['first'], self.images['second']
+        y0, x0, height, width = overlap(first.shape, second.shape, *options['offset'])
+        if not height or not width:
+            self.log("⚠️ 当前偏移下两幅图像没有重叠部分", "warning")
+            return
+        self.running = True
+        self._pending = False
+        self.btn_combine.setEnabled(False)
+        self.btn_cancel.setEnabled(True)
+        for button in self.browse_buttons.values():
+            button.setEnabled(False)
+        self.progress_bar.setValue(0)
+        
+        worker = TaskWorker(self._combine, first, second, options)
+        self.processor.set_progress_callback(worker.signals.progress.emit)
+        worker.signals.progress.connect(self.on_progress)
+        worker.signals.finished.connect(self.on_combine_finished)
+        worker.signals.failed.connect(self.on_combine_failed)
+        if self.status and self.is_tiled():
+            self.status.begin_job("双图合成", unit="块")
+        self.thread_pool.start(worker)
+    
+    def _combine(self, first, second, options):
+        """合成并生成预览（工作线程）"""
+        if not self.processor.process(first, second, options=options):
+            return None
+        result = self.processor.get_result()
+        width, height = self.PREVIEW_SIZE
+        preview = result.thumbnail(width * 2, height * 2) if isinstance(result, TiledImage) else result
+        return result, preview, options
+    
+    def on_cancel_clicked(self):
+        """取消合成"""
+        if self.processor:
+            self._pending = False
+            self.processor.cancel()
+            self.btn_cancel.setEnabled(False)
+            self.log("⏹ 正在取消...")
+    
+    def on_progress(self, progress):
+        """更新进度"""
+        total = progress['total'] or 1
+        self.progress_bar.setValue(int(progress['current'] * 1000 / total))
+        if self.status and self.is_tiled():
+            self.status.update_progress(progress['current'], progress['total'])
+    
+    def _finish(self):
+        """合成结束（成功或失败）时恢复按钮"""
+        self.running = False
+        self.btn_combine.setEnabled(True)
+        self.btn_cancel.setEnabled(False)
+        for button in self.browse_buttons.values():
+            button.setEnabled(True)
+        if self.status and self.is_tiled():
+            self.status.end_job()
+    
+    def on_combine_finished(self, combined):
+        """合成完成：显示结果；期间选项有改动则再合成一次"""
+        self._finish()
+        if combined is None:
+            self.log("⏹ 合成已取消或失败", "warning")
+        else:
+            result, preview, options = combined
+            previous, self.result = self.result, result
+            self._release(previous)
+            self.progress_bar.setValue(self.progress_bar.maximum())
+            width, height = self.PREVIEW_SIZE
+            image = array_to_qimage(preview).scaled(width, height, Qt.KeepAspectRatio, Qt.FastTransformation)
+            self.preview_label.setPixmap(QPixmap.fromImage(image))
+            y0, x0, rows, cols = self.processor.region
+            info = (f"{OPERATIONS[options['operation']]} | 重叠 {cols}x{rows}，位于 A 的 ({x0}, {y0}) | "
+                    f"通道 {options['channels'] or '无'} | 位掩码 0x{options['bit_mask']:02X} | "
+                    f"用时 {self.processor.elapsed * 1000:.0f} ms")
+            self.info_label.setText(info)
+            self.log(f"✨ {info}", "success")
+        if self._pending:
+            self.on_options_changed()
+    
+    def on_combine_failed(self, error):
+        """合成出错"""
+        self._finish()
+        self.log(f"❌ 合成失败: {error}", "error")
+    
+    def on_save_clicked(self):
+        """保存全分辨率结果（分块结果在后台流式写出）"""
+        if self.result is None:
+            self.log("⚠️ 没有可保存的结果！", "warning")
+            return
+        file_path, _ = QFileDialog.getSaveFileName(self, "保存合成结果", "", "PNG图像 (*.png);;所有文件 (*)")
+        if not file_path:
+            return
+        if isinstance(self.result, TiledImage):
+            self.log(f"⏳ 正在写出: {file_path}")
+            worker = TaskWorker(self._save_tiled, self.result, file_path)
+            worker.signals.finished.connect(self.on_saved)
+            worker.signals.failed.connect(self.on_save_failed)
+            self.thread_pool.start(worker)
+        elif array_to_qimage(self.result).save(file_path):
+            self.log(f"💾 已保存到: {file_path}", "success")
+        else:
+            self.log(f"❌ 保存失败: {file_path}", "error")
+    
+    @staticmethod
+    def _save_tiled(store, file_path):
+        """流式写出分块结果（工作线程）"""
+        store.save_png(file_path)
+        return file_path
+    
+    def on_saved(self, file_path):
+        """分块结果写出完成"""
+        self.log(f"💾 已保存到: {file_path}", "success")
+    
+    def on_save_failed(self, error):
+        """分块结果写出失败"""
+        self.log(f"❌ 保存失败: {error}", "error")
+    
+    def log(self, message, level="info"):
+        """输出日志"""
+        self.log_view.append(message, level)
+        
+        # 更新状态栏
+        if self.parent_window and hasattr(self.parent_window, 'status'):
+            self.parent_window.status.show_message(message)
+    
+    def cleanup(self):
+        """清理资源"""
+        self._pending = False
+        for image in (*self.images.values(), self.result):
+            if isinstance(image, TiledImage):
+                image.close()
+        if self.processor:
+            self.processor.cleanup()
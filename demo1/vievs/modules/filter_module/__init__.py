@@ -0,0 +1,6 @@
+"""
+滤镜浏览模块
+"""
+from .filter_module_ui import FilterModuleUI
+
+__all__ = ['FilterModuleUI']
@@ -0,0 +1,256 @@
+# -*- coding: utf-8 -*-
+"""
+滤镜浏览模块UI - 对应 core.ColorFilterProcessor
+
+滤镜结果在线程池中渲染，按 (图像哈希, 滤镜) 存入按内存限制的 LRU 缓存；
+显示某个滤镜后立即在后台预取前后相邻的滤镜，因此逐个翻看时不需要等待
+"""
+
+import hashlib
+import os
+
+from PySide6.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QPushButton,
+                               QLabel, QGroupBox, QListWidget, QFileDialog)
+from PySide6.QtCore import Qt, QThreadPool
+from PySide6.QtGui import QImage, QPixmap, QKeySequence, QShortcut
+
+from vievs.widgets import LogView, TaskWorker, LRUCache, qimage_to_array, array_to_qimage
+
+
+class FilterModuleUI(QWidget):
+    """滤镜浏览模块UI"""
+    
+    # 预览区域的最大尺寸
+    PREVIEW_SIZE = (640, 400)
+    # 滤镜结果缓存的内存上限
+    CACHE_BYTES = 512 << 20
+    # 向前、向后各预取的滤镜数
+    PREFETCH = 2
+    
+    def __init__(self, parent=None, processor=None):
+        super().__init__(parent)
+        self.parent_window = parent
+        self.processor = processor  # ColorFilterProcessor 实例
+        self.thread_pool = QThreadPool.globalInstance()
+        self.current_image_path = ""
+        self.image_array = None
+        self.image_hash = None
+        # (图像哈希, 滤镜下标) -> (结果数组, 预览 QImage)
+        self.cache = LRUCache(256, max_bytes=self.CACHE_BYTES,
+                              size_of=lambda item: item[0].nbytes + item[1].sizeInBytes())
+        self._pending = set()  # 正在渲染的缓存键
+        
+        if self.processor:
+            self.processor.initialize()
+        
+        self.init_ui()
+        self.connect_signals()
+    
+    def init_ui(self):
+        """初始化界面"""
+        main_layout = QVBoxLayout(self)
+        main_layout.setContentsMargins(20, 15, 20, 15)
+        main_layout.setSpacing(12)
+        
+        # 文件选择区域
+        file_group = QGroupBox("📁 图像文件")
+        file_layout = QHBoxLayout()
+        
+        self.file_label = QLabel("未选择文件")
+        file_layout.addWidget(self.file_label)
+        
+        self.btn_browse = QPushButton("📁 浏览...")
+        self.btn_browse.setMaximumWidth(100)
+        file_layout.addWidget(self.btn_browse)
+        
+        file_group.setLayout(file_layout)
+        main_layout.addWidget(file_group)
+        
+        # 滤镜列表 + 预览
+        body_layout = QHBoxLayout()
+        
+        self.filter_list = QListWidget()
+        self.filter_list.setMaximumWidth(200)
+        if self.processor:
+            self.filter_list.addItems(self.processor.filter_names())
+        body_layout.addWidget(self.filter_list)
+        
+        view_layout = QVBoxLayout()
+        self.preview_label = QLabel("未加载图像")
+        self.preview_label.setAlignment(Qt.AlignCenter)
+        self.preview_label.setMinimumHeight(240)
+        view_layout.addWidget(self.preview_label, 1)
+        
+        self.info_label = QLabel("")
+        view_layout.addWidget(self.info_label)
+        
+        button_layout = QHBoxLayout()
+        self.btn_prev = QPushButton("◀ 上一个")
+        self.btn_next = QPushButton("下一个 ▶")
+        self.btn_save = QPushButton("💾 保存结果")
+        button_layout.addWidget(self.btn_prev)
+        button_layout.addWidget(self.btn_next)
+        button_layout.addStretch()
+        button_layout.addWidget(self.btn_save)
+        view_layout.addLayout(button_layout)
+        
+        body_layout.addLayout(view_layout, 1)
+        main_layout.addLayout(body_layout, 1)
+        
+        # 日志输出
+        log_group = QGroupBox("📋 处理日志")
+        log_layout = QVBoxLayout()
+        
+        self.log_view = LogView()
+        self.log_view.setMaximumHeight(140)
+        log_layout.addWidget(self.log_view)
+        
+        log_group.setLayout(log_layout)
+        main_layout.addWidget(log_group)
+        
+        # 初始日志
+        self.log("✅ 滤镜浏览模块已加载", "success")
+        self.log("💡 提示: 加载图像后用 ←/→ 或列表切换滤镜")
+    
+    def connect_signals(self):
+        """连接信号槽"""
+        self.btn_browse.clicked.connect(self.on_browse_clicked)
+        self.filter_list.currentRowChanged.connect(self.show_filter)
+        self.btn_prev.clicked.connect(lambda: self.step_filter(-1))
+        self.btn_next.clicked.connect(lambda: self.step_filter(1))
+        self.btn_save.clicked.connect(self.on_save_clicked)
+        QShortcut(QKeySequence(Qt.Key_Left), self, lambda: self.step_filter(-1))
+        QShortcut(QKeySequence(Qt.Key_Right), self, lambda: self.step_filter(1))
+    
+    def on_browse_clicked(self):
+        """浏览文件"""
+        file_path, _ = QFileDialog.getOpenFileName(
+            self,
+            "选择图像文件",
+            "",
+            "图像文件 (*.png *.bmp *.gif *.jpg *.jpeg *.tif *.tiff);;所有文件 (*)"
+        )
+        if file_path:
+            self.load_image(file_path)
+    
+    def load_image(self, file_path):
+        """加载图像（统一转换为 RGBA），计算内容哈希作为缓存键"""
+        image = QImage(file_path)
+        if image.isNull():
+            self.log(f"❌ 无法读取图像: {os.path.basename(file_path)}", "error")
+            return False
+        self.current_image_path = file_path
+        self.image_array = qimage_to_array(image.convertToFormat(QImage.Format_RGBA8888))
+        # 同一幅图像重新加载时仍能命中缓存
+        self.image_hash = hashlib.blake2b(self.image_array.data, digest_size=16).hexdigest()
+        self.file_label.setText(os.path.basename(file_path))
+        self.log(f"📁 已选择: {os.path.basename(file_path)} ({image.width()}x{image.height()})")
+        if self.filter_list.currentRow() < 0:
+            self.filter_list.setCurrentRow(0)
+        else:
+            self.show_filter(self.filter_list.currentRow())
+        return True
+    
+    def step_filter(self, delta):
+        """切换到前 / 后一个滤镜（循环）"""
+        count = self.filter_list.count()
+        if count:
+            self.filter_list.setCurrentRow((self.filter_list.currentRow() + delta) % count)
+    
+    def show_filter(self, index):
+        """显示滤镜结果：命中缓存立即显示，否则后台渲染；然后预取相邻滤镜"""
+        if self.image_array is None or index < 0:
+            return
+        cached = self.cache.get((self.image_hash, index))
+        if cached:
+            self.display(index, cached)
+        else:
+            self.preview_label.setText("⏳ 渲染中...")
+            self.render(index)
+        count = self.filter_list.count()
+        for offset in range(1, self.PREFETCH + 1):
+            self.render((index + offset) % count)
+            self.render((index - offset) % count)
+    
+    def render(self, index):
+        """在线程池中渲染滤镜（已缓存或正在渲染时跳过）"""
+        key = (self.image_hash, index)
+        if key in self.cache or key in self._pending:
+            return
+        self._pending.add(key)
+        worker = TaskWorker(self._render, key, self.image_array, index)
+        worker.signals.finished.connect(self.on_rendered)
+        self.thread_pool.start(worker)
+    
+    def _render(self, key, image, index):
+        """应用滤镜并生成预览图（工作线程）；出错时返回 (key, None, 错误信息)，以便只撤销这一项"""
+        try:
+            result = self.processor.apply_filter(image, index)
+            width, height = self.PREVIEW_SIZE
+            preview = array_to_qimage(result).scaled(width, height, Qt.KeepAspectRatio, Qt.SmoothTransformation)
+        except Exception as e:
+            return key, None, str(e)
+        return key, result, preview
+    
+    def on_rendered(self, rendered):
+        """渲染完成：写入缓存，若正是当前滤镜则显示"""
+        key, result, preview = rendered
+        if result is None:
+            self.on_render_failed(key, preview)
+            return
+        self._pending.discard(key)
+        if key[0] != self.image_hash:
+            return
+        self.cache.put(key, (result, preview))
+        if key[1] == self.filter_list.currentRow():
+            self.display(key[1], (result, preview))
+    
+    def on_render_failed(self, key, error):
+        """渲染出错：只移除失败的这一项，其他在途的预取不受影响"""
+        self._pending.discard(key)
+        if key[0] != self.image_hash:
+            return
+        if key[1] == self.filter_list.currentRow():
+            self.preview_label.setText("❌ 渲染失败")
+        self.log(f"❌ 滤镜渲染失败 ({self.filter_list.item(key[1]).text()}): {error}", "error")
+    
+    def display(self, index, cached):
+        """显示缓存的预览图"""
+        result, preview = cached
+        self.preview_label.setPixmap(QPixmap.fromImage(preview))
+        self.info_label.setText(
+            f"{self.filter_list.item(index).text()}: {result.shape[1]}x{result.shape[0]} | "
+            f"缓存 {len(self.cache)} 项 / {self.cache.total_bytes / (1 << 20):.0f} MB")
+    
+    def on_save_clicked(self):
+        """保存当前滤镜的全分辨率结果"""
+        cached = self.cache.get((self.image_hash, self.filter_list.currentRow()))
+        if not cached:
+            self.log("⚠️ 没有可保存的结果！", "warning")
+            return
+        file_path, _ = QFileDialog.getSaveFileName(
+            self,
+            "保存滤镜结果",
+            "",
+            "PNG图像 (*.png);;BMP图像 (*.bmp);;所有文件 (*)"
+        )
+        if not file_path:
+            return
+        if array_to_qimage(cached[0]).save(file_path):
+            self.log(f"💾 已保存到: {file_path}", "success")
+        else:
+            self.log(f"❌ 保存失败: {file_path}", "error")
+    
+    def log(self, message, level="info"):
+        """输出日志"""
+        self.log_view.append(message, level)
+        
+        # 更新状态栏
+        if self.parent_window and hasattr(self.parent_window, 'status'):
+            self.parent_window.status.show_message(message)
+    
+    def cleanup(self):
+        """清理资源"""
+        self.cache.clear()
+        if self.processor:
+            self.processor.cleanup()
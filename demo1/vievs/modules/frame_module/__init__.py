@@ -0,0 +1,6 @@
+"""
+单帧图处理模块
+"""
+from .frame_module_ui import FrameModuleUI
+
+__all__ = ['FrameModuleUI']
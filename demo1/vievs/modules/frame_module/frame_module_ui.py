@@ -0,0 +1,469 @@
+# -*- coding: utf-8 -*-
+"""
+单帧图处理模块UI - 对应 core.FrameReducer / core.AnimationDecoder
+
+帧源可以是 GIF / APNG 动画，也可以是一组图像文件（按文件名排序）。
+- 单帧查看：原始帧、与上一帧差分、与首帧异或，可选增强（拉伸 / 非零置白）
+- 多帧归约：相邻差分、异或累计、最大 / 最小 / 中位数 / 平均，后台按块流式计算，可取消
+- 帧延时解码：数值、ASCII、两种取值时按位打包
+"""
+
+import os
+
+from PySide6.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QPushButton,
+                               QLabel, QGroupBox, QComboBox, QSpinBox, QFormLayout,
+                               QFileDialog, QProgressBar)
+from PySide6.QtCore import Qt, QThreadPool
+from PySide6.QtGui import QImage, QPixmap
+
+from vievs.widgets import LogView, TaskWorker, ResultView, array_to_qimage, qimage_to_array
+from core.modules.frame_reducer import (REDUCTIONS, FRAME_VIEWS, ENHANCES, ImageSequence,
+                                        decode_delays, enhance, to_rgba)
+
+
+def load_image_array(path):
+    """用 Qt 读取任意格式的图像为 RGBA 数组（图像序列的 loader，可在工作线程中调用）"""
+    image = QImage(path)
+    if image.isNull():
+        raise ValueError(f"无法读取图像: {os.path.basename(path)}")
+    return qimage_to_array(image.convertToFormat(QImage.Format_RGBA8888))
+
+
+class FrameModuleUI(QWidget):
+    """单帧图处理模块UI（单帧查看 + 多帧归约）"""
+    
+    # 预览区域的最大尺寸
+    PREVIEW_SIZE = (420, 320)
+    
+    def __init__(self, parent=None, processor=None, decoder=None):
+        super().__init__(parent)
+        self.parent_window = parent
+        self.processor = processor  # FrameReducer 实例
+        self.decoder = decoder  # AnimationDecoder 实例
+        self.thread_pool = QThreadPool.globalInstance()
+        self.status = getattr(parent, 'status', None)  # MainWindow 的 StatusService
+        self.source = None  # 当前帧源：decoder 或 ImageSequence
+        self.source_name = ""
+        self.view_image = None  # 当前单帧查看结果（增强后）
+        self.result_image = None  # 当前归约结果（增强后）
+        self.result = None
+        self._view_request = None  # 最近一次请求的 (帧源, 帧号, 查看方式, 增强)，过期的结果丢弃
+        self._loading_path = None
+        
+        for core in (self.processor, self.decoder):
+            if core:
+                core.initialize()
+        
+        self.init_ui()
+        self.connect_signals()
+    
+    def init_ui(self):
+        """初始化界面"""
+        main_layout = QVBoxLayout(self)
+        main_layout.setContentsMargins(20, 15, 20, 15)
+        main_layout.setSpacing(12)
+        
+        # 帧源
+        source_group = QGroupBox("📁 帧源")
+        source_layout = QHBoxLayout()
+        self.source_label = QLabel("未加载帧源")
+        source_layout.addWidget(self.source_label, 1)
+        self.btn_open_animation = QPushButton("🎬 打开动画...")
+        self.btn_open_sequence = QPushButton("🖼 打开图像序列...")
+        source_layout.addWidget(self.btn_open_animation)
+        source_layout.addWidget(self.btn_open_sequence)
+        source_group.setLayout(source_layout)
+        main_layout.addWidget(source_group)
+        
+        # 选项
+        options_group = QGroupBox("⚙️ 归约选项")
+        options_layout = QHBoxLayout()
+        form = QFormLayout()
+        self.reduction_combo = QComboBox()
+        for key, name in REDUCTIONS.items():
+            self.reduction_combo.addItem(name, key)
+        form.addRow("归约方式:", self.reduction_combo)
+        self.enhance_combo = QComboBox()
+        for key, name in ENHANCES.items():
+            self.enhance_combo.addItem(name, key)
+        form.addRow("增强:", self.enhance_combo)
+        options_layout.addLayout(form)
+        
+        range_form = QFormLayout()
+        range_layout = QHBoxLayout()
+        self.start_spin = QSpinBox()
+        self.end_spin = QSpinBox()
+        self.step_spin = QSpinBox()
+        self.step_spin.setRange(1, 1 << 20)
+        for spin in (self.start_spin, self.end_spin):
+            spin.setRange(0, 0)
+        range_layout.addWidget(self.start_spin)
+        range_layout.addWidget(QLabel("~"))
+        range_layout.addWidget(self.end_spin)
+        range_layout.addWidget(QLabel("步长"))
+        range_layout.addWidget(self.step_spin)
+        range_form.addRow("帧范围:", range_layout)
+        self.memory_spin = QSpinBox()
+        self.memory_spin.setRange(16, 8192)
+        self.memory_spin.setValue(self.processor.MEMORY_BYTES >> 20 if self.processor else 256)
+        self.memory_spin.setSuffix(" MB")
+        range_form.addRow("内存上限:", self.memory_spin)
+        options_layout.addLayout(range_form)
+        
+        button_layout = QVBoxLayout()
+        self.btn_reduce = QPushButton("🚀 开始归约")
+        self.btn_cancel = QPushButton("⏹ 取消")
+        self.btn_cancel.setEnabled(False)
+        button_layout.addWidget(self.btn_reduce)
+        button_layout.addWidget(self.btn_cancel)
+        options_layout.addLayout(button_layout)
+        options_group.setLayout(options_layout)
+        main_layout.addWidget(options_group)
+        
+        self.progress_bar = QProgressBar()
+        self.progress_bar.setRange(0, 1000)
+        main_layout.addWidget(self.progress_bar)
+        
+        # 单帧查看 + 归约结果
+        body_layout = QHBoxLayout()
+        
+        view_group = QGroupBox("🔍 单帧查看")
+        view_layout = QVBoxLayout()
+        view_bar = QHBoxLayout()
+        self.view_combo = QComboBox()
+        for key, name in FRAME_VIEWS.items():
+            self.view_combo.addItem(name, key)
+        view_bar.addWidget(self.view_combo)
+        view_bar.addWidget(QLabel("帧:"))
+        self.frame_spin = QSpinBox()
+        self.frame_spin.setRange(0, 0)
+        view_bar.addWidget(self.frame_spin)
+        view_bar.addStretch()
+        self.btn_save_view = QPushButton("💾 保存")
+        view_bar.addWidget(self.btn_save_view)
+        view_layout.addLayout(view_bar)
+        self.view_label = QLabel("未加载帧源")
+        self.view_label.setAlignment(Qt.AlignCenter)
+        self.view_label.setMinimumHeight(200)
+        view_layout.addWidget(self.view_label, 1)
+        view_group.setLayout(view_layout)
+        body_layout.addWidget(view_group, 1)
+        
+        result_group = QGroupBox("🧮 归约结果")
+        result_layout = QVBoxLayout()
+        result_bar = QHBoxLayout()
+        self.result_info_label = QLabel("")
+        result_bar.addWidget(self.result_info_label, 1)
+        self.btn_save_result = QPushButton("💾 保存")
+        result_bar.addWidget(self.btn_save_result)
+        result_layout.addLayout(result_bar)
+        self.result_label = QLabel("尚未归约")
+        self.result_label.setAlignment(Qt.AlignCenter)
+        self.result_label.setMinimumHeight(200)
+        result_layout.addWidget(self.result_label, 1)
+        result_group.setLayout(result_layout)
+        body_layout.addWidget(result_group, 1)
+        
+        main_layout.addLayout(body_layout, 1)
+        
+        # 帧延时解码
+        delay_group = QGroupBox("⏱ 帧延时解码")
+        delay_layout = QVBoxLayout()
+        self.btn_decode_delays = QPushButton("🔓 解码帧延时")
+        self.btn_decode_delays.setMaximumWidth(160)
+        delay_layout.addWidget(self.btn_decode_delays)
+        self.delay_view = ResultView()
+        self.delay_view.setMaximumHeight(120)
+        delay_layout.addWidget(self.delay_view)
+        delay_group.setLayout(delay_layout)
+        main_layout.addWidget(delay_group)
+        
+        # 日志输出
+        log_group = QGroupBox("📋 处理日志")
+        log_layout = QVBoxLayout()
+        
+        self.log_view = LogView()
+        self.log_view.setMaximumHeight(100)
+        log_layout.addWidget(self.log_view)
+        
+        log_group.setLayout(log_layout)
+        main_layout.addWidget(log_group)
+        
+        self.log("✅ 单帧图处理模块已加载", "success")
+        self.log("💡 提示: 隐藏在动画里的信息常常要差分、异或或叠加多帧才能看到")
+    
+    def connect_signals(self):
+        """连接信号槽"""
+        self.btn_open_animation.clicked.connect(self.on_open_animation_clicked)
+        self.btn_open_sequence.clicked.connect(self.on_open_sequence_clicked)
+        self.frame_spin.valueChanged.connect(self.request_view)
+        self.view_combo.currentIndexChanged.connect(self.request_view)
+        self.enhance_combo.currentIndexChanged.connect(self.on_enhance_changed)
+        self.btn_reduce.clicked.connect(self.on_reduce_clicked)
+        self.btn_cancel.clicked.connect(self.on_cancel_clicked)
+        self.btn_save_view.clicked.connect(lambda: self.save_image(self.view_image, "保存单帧结果"))
+        self.btn_save_result.clicked.connect(lambda: self.save_image(self.result_image, "保存归约结果"))
+        self.btn_decode_delays.clicked.connect(self.on_decode_delays_clicked)
+    
+    # ==================== 帧源 ====================
+    
+    def on_open_animation_clicked(self):
+        """打开 GIF / APNG（在后台建立帧索引）"""
+        file_path, _ = QFileDialog.getOpenFileName(
+            self,
+            "选择动画文件",
+            "",
+            "动画文件 (*.gif *.png *.apng);;所有文件 (*)"
+        )
+        if file_path:
+            self.load_animation(file_path)
+    
+    def load_animation(self, file_path):
+        """后台扫描动画帧索引"""
+        self.source = None
+        self._loading_path = file_path
+        self.source_label.setText(f"⏳ 扫描 {os.path.basename(file_path)}...")
+        worker = TaskWorker(self.decoder.process, file_path)
+        worker.signals.finished.connect(self.on_animation_loaded)
+        worker.signals.failed.connect(self.on_source_failed)
+        self.thread_pool.start(worker)
+    
+    def on_animation_loaded(self, success):
+        """动画索引完成"""
+        file_path = self._loading_path
+        if not success:
+            self.source_label.setText("未加载帧源")
+            self.log(f"❌ 无法解析动画: {os.path.basename(file_path)}", "error")
+            return
+        result = self.decoder.get_result()
+        self.set_source(self.decoder, f"{os.path.basename(file_path)} ({result['format']} "
+                                      f"{result['width']}x{result['height']}, {result['frame_count']} 帧)")
+    
+    def on_open_sequence_clicked(self):
+        """打开一组图像文件作为帧序列"""
+        file_paths, _ = QFileDialog.getOpenFileNames(
+            self,
+            "选择图像序列",
+            "",
+            "图像文件 (*.png *.bmp *.jpg *.jpeg *.gif *.tif *.tiff);;所有文件 (*)"
+        )
+        if file_paths:
+            self.load_sequence(sorted(file_paths))
+    
+    def load_sequence(self, file_paths):
+        """以第一帧的尺寸为准建立图像序列"""
+        try:
+            sequence = ImageSequence(file_paths, load_image_array)
+        except ValueError as e:
+            self.log(f"❌ {e}", "error")
+            return
+        self.set_source(sequence, f"图像序列: {len(file_paths)} 帧 "
+                                  f"({sequence.width}x{sequence.height}, 从 {os.path.basename(file_paths[0])} 开始)")
+    
+    def on_source_failed(self, error):
+        """帧源加载出错"""
+        self.source_label.setText("未加载帧源")
+        self.log(f"❌ 加载失败: {error}", "error")
+    
+    def set_source(self, source, name):
+        """切换帧源：重置帧范围并显示第 0 帧"""
+        self.source = source
+        self.source_name = name
+        self.source_label.setText(name)
+        self.log(f"📁 {name}", "success")
+        last = source.frame_count - 1
+        self.frame_spin.setRange(0, last)
+        self.start_spin.setRange(0, last)
+        self.end_spin.setRange(1, source.frame_count)
+        self.start_spin.setValue(0)
+        self.end_spin.setValue(source.frame_count)
+        self.step_spin.setValue(1)
+        self.btn_decode_delays.setEnabled(source is self.decoder)
+        self.request_view()
+    
+    # ==================== 单帧查看 ====================
+    
+    def request_view(self, *_):
+        """在后台计算单帧查看结果（只显示最近一次请求的结果）"""
+        if self.source is None:
+            return
+        request = (self.source, self.frame_spin.value(), self.view_combo.currentData(),
+                   self.enhance_combo.currentData())
+        self._view_request = request
+        worker = TaskWorker(self._compute_view, request)
+        worker.signals.finished.connect(self.on_view_ready)
+        worker.signals.failed.connect(self.on_view_failed)
+        self.thread_pool.start(worker)
+    
+    def _compute_view(self, request):
+        """计算单帧查看结果（工作线程）"""
+        source, index, view, mode = request
+        if request != self._view_request:
+            return request, None
+        image = self.processor.frame_view(source, index, view)
+        if view != 'frame':
+            image = enhance(image, mode)
+        return request, to_rgba(image)
+    
+    def on_view_ready(self, ready):
+        """显示单帧查看结果"""
+        request, image = ready
+        if image is None or request != self._view_request:
+            return
+        self.view_image = image
+        self.set_preview(self.view_label, image)
+    
+    def on_view_failed(self, error):
+        """单帧查看出错"""
+        self.log(f"❌ 单帧查看失败: {error}", "error")
+    
+    def on_enhance_changed(self):
+        """增强方式改变：刷新单帧查看与归约结果"""
+        self.request_view()
+        if self.result:
+            self.show_result()
+    
+    def set_preview(self, label, image):
+        """把数组缩放显示到标签中"""
+        width, height = self.PREVIEW_SIZE
+        qimage = array_to_qimage(image)
+        label.setPixmap(QPixmap.fromImage(qimage.scaled(width, height, Qt.KeepAspectRatio,
+                                                        Qt.FastTransformation)))
+    
+    # ==================== 多帧归约 ====================
+    
+    def on_reduce_clicked(self):
+        """开始归约"""
+        if self.source is None:
+            self.log("⚠️ 请先打开动画或图像序列", "warning")
+            return
+        reduction = self.reduction_combo.currentData()
+        options = {
+            'reduction': reduction,
+            'start': self.start_spin.value(),
+            'end': self.end_spin.value(),
+            'step': self.step_spin.value(),
+            'memory_mb': self.memory_spin.value(),
+        }
+        if options['start'] >= options['end']:
+            self.log("⚠️ 帧范围为空", "warning")
+            return
+        total = len(range(options['start'], options['end'], options['step']))
+        self.btn_reduce.setEnabled(False)
+        self.btn_cancel.setEnabled(True)
+        self.progress_bar.setValue(0)
+        self.log(f"🚀 {REDUCTIONS[reduction]}: 第 {options['start']}~{options['end'] - 1} 帧, "
+                 f"步长 {options['step']}, 共 {total} 帧")
+        
+        worker = TaskWorker(self.processor.process, self.source, options=options)
+        self.processor.set_progress_callback(worker.signals.progress.emit)
+        worker.signals.progress.connect(self.on_progress)
+        worker.signals.finished.connect(self.on_reduce_finished)
+        worker.signals.failed.connect(self.on_reduce_failed)
+        if self.status:
+            self.status.begin_job("多帧归约", total=total, unit="帧")
+        self.thread_pool.start(worker)
+    
+    def on_cancel_clicked(self):
+        """取消归约"""
+        if self.processor:
+            self.processor.cancel()
+            self.btn_cancel.setEnabled(False)
+            self.log("⏹ 正在取消...")
+    
+    def on_progress(self, progress):
+        """更新进度"""
+        total = progress['total'] or 1
+        self.progress_bar.setValue(int(progress['current'] * 1000 / total))
+        if self.status:
+            self.status.update_progress(progress['current'], progress['total'])
+    
+    def on_reduce_finished(self, success):
+        """归约结束：显示结果"""
+        self.btn_reduce.setEnabled(True)
+        self.btn_cancel.setEnabled(False)
+        if self.status:
+            self.status.end_job()
+        result = self.processor.get_result()
+        if not success or not result:
+            self.log("❌ 归约失败", "error")
+            return
+        self.result = result
+        state = "⏹ 已取消（部分结果）" if result['cancelled'] else "✨ 完成"
+        self.log(f"{state}: {result['frames']} 帧, 用时 {result['elapsed']:.2f}s"
+                 + (f", 分 {result['passes']} 遍统计" if result['passes'] > 1 else ""),
+                 "warning" if result['cancelled'] else "success")
+        if not result['cancelled']:
+            self.progress_bar.setValue(self.progress_bar.maximum())
+        self.show_result()
+    
+    def on_reduce_failed(self, error):
+        """归约出错"""
+        self.btn_reduce.setEnabled(True)
+        self.btn_cancel.setEnabled(False)
+        if self.status:
+            self.status.end_job()
+        self.log(f"❌ 归约失败: {error}", "error")
+    
+    def show_result(self):
+        """按当前增强方式显示归约结果（差分与异或才增强）"""
+        image = self.result['image']
+        if self.result['reduction'] in ('diff', 'xor'):
+            image = enhance(image, self.enhance_combo.currentData())
+        self.result_image = to_rgba(image)
+        changed = int((self.result['image'] != 0).any(axis=2).sum())
+        info = REDUCTIONS[self.result['reduction']]
+        if self.result['reduction'] in ('diff', 'xor'):
+            info += f" | 有变化的像素 {changed:,}"
+        self.result_info_label.setText(info)
+        self.set_preview(self.result_label, self.result_image)
+    
+    def save_image(self, image, title):
+        """保存全分辨率结果"""
+        if image is None:
+            self.log("⚠️ 没有可保存的结果！", "warning")
+            return
+        file_path, _ = QFileDialog.getSaveFileName(self, title, "", "PNG图像 (*.png);;所有文件 (*)")
+        if not file_path:
+            return
+        if array_to_qimage(image).save(file_path):
+            self.log(f"💾 已保存到: {file_path}", "success")
+        else:
+            self.log(f"❌ 保存失败: {file_path}", "error")
+    
+    # ==================== 帧延时 ====================
+    
+    def on_decode_delays_clicked(self):
+        """把帧延时当作数据解码，结果写入查看器并发布"""
+        if self.source is not self.decoder:
+            self.log("⚠️ 帧延时只对动画有效", "warning")
+            return
+        decoded = decode_delays(self.decoder.delays(), gif=self.decoder.is_gif)
+        lines = [f"取值 ({len(decoded['values'])} 帧): {' '.join(map(str, decoded['values']))}"]
+        if decoded['ascii'] is not None:
+            lines.append(f"ASCII: {decoded['ascii']}")
+        if decoded['bits'] is not None:
+            lines.append(f"二进制: {decoded['bits']}")
+        if decoded['bytes']:
+            lines.append(f"字节: {decoded['bytes'].hex()}  |  {decoded['bytes'].decode('latin-1')!r}")
+            lines.append(f"取反: {decoded['inverted'].hex()}  |  {decoded['inverted'].decode('latin-1')!r}")
+        text = "\n".join(lines)
+        self.delay_view.set_text(text)
+        self.log(f"⏱ 已解码 {len(decoded['values'])} 个帧延时")
+        if self.parent_window and hasattr(self.parent_window, 'publish_data'):
+            self.parent_window.publish_data("帧延时", decoded['ascii'] or text)
+    
+    def log(self, message, level="info"):
+        """输出日志"""
+        self.log_view.append(message, level)
+        
+        # 更新状态栏
+        if self.parent_window and hasattr(self.parent_window, 'status'):
+            self.parent_window.status.show_message(message)
+    
+    def cleanup(self):
+        """清理资源"""
+        self._view_request = None
+        for core in (self.processor, self.decoder):
+            if core:
+                core.cleanup()
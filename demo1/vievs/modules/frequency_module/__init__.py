@@ -0,0 +1,6 @@
+"""
+颜色频率模块
+"""
+from .frequency_module_ui import FrequencyModuleUI
+
+__all__ = ['FrequencyModuleUI']
@@ -0,0 +1,323 @@
+# -*- coding: utf-8 -*-
+"""
+颜色频率模块UI - 对应 core.ColorFrequencyAnalyzer
+
+调色板 PNG / GIF 直接按索引统计，其他格式由 Qt 解码为 RGBA 后统计；读取与统计都在线程池中进行。
+颜色表按像素数排名（最多列出 MAX_ROWS 行），选中一行即在缩略图上高亮该颜色的全部像素；
+颜色可按次数、通道值或字母表映射为字符，还原按颜色频率编码的信息。
+"""
+
+import os
+
+from PySide6.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QPushButton,
+                               QLabel, QGroupBox, QComboBox, QSpinBox, QLineEdit,
+                               QFormLayout, QFileDialog, QTableWidget, QTableWidgetItem,
+                               QHeaderView, QAbstractItemView)
+from PySide6.QtCore import Qt, QThreadPool
+from PySide6.QtGui import QImage, QPixmap, QColor
+
+import numpy as np
+
+from vievs.widgets import LogView, TaskWorker, ResultView, array_to_qimage, qimage_to_array
+from core.modules.color_frequency import MAPPINGS, ORDERS, load_indexed, unpack_colour
+
+
+# 英文字母按使用频率从高到低（含空格），作为字母表映射的默认值
+ENGLISH_FREQUENCY = " etaoinshrdlcumwfgypbvkjxqz"
+
+
+class FrequencyModuleUI(QWidget):
+    """颜色频率模块UI"""
+    
+    # 颜色表最多列出的行数
+    MAX_ROWS = 2000
+    # 预览的最大边长
+    PREVIEW_SIDE = 480
+    
+    def __init__(self, parent=None, processor=None):
+        super().__init__(parent)
+        self.parent_window = parent
+        self.processor = processor  # ColorFrequencyAnalyzer 实例
+        self.thread_pool = QThreadPool.globalInstance()
+        self.file_path = None
+        self.result = None
+        self.thumbnail = None
+        self._highlight_request = None  # 最近一次请求高亮的排名，过期的结果丢弃
+        
+        if self.processor:
+            self.processor.initialize()
+        
+        self.init_ui()
+        self.connect_signals()
+    
+    def init_ui(self):
+        """初始化界面"""
+        main_layout = QVBoxLayout(self)
+        main_layout.setContentsMargins(20, 15, 20, 15)
+        main_layout.setSpacing(12)
+        
+        # 文件选择区域
+        file_group = QGroupBox("📁 图像文件")
+        file_layout = QVBoxLayout()
+        
+        path_layout = QHBoxLayout()
+        self.file_label = QLabel("未选择文件")
+        path_layout.addWidget(self.file_label, 1)
+        self.btn_browse = QPushButton("📁 浏览...")
+        self.btn_browse.setMaximumWidth(100)
+        path_layout.addWidget(self.btn_browse)
+        file_layout.addLayout(path_layout)
+        
+        self.summary_label = QLabel("")
+        file_layout.addWidget(self.summary_label)
+        
+        file_group.setLayout(file_layout)
+        main_layout.addWidget(file_group)
+        
+        # 颜色表 + 高亮预览
+        body_layout = QHBoxLayout()
+        
+        self.colour_table = QTableWidget(0, 5)
+        self.colour_table.setHorizontalHeaderLabels(["排名", "颜色", "RGBA", "像素数", "占比"])
+        self.colour_table.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeToContents)
+        self.colour_table.verticalHeader().setVisible(False)
+        self.colour_table.setEditTriggers(QTableWidget.NoEditTriggers)
+        self.colour_table.setSelectionBehavior(QAbstractItemView.SelectRows)
+        self.colour_table.setSelectionMode(QAbstractItemView.SingleSelection)
+        self.colour_table.setMaximumWidth(440)
+        body_layout.addWidget(self.colour_table)
+        
+        view_layout = QVBoxLayout()
+        self.preview_label = QLabel("未加载图像")
+        self.preview_label.setAlignment(Qt.AlignCenter)
+        self.preview_label.setMinimumHeight(240)
+        view_layout.addWidget(self.preview_label, 1)
+        self.highlight_label = QLabel("")
+        self.highlight_label.setWordWrap(True)
+        view_layout.addWidget(self.highlight_label)
+        body_layout.addLayout(view_layout, 1)
+        
+        main_layout.addLayout(body_layout, 1)
+        
+        # 频率解码
+        decode_group = QGroupBox("🔓 频率解码")
+        decode_layout = QVBoxLayout()
+        form_layout = QHBoxLayout()
+        form = QFormLayout()
+        self.mapping_combo = QComboBox()
+        for key, name in MAPPINGS.items():
+            self.mapping_combo.addItem(name, key)
+        form.addRow("映射:", self.mapping_combo)
+        self.order_combo = QComboBox()
+        for key, name in ORDERS.items():
+            self.order_combo.addItem(name, key)
+        form.addRow("顺序:", self.order_combo)
+        form_layout.addLayout(form)
+        
+        filter_form = QFormLayout()
+        self.min_count_spin = QSpinBox()
+        self.min_count_spin.setRange(1, 1 << 30)
+        filter_form.addRow("最少像素数:", self.min_count_spin)
+        self.limit_spin = QSpinBox()
+        self.limit_spin.setRange(0, 1 << 20)
+        self.limit_spin.setSpecialValueText("不限")
+        filter_form.addRow("最多颜色数:", self.limit_spin)
+        form_layout.addLayout(filter_form)
+        decode_layout.addLayout(form_layout)
+        
+        alphabet_layout = QHBoxLayout()
+        alphabet_layout.addWidget(QLabel("字母表:"))
+        self.alphabet_edit = QLineEdit(ENGLISH_FREQUENCY)
+        alphabet_layout.addWidget(self.alphabet_edit, 1)
+        self.btn_decode = QPushButton("🔓 解码")
+        alphabet_layout.addWidget(self.btn_decode)
+        decode_layout.addLayout(alphabet_layout)
+        
+        self.decode_view = ResultView()
+        self.decode_view.setMaximumHeight(110)
+        decode_layout.addWidget(self.decode_view)
+        decode_group.setLayout(decode_layout)
+        main_layout.addWidget(decode_group)
+        
+        # 日志输出
+        log_group = QGroupBox("📋 处理日志")
+        log_layout = QVBoxLayout()
+        
+        self.log_view = LogView()
+        self.log_view.setMaximumHeight(100)
+        log_layout.addWidget(self.log_view)
+        
+        log_group.setLayout(log_layout)
+        main_layout.addWidget(log_group)
+        
+        self.log("✅ 颜色频率模块已加载", "success")
+        self.log("💡 提示: 颜色按像素数排名；次数、通道值或排名都可能是隐藏的字符")
+    
+    def connect_signals(self):
+        """连接信号槽"""
+        self.btn_browse.clicked.connect(self.on_browse_clicked)
+        self.colour_table.currentCellChanged.connect(self.on_colour_selected)
+        self.btn_decode.clicked.connect(self.on_decode_clicked)
+    
+    # ==================== 统计 ====================
+    
+    def on_browse_clicked(self):
+        """浏览文件"""
+        file_path, _ = QFileDialog.getOpenFileName(
+            self,
+            "选择图像文件",
+            "",
+            "图像文件 (*.png *.bmp *.gif *.jpg *.jpeg *.tif *.tiff);;所有文件 (*)"
+        )
+        if file_path:
+            self.load_image(file_path)
+    
+    def load_image(self, file_path):
+        """在后台读取并统计"""
+        self.file_path = file_path
+        self.result = None
+        self.colour_table.setRowCount(0)
+        self.preview_label.setText("⏳ 统计中...")
+        self.file_label.setText(os.path.basename(file_path))
+        self.log(f"📁 已选择: {os.path.basename(file_path)}")
+        worker = TaskWorker(self._analyze, file_path)
+        worker.signals.finished.connect(self.on_analyzed)
+        worker.signals.failed.connect(self.on_analyze_failed)
+        self.thread_pool.start(worker)
+    
+    def _analyze(self, file_path):
+        """读取图像（调色板图像按索引）并统计（工作线程）"""
+        source = load_indexed(file_path)
+        if source is None:
+            image = QImage(file_path)
+            if image.isNull():
+                raise ValueError(f"无法读取图像: {os.path.basename(file_path)}")
+            source = qimage_to_array(image.convertToFormat(QImage.Format_RGBA8888))
+        if not self.processor.process(source):
+            raise ValueError("颜色统计失败")
+        return file_path, self.processor.get_result(), self.processor.thumbnail(self.PREVIEW_SIDE)
+    
+    def on_analyzed(self, analyzed):
+        """统计完成：填充颜色表并显示缩略图"""
+        file_path, result, thumbnail = analyzed
+        if file_path != self.file_path:
+            return
+        self.result = result
+        self.thumbnail = thumbnail
+        kind = "调色板索引" if result['indexed'] else "RGBA"
+        summary = (f"{result['width']}x{result['height']} ({kind}) | {result['total']:,} 像素 | "
+                   f"{result['unique']:,} 种颜色 | 统计用时 {result['elapsed'] * 1000:.0f} ms")
+        self.summary_label.setText(summary)
+        self.log(f"🎨 {summary}", "success")
+        self.fill_table()
+        self.show_preview(thumbnail)
+    
+    def on_analyze_failed(self, error):
+        """统计出错"""
+        self.preview_label.setText("无法统计")
+        self.log(f"❌ 统计失败: {error}", "error")
+    
+    def fill_table(self):
+        """颜色表：按排名列出前 MAX_ROWS 种颜色"""
+        result = self.result
+        rows = min(result['unique'], self.MAX_ROWS)
+        self.colour_table.setUpdatesEnabled(False)
+        self.colour_table.setRowCount(rows)
+        for rank in range(rows):
+            r, g, b, a = unpack_colour(result['colours'][rank])
+            count = int(result['counts'][rank])
+            swatch = QTableWidgetItem("")
+            swatch.setBackground(QColor(r, g, b))
+            label = f"#{r:02x}{g:02x}{b:02x}{a:02x}"
+            if result['indexed']:
+                label += f" [{result['indices'][rank]}]"
+            values = [str(rank), None, label, f"{count:,}", f"{count * 100 / result['total']:.3f}%"]
+            for column, value in enumerate(values):
+                self.colour_table.setItem(rank, column, swatch if value is None else QTableWidgetItem(value))
+        self.colour_table.setUpdatesEnabled(True)
+        if result['unique'] > rows:
+            self.log(f"⚠️ 颜色过多，表中只列出前 {rows} 种", "warning")
+    
+    # ==================== 高亮 ====================
+    
+    def on_colour_selected(self, row, *_):
+        """选中颜色：在后台计算高亮掩码"""
+        if self.result is None or row < 0:
+            return
+        self._highlight_request = row
+        worker = TaskWorker(self.processor.highlight, row, self.PREVIEW_SIDE)
+        worker.signals.finished.connect(self.on_highlighted)
+        worker.signals.failed.connect(self.on_highlight_failed)
+        self.thread_pool.start(worker)
+    
+    def on_highlighted(self, highlight):
+        """显示高亮：其余像素变暗，该颜色的像素标红"""
+        row = self.colour_table.currentRow()
+        if row != self._highlight_request or self.thumbnail is None:
+            return
+        mask = highlight['preview'] > 0
+        overlay = self.thumbnail // 4
+        overlay[..., 3] = 255
+        overlay[mask] = (255, 0, 0, 255)
+        self.show_preview(overlay)
+        
+        text = f"排名 {row}: {highlight['count']:,} 像素"
+        if highlight['bbox']:
+            x0, y0, x1, y1 = highlight['bbox']
+            text += f" | 包围盒 ({x0}, {y0}) - ({x1 - 1}, {y1 - 1})"
+        positions = " ".join(f"({x},{y})" for x, y in highlight['positions'][:16])
+        text += f" | 前几个像素: {positions}"
+        self.highlight_label.setText(text)
+    
+    def on_highlight_failed(self, error):
+        """高亮出错"""
+        self.log(f"❌ 高亮失败: {error}", "error")
+    
+    def show_preview(self, image):
+        """显示预览"""
+        pixmap = QPixmap.fromImage(array_to_qimage(np.ascontiguousarray(image)))
+        if max(pixmap.width(), pixmap.height()) < self.PREVIEW_SIDE:
+            pixmap = pixmap.scaled(self.PREVIEW_SIDE, self.PREVIEW_SIDE, Qt.KeepAspectRatio, Qt.FastTransformation)
+        self.preview_label.setPixmap(pixmap)
+    
+    # ==================== 解码 ====================
+    
+    def on_decode_clicked(self):
+        """按当前映射把颜色解码为文本"""
+        if self.result is None:
+            self.log("⚠️ 请先加载图像", "warning")
+            return
+        mapping = self.mapping_combo.currentData()
+        try:
+            decoded = self.processor.decode(
+                mapping=mapping,
+                order=self.order_combo.currentData(),
+                alphabet=self.alphabet_edit.text(),
+                min_count=self.min_count_spin.value(),
+                limit=self.limit_spin.value() or None,
+            )
+        except ValueError as e:
+            self.log(f"⚠️ {e}", "warning")
+            return
+        lines = [decoded['text']]
+        if decoded['bytes'] is not None:
+            lines.append(f"hex: {decoded['bytes'].hex()}")
+        self.decode_view.set_text("\n".join(lines))
+        self.log(f"🔓 {MAPPINGS[mapping]} / {ORDERS[self.order_combo.currentData()]}: "
+                 f"{len(decoded['ranks'])} 种颜色 → {decoded['text'][:60]!r}")
+        if self.parent_window and hasattr(self.parent_window, 'publish_data'):
+            self.parent_window.publish_data("颜色频率", decoded['text'])
+    
+    def log(self, message, level="info"):
+        """输出日志"""
+        self.log_view.append(message, level)
+        
+        # 更新状态栏
+        if self.parent_window and hasattr(self.parent_window, 'status'):
+            self.parent_window.status.show_message(message)
+    
+    def cleanup(self):
+        """清理资源"""
+        self._highlight_request = None
+        if self.processor:
+            self.processor.cleanup()
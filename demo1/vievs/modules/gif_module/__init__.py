@@ -0,0 +1,6 @@
+"""
+GIF / APNG 帧浏览模块
+"""
+from .gif_module_ui import GifModuleUI
+
+__all__ = ['GifModuleUI']
@@ -0,0 +1,485 @@
+# -*- coding: utf-8 -*-
+"""
+GIF / APNG 帧浏览模块UI - 对应 core.AnimationDecoder
+
+打开文件只建立帧索引；拖动进度条时只请求当前帧，后台同一时间只解码一帧，
+解码期间到达的请求合并为最近的一个，因此快速拖动不会堆积解码任务。
+帧表列出每帧的延时、处置方式、区域与调色板，可导出选中的帧或发布延时序列。
+"""
+
+import os
+
+from PySide6.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QPushButton,
+                               QLabel, QGroupBox, QSlider, QSpinBox, QCheckBox,
+                               QFileDialog, QTableWidget, QTableWidgetItem, QHeaderView,
+                               QAbstractItemView)
+from PySide6.QtCore import Qt, QThreadPool, QTimer
+from PySide6.QtGui import QPixmap
+
+import numpy as np
+
+from vievs.widgets import LogView, TaskWorker, array_to_qimage
+
+
+DISPOSAL_NAMES = {'none': "保留", 'background': "清除", 'previous': "恢复"}
+
+
+class GifModuleUI(QWidget):
+    """GIF / APNG 帧浏览模块UI"""
+    
+    # 预览区域的最大尺寸
+    PREVIEW_SIZE = (560, 360)
+    # 播放时的最小帧间隔（毫秒），延时为 0 的帧按浏览器的习惯放慢
+    MIN_DELAY = 20
+    # 调色板色块的边长与每行个数
+    SWATCH_SIZE = 10
+    SWATCH_COLUMNS = 32
+    
+    def __init__(self, parent=None, processor=None):
+        super().__init__(parent)
+        self.parent_window = parent
+        self.processor = processor  # AnimationDecoder 实例
+        self.thread_pool = QThreadPool.globalInstance()
+        self.status = getattr(parent, 'status', None)  # MainWindow 的 StatusService
+        self.file_path = None
+        self.frames = []
+        self._job = 0  # 每次打开文件递增，过期的解码结果丢弃
+        self._rendering = False
+        self._wanted = None  # 解码期间最近一次请求的 (帧号, 是否原始像素)
+        self._shown = None  # 当前显示的 (帧号, 是否原始像素)
+        self._loading = False
+        self._exporting = False
+        self._pending_load = None  # 等当前解码结束后再打开的文件
+        self.play_timer = QTimer(self)
+        self.play_timer.setSingleShot(True)
+        
+        if self.processor:
+            self.processor.initialize()
+        
+        self.init_ui()
+        self.connect_signals()
+    
+    def init_ui(self):
+        """初始化界面"""
+        main_layout = QVBoxLayout(self)
+        main_layout.setContentsMargins(20, 15, 20, 15)
+        main_layout.setSpacing(12)
+        
+        # 文件选择区域
+        file_group = QGroupBox("📁 动画文件")
+        file_layout = QVBoxLayout()
+        
+        path_layout = QHBoxLayout()
+        self.file_label = QLabel("未选择文件")
+        path_layout.addWidget(self.file_label, 1)
+        self.btn_browse = QPushButton("📁 浏览...")
+        self.btn_browse.setMaximumWidth(100)
+        path_layout.addWidget(self.btn_browse)
+        file_layout.addLayout(path_layout)
+        
+        self.summary_label = QLabel("")
+        self.summary_label.setWordWrap(True)
+        file_layout.addWidget(self.summary_label)
+        
+        file_group.setLayout(file_layout)
+        main_layout.addWidget(file_group)
+        
+        # 帧表 + 预览
+        body_layout = QHBoxLayout()
+        
+        self.frame_table = QTableWidget(0, 6)
+        self.frame_table.setHorizontalHeaderLabels(["帧", "延时(ms)", "处置", "区域", "透明色", "调色板"])
+        self.frame_table.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeToContents)
+        self.frame_table.verticalHeader().setVisible(False)
+        self.frame_table.setEditTriggers(QTableWidget.NoEditTriggers)
+        self.frame_table.setSelectionBehavior(QAbstractItemView.SelectRows)
+        self.frame_table.setSelectionMode(QAbstractItemView.ExtendedSelection)
+        self.frame_table.setMaximumWidth(420)
+        body_layout.addWidget(self.frame_table)
+        
+        view_layout = QVBoxLayout()
+        self.preview_label = QLabel("未加载动画")
+        self.preview_label.setAlignment(Qt.AlignCenter)
+        self.preview_label.setMinimumHeight(240)
+        view_layout.addWidget(self.preview_label, 1)
+        
+        scrub_layout = QHBoxLayout()
+        self.btn_play = QPushButton("▶ 播放")
+        self.btn_play.setCheckable(True)
+        scrub_layout.addWidget(self.btn_play)
+        self.frame_slider = QSlider(Qt.Horizontal)
+        self.frame_slider.setRange(0, 0)
+        scrub_layout.addWidget(self.frame_slider, 1)
+        self.frame_spin = QSpinBox()
+        self.frame_spin.setRange(0, 0)
+        scrub_layout.addWidget(self.frame_spin)
+        view_layout.addLayout(scrub_layout)
+        
+        self.raw_check = QCheckBox("只显示帧区域的原始像素（不与之前的帧合成）")
+        view_layout.addWidget(self.raw_check)
+        
+        self.frame_info_label = QLabel("")
+        self.frame_info_label.setWordWrap(True)
+        view_layout.addWidget(self.frame_info_label)
+        
+        self.palette_label = QLabel("")
+        view_layout.addWidget(self.palette_label)
+        
+        self.cache_label = QLabel("")
+        view_layout.addWidget(self.cache_label)
+        
+        button_layout = QHBoxLayout()
+        self.btn_export_selected = QPushButton("💾 导出选中帧")
+        self.btn_export_all = QPushButton("💾 导出全部帧")
+        self.btn_delays = QPushButton("📤 发布延时序列")
+        button_layout.addWidget(self.btn_export_selected)
+        button_layout.addWidget(self.btn_export_all)
+        button_layout.addWidget(self.btn_delays)
+        button_layout.addStretch()
+        view_layout.addLayout(button_layout)
+        
+        body_layout.addLayout(view_layout, 1)
+        main_layout.addLayout(body_layout, 1)
+        
+        # 日志输出
+        log_group = QGroupBox("📋 处理日志")
+        log_layout = QVBoxLayout()
+        
+        self.log_view = LogView()
+        self.log_view.setMaximumHeight(120)
+        log_layout.addWidget(self.log_view)
+        
+        log_group.setLayout(log_layout)
+        main_layout.addWidget(log_group)
+        
+        self.set_loaded(False)
+        self.log("✅ GIF 帧浏览模块已加载", "success")
+        self.log("💡 提示: 支持 GIF 与 APNG，帧按需解码；延时、处置方式与调色板常藏有隐写信息")
+    
+    def connect_signals(self):
+        """连接信号槽"""
+        self.btn_browse.clicked.connect(self.on_browse_clicked)
+        self.frame_slider.valueChanged.connect(self.on_frame_changed)
+        self.frame_spin.valueChanged.connect(self.frame_slider.setValue)
+        self.frame_table.currentCellChanged.connect(self.on_table_row_changed)
+        self.raw_check.toggled.connect(lambda: self.request_frame(self.frame_slider.value()))
+        self.btn_play.toggled.connect(self.on_play_toggled)
+        self.play_timer.timeout.connect(self.on_play_tick)
+        self.btn_export_selected.clicked.connect(lambda: self.export_frames(self.selected_frames()))
+        self.btn_export_all.clicked.connect(lambda: self.export_frames(list(range(len(self.frames)))))
+        self.btn_delays.clicked.connect(self.on_delays_clicked)
+    
+    def set_loaded(self, loaded):
+        """根据是否已打开文件启用控件"""
+        for widget in (self.btn_play, self.frame_slider, self.frame_spin, self.raw_check,
+                       self.btn_export_selected, self.btn_export_all, self.btn_delays):
+            widget.setEnabled(loaded)
+    
+    # ==================== 打开文件 ====================
+    
+    def on_browse_clicked(self):
+        """浏览文件"""
+        file_path, _ = QFileDialog.getOpenFileName(
+            self,
+            "选择动画文件",
+            "",
+            "动画文件 (*.gif *.png *.apng);;所有文件 (*)"
+        )
+        if file_path:
+            self.load_animation(file_path)
+    
+    def set_busy(self):
+        """扫描或导出期间禁止打开其他文件（两者都在后台读取当前文件）"""
+        self.btn_browse.setEnabled(not (self._loading or self._exporting))
+    
+    def load_animation(self, file_path):
+        """在后台扫描帧索引；正在解码时等解码结束再打开，正在导出时拒绝"""
+        if self._loading or self._exporting:
+            self.log("⚠️ 正在扫描或导出，请等待完成后再打开其他文件", "warning")
+            return
+        self.btn_play.setChecked(False)
+        if self._rendering:
+            self._pending_load = file_path
+            return
+        self._loading = True
+        self.set_busy()
+        self._job += 1
+        self._shown = None
+        self.set_loaded(False)
+        self.frame_table.setRowCount(0)
+        self.preview_label.setText("⏳ 扫描中...")
+        self.file_label.setText(os.path.basename(file_path))
+        self.log(f"📁 已选择: {os.path.basename(file_path)}")
+        worker = TaskWorker(self.processor.process, file_path)
+        worker.signals.finished.connect(self.on_loaded)
+        worker.signals.failed.connect(self.on_load_failed)
+        self.thread_pool.start(worker)
+    
+    def on_loaded(self, success):
+        """索引完成：填充帧表并显示第 0 帧"""
+        self._loading = False
+        self.set_busy()
+        result = self.processor.get_result()
+        if not success or not result:
+            self.preview_label.setText("无法打开文件")
+            self.log("❌ 无法解析动画文件", "error")
+            return
+        self.file_path = self.processor.file_path
+        self.frames = result['frames']
+        
+        loop = result['loop']
+        loop_text = "无限循环" if loop == 0 else ("不循环" if loop is None else f"循环 {loop} 次")
+        summary = (f"{result['format']} {result['width']}x{result['height']} | {result['frame_count']} 帧 | "
+                   f"总时长 {result['duration'] / 1000:.2f} 秒 | {loop_text} | 关键帧 {result['key_frames']}")
+        self.summary_label.setText(summary)
+        self.log(f"🎬 {summary}", "success")
+        if result['trailing']:
+            self.log(f"⚠️ 文件结束标记之后还有 {result['trailing']} 字节附加数据", "warning")
+        if result['hidden_default']:
+            self.log("⚠️ APNG 含有不参与动画的默认图像（IDAT 在第一个 fcTL 之前）", "warning")
+        for comment in result['comments']:
+            self.log(f"📝 注释: {comment[:200]}")
+        
+        self.fill_table()
+        last = len(self.frames) - 1
+        self.frame_slider.setRange(0, last)
+        self.frame_spin.setRange(0, last)
+        self.set_loaded(True)
+        if self.frame_slider.value() == 0:
+            self.request_frame(0)
+        else:
+            self.frame_slider.setValue(0)
+    
+    def on_load_failed(self, error):
+        """扫描出错"""
+        self._loading = False
+        self.set_busy()
+        self.preview_label.setText("无法打开文件")
+        self.log(f"❌ 打开失败: {error}", "error")
+    
+    def fill_table(self):
+        """帧表：每帧一行"""
+        self.frame_table.setUpdatesEnabled(False)
+        self.frame_table.setRowCount(len(self.frames))
+        for row, frame in enumerate(self.frames):
+            palette = frame['palette']
+            palette_text = "无" if palette is None else f"{'局部' if frame['local_palette'] else '全局'} {len(palette)}"
+            values = [
+                str(frame['index']),
+                str(frame['delay']),
+                DISPOSAL_NAMES[frame['disposal']],
+                f"{frame['width']}x{frame['height']}+{frame['x']}+{frame['y']}",
+                "" if frame['transparent'] is None else str(frame['transparent']),
+                palette_text,
+            ]
+            for column, value in enumerate(values):
+                self.frame_table.setItem(row, column, QTableWidgetItem(value))
+        self.frame_table.setUpdatesEnabled(True)
+    
+    # ==================== 浏览 ====================
+    
+    def on_frame_changed(self, index):
+        """拖动进度条：同步帧号与帧表，请求解码"""
+        self.frame_spin.blockSignals(True)
+        self.frame_spin.setValue(index)
+        self.frame_spin.blockSignals(False)
+        if self.frame_table.currentRow() != index:
+            self.frame_table.blockSignals(True)
+            self.frame_table.setCurrentCell(index, 0)
+            self.frame_table.blockSignals(False)
+        self.show_frame_info(index)
+        self.request_frame(index)
+    
+    def on_table_row_changed(self, row, *_):
+        """选中帧表中的行"""
+        if row >= 0:
+            self.frame_slider.setValue(row)
+    
+    def show_frame_info(self, index):
+        """显示帧信息与调色板色块"""
+        if not 0 <= index < len(self.frames):
+            return
+        frame = self.frames[index]
+        self.frame_info_label.setText(
+            f"第 {index} 帧 | 延时 {frame['delay']} ms | 处置 {DISPOSAL_NAMES[frame['disposal']]} "
+            f"({frame['disposal_code']}) | 区域 {frame['width']}x{frame['height']} @ ({frame['x']}, {frame['y']}) | "
+            f"透明色 {frame['transparent']} | {'隔行' if frame['interlaced'] else '逐行'} | "
+            f"数据 {frame['data_size']:,} 字节 | {'关键帧' if frame['key'] else '依赖前帧'}")
+        palette = frame['palette']
+        if palette is None or not len(palette):
+            self.palette_label.clear()
+            return
+        columns = min(self.SWATCH_COLUMNS, len(palette))
+        rows = -(-len(palette) // columns)
+        cells = np.zeros((rows * columns, 4), dtype=np.uint8)
+        cells[:len(palette), :3] = palette
+        cells[:len(palette), 3] = 255
+        swatch = cells.reshape(rows, columns, 4).repeat(self.SWATCH_SIZE, 0).repeat(self.SWATCH_SIZE, 1)
+        self.palette_label.setPixmap(QPixmap.fromImage(array_to_qimage(swatch)))
+    
+    def request_frame(self, index):
+        """请求显示一帧：后台空闲时立即解码，否则记下请求，等当前解码结束后再处理"""
+        if not self.frames or self._loading or self._pending_load:
+            return
+        self._wanted = (index, self.raw_check.isChecked())
+        if self._wanted == self._shown and not self.btn_play.isChecked():
+            return
+        if not self._rendering:
+            self._start_render()
+    
+    def _start_render(self):
+        """解码最近一次请求的帧"""
+        index, raw = self._wanted
+        self._wanted = None
+        self._rendering = True
+        if raw or not self.processor.is_cached(index):
+            self.cache_label.setText(f"⏳ 解码第 {index} 帧...")
+        worker = TaskWorker(self._render, self._job, index, raw)
+        worker.signals.finished.connect(self.on_rendered)
+        worker.signals.failed.connect(self.on_render_failed)
+        self.thread_pool.start(worker)
+    
+    def _render(self, job, index, raw):
+        """解码并缩放预览（工作线程）"""
+        pixels = self.processor.raw_frame(index) if raw else self.processor.frame(index)
+        width, height = self.PREVIEW_SIZE
+        image = array_to_qimage(pixels)
+        if image.width() > width or image.height() > height:
+            image = image.scaled(width, height, Qt.KeepAspectRatio, Qt.FastTransformation)
+        else:
+            image = image.copy()
+        return job, index, raw, image
+    
+    def _start_pending_load(self):
+        """解码结束后打开等待中的文件"""
+        file_path, self._pending_load = self._pending_load, None
+        self._wanted = None
+        self.load_animation(file_path)
+    
+    def on_rendered(self, rendered):
+        """解码完成：显示，若期间有新的请求则继续解码"""
+        job, index, raw, image = rendered
+        self._rendering = False
+        if self._pending_load:
+            self._start_pending_load()
+            return
+        if job != self._job:
+            if self._wanted:
+                self._start_render()
+            return
+        self.preview_label.setPixmap(QPixmap.fromImage(image))
+        frames, checkpoints, size = self.processor.cache_info()
+        self.cache_label.setText(f"缓存 {frames} 帧 + {checkpoints} 个检查点 / {size / (1 << 20):.1f} MB")
+        self._shown = (index, raw)
+        if self.btn_play.isChecked():
+            delay = max(self.frames[index]['delay'], self.MIN_DELAY)
+            self.play_timer.start(delay)
+        if self._wanted and self._wanted != self._shown:
+            self._start_render()
+        else:
+            self._wanted = None
+    
+    def on_render_failed(self, error):
+        """解码出错"""
+        self._rendering = False
+        self._wanted = None
+        self.btn_play.setChecked(False)
+        if self._pending_load:
+            self._start_pending_load()
+            return
+        self.log(f"❌ 解码失败: {error}", "error")
+    
+    def on_play_toggled(self, playing):
+        """播放 / 暂停（按每帧自己的延时推进，解码慢时自动等待）"""
+        self.btn_play.setText("⏸ 暂停" if playing else "▶ 播放")
+        if playing:
+            self.on_play_tick()
+        else:
+            self.play_timer.stop()
+    
+    def on_play_tick(self):
+        """播放到下一帧（末帧之后回到第 0 帧）"""
+        if not self.btn_play.isChecked() or not self.frames:
+            return
+        self.frame_slider.setValue((self.frame_slider.value() + 1) % len(self.frames))
+    
+    # ==================== 导出 ====================
+    
+    def selected_frames(self):
+        """帧表中选中的帧号"""
+        return sorted({index.row() for index in self.frame_table.selectionModel().selectedRows()})
+    
+    def export_frames(self, indices):
+        """把帧导出为 PNG（后台执行，可在状态栏查看进度）"""
+        if not indices:
+            self.log("⚠️ 请先在帧表中选择要导出的帧", "warning")
+            return
+        directory = QFileDialog.getExistingDirectory(self, "选择导出目录")
+        if not directory:
+            return
+        if self._loading or self._pending_load:
+            self.log("⚠️ 正在打开其他文件，无法导出", "warning")
+            return
+        composited = not self.raw_check.isChecked()
+        prefix = os.path.splitext(os.path.basename(self.file_path))[0]
+        self.log(f"💾 导出 {len(indices)} 帧（{'合成画布' if composited else '原始帧区域'}）到 {directory}")
+        self._exporting = True
+        self.set_busy()
+        self.btn_export_selected.setEnabled(False)
+        self.btn_export_all.setEnabled(False)
+        worker = TaskWorker(self.processor.export_frames, indices, directory, composited, prefix)
+        self.processor.set_progress_callback(worker.signals.progress.emit)
+        worker.signals.progress.connect(self.on_export_progress)
+        worker.signals.finished.connect(self.on_export_finished)
+        worker.signals.failed.connect(self.on_export_failed)
+        if self.status:
+            self.status.begin_job("导出帧", total=len(indices), unit="帧")
+        self.thread_pool.start(worker)
+    
+    def on_export_progress(self, progress):
+        """更新导出进度"""
+        if self.status:
+            self.status.update_progress(progress['current'], progress['total'])
+    
+    def on_export_finished(self, paths):
+        """导出完成"""
+        self._exporting = False
+        self.set_busy()
+        self.btn_export_selected.setEnabled(True)
+        self.btn_export_all.setEnabled(True)
+        if self.status:
+            self.status.end_job()
+        self.log(f"✨ 已导出 {len(paths)} 帧", "success")
+    
+    def on_export_failed(self, error):
+        """导出出错"""
+        self._exporting = False
+        self.set_busy()
+        self.btn_export_selected.setEnabled(True)
+        self.btn_export_all.setEnabled(True)
+        if self.status:
+            self.status.end_job()
+        self.log(f"❌ 导出失败: {error}", "error")
+    
+    def on_delays_clicked(self):
+        """把每帧延时发布到结果面板（延时序列常被用来编码数据）"""
+        delays = self.processor.delays()
+        text = " ".join(str(delay) for delay in delays)
+        self.log(f"⏱ 延时序列 ({len(delays)} 帧): {text[:200]}{'...' if len(text) > 200 else ''}")
+        if self.parent_window and hasattr(self.parent_window, 'publish_data'):
+            self.parent_window.publish_data("GIF 延时", text)
+    
+    def log(self, message, level="info"):
+        """输出日志"""
+        self.log_view.append(message, level)
+        
+        # 更新状态栏
+        if self.parent_window and hasattr(self.parent_window, 'status'):
+            self.parent_window.status.show_message(message)
+    
+    def cleanup(self):
+        """清理资源"""
+        self.play_timer.stop()
+        self._job += 1
+        if self.processor:
+            self.processor.cleanup()
@@ -0,0 +1,6 @@
+"""
+哈希破解模块
+"""
+from .hash_module_ui import HashModuleUI
+
+__all__ = ['HashModuleUI']
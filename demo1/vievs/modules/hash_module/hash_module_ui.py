@@ -0,0 +1,271 @@
+"""
+哈希破解模块UI - 对应 core.HashCracker
+
+字典攻击在后台线程中驱动进程池执行，进度（H/s、已破解数）通过信号回到界面
+"""
+
+import os
+
+from PySide6.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QPushButton,
+                               QLabel, QGroupBox, QComboBox, QSpinBox,
+                               QPlainTextEdit, QCheckBox, QFormLayout, QFileDialog,
+                               QProgressBar, QTableWidget, QTableWidgetItem, QHeaderView)
+from PySide6.QtCore import QThreadPool
+
+from core.modules.hash_cracker import ALGORITHMS, RULES, identify_hash
+from vievs.widgets import LogView, TaskWorker
+
+
+class HashModuleUI(QWidget):
+    """哈希破解模块UI"""
+    
+    def __init__(self, parent=None, processor=None):
+        super().__init__(parent)
+        self.parent_window = parent
+        self.processor = processor  # HashCracker 实例
+        self.thread_pool = QThreadPool.globalInstance()
+        self.status = getattr(parent, 'status', None)  # MainWindow 的 StatusService
+        self.wordlist_path = None
+        
+        # 初始化处理器
+        if self.processor:
+            self.processor.initialize()
+        
+        self.init_ui()
+        self.connect_signals()
+    
+    def init_ui(self):
+        """初始化界面"""
+        main_layout = QVBoxLayout(self)
+        main_layout.setContentsMargins(20, 15, 20, 15)
+        main_layout.setSpacing(12)
+        
+        # 目标哈希
+        target_group = QGroupBox("🔑 目标哈希 (每行一个，支持 pwdump / $NT$)")
+        target_layout = QVBoxLayout()
+        
+        self.hash_edit = QPlainTextEdit()
+        self.hash_edit.setMaximumHeight(100)
+        target_layout.addWidget(self.hash_edit)
+        
+        target_group.setLayout(target_layout)
+        main_layout.addWidget(target_group)
+        
+        # 攻击选项
+        options_group = QGroupBox("⚙️ 攻击选项")
+        options_layout = QFormLayout()
+        
+        wordlist_layout = QHBoxLayout()
+        self.wordlist_label = QLabel("未选择字典")
+        wordlist_layout.addWidget(self.wordlist_label)
+        self.btn_browse = QPushButton("📁 浏览...")
+        self.btn_browse.setMaximumWidth(100)
+        wordlist_layout.addWidget(self.btn_browse)
+        options_layout.addRow("字典文件:", wordlist_layout)
+        
+        self.algorithm_combo = QComboBox()
+        self.algorithm_combo.addItems(["auto"] + ALGORITHMS)
+        options_layout.addRow("算法:", self.algorithm_combo)
+        
+        rules_layout = QHBoxLayout()
+        self.rule_checks = {}
+        for name, description in RULES.items():
+            check = QCheckBox(description)
+            self.rule_checks[name] = check
+            rules_layout.addWidget(check)
+        rules_layout.addStretch()
+        options_layout.addRow("变形规则:", rules_layout)
+        
+        self.workers_spin = QSpinBox()
+        self.workers_spin.setRange(1, 64)
+        self.workers_spin.setValue(os.cpu_count() or 1)
+        options_layout.addRow("进程数:", self.workers_spin)
+        
+        options_group.setLayout(options_layout)
+        main_layout.addWidget(options_group)
+        
+        # 操作按钮
+        button_layout = QHBoxLayout()
+        
+        self.btn_identify = QPushButton("🔍 识别类型")
+        self.btn_identify.setMinimumHeight(35)
+        self.btn_start = QPushButton("🚀 开始破解")
+        self.btn_start.setMinimumHeight(35)
+        self.btn_cancel = QPushButton("⏹ 取消")
+        self.btn_cancel.setMinimumHeight(35)
+        self.btn_cancel.setEnabled(False)
+        
+        button_layout.addStretch()
+        button_layout.addWidget(self.btn_identify)
+        button_layout.addWidget(self.btn_start)
+        button_layout.addWidget(self.btn_cancel)
+        
+        main_layout.addLayout(button_layout)
+        
+        # 进度
+        progress_layout = QHBoxLayout()
+        self.progress_bar = QProgressBar()
+        self.progress_bar.setRange(0, 1000)
+        progress_layout.addWidget(self.progress_bar)
+        self.rate_label = QLabel("0 H/s")
+        self.rate_label.setMinimumWidth(160)
+        progress_layout.addWidget(self.rate_label)
+        main_layout.addLayout(progress_layout)
+        
+        # 破解结果
+        result_group = QGroupBox("✨ 破解结果")
+        result_layout = QVBoxLayout()
+        
+        self.result_table = QTableWidget(0, 3)
+        self.result_table.setHorizontalHeaderLabels(["哈希", "算法", "明文"])
+        self.result_table.horizontalHeader().setSectionResizeMode(0, QHeaderView.Stretch)
+        self.result_table.setEditTriggers(QTableWidget.NoEditTriggers)
+        result_layout.addWidget(self.result_table)
+        
+        result_group.setLayout(result_layout)
+        main_layout.addWidget(result_group)
+        
+        # 日志输出
+        log_group = QGroupBox("📋 处理日志")
+        log_layout = QVBoxLayout()
+        
+        self.log_view = LogView()
+        self.log_view.setMaximumHeight(140)
+        log_layout.addWidget(self.log_view)
+        
+        log_group.setLayout(log_layout)
+        main_layout.addWidget(log_group)
+        
+        self.log("✅ 哈希破解模块已加载", "success")
+    
+    def connect_signals(self):
+        """连接信号槽"""
+        self.btn_browse.clicked.connect(self.on_browse_clicked)
+        self.btn_identify.clicked.connect(self.on_identify_clicked)
+        self.btn_start.clicked.connect(self.on_start_clicked)
+        self.btn_cancel.clicked.connect(self.on_cancel_clicked)
+    
+    def target_hashes(self):
+        """获取目标哈希列表"""
+        return [line.strip() for line in self.hash_edit.toPlainText().splitlines() if line.strip()]
+    
+    def on_browse_clicked(self):
+        """选择字典文件"""
+        file_path, _ = QFileDialog.getOpenFileName(
+            self, "选择字典文件", "", "字典文件 (*.txt *.lst *.dic);;所有文件 (*.*)"
+        )
+        if file_path:
+            self.wordlist_path = file_path
+            size = os.path.getsize(file_path)
+            self.wordlist_label.setText(f"{os.path.basename(file_path)} ({size / 1048576:.1f} MB)")
+            self.log(f"📁 字典: {file_path}")
+    
+    def on_identify_clicked(self):
+        """识别哈希类型"""
+        hashes = self.target_hashes()
+        if not hashes:
+            self.log("⚠️ 请先输入目标哈希", "warning")
+            return
+        for text in hashes:
+            digest, algorithms = identify_hash(text)
+            names = ", ".join(algorithms) if algorithms else "未知"
+            self.log(f"🔍 {digest[:32]}{'...' if len(digest) > 32 else ''}: {names}")
+    
+    def on_start_clicked(self):
+        """开始字典攻击"""
+        if not self.processor:
+            return
+        hashes = self.target_hashes()
+        if not hashes:
+            self.log("⚠️ 请先输入目标哈希", "warning")
+            return
+        if not self.wordlist_path:
+            self.log("⚠️ 请先选择字典文件", "warning")
+            return
+        
+        options = {
+            'wordlist': self.wordlist_path,
+            'algorithm': self.algorithm_combo.currentText(),
+            'rules': [name for name, check in self.rule_checks.items() if check.isChecked()],
+            'workers': self.workers_spin.value(),
+        }
+        
+        self.btn_start.setEnabled(False)
+        self.btn_cancel.setEnabled(True)
+        self.progress_bar.setValue(0)
+        self.result_table.setRowCount(0)
+        self.log("🚀 开始破解...")
+        
+        worker = TaskWorker(self.processor.process, hashes, options=options)
+        self.processor.set_progress_callback(worker.signals.progress.emit)
+        worker.signals.progress.connect(self.on_progress)
+        worker.signals.finished.connect(self.on_attack_finished)
+        worker.signals.failed.connect(self.on_attack_failed)
+        if self.status:
+            self.status.begin_job("哈希破解", total=os.path.getsize(self.wordlist_path), unit="H")
+        self.thread_pool.start(worker)
+    
+    def on_cancel_clicked(self):
+        """取消破解"""
+        if self.processor:
+            self.processor.cancel()
+            self.btn_cancel.setEnabled(False)
+            self.log("⏹ 正在取消...")
+    
+    def on_progress(self, progress):
+        """更新进度"""
+        total = progress['total'] or 1
+        self.progress_bar.setValue(int(progress['current'] * 1000 / total))
+        self.rate_label.setText(f"{progress['rate']:,.0f} H/s  已破解 {progress['found']}")
+        if self.status:
+            self.status.update_progress(progress['current'], progress['total'], rate=progress['rate'])
+    
+    def on_attack_finished(self, success):
+        """破解结束"""
+        self.btn_start.setEnabled(True)
+        self.btn_cancel.setEnabled(False)
+        if self.status:
+            self.status.end_job()
+        result = self.processor.get_result()
+        if not success or not result:
+            self.log("❌ 破解失败", "error")
+            return
+        
+        found = result['found']
+        self.result_table.setRowCount(len(found))
+        for row, (digest, (algorithm, word)) in enumerate(found.items()):
+            self.result_table.setItem(row, 0, QTableWidgetItem(digest))
+            self.result_table.setItem(row, 1, QTableWidgetItem(algorithm))
+            self.result_table.setItem(row, 2, QTableWidgetItem(word))
+        
+        self.rate_label.setText(f"{result['rate']:,.0f} H/s  已破解 {len(found)}")
+        state = "⏹ 已取消" if result['cancelled'] else "✨ 完成"
+        self.log(f"{state}: {result['hashed']:,} 次哈希, 用时 {result['elapsed']:.1f}s, "
+                 f"破解 {len(found)} 个", "warning" if result['cancelled'] else "success")
+        if not result['cancelled']:
+            self.progress_bar.setValue(self.progress_bar.maximum())
+        
+        if found and self.parent_window and hasattr(self.parent_window, 'publish_data'):
+            text = "\n".join(f"{digest}:{word}" for digest, (_, word) in found.items())
+            self.parent_window.publish_data("哈希破解", text)
+    
+    def on_attack_failed(self, error):
+        """破解出错"""
+        self.btn_start.setEnabled(True)
+        self.btn_cancel.setEnabled(False)
+        if self.status:
+            self.status.end_job()
+        self.log(f"❌ 破解失败: {error}", "error")
+    
+    def log(self, message, level="info"):
+        """输出日志"""
+        self.log_view.append(message, level)
+        
+        # 更新状态栏
+        if self.parent_window and hasattr(self.parent_window, 'status'):
+            self.parent_window.status.show_message(message)
+    
+    def cleanup(self):
+        """清理资源"""
+        if self.processor:
+            self.processor.cleanup()
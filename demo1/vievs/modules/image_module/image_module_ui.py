@@ -1,22 +1,98 @@
 # -*- coding: utf-8 -*-
 """
-图像处理模块UI
+图像处理模块UI - 对应 core.ImageProcessor / core.JigsawSolver
+
+- 图像处理：灰度化、二值化等单图处理，带渐进式预览与超大图像分块模式
+- 拼图还原：把当前图像按网格切成的图块、或目录中的碎片重新拼合
+- 批量处理：对目录树中的全部图像执行当前选择的处理，编解码在进程池中进行
 """
 
+import os
+import time
+
+import numpy as np
 from PySide6.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QPushButton,
                                QLabel, QGroupBox, QComboBox, QFileDialog,
-                               QTextEdit, QCheckBox, QSpinBox, QFormLayout)
-from PySide6.QtCore import Qt
-from PySide6.QtGui import QPixmap
+                               QCheckBox, QSpinBox, QFormLayout, QTabWidget, QLineEdit,
+                               QProgressBar)
+from PySide6.QtCore import Qt, QThreadPool, QTimer
+from PySide6.QtGui import QImage, QImageReader, QPixmap
+
+from core.modules.image_processor import OPERATIONS, DEFAULT_PARAMS
+from core.modules.batch_processor import OUTPUT_FORMATS
+from core.modules.jigsaw_solver import split_grid
+from core.modules.tiled_image import TiledImage
+from vievs.widgets import (LogView, TaskWorker, LRUCache, qimage_to_array, array_to_qimage,
+                           load_tiled_image, decode_image_bytes, encode_image_bytes)
+
+
+# 各处理类型的参数名称与范围，None 表示该处理没有参数
+PARAM_SPECS = {
+    'grayscale': None,
+    'binarize': ("阈值 (0=自动):", 0, 255),
+    'edge': None,
+    'blur': ("模糊半径:", 1, 200),
+    'sharpen': ("锐化强度 (%):", 1, 1000),
+    'rotate': ("顺时针角度:", 0, 359),
+    'scale': ("缩放比例 (%):", 1, 1000),
+}
 
 
 class ImageModuleUI(QWidget):
     """图像处理模块UI"""
     
-    def __init__(self, parent=None):
+    # 预览区域的最大尺寸
+    PREVIEW_SIZE = (640, 360)
+    # 超过该像素数的图像进入分块模式（解码到内存映射文件，按块处理）
+    TILED_PIXELS = 1 << 26
+    # 参数停止变化多久后开始全分辨率预览（毫秒）
+    REFINE_DELAY = 200
+    
+    # 碎片目录中识别的图像扩展名
+    PIECE_EXTENSIONS = ('.png', '.bmp', '.jpg', '.jpeg', '.gif', '.tif', '.tiff', '.webp')
+    
+    def __init__(self, parent=None, processor=None, solver=None, batch=None):
         super().__init__(parent)
         self.parent_window = parent
+        self.processor = processor  # ImageProcessor 实例
+        self.solver = solver  # JigsawSolver 实例
+        self.batch = batch  # BatchImageProcessor 实例
+        self.batch_dir = None
+        self.batch_output_dir = None
+        self.piece_dir = None
+        self.puzzle_image = None
+        self._solve_started = 0.0
+        self.thread_pool = QThreadPool.globalInstance()
+        self.status = getattr(parent, 'status', None)  # MainWindow 的 StatusService
         self.current_image_path = ""
+        # 原图 QImage 与共享其内存的数组；处理结果同理
+        # 分块模式下数组为 TiledImage，QImage 只是缩略图
+        self.source_image = None
+        self.source_array = None
+        self.result_image = None
+        self.result_array = None
+        self._shown = None
+        self._started = 0.0
+        # 渐进式预览：先处理缩小的代理图，再在后台处理全分辨率图像
+        # 预览使用独立的处理器实例，不影响正式处理的状态
+        self.preview_processor = type(processor)() if processor else None
+        self.preview_cache = LRUCache(32)  # (图像版本, 处理类型, 参数) -> (预览 QImage, 是否全分辨率)
+        self._previewing = False
+        self._preview_generation = 0  # 每次重新预览加一，旧的渲染结果据此丢弃
+        self._image_versions = {'source': 0, 'result': 0}
+        self._proxy = None  # (图像版本, 代理数组, 缩小比例)
+        self._pending_refine = None
+        self._refine_processor = None
+        self._refined = None  # 最近一次全分辨率预览 (key, 结果数组, 阈值)，开始处理时可直接复用
+        self._processing = None  # 正式处理进行中时为 (开始时的原图版本, 输入图像)
+        self._retired = []  # 处理期间被替换、等处理结束再关闭的分块存储
+        
+        if self.processor:
+            self.processor.initialize()
+        if self.solver:
+            self.solver.initialize()
+        if self.batch:
+            self.batch.initialize()
         
         self.init_ui()
         self.connect_signals()
@@ -41,6 +117,38 @@ class ImageModuleUI(QWidget):
         file_group.setLayout(file_layout)
         main_layout.addWidget(file_group)
         
+        self.tabs = QTabWidget()
+        self.tabs.addTab(self._create_process_page(), "🖼️ 图像处理")
+        self.tabs.addTab(self._create_jigsaw_page(), "🧩 拼图还原")
+        self.tabs.addTab(self._create_batch_page(), "📂 批量处理")
+        main_layout.addWidget(self.tabs, 1)
+        
+        # 日志输出
+        log_group = QGroupBox("📋 处理日志")
+        log_layout = QVBoxLayout()
+        
+        self.log_view = LogView()
+        self.log_view.setMaximumHeight(220)
+        log_layout.addWidget(self.log_view)
+        
+        log_group.setLayout(log_layout)
+        main_layout.addWidget(log_group)
+        
+        self.refine_timer = QTimer(self)
+        self.refine_timer.setSingleShot(True)
+        self.refine_timer.setInterval(self.REFINE_DELAY)
+        
+        self.on_operation_changed()
+        
+        # 初始日志
+        self.log("✅ 图像处理模块已加载", "success")
+        self.log("💡 提示: 请先选择图像文件，然后选择处理类型；打乱的图块可在拼图还原页重新拼合")
+    
+    def _create_process_page(self):
+        """单图处理页"""
+        page = QWidget()
+        page_layout = QVBoxLayout(page)
+        
         # 处理选项
         options_group = QGroupBox("⚙️ 处理选项")
         options_layout = QFormLayout()
@@ -58,19 +166,24 @@ class ImageModuleUI(QWidget):
         ])
         options_layout.addRow("处理类型:", self.process_combo)
         
-        # 质量参数
+        # 处理参数（含义随处理类型变化）
+        self.param_label = QLabel()
+        self.param_spin = QSpinBox()
+        options_layout.addRow(self.param_label, self.param_spin)
+        
+        # 保存质量（JPEG 等有损格式）
         self.quality_spin = QSpinBox()
         self.quality_spin.setRange(1, 100)
         self.quality_spin.setValue(85)
-        options_layout.addRow("质量:", self.quality_spin)
+        options_layout.addRow("保存质量:", self.quality_spin)
         
-        # 保留原图
+        # 保留原图：勾选时每次都处理原图，否则在上一次结果上继续处理
         self.keep_original_check = QCheckBox("保留原始图像")
         self.keep_original_check.setChecked(True)
         options_layout.addRow(self.keep_original_check)
         
         options_group.setLayout(options_layout)
-        main_layout.addWidget(options_group)
+        page_layout.addWidget(options_group)
         
         # 操作按钮
         button_layout = QHBoxLayout()
@@ -87,27 +200,153 @@ class ImageModuleUI(QWidget):
         button_layout.addWidget(self.btn_process)
         button_layout.addWidget(self.btn_save)
         
-        main_layout.addLayout(button_layout)
+        page_layout.addLayout(button_layout)
         
-        # 日志输出
-        log_group = QGroupBox("📋 处理日志")
-        log_layout = QVBoxLayout()
+        # 预览
+        preview_group = QGroupBox("🖼️ 预览")
+        preview_layout = QVBoxLayout()
         
-        self.log_text = QTextEdit()
-        self.log_text.setReadOnly(True)
-        self.log_text.setMaximumHeight(180)
-        self.log_text.setPlaceholderText("处理日志将显示在这里...")
-        log_layout.addWidget(self.log_text)
+        self.preview_label = QLabel("未加载图像")
+        self.preview_label.setAlignment(Qt.AlignCenter)
+        self.preview_label.setMinimumHeight(200)
+        preview_layout.addWidget(self.preview_label)
         
-        log_group.setLayout(log_layout)
-        main_layout.addWidget(log_group)
+        self.image_info_label = QLabel("")
+        preview_layout.addWidget(self.image_info_label)
         
-        # 添加伸缩
-        main_layout.addStretch()
+        preview_group.setLayout(preview_layout)
+        page_layout.addWidget(preview_group)
+        return page
+    
+    def _create_jigsaw_page(self):
+        """拼图还原页"""
+        page = QWidget()
+        page_layout = QVBoxLayout(page)
         
-        # 初始日志
-        self.log("✅ 图像处理模块已加载")
-        self.log("💡 提示: 请先选择图像文件，然后选择处理类型")
+        options_layout = QFormLayout()
+        
+        # 图块来源：当前图像按网格切分，或目录中的碎片文件
+        self.piece_source_combo = QComboBox()
+        self.piece_source_combo.addItems(["当前图像 (按网格切分)", "碎片目录"])
+        options_layout.addRow("图块来源:", self.piece_source_combo)
+        
+        directory_layout = QHBoxLayout()
+        self.piece_dir_label = QLabel("未选择目录")
+        directory_layout.addWidget(self.piece_dir_label)
+        self.btn_piece_dir = QPushButton("📂 选择目录...")
+        self.btn_piece_dir.setMaximumWidth(120)
+        directory_layout.addWidget(self.btn_piece_dir)
+        options_layout.addRow("碎片目录:", directory_layout)
+        
+        grid_layout = QHBoxLayout()
+        self.grid_rows_spin = QSpinBox()
+        self.grid_rows_spin.setRange(0, 1000)
+        self.grid_rows_spin.setValue(10)
+        self.grid_cols_spin = QSpinBox()
+        self.grid_cols_spin.setRange(0, 1000)
+        self.grid_cols_spin.setValue(10)
+        grid_layout.addWidget(self.grid_rows_spin)
+        grid_layout.addWidget(QLabel("行 ×"))
+        grid_layout.addWidget(self.grid_cols_spin)
+        grid_layout.addWidget(QLabel("列 (0 = 自动)"))
+        grid_layout.addStretch()
+        options_layout.addRow("网格:", grid_layout)
+        page_layout.addLayout(options_layout)
+        
+        button_layout = QHBoxLayout()
+        self.btn_solve = QPushButton("🧩 开始还原")
+        self.btn_solve.setMinimumHeight(35)
+        self.btn_solve_cancel = QPushButton("⏹ 取消")
+        self.btn_solve_cancel.setMinimumHeight(35)
+        self.btn_solve_cancel.setEnabled(False)
+        self.btn_save_puzzle = QPushButton("💾 保存拼图")
+        self.btn_save_puzzle.setMinimumHeight(35)
+        button_layout.addStretch()
+        button_layout.addWidget(self.btn_solve)
+        button_layout.addWidget(self.btn_solve_cancel)
+        button_layout.addWidget(self.btn_save_puzzle)
+        page_layout.addLayout(button_layout)
+        
+        self.puzzle_label = QLabel("未还原")
+        self.puzzle_label.setAlignment(Qt.AlignCenter)
+        self.puzzle_label.setMinimumHeight(200)
+        page_layout.addWidget(self.puzzle_label, 1)
+        
+        self.puzzle_info_label = QLabel("")
+        page_layout.addWidget(self.puzzle_info_label)
+        return page
+    
+    def _create_batch_page(self):
+        """批量处理页（处理类型、参数与保存质量沿用图像处理页的设置）"""
+        page = QWidget()
+        page_layout = QVBoxLayout(page)
+        
+        options_layout = QFormLayout()
+        
+        input_layout = QHBoxLayout()
+        self.batch_dir_label = QLabel("未选择目录")
+        input_layout.addWidget(self.batch_dir_label)
+        self.btn_batch_dir = QPushButton("📂 选择目录...")
+        self.btn_batch_dir.setMaximumWidth(120)
+        input_layout.addWidget(self.btn_batch_dir)
+        options_layout.addRow("输入目录:", input_layout)
+        
+        # 输出位置：原文件旁加后缀，或在输出目录中镜像输入目录的结构
+        self.batch_output_combo = QComboBox()
+        self.batch_output_combo.addItems(["保存在原文件旁 (加后缀)", "镜像到输出目录"])
+        options_layout.addRow("输出位置:", self.batch_output_combo)
+        
+        output_layout = QHBoxLayout()
+        self.batch_output_label = QLabel("未选择目录")
+        output_layout.addWidget(self.batch_output_label)
+        self.btn_batch_output = QPushButton("📂 选择目录...")
+        self.btn_batch_output.setMaximumWidth(120)
+        output_layout.addWidget(self.btn_batch_output)
+        options_layout.addRow("输出目录:", output_layout)
+        
+        self.batch_suffix_edit = QLineEdit("_processed")
+        options_layout.addRow("文件名后缀:", self.batch_suffix_edit)
+        
+        self.batch_format_combo = QComboBox()
+        for key, name in OUTPUT_FORMATS.items():
+            self.batch_format_combo.addItem(name, key)
+        options_layout.addRow("输出格式:", self.batch_format_combo)
+        
+        check_layout = QHBoxLayout()
+        self.batch_recursive_check = QCheckBox("包含子目录")
+        self.batch_recursive_check.setChecked(True)
+        check_layout.addWidget(self.batch_recursive_check)
+        self.batch_overwrite_check = QCheckBox("覆盖已存在的输出")
+        check_layout.addWidget(self.batch_overwrite_check)
+        check_layout.addStretch()
+        options_layout.addRow(check_layout)
+        
+        self.batch_workers_spin = QSpinBox()
+        self.batch_workers_spin.setRange(1, max((os.cpu_count() or 1) * 2, 2))
+        self.batch_workers_spin.setValue(os.cpu_count() or 1)
+        options_layout.addRow("进程数:", self.batch_workers_spin)
+        page_layout.addLayout(options_layout)
+        
+        button_layout = QHBoxLayout()
+        self.btn_batch_start = QPushButton("🚀 批量处理")
+        self.btn_batch_start.setMinimumHeight(35)
+        self.btn_batch_cancel = QPushButton("⏹ 取消")
+        self.btn_batch_cancel.setMinimumHeight(35)
+        self.btn_batch_cancel.setEnabled(False)
+        button_layout.addStretch()
+        button_layout.addWidget(self.btn_batch_start)
+        button_layout.addWidget(self.btn_batch_cancel)
+        page_layout.addLayout(button_layout)
+        
+        self.batch_progress_bar = QProgressBar()
+        self.batch_progress_bar.setRange(0, 1000)
+        page_layout.addWidget(self.batch_progress_bar)
+        self.batch_info_label = QLabel("")
+        page_layout.addWidget(self.batch_info_label)
+        page_layout.addStretch()
+        
+        self.on_batch_output_changed()
+        return page
     
     def connect_signals(self):
         """连接信号槽"""
@@ -115,6 +354,55 @@ class ImageModuleUI(QWidget):
         self.btn_process.clicked.connect(self.on_process_clicked)
         self.btn_preview.clicked.connect(self.on_preview_clicked)
         self.btn_save.clicked.connect(self.on_save_clicked)
+        self.process_combo.currentIndexChanged.connect(self.on_operation_changed)
+        self.process_combo.currentIndexChanged.connect(self.on_options_changed)
+        self.param_spin.valueChanged.connect(self.on_options_changed)
+        self.keep_original_check.toggled.connect(self.on_options_changed)
+        self.refine_timer.timeout.connect(self.start_refine)
+        self.btn_piece_dir.clicked.connect(self.on_piece_dir_clicked)
+        self.btn_solve.clicked.connect(self.on_solve_clicked)
+        self.btn_solve_cancel.clicked.connect(self.on_solve_cancel_clicked)
+        self.btn_save_puzzle.clicked.connect(self.on_save_puzzle_clicked)
+        self.btn_batch_dir.clicked.connect(self.on_batch_dir_clicked)
+        self.btn_batch_output.clicked.connect(self.on_batch_output_clicked)
+        self.batch_output_combo.currentIndexChanged.connect(self.on_batch_output_changed)
+        self.btn_batch_start.clicked.connect(self.on_batch_start_clicked)
+        self.btn_batch_cancel.clicked.connect(self.on_batch_cancel_clicked)
+    
+    def current_operation(self):
+        """当前选择的处理类型"""
+        return OPERATIONS[self.process_combo.currentIndex()]
+    
+    def current_options(self):
+        """当前的处理选项"""
+        operation = self.current_operation()
+        options = {'operation': operation}
+        if PARAM_SPECS.get(operation):
+            options['param'] = self.param_spin.value()
+        return options
+    
+    def current_input(self):
+        """
+        本次处理的输入图像
+        
+        Returns:
+            tuple: ('source' 或 'result', 图像数组)；不保留原图时在上一次的结果上继续处理
+        """
+        if self.keep_original_check.isChecked() or self.result_array is None:
+            return 'source', self.source_array
+        return 'result', self.result_array
+    
+    def on_operation_changed(self):
+        """切换处理类型时更新参数控件"""
+        operation = self.current_operation()
+        spec = PARAM_SPECS.get(operation)
+        self.param_label.setVisible(spec is not None)
+        self.param_spin.setVisible(spec is not None)
+        if spec:
+            name, minimum, maximum = spec
+            self.param_label.setText(name)
+            self.param_spin.setRange(minimum, maximum)
+            self.param_spin.setValue(DEFAULT_PARAMS.get(operation, minimum))
     
     def on_browse_clicked(self):
         """浏览文件"""
@@ -125,39 +413,345 @@ class ImageModuleUI(QWidget):
             "图像文件 (*.png *.jpg *.jpeg *.bmp *.gif);;所有文件 (*)"
         )
         if file_path:
-            self.current_image_path = file_path
-            import os
-            self.file_label.setText(os.path.basename(file_path))
-            self.log(f"📁 已选择: {os.path.basename(file_path)}")
+            self.load_image(file_path)
+    
+    def load_image(self, file_path):
+        """加载图像，转换为 RGBA8888 后与数组共享内存；超大图像转入分块模式"""
+        size = QImageReader(file_path).size()
+        if size.isValid() and size.width() * size.height() > self.TILED_PIXELS:
+            self.load_tiled(file_path)
+            return True
+        image = QImage(file_path)
+        if image.isNull():
+            self.log(f"❌ 无法读取图像: {os.path.basename(file_path)}", "error")
+            return False
+        array = qimage_to_array(image)
+        self.set_source(file_path, array, array_to_qimage(array))
+        return True
+    
+    def load_tiled(self, file_path):
+        """在线程池中把超大图像解码到分块存储"""
+        self.log(f"🧱 图像过大，使用分块模式加载: {os.path.basename(file_path)}")
+        self.btn_process.setEnabled(False)
+        self.btn_browse.setEnabled(False)
+        worker = TaskWorker(self._decode_tiled, file_path)
+        worker.signals.finished.connect(self.on_tiled_loaded)
+        worker.signals.failed.connect(self.on_tiled_failed)
+        if self.status:
+            self.status.begin_job("分块加载")
+        self.thread_pool.start(worker)
+    
+    def _decode_tiled(self, file_path):
+        """解码并生成缩略图（工作线程）"""
+        store = load_tiled_image(file_path)
+        width, height = self.PREVIEW_SIZE
+        return file_path, store, store.thumbnail(width * 2, height * 2)
+    
+    def on_tiled_loaded(self, loaded):
+        """分块加载完成"""
+        self.btn_process.setEnabled(True)
+        self.btn_browse.setEnabled(True)
+        if self.status:
+            self.status.end_job()
+        file_path, store, thumbnail = loaded
+        self.set_source(file_path, store, array_to_qimage(thumbnail))
+    
+    def on_tiled_failed(self, error):
+        """分块加载失败"""
+        self.btn_process.setEnabled(True)
+        self.btn_browse.setEnabled(True)
+        if self.status:
+            self.status.end_job()
+        self.log(f"❌ 无法读取图像: {error}", "error")
+    
+    def set_source(self, file_path, array, image):
+        """替换原图（释放旧的分块存储）"""
+        previous = (self.source_array, self.result_array)
+        self.stop_preview()
+        self.current_image_path = file_path
+        self.source_array = array
+        self.source_image = image
+        self.result_image = None
+        self.result_array = None
+        self._image_versions['source'] += 1
+        self._image_versions['result'] += 1
+        self._release(*previous)
+        self.file_label.setText(os.path.basename(file_path))
+        self.show_image(self.source_image)
+        height, width = array.shape[:2]
+        self.log(f"📁 已选择: {os.path.basename(file_path)} ({width}x{height})")
+    
+    def _release(self, *arrays):
+        """关闭不再使用的分块存储，删除其临时文件；正在处理的输入等处理结束后再关闭"""
+        busy = self._processing[1] if self._processing else None
+        for array in arrays:
+            if isinstance(array, TiledImage) and array is not self.source_array and array is not self.result_array:
+                if array is busy:
+                    self._retired.append(array)
+                else:
+                    array.close()
+    
+    def finish_processing(self):
+        """正式处理结束：恢复按钮，关闭处理期间被替换的分块存储"""
+        version = self._processing[0] if self._processing else None
+        self._processing = None
+        self.btn_process.setEnabled(True)
+        self.btn_browse.setEnabled(True)
+        if self.status:
+            self.status.end_job()
+        retired, self._retired = self._retired, []
+        self._release(*retired)
+        return version
     
     def on_process_clicked(self):
-        """开始处理"""
-        if not self.current_image_path:
-            self.log("⚠️ 请先选择图像文件！")
+        """开始处理（在线程池中执行）"""
+        if self.source_array is None:
+            self.log("⚠️ 请先选择图像文件！", "warning")
+            return
+        if not self.processor:
+            self.log("❌ 没有可用的处理器", "error")
             return
         
-        process_type = self.process_combo.currentText()
-        quality = self.quality_spin.value()
-        keep_original = self.keep_original_check.isChecked()
+        options = self.current_options()
+        name, image = self.current_input()
         
-        self.log(f"🔧 处理类型: {process_type}")
-        self.log(f"📊 质量参数: {quality}")
-        self.log(f"🚀 开始处理图像...")
+        self.log(f"🔧 处理类型: {self.process_combo.currentText()}")
+        if 'param' in options:
+            self.log(f"📊 {self.param_label.text()} {options['param']}")
+        
+        # 全分辨率预览已经算出了同样的结果，直接采用
+        if self._refined and self._refined[0] == self.preview_key(name, options):
+            _, result, threshold = self._refined
+            self._refined = None
+            self.log("♻️ 使用预览中已完成的全分辨率结果")
+            self.apply_result(result, threshold, 0.0)
+            return
         
-        # TODO: 调用实际的图像处理逻辑
-        self.log("✨ 处理完成！")
+        self.log("🚀 开始处理图像...")
+        self.btn_process.setEnabled(False)
+        # 处理期间不允许更换原图，结果仍会按原图版本核对
+        self.btn_browse.setEnabled(False)
+        self._processing = (self._image_versions['source'], image)
+        self._started = time.perf_counter()
+        
+        worker = TaskWorker(self.processor.process, image, options=options)
+        self.processor.set_progress_callback(worker.signals.progress.emit)
+        worker.signals.progress.connect(self.on_progress)
+        worker.signals.finished.connect(self.on_process_finished)
+        worker.signals.failed.connect(self.on_process_failed)
+        if self.status:
+            if isinstance(image, TiledImage):
+                self.status.begin_job(self.process_combo.currentText(), unit="块")
+            else:
+                self.status.begin_job(self.process_combo.currentText(), total=image.shape[0], unit="行")
+        self.thread_pool.start(worker)
+    
+    def on_progress(self, progress):
+        """处理进度"""
+        if self.status:
+            self.status.update_progress(progress['current'], progress['total'])
+    
+    def on_process_finished(self, success):
+        """处理完成；原图在处理期间被替换时丢弃结果"""
+        version = self.finish_processing()
+        if not success:
+            self.log("❌ 处理失败", "error")
+            return
+        result = self.processor.get_result()
+        if version != self._image_versions['source']:
+            self._release(result)
+            self.log("⚠️ 原图已更换，丢弃过期的处理结果", "warning")
+            return
+        self.apply_result(result, self.processor.threshold, time.perf_counter() - self._started)
+    
+    def apply_result(self, result, threshold, elapsed):
+        """显示新的处理结果并替换上一次的结果"""
+        self.stop_preview()
+        previous, self.result_array = self.result_array, result
+        self._image_versions['result'] += 1
+        self._release(previous)
+        if isinstance(self.result_array, TiledImage):
+            width, height = self.PREVIEW_SIZE
+            self.result_image = array_to_qimage(self.result_array.thumbnail(width * 2, height * 2))
+        else:
+            self.result_image = array_to_qimage(self.result_array)
+        self.show_image(self.result_image)
+        if threshold is not None:
+            self.log(f"📏 二值化阈值: {threshold}")
+        height, width = self.result_array.shape[:2]
+        self.log(f"✨ 处理完成！{width}x{height}, 用时 {elapsed:.2f}s", "success")
+    
+    def on_process_failed(self, error):
+        """处理出错"""
+        self.finish_processing()
+        self.log(f"❌ 处理失败: {error}", "error")
     
     def on_preview_clicked(self):
-        """预览"""
-        if not self.current_image_path:
-            self.log("⚠️ 请先选择图像文件！")
+        """预览：开启后随处理选项实时预览，再次点击关闭"""
+        if self.source_image is None:
+            self.log("⚠️ 请先选择图像文件！", "warning")
+            return
+        if self._previewing:
+            self.stop_preview()
+            self.show_image(self.result_image if self.result_image is not None else self.source_image)
+            self.log("👁️ 已关闭预览")
+            return
+        self._previewing = True
+        self.btn_preview.setText("👁️ 关闭预览")
+        self.log("👁️ 实时预览已开启，调整处理选项即可查看效果")
+        self.render_preview()
+    
+    def on_options_changed(self):
+        """处理选项变化时刷新预览"""
+        if self._previewing:
+            self.render_preview()
+    
+    def stop_preview(self):
+        """关闭预览并作废进行中的渲染"""
+        self._previewing = False
+        self._preview_generation += 1
+        self.refine_timer.stop()
+        if self._refine_processor:
+            self._refine_processor.cancel()
+        self.btn_preview.setText("👁️ 预览")
+    
+    def preview_key(self, name, options):
+        """预览缓存的键"""
+        return (name, self._image_versions[name], options['operation'], options.get('param'))
+    
+    def render_preview(self):
+        """
+        渐进式预览
+        
+        1. 缓存命中直接显示
+        2. 否则在主线程处理代理图（预览区域大小，几十毫秒内完成）并显示
+        3. 参数停止变化 REFINE_DELAY 毫秒后在后台处理全分辨率图像，完成后替换代理预览
+        """
+        self._preview_generation += 1
+        self.refine_timer.stop()
+        if self._refine_processor:
+            self._refine_processor.cancel()
+        
+        name, image = self.current_input()
+        options = self.current_options()
+        key = self.preview_key(name, options)
+        cached = self.preview_cache.get(key)
+        if cached:
+            preview, refined = cached
+            self.show_preview(preview, refined)
+            if refined:
+                return
+        else:
+            started = time.perf_counter()
+            proxy, factor = self.proxy_of(name, image)
+            if not self.preview_processor.process(proxy, options=self.proxy_options(options, factor)):
+                return
+            preview = array_to_qimage(self.preview_processor.get_result())
+            self.preview_cache.put(key, (preview, False))
+            self.show_preview(preview, False)
+            if self.status:
+                self.status.show_message(f"⚡ 代理预览: {(time.perf_counter() - started) * 1000:.0f} ms")
+        
+        # 分块模式的全分辨率处理代价太大，只显示代理预览
+        if isinstance(image, TiledImage):
             return
-        self.log("👁️ 预览功能开发中...")
+        self._pending_refine = (self._preview_generation, key, image, options)
+        self.refine_timer.start()
+    
+    def proxy_of(self, name, image):
+        """
+        预览区域大小的代理图（按图像版本缓存）
+        
+        Returns:
+            tuple: (代理数组, 缩小比例)
+        """
+        version = (name, self._image_versions[name])
+        if self._proxy and self._proxy[0] == version:
+            return self._proxy[1], self._proxy[2]
+        width, height = self.PREVIEW_SIZE
+        if isinstance(image, TiledImage):
+            proxy = image.thumbnail(width, height)
+        else:
+            step = max(-(-image.shape[1] // width), -(-image.shape[0] // height), 1)
+            proxy = np.ascontiguousarray(image[::step, ::step])
+        factor = proxy.shape[1] / image.shape[1]
+        self._proxy = (version, proxy, factor)
+        return proxy, factor
+    
+    @staticmethod
+    def proxy_options(options, factor):
+        """把以像素为单位的参数换算到代理图尺寸"""
+        options = dict(options)
+        if options['operation'] == 'blur':
+            options['param'] = max(int(round(options['param'] * factor)), 1)
+        elif options['operation'] == 'scale':
+            # 缩放后仍按预览区域显示，代理图上不必真的放大
+            options['param'] = min(options['param'], 100)
+        return options
+    
+    def start_refine(self):
+        """在线程池中处理全分辨率预览"""
+        generation, key, image, options = self._pending_refine
+        if generation != self._preview_generation:
+            return
+        processor = type(self.processor)()
+        self._refine_processor = processor
+        worker = TaskWorker(self._refine, generation, key, processor, image, options)
+        worker.signals.finished.connect(self.on_refine_finished)
+        worker.signals.failed.connect(self.on_refine_failed)
+        self.thread_pool.start(worker)
+    
+    def _refine(self, generation, key, processor, image, options):
+        """全分辨率处理并缩小到预览尺寸（工作线程）"""
+        if generation != self._preview_generation or not processor.process(image, options=options):
+            return None
+        result = processor.get_result()
+        width, height = self.PREVIEW_SIZE
+        preview = array_to_qimage(result).scaled(width, height, Qt.KeepAspectRatio, Qt.SmoothTransformation)
+        return generation, key, result, processor.threshold, preview
+    
+    def on_refine_finished(self, refined):
+        """全分辨率预览完成；过期的结果仍写入缓存，但不显示"""
+        if refined is None:
+            return
+        generation, key, result, threshold, preview = refined
+        self.preview_cache.put(key, (preview, True))
+        if generation != self._preview_generation:
+            return
+        self._refined = (key, result, threshold)
+        self.show_preview(preview, True)
+    
+    def on_refine_failed(self, error):
+        """全分辨率预览出错"""
+        self.log(f"⚠️ 预览失败: {error}", "warning")
+    
+    def show_preview(self, image, refined):
+        """显示预览图"""
+        width, height = self.PREVIEW_SIZE
+        self._shown = image
+        self.preview_label.setPixmap(QPixmap.fromImage(
+            image.scaled(width, height, Qt.KeepAspectRatio, Qt.FastTransformation)))
+        quality = "全分辨率" if refined else "代理图"
+        self.image_info_label.setText(f"预览 ({quality}): {self.process_combo.currentText()}")
+    
+    def show_image(self, image):
+        """缩放到预览区域大小后显示（只转换缩小后的图像）"""
+        self._shown = image
+        width, height = self.PREVIEW_SIZE
+        preview = image.scaled(width, height, Qt.KeepAspectRatio, Qt.SmoothTransformation)
+        self.preview_label.setPixmap(QPixmap.fromImage(preview))
+        if image is self.result_image:
+            label, array = "处理结果", self.result_array
+        else:
+            label, array = "原始图像", self.source_array
+        height, width = array.shape[:2]
+        mode = " (分块模式)" if isinstance(array, TiledImage) else ""
+        self.image_info_label.setText(f"{label}: {width}x{height}{mode}")
     
     def on_save_clicked(self):
         """保存结果"""
-        if not self.current_image_path:
-            self.log("⚠️ 没有可保存的结果！")
+        if self.result_image is None:
+            self.log("⚠️ 没有可保存的结果！", "warning")
             return
         
         file_path, _ = QFileDialog.getSaveFileName(
@@ -166,22 +760,301 @@ class ImageModuleUI(QWidget):
             "",
             "PNG图像 (*.png);;JPEG图像 (*.jpg);;所有文件 (*)"
         )
-        if file_path:
-            self.log(f"💾 已保存到: {file_path}")
+        if not file_path:
+            return
+        if isinstance(self.result_array, TiledImage):
+            # 分块结果按行带流式写出，只支持 PNG
+            if not file_path.lower().endswith('.png'):
+                self.log("⚠️ 分块模式只能保存为 PNG", "warning")
+                return
+            try:
+                self.result_array.save_png(file_path)
+            except OSError as e:
+                self.log(f"❌ 保存失败: {e}", "error")
+                return
+            self.log(f"💾 已保存到: {file_path}", "success")
+        elif self.result_image.save(file_path, None, self.quality_spin.value()):
+            self.log(f"💾 已保存到: {file_path}", "success")
+        else:
+            self.log(f"❌ 保存失败: {file_path}", "error")
     
-    def log(self, message):
-        """输出日志"""
-        from PySide6.QtGui import QTextCursor
+    # ==================== 拼图还原 ====================
+    
+    def on_piece_dir_clicked(self):
+        """选择碎片目录"""
+        directory = QFileDialog.getExistingDirectory(self, "选择碎片目录")
+        if directory:
+            self.piece_dir = directory
+            count = len(self.piece_files(directory))
+            self.piece_dir_label.setText(f"{os.path.basename(directory)} ({count} 个文件)")
+            self.piece_source_combo.setCurrentIndex(1)
+            self.log(f"📂 碎片目录: {directory}, {count} 个图像文件")
+    
+    def piece_files(self, directory):
+        """目录中的图像文件（按文件名排序）"""
+        return sorted(os.path.join(directory, name) for name in os.listdir(directory)
+                      if name.lower().endswith(self.PIECE_EXTENSIONS))
+    
+    def _load_pieces(self, directory):
+        """读取目录中的全部碎片，统一为 RGBA（工作线程）"""
+        tiles = []
+        for path in self.piece_files(directory):
+            image = QImage(path)
+            if image.isNull():
+                raise ValueError(f"无法读取碎片: {os.path.basename(path)}")
+            array = qimage_to_array(image.convertToFormat(QImage.Format_RGBA8888))
+            if tiles and array.shape != tiles[0].shape:
+                raise ValueError(f"碎片尺寸不一致: {os.path.basename(path)} "
+                                 f"{array.shape[1]}x{array.shape[0]}")
+            tiles.append(array)
+        if not tiles:
+            raise ValueError("目录中没有图像文件")
+        return np.stack(tiles)
+    
+    def _solve(self, source, rows, cols):
+        """准备图块并还原（工作线程）"""
+        if isinstance(source, str):
+            tiles = self._load_pieces(source)
+        else:
+            tiles = split_grid(source, rows, cols)
+        if not self.solver.process(tiles, options={'rows': rows, 'cols': cols}):
+            return None
+        return self.solver.get_result()
+    
+    def on_solve_clicked(self):
+        """开始还原（在线程池中执行）"""
+        if not self.solver:
+            return
+        rows, cols = self.grid_rows_spin.value(), self.grid_cols_spin.value()
+        if self.piece_source_combo.currentIndex() == 1:
+            if not self.piece_dir:
+                self.log("⚠️ 请先选择碎片目录！", "warning")
+                return
+            source = self.piece_dir
+        else:
+            if self.source_array is None:
+                self.log("⚠️ 请先选择图像文件！", "warning")
+                return
+            if isinstance(self.source_array, TiledImage):
+                self.log("⚠️ 分块模式的图像不支持拼图还原", "warning")
+                return
+            if not rows or not cols:
+                self.log("⚠️ 按网格切分时需要指定行数和列数", "warning")
+                return
+            source = self.source_array
+        
+        self.btn_solve.setEnabled(False)
+        self.btn_solve_cancel.setEnabled(True)
+        self.puzzle_label.setText("⏳ 还原中...")
+        self._solve_started = time.perf_counter()
+        self.log(f"🧩 开始还原: {rows or '自动'} 行 × {cols or '自动'} 列")
+        
+        worker = TaskWorker(self._solve, source, rows, cols)
+        self.solver.set_progress_callback(worker.signals.progress.emit)
+        worker.signals.progress.connect(self.on_solve_progress)
+        worker.signals.finished.connect(self.on_solve_finished)
+        worker.signals.failed.connect(self.on_solve_failed)
+        if self.status:
+            self.status.begin_job("拼图还原")
+        self.thread_pool.start(worker)
+    
+    def on_solve_cancel_clicked(self):
+        """取消还原"""
+        if self.solver:
+            self.solver.cancel()
+            self.btn_solve_cancel.setEnabled(False)
+            self.log("⏹ 正在取消...")
+    
+    def on_solve_progress(self, progress):
+        """更新还原进度"""
+        if self.status:
+            self.status.update_progress(progress['current'], progress['total'])
+    
+    def on_solve_finished(self, result):
+        """还原完成：显示拼合结果"""
+        self.btn_solve.setEnabled(True)
+        self.btn_solve_cancel.setEnabled(False)
+        if self.status:
+            self.status.end_job()
+        if result is None:
+            self.puzzle_label.setText("未还原")
+            self.log("⚠️ 拼图还原失败或已取消", "warning")
+            return
+        
+        elapsed = time.perf_counter() - self._solve_started
+        order = result['order']
+        self.puzzle_image = array_to_qimage(result['image'])
+        width, height = self.PREVIEW_SIZE
+        self.puzzle_label.setPixmap(QPixmap.fromImage(
+            self.puzzle_image.scaled(width, height, Qt.KeepAspectRatio, Qt.SmoothTransformation)))
+        self.puzzle_info_label.setText(
+            f"{order.shape[0]}x{order.shape[1]} 块 → {self.puzzle_image.width()}x{self.puzzle_image.height()} | "
+            f"相邻最佳伙伴 {result['buddies']:.1%}")
+        self.log(f"✨ 拼图完成: {order.size} 块, 用时 {elapsed:.2f}s, "
+                 f"相邻最佳伙伴 {result['buddies']:.1%}", "success")
+    
+    def on_solve_failed(self, error):
+        """还原出错"""
+        self.btn_solve.setEnabled(True)
+        self.btn_solve_cancel.setEnabled(False)
+        if self.status:
+            self.status.end_job()
+        self.puzzle_label.setText("未还原")
+        self.log(f"❌ 拼图还原失败: {error}", "error")
+    
+    def on_save_puzzle_clicked(self):
+        """保存拼合结果"""
+        if self.puzzle_image is None:
+            self.log("⚠️ 没有可保存的拼图！", "warning")
+            return
+        file_path, _ = QFileDialog.getSaveFileName(
+            self,
+            "保存拼图",
+            "",
+            "PNG图像 (*.png);;BMP图像 (*.bmp);;所有文件 (*)"
+        )
+        if not file_path:
+            return
+        if self.puzzle_image.save(file_path):
+            self.log(f"💾 已保存到: {file_path}", "success")
+        else:
+            self.log(f"❌ 保存失败: {file_path}", "error")
+    
+    # ==================== 批量处理 ====================
+    
+    def on_batch_dir_clicked(self):
+        """选择输入目录"""
+        directory = QFileDialog.getExistingDirectory(self, "选择输入目录")
+        if directory:
+            self.batch_dir = directory
+            self.batch_dir_label.setText(directory)
+            self.log(f"📂 批量输入目录: {directory}")
+    
+    def on_batch_output_clicked(self):
+        """选择输出目录"""
+        directory = QFileDialog.getExistingDirectory(self, "选择输出目录")
+        if directory:
+            self.batch_output_dir = directory
+            self.batch_output_label.setText(directory)
+            self.batch_output_combo.setCurrentIndex(1)
+    
+    def on_batch_output_changed(self):
+        """输出位置改变：只启用对应的控件"""
+        mirror = self.batch_output_combo.currentIndex() == 1
+        self.btn_batch_output.setEnabled(mirror)
+        self.batch_suffix_edit.setEnabled(not mirror)
+    
+    def on_batch_start_clicked(self):
+        """开始批量处理（在线程池中调度，编解码在进程池中进行）"""
+        if not self.batch:
+            return
+        if not self.batch_dir:
+            self.log("⚠️ 请先选择输入目录！", "warning")
+            return
+        mirror = self.batch_output_combo.currentIndex() == 1
+        if mirror and not self.batch_output_dir:
+            self.log("⚠️ 请先选择输出目录！", "warning")
+            return
+        suffix = self.batch_suffix_edit.text().strip()
+        if not mirror and not suffix:
+            self.log("⚠️ 保存在原文件旁时需要文件名后缀", "warning")
+            return
         
-        cursor = self.log_text.textCursor()
-        cursor.movePosition(QTextCursor.End)
-        self.log_text.setTextCursor(cursor)
-        self.log_text.append(message)
+        options = self.current_options()
+        options.update({
+            'decode': decode_image_bytes,
+            'encode': encode_image_bytes,
+            'quality': self.quality_spin.value(),
+            'output_dir': self.batch_output_dir if mirror else None,
+            'suffix': suffix,
+            'format': self.batch_format_combo.currentData(),
+            'recursive': self.batch_recursive_check.isChecked(),
+            'overwrite': self.batch_overwrite_check.isChecked(),
+            'workers': self.batch_workers_spin.value(),
+        })
+        self.btn_batch_start.setEnabled(False)
+        self.btn_batch_cancel.setEnabled(True)
+        self.batch_progress_bar.setValue(0)
+        self.batch_info_label.setText("⏳ 扫描目录...")
+        self.log(f"📂 批量{self.process_combo.currentText()}: {self.batch_dir}")
+        
+        worker = TaskWorker(self.batch.process, self.batch_dir, options=options)
+        self.batch.set_progress_callback(worker.signals.progress.emit)
+        worker.signals.progress.connect(self.on_batch_progress)
+        worker.signals.finished.connect(self.on_batch_finished)
+        worker.signals.failed.connect(self.on_batch_failed)
+        if self.status:
+            self.status.begin_job("批量处理", unit="个")
+        self.thread_pool.start(worker)
+    
+    def on_batch_cancel_clicked(self):
+        """取消批量处理（正在编解码的文件会先完成）"""
+        if self.batch:
+            self.batch.cancel()
+            self.btn_batch_cancel.setEnabled(False)
+            self.log("⏹ 正在取消...")
+    
+    def on_batch_progress(self, progress):
+        """更新批量处理的进度与吞吐量"""
+        current, total = progress['current'], progress['total']
+        self.batch_progress_bar.setValue(int(current * 1000 / (total or 1)))
+        self.batch_info_label.setText(
+            f"{current}/{total} 个文件 | {progress['rate']:.1f} 个/s | "
+            f"{progress['throughput'] / (1 << 20):.1f} MB/s | 失败 {progress['failed']}")
+        if self.status:
+            self.status.update_progress(current, total, rate=progress['rate'])
+    
+    def on_batch_finished(self, success):
+        """批量处理结束：汇总结果"""
+        self.btn_batch_start.setEnabled(True)
+        self.btn_batch_cancel.setEnabled(False)
+        if self.status:
+            self.status.end_job()
+        result = self.batch.get_result()
+        if not success or not result:
+            self.batch_info_label.setText("")
+            self.log("❌ 批量处理失败", "error")
+            return
+        summary = (f"{result['done']}/{result['total']} 个文件, 跳过 {result['skipped']}, "
+                   f"失败 {len(result['failed'])}, 用时 {result['elapsed']:.2f}s, "
+                   f"{result['rate']:.1f} 个/s, {result['throughput'] / (1 << 20):.1f} MB/s")
+        self.batch_info_label.setText(summary)
+        for path, error in result['failed'][:20]:
+            self.log(f"❌ {os.path.relpath(path, self.batch_dir)}: {error}", "error")
+        if result['cancelled']:
+            self.log(f"⏹ 批量处理已取消: {summary}", "warning")
+        else:
+            self.batch_progress_bar.setValue(self.batch_progress_bar.maximum())
+            self.log(f"✨ 批量处理完成: {summary}", "success")
+    
+    def on_batch_failed(self, error):
+        """批量处理出错"""
+        self.btn_batch_start.setEnabled(True)
+        self.btn_batch_cancel.setEnabled(False)
+        if self.status:
+            self.status.end_job()
+        self.batch_info_label.setText("")
+        self.log(f"❌ 批量处理失败: {error}", "error")
+    
+    def log(self, message, level="info"):
+        """输出日志"""
+        self.log_view.append(message, level)
         
         # 更新状态栏
-        if self.parent_window and hasattr(self.parent_window, 'statusbar'):
-            self.parent_window.statusbar.showMessage(message)
+        if self.parent_window and hasattr(self.parent_window, 'status'):
+            self.parent_window.status.show_message(message)
     
     def cleanup(self):
         """清理资源"""
-        pass
+        self.stop_preview()
+        if self.processor:
+            self.processor.cancel()
+            self.processor.cleanup()
+        if self.solver:
+            self.solver.cancel()
+            self.solver.cleanup()
+        if self.batch:
+            self.batch.cleanup()
+        for array in (self.source_array, self.result_array):
+            if isinstance(array, TiledImage):
+                array.close()
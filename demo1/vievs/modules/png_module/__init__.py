@@ -0,0 +1,6 @@
+"""
+PNG 结构分析模块
+"""
+from .png_module_ui import PngModuleUI
+
+__all__ = ['PngModuleUI']
@@ -0,0 +1,419 @@
+# -*- coding: utf-8 -*-
+"""
+PNG 结构模块UI - 对应 core.PngInspector
+
+分析在线程池中进行：先遍历全部块（校验 CRC、解析文本块、检查 IEND 之后的数据），
+再按需流式解压 IDAT 统计每行的滤波类型。块表中 CRC 错误的行标红、未知块标黄；
+点击异常可定位到对应的块，块数据与附加数据可以直接导出。
+"""
+
+import os
+
+from PySide6.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QPushButton,
+                               QLabel, QGroupBox, QCheckBox, QProgressBar,
+                               QFileDialog, QTableWidget, QTableWidgetItem, QHeaderView,
+                               QAbstractItemView)
+from PySide6.QtCore import QThreadPool
+from PySide6.QtGui import QColor
+
+from vievs.widgets import LogView, TaskWorker, ResultView
+from core.modules.png_inspector import FILTER_NAMES
+
+
+LEVEL_NAMES = {'error': "错误", 'warning': "警告"}
+
+
+class PngModuleUI(QWidget):
+    """PNG 结构模块UI"""
+    
+    # 块表最多列出的行数
+    MAX_ROWS = 5000
+    # 超过该大小的文件在状态栏显示进度
+    LARGE_FILE = 1 << 24
+    
+    def __init__(self, parent=None, processor=None):
+        super().__init__(parent)
+        self.parent_window = parent
+        self.processor = processor  # PngInspector 实例
+        self.thread_pool = QThreadPool.globalInstance()
+        self.status = getattr(parent, 'status', None)  # MainWindow 的 StatusService
+        self.file_path = None
+        self.report = None
+        self.running = False
+        self._tracked = False  # 当前任务是否在状态栏显示进度
+        
+        if self.processor:
+            self.processor.initialize()
+        
+        self.init_ui()
+        self.connect_signals()
+    
+    def init_ui(self):
+        """初始化界面"""
+        main_layout = QVBoxLayout(self)
+        main_layout.setContentsMargins(20, 15, 20, 15)
+        main_layout.setSpacing(12)
+        
+        # 文件选择区域
+        file_group = QGroupBox("📁 PNG 文件")
+        file_layout = QVBoxLayout()
+        
+        path_layout = QHBoxLayout()
+        self.file_label = QLabel("未选择文件")
+        path_layout.addWidget(self.file_label, 1)
+        self.inflate_check = QCheckBox("解压 IDAT 检查扫描行")
+        self.inflate_check.setChecked(True)
+        path_layout.addWidget(self.inflate_check)
+        self.btn_browse = QPushButton("📁 浏览...")
+        self.btn_browse.setMaximumWidth(100)
+        path_layout.addWidget(self.btn_browse)
+        self.btn_cancel = QPushButton("⏹ 取消")
+        self.btn_cancel.setEnabled(False)
+        path_layout.addWidget(self.btn_cancel)
+        file_layout.addLayout(path_layout)
+        
+        self.summary_label = QLabel("")
+        self.summary_label.setWordWrap(True)
+        file_layout.addWidget(self.summary_label)
+        
+        self.progress_bar = QProgressBar()
+        self.progress_bar.setRange(0, 1000)
+        file_layout.addWidget(self.progress_bar)
+        
+        file_group.setLayout(file_layout)
+        main_layout.addWidget(file_group)
+        
+        # 块表 + 异常 / 滤波 / 文本
+        body_layout = QHBoxLayout()
+        
+        chunk_layout = QVBoxLayout()
+        self.chunk_table = QTableWidget(0, 6)
+        self.chunk_table.setHorizontalHeaderLabels(["序号", "偏移", "类型", "长度", "CRC", "说明"])
+        self.chunk_table.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeToContents)
+        self.chunk_table.verticalHeader().setVisible(False)
+        self.chunk_table.setEditTriggers(QTableWidget.NoEditTriggers)
+        self.chunk_table.setSelectionBehavior(QAbstractItemView.SelectRows)
+        self.chunk_table.setSelectionMode(QAbstractItemView.ExtendedSelection)
+        chunk_layout.addWidget(self.chunk_table, 1)
+        
+        button_layout = QHBoxLayout()
+        self.btn_export_chunks = QPushButton("💾 导出选中块")
+        self.btn_export_trailing = QPushButton("💾 导出附加数据")
+        self.btn_publish = QPushButton("📤 发布文本块")
+        button_layout.addWidget(self.btn_export_chunks)
+        button_layout.addWidget(self.btn_export_trailing)
+        button_layout.addWidget(self.btn_publish)
+        button_layout.addStretch()
+        chunk_layout.addLayout(button_layout)
+        body_layout.addLayout(chunk_layout, 1)
+        
+        detail_layout = QVBoxLayout()
+        detail_layout.addWidget(QLabel("⚠️ 异常:"))
+        self.anomaly_table = QTableWidget(0, 3)
+        self.anomaly_table.setHorizontalHeaderLabels(["级别", "偏移", "说明"])
+        self.anomaly_table.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeToContents)
+        self.anomaly_table.horizontalHeader().setStretchLastSection(True)
+        self.anomaly_table.verticalHeader().setVisible(False)
+        self.anomaly_table.setEditTriggers(QTableWidget.NoEditTriggers)
+        self.anomaly_table.setSelectionBehavior(QAbstractItemView.SelectRows)
+        self.anomaly_table.setSelectionMode(QAbstractItemView.SingleSelection)
+        detail_layout.addWidget(self.anomaly_table, 1)
+        
+        self.idat_label = QLabel("")
+        self.idat_label.setWordWrap(True)
+        detail_layout.addWidget(self.idat_label)
+        
+        detail_layout.addWidget(QLabel("📝 文本块:"))
+        self.text_view = ResultView()
+        detail_layout.addWidget(self.text_view, 1)
+        body_layout.addLayout(detail_layout, 1)
+        
+        main_layout.addLayout(body_layout, 1)
+        
+        # 日志输出
+        log_group = QGroupBox("📋 处理日志")
+        log_layout = QVBoxLayout()
+        
+        self.log_view = LogView()
+        self.log_view.setMaximumHeight(100)
+        log_layout.addWidget(self.log_view)
+        
+        log_group.setLayout(log_layout)
+        main_layout.addWidget(log_group)
+        
+        self.set_loaded(False)
+        self.log("✅ PNG 结构模块已加载", "success")
+        self.log("💡 提示: 只读取块结构与 IDAT 的行首字节，不解码图像；IEND 之后的数据、未知块与多余的 IDAT 常藏有信息")
+    
+    def connect_signals(self):
+        """连接信号槽"""
+        self.btn_browse.clicked.connect(self.on_browse_clicked)
+        self.btn_cancel.clicked.connect(self.on_cancel_clicked)
+        self.anomaly_table.currentCellChanged.connect(self.on_anomaly_selected)
+        self.btn_export_chunks.clicked.connect(self.on_export_chunks_clicked)
+        self.btn_export_trailing.clicked.connect(self.on_export_trailing_clicked)
+        self.btn_publish.clicked.connect(self.on_publish_clicked)
+    
+    def set_loaded(self, loaded):
+        """根据是否有分析结果启用控件"""
+        self.btn_export_chunks.setEnabled(loaded)
+        self.btn_export_trailing.setEnabled(loaded and bool(self.report and self.report['trailing']))
+        self.btn_publish.setEnabled(loaded and bool(self.report and self.report['texts']))
+    
+    # ==================== 分析 ====================
+    
+    def on_browse_clicked(self):
+        """浏览文件"""
+        file_path, _ = QFileDialog.getOpenFileName(
+            self,
+            "选择 PNG 文件",
+            "",
+            "PNG 文件 (*.png *.apng);;所有文件 (*)"
+        )
+        if file_path:
+            self.inspect_file(file_path)
+    
+    def inspect_file(self, file_path):
+        """在后台分析文件结构"""
+        if self.running:
+            self.log("⚠️ 正在分析，请稍候", "warning")
+            return
+        self.running = True
+        self.file_path = file_path
+        self.report = None
+        self.set_loaded(False)
+        self.btn_browse.setEnabled(False)
+        self.btn_cancel.setEnabled(True)
+        self.chunk_table.setRowCount(0)
+        self.anomaly_table.setRowCount(0)
+        self.text_view.clear()
+        self.idat_label.setText("")
+        self.summary_label.setText("⏳ 分析中...")
+        self.progress_bar.setValue(0)
+        self.file_label.setText(os.path.basename(file_path))
+        self.log(f"📁 已选择: {os.path.basename(file_path)}")
+        
+        options = {'inflate': self.inflate_check.isChecked()}
+        worker = TaskWorker(self._inspect, file_path, options)
+        self.processor.set_progress_callback(worker.signals.progress.emit)
+        worker.signals.progress.connect(self.on_progress)
+        worker.signals.finished.connect(self.on_inspected)
+        worker.signals.failed.connect(self.on_inspect_failed)
+        self._tracked = bool(self.status) and os.path.getsize(file_path) > self.LARGE_FILE
+        if self._tracked:
+            self.status.begin_job("PNG 结构分析", unit="B")
+        self.thread_pool.start(worker)
+    
+    def _inspect(self, file_path, options):
+        """分析（工作线程）"""
+        if not self.processor.process(file_path, options=options):
+            return None
+        return self.processor.get_result()
+    
+    def on_cancel_clicked(self):
+        """取消分析"""
+        if self.processor:
+            self.processor.cancel()
+            self.btn_cancel.setEnabled(False)
+            self.log("⏹ 正在取消...")
+    
+    def on_progress(self, progress):
+        """更新进度：遍历块占前 20%，解压 IDAT 占其余部分"""
+        total = progress['total'] or 1
+        fraction = progress['current'] / total
+        fraction = fraction * 0.2 if progress.get('stage') == 'chunks' else 0.2 + fraction * 0.8
+        self.progress_bar.setValue(int(fraction * 1000))
+        if self._tracked:
+            self.status.update_progress(progress['current'], progress['total'])
+    
+    def _finish(self):
+        """分析结束（成功或失败）时恢复按钮"""
+        self.running = False
+        self.btn_browse.setEnabled(True)
+        self.btn_cancel.setEnabled(False)
+        if self._tracked:
+            self.status.end_job()
+            self._tracked = False
+    
+    def on_inspected(self, report):
+        """分析完成：填充块表、异常表与文本块"""
+        self._finish()
+        if report is None:
+            self.summary_label.setText("")
+            self.log("⏹ 分析已取消或失败（详见控制台输出）", "warning")
+            return
+        self.report = report
+        self.progress_bar.setValue(self.progress_bar.maximum())
+        ihdr = report['ihdr']
+        image = (f"{ihdr['width']}x{ihdr['height']} 位深 {ihdr['bit_depth']} 颜色类型 {ihdr['color_type']}"
+                 f"{' 隔行' if ihdr['interlace'] else ''}") if ihdr else "无 IHDR"
+        errors = sum(anomaly['level'] == 'error' for anomaly in report['anomalies'])
+        summary = (f"{image} | {report['size']:,} 字节 | {len(report['chunks'])} 个块 | "
+                   f"{len(report['anomalies'])} 处异常（{errors} 处错误） | "
+                   f"遍历 {report['walk_elapsed'] * 1000:.0f} ms，共 {report['elapsed'] * 1000:.0f} ms")
+        self.summary_label.setText(summary)
+        self.log(f"🧩 {summary}", "error" if errors else "success")
+        
+        self.fill_chunks()
+        self.fill_anomalies()
+        self.show_idat(report['idat'])
+        self.show_texts(report['texts'])
+        self.set_loaded(True)
+    
+    def on_inspect_failed(self, error):
+        """分析出错"""
+        self._finish()
+        self.summary_label.setText("")
+        self.log(f"❌ 分析失败: {error}", "error")
+    
+    def fill_chunks(self):
+        """块表：最多列出 MAX_ROWS 个块"""
+        chunks = self.report['chunks']
+        rows = min(len(chunks), self.MAX_ROWS)
+        self.chunk_table.setUpdatesEnabled(False)
+        self.chunk_table.setRowCount(rows)
+        for row, chunk in enumerate(chunks[:rows]):
+            if chunk['crc'] is None:
+                crc = "缺失"
+            elif chunk['crc_ok']:
+                crc = f"{chunk['crc']:08X}"
+            else:
+                crc = f"{chunk['crc']:08X} ≠ {chunk['actual_crc']:08X}"
+            kind = "关键" if chunk['critical'] else "辅助"
+            if chunk['private']:
+                kind += "·私有"
+            values = [str(chunk['index']), f"0x{chunk['offset']:X}", chunk['type'], f"{chunk['length']:,}",
+                      crc, f"{chunk['note']}（{kind}）"]
+            colour = None
+            if chunk['crc'] is None or not chunk['crc_ok']:
+                colour = QColor(255, 200, 200)
+            elif not chunk['known']:
+                colour = QColor(255, 240, 180)
+            for column, value in enumerate(values):
+                item = QTableWidgetItem(value)
+                if colour is not None:
+                    item.setBackground(colour)
+                self.chunk_table.setItem(row, column, item)
+        self.chunk_table.setUpdatesEnabled(True)
+        if len(chunks) > rows:
+            self.log(f"⚠️ 块过多，表中只列出前 {rows} 个", "warning")
+    
+    def fill_anomalies(self):
+        """异常表"""
+        anomalies = self.report['anomalies']
+        self.anomaly_table.setRowCount(len(anomalies))
+        for row, anomaly in enumerate(anomalies):
+            offset = "" if anomaly['offset'] is None else f"0x{anomaly['offset']:X}"
+            for column, value in enumerate([LEVEL_NAMES[anomaly['level']], offset, anomaly['message']]):
+                self.anomaly_table.setItem(row, column, QTableWidgetItem(value))
+            self.log(f"⚠️ {anomaly['message']}", anomaly['level'])
+        if not anomalies:
+            self.log("✅ 没有发现结构异常", "success")
+    
+    def on_anomaly_selected(self, row, *_):
+        """选中异常：在块表中定位对应偏移的块"""
+        if self.report is None or row < 0 or row >= len(self.report['anomalies']):
+            return
+        offset = self.report['anomalies'][row]['offset']
+        if offset is None:
+            return
+        for chunk in self.report['chunks'][:self.MAX_ROWS]:
+            if chunk['offset'] == offset:
+                self.chunk_table.selectRow(chunk['index'])
+                self.chunk_table.scrollToItem(self.chunk_table.item(chunk['index'], 0))
+                return
+    
+    def show_idat(self, idat):
+        """IDAT 统计：压缩 / 解压大小与滤波类型直方图"""
+        if idat is None:
+            self.idat_label.setText("IDAT 未解压" if self.report['ihdr'] else "")
+            return
+        expected = "未知" if idat['expected'] is None else f"{idat['expected']:,}"
+        counts = idat['counts']
+        filters = " | ".join(f"{name} {int(counts[value]):,}" for value, name in enumerate(FILTER_NAMES))
+        if idat['invalid_rows']:
+            filters += f" | 无效 {idat['invalid_rows']:,}"
+        text = (f"IDAT: {idat['chunks']} 块, 压缩 {idat['compressed']:,} 字节 → 解压 {idat['decompressed']:,}"
+                f"（应为 {expected}）\n滤波类型: {filters}")
+        if idat['zlib']:
+            text += f"\nzlib 窗口 {idat['zlib']['window']} 字节, 压缩级别标记 {idat['zlib']['level']}"
+        self.idat_label.setText(text)
+    
+    def show_texts(self, texts):
+        """文本块列表"""
+        lines = []
+        for text in texts:
+            header = f"[{text['type']} @0x{text['offset']:X}] {text['keyword']}"
+            if text['language'] or text['translated']:
+                header += f" ({text['language']} / {text['translated']})"
+            if text['truncated']:
+                header += " [已截断]"
+            lines.append(header)
+            lines.append(f"    {text['text']}" if text['error'] is None else f"    ❌ {text['error']}")
+        self.text_view.set_text("\n".join(lines) if lines else "（没有文本块）")
+    
+    # ==================== 导出 ====================
+    
+    def selected_chunks(self):
+        """表中选中的块"""
+        rows = sorted({index.row() for index in self.chunk_table.selectionModel().selectedRows()})
+        return [self.report['chunks'][row] for row in rows]
+    
+    def on_export_chunks_clicked(self):
+        """把选中块的数据依次写入文件（不含长度、类型与 CRC）"""
+        chunks = self.selected_chunks() if self.report else []
+        if not chunks:
+            self.log("⚠️ 请先在块表中选择要导出的块", "warning")
+            return
+        default = f"{chunks[0]['type']}_{chunks[0]['index']}.bin"
+        file_path, _ = QFileDialog.getSaveFileName(self, "导出块数据", default, "所有文件 (*)")
+        if not file_path:
+            return
+        try:
+            with open(file_path, 'wb') as f:
+                for chunk in chunks:
+                    f.write(self.processor.chunk_data(self.file_path, chunk))
+        except OSError as e:
+            self.log(f"❌ 导出失败: {e}", "error")
+            return
+        self.log(f"💾 已导出 {len(chunks)} 个块的数据到: {file_path}", "success")
+    
+    def on_export_trailing_clicked(self):
+        """导出结构结束后的附加数据，按识别出的文件类型给出扩展名"""
+        trailing = self.report and self.report['trailing']
+        if not trailing:
+            return
+        extension = trailing['kinds'][0][1] if trailing['kinds'] else "bin"
+        file_path, _ = QFileDialog.getSaveFileName(self, "导出附加数据", f"trailing.{extension}", "所有文件 (*)")
+        if not file_path:
+            return
+        try:
+            with open(file_path, 'wb') as f:
+                f.write(self.processor.trailing_data(self.file_path))
+        except OSError as e:
+            self.log(f"❌ 导出失败: {e}", "error")
+            return
+        self.log(f"💾 已导出 {trailing['size']:,} 字节附加数据到: {file_path}", "success")
+    
+    def on_publish_clicked(self):
+        """把文本块内容发布到共享数据"""
+        texts = self.report['texts'] if self.report else []
+        if not texts:
+            return
+        content = "\n".join(f"{text['keyword']}: {text['text']}" for text in texts)
+        if self.parent_window and hasattr(self.parent_window, 'publish_data'):
+            self.parent_window.publish_data("PNG 文本块", content)
+            self.log(f"📤 已发布 {len(texts)} 个文本块", "success")
+    
+    def log(self, message, level="info"):
+        """输出日志"""
+        self.log_view.append(message, level)
+        
+        # 更新状态栏
+        if self.parent_window and hasattr(self.parent_window, 'status'):
+            self.parent_window.status.show_message(message)
+    
+    def cleanup(self):
+        """清理资源"""
+        if self.processor:
+            self.processor.cleanup()
@@ -0,0 +1,6 @@
+"""
+全局搜索模块
+"""
+from .search_module_ui import SearchModuleUI
+
+__all__ = ['SearchModuleUI']
@@ -0,0 +1,187 @@
+"""
+全局搜索模块UI - 对应 core.SecretFinder
+
+在所有已加载文件和各模块发布的处理结果中搜索 flag / 密钥等内容，
+新的数据通过 MainWindow.data_published 信号到达时自动增量扫描
+"""
+
+from PySide6.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QPushButton,
+                               QLabel, QGroupBox, QPlainTextEdit, QCheckBox,
+                               QTableWidget, QTableWidgetItem, QHeaderView, QSplitter)
+from PySide6.QtCore import Qt, QThreadPool
+
+from core.modules.secret_finder import parse_patterns, format_patterns
+from vievs.widgets import LogView, TaskWorker
+
+
+class SearchModuleUI(QWidget):
+    """全局搜索模块UI"""
+    
+    def __init__(self, parent=None, processor=None):
+        super().__init__(parent)
+        self.parent_window = parent
+        self.processor = processor  # SecretFinder 实例
+        self.thread_pool = QThreadPool.globalInstance()
+        
+        # 初始化处理器
+        if self.processor:
+            self.processor.initialize()
+        
+        self.init_ui()
+        self.connect_signals()
+    
+    def init_ui(self):
+        """初始化界面"""
+        main_layout = QVBoxLayout(self)
+        main_layout.setContentsMargins(20, 15, 20, 15)
+        main_layout.setSpacing(12)
+        
+        splitter = QSplitter(Qt.Horizontal)
+        
+        # 规则编辑
+        rules_group = QGroupBox("📜 搜索规则 (名称: 正则)")
+        rules_layout = QVBoxLayout()
+        
+        self.rules_edit = QPlainTextEdit()
+        if self.processor:
+            self.rules_edit.setPlainText(format_patterns(self.processor.patterns))
+        rules_layout.addWidget(self.rules_edit)
+        
+        self.auto_scan_check = QCheckBox("新结果到达时自动扫描")
+        self.auto_scan_check.setChecked(True)
+        rules_layout.addWidget(self.auto_scan_check)
+        
+        rules_group.setLayout(rules_layout)
+        splitter.addWidget(rules_group)
+        
+        # 匹配结果
+        result_group = QGroupBox("🔎 匹配结果")
+        result_layout = QVBoxLayout()
+        
+        self.result_table = QTableWidget(0, 4)
+        self.result_table.setHorizontalHeaderLabels(["来源", "偏移", "规则", "内容"])
+        self.result_table.horizontalHeader().setSectionResizeMode(3, QHeaderView.Stretch)
+        self.result_table.setEditTriggers(QTableWidget.NoEditTriggers)
+        self.result_table.setSelectionBehavior(QTableWidget.SelectRows)
+        result_layout.addWidget(self.result_table)
+        
+        self.summary_label = QLabel("匹配: 0")
+        result_layout.addWidget(self.summary_label)
+        
+        result_group.setLayout(result_layout)
+        splitter.addWidget(result_group)
+        splitter.setStretchFactor(1, 2)
+        main_layout.addWidget(splitter)
+        
+        # 操作按钮
+        button_layout = QHBoxLayout()
+        
+        self.btn_apply = QPushButton("🔁 应用规则并重新扫描")
+        self.btn_apply.setMinimumHeight(35)
+        self.btn_copy = QPushButton("📋 复制选中内容")
+        self.btn_copy.setMinimumHeight(35)
+        
+        button_layout.addStretch()
+        button_layout.addWidget(self.btn_apply)
+        button_layout.addWidget(self.btn_copy)
+        
+        main_layout.addLayout(button_layout)
+        
+        # 日志输出
+        log_group = QGroupBox("📋 处理日志")
+        log_layout = QVBoxLayout()
+        
+        self.log_view = LogView()
+        self.log_view.setMaximumHeight(140)
+        log_layout.addWidget(self.log_view)
+        
+        log_group.setLayout(log_layout)
+        main_layout.addWidget(log_group)
+        
+        self.log("✅ 全局搜索模块已加载", "success")
+    
+    def connect_signals(self):
+        """连接信号槽"""
+        self.btn_apply.clicked.connect(self.on_apply_clicked)
+        self.btn_copy.clicked.connect(self.on_copy_clicked)
+        
+        if self.parent_window and hasattr(self.parent_window, 'data_published'):
+            self.parent_window.data_published.connect(self.on_data_published)
+    
+    def on_data_published(self, source, data):
+        """其他模块发布了新数据，后台增量扫描"""
+        if not self.processor or not self.auto_scan_check.isChecked():
+            return
+        worker = TaskWorker(self.processor.add_source, source, data)
+        worker.signals.finished.connect(lambda matches: self.on_source_scanned(source, matches))
+        worker.signals.failed.connect(lambda error: self.log(f"❌ 扫描 {source} 失败: {error}", "error"))
+        self.thread_pool.start(worker)
+    
+    def on_source_scanned(self, source, matches):
+        """单个数据源扫描完成"""
+        self.refresh_table()
+        if matches:
+            self.log(f"🎯 {source}: 发现 {len(matches)} 处匹配", "success")
+    
+    def on_apply_clicked(self):
+        """应用规则并重新扫描全部数据源"""
+        if not self.processor:
+            return
+        errors = self.processor.set_patterns(parse_patterns(self.rules_edit.toPlainText()))
+        for error in errors:
+            self.log(f"⚠️ 规则无效: {error}", "warning")
+        
+        self.btn_apply.setEnabled(False)
+        self.log("🔁 正在重新扫描全部数据源...")
+        worker = TaskWorker(self.processor.process)
+        worker.signals.finished.connect(self.on_rescan_finished)
+        worker.signals.failed.connect(self.on_rescan_failed)
+        self.thread_pool.start(worker)
+    
+    def on_rescan_finished(self, success):
+        """重新扫描完成"""
+        self.btn_apply.setEnabled(True)
+        self.refresh_table()
+        if success:
+            self.log("✨ 扫描完成！", "success")
+        else:
+            self.log("❌ 扫描失败", "error")
+    
+    def on_rescan_failed(self, error):
+        """重新扫描出错"""
+        self.btn_apply.setEnabled(True)
+        self.log(f"❌ 扫描失败: {error}", "error")
+    
+    def refresh_table(self):
+        """刷新匹配表"""
+        matches = self.processor.get_result()
+        self.result_table.setRowCount(len(matches))
+        for row, match in enumerate(matches):
+            self.result_table.setItem(row, 0, QTableWidgetItem(match['source']))
+            self.result_table.setItem(row, 1, QTableWidgetItem(f"0x{match['offset']:x}"))
+            self.result_table.setItem(row, 2, QTableWidgetItem(match['rule']))
+            self.result_table.setItem(row, 3, QTableWidgetItem(match['text']))
+        self.summary_label.setText(f"匹配: {len(matches)}")
+    
+    def on_copy_clicked(self):
+        """复制选中行的匹配内容"""
+        from PySide6.QtWidgets import QApplication
+        
+        rows = sorted({index.row() for index in self.result_table.selectedIndexes()})
+        texts = [self.result_table.item(row, 3).text() for row in rows]
+        if texts:
+            QApplication.clipboard().setText("\n".join(texts))
+            self.log(f"📋 已复制 {len(texts)} 条")
+    
+    def log(self, message, level="info"):
+        """输出日志"""
+        self.log_view.append(message, level)
+        
+        # 更新状态栏
+        if self.parent_window and hasattr(self.parent_window, 'status'):
+            self.parent_window.status.show_message(message)
+    
+    def cleanup(self):
+        """清理资源"""
+        if self.processor:
+            self.processor.cleanup()
@@ -0,0 +1,6 @@
+"""
+频域分析模块
+"""
+from .spectrum_module_ui import SpectrumModuleUI
+
+__all__ = ['SpectrumModuleUI']
@@ -0,0 +1,403 @@
+# -*- coding: utf-8 -*-
+"""
+频域分析模块UI - 对应 core.SpectrumAnalyzer
+
+- 单图频谱：各通道的对数幅度谱 / 相位谱，半谱按图像和通道缓存，切换显示方式不重新变换
+- 双图差分：原图与水印图的频域差分（BlindWaterMark），可输入种子还原置乱
+- 分块 DCT：取每块的一个系数生成系数图，按符号或两系数比较提取比特
+图像读取与变换都在线程池中进行，大图的变换可取消。
+"""
+
+import os
+
+from PySide6.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QPushButton,
+                               QLabel, QGroupBox, QComboBox, QSpinBox, QDoubleSpinBox,
+                               QLineEdit, QCheckBox, QFormLayout, QFileDialog, QProgressBar)
+from PySide6.QtCore import Qt, QThreadPool
+from PySide6.QtGui import QImage, QPixmap
+
+from vievs.widgets import LogView, TaskWorker, ResultView, array_to_qimage, qimage_to_array
+from core.modules.spectrum_analyzer import MODES, CHANNELS, SPECTRA, DCT_BITS
+from core.modules.frame_reducer import to_rgba
+
+
+def load_rgba(path):
+    """用 Qt 读取图像为 RGBA 数组（工作线程）"""
+    image = QImage(path)
+    if image.isNull():
+        raise ValueError(f"无法读取图像: {os.path.basename(path)}")
+    return path, qimage_to_array(image.convertToFormat(QImage.Format_RGBA8888))
+
+
+class SpectrumModuleUI(QWidget):
+    """频域分析模块UI"""
+    
+    # 预览区域的最大尺寸
+    PREVIEW_SIZE = (560, 420)
+    
+    def __init__(self, parent=None, processor=None):
+        super().__init__(parent)
+        self.parent_window = parent
+        self.processor = processor  # SpectrumAnalyzer 实例
+        self.thread_pool = QThreadPool.globalInstance()
+        self.status = getattr(parent, 'status', None)  # MainWindow 的 StatusService
+        self.keys = {'image': None, 'reference': None}  # 已登记到分析器的图像键
+        self.result = None
+        self.result_image = None
+        self.running = False
+        
+        if self.processor:
+            self.processor.initialize()
+        
+        self.init_ui()
+        self.connect_signals()
+        self.on_mode_changed()
+    
+    def init_ui(self):
+        """初始化界面"""
+        main_layout = QVBoxLayout(self)
+        main_layout.setContentsMargins(20, 15, 20, 15)
+        main_layout.setSpacing(12)
+        
+        # 文件选择区域
+        file_group = QGroupBox("📁 图像文件")
+        file_layout = QFormLayout()
+        
+        image_layout = QHBoxLayout()
+        self.image_label = QLabel("未选择文件")
+        image_layout.addWidget(self.image_label, 1)
+        self.btn_image = QPushButton("📁 浏览...")
+        self.btn_image.setMaximumWidth(100)
+        image_layout.addWidget(self.btn_image)
+        file_layout.addRow("待分析 / 水印图:", image_layout)
+        
+        reference_layout = QHBoxLayout()
+        self.reference_label = QLabel("未选择文件")
+        reference_layout.addWidget(self.reference_label, 1)
+        self.btn_reference = QPushButton("📁 浏览...")
+        self.btn_reference.setMaximumWidth(100)
+        reference_layout.addWidget(self.btn_reference)
+        file_layout.addRow("原图:", reference_layout)
+        
+        file_group.setLayout(file_layout)
+        main_layout.addWidget(file_group)
+        
+        # 分析选项
+        options_group = QGroupBox("⚙️ 分析选项")
+        options_layout = QHBoxLayout()
+        
+        form = QFormLayout()
+        self.mode_combo = QComboBox()
+        for key, name in MODES.items():
+            self.mode_combo.addItem(name, key)
+        form.addRow("方式:", self.mode_combo)
+        self.channel_combo = QComboBox()
+        for key, name in CHANNELS.items():
+            self.channel_combo.addItem(name, key)
+        self.channel_combo.addItem("RGB 合成", 'rgb')
+        form.addRow("通道:", self.channel_combo)
+        self.spectrum_combo = QComboBox()
+        for key, name in SPECTRA.items():
+            self.spectrum_combo.addItem(name, key)
+        form.addRow("显示:", self.spectrum_combo)
+        options_layout.addLayout(form)
+        
+        watermark_form = QFormLayout()
+        self.alpha_spin = QDoubleSpinBox()
+        self.alpha_spin.setRange(0.01, 1000)
+        self.alpha_spin.setValue(3.0)
+        watermark_form.addRow("强度 alpha:", self.alpha_spin)
+        self.seed_edit = QLineEdit()
+        self.seed_edit.setPlaceholderText("留空不还原置乱，如 20160930")
+        watermark_form.addRow("置乱种子:", self.seed_edit)
+        self.normalize_check = QCheckBox("拉伸到 0~255")
+        watermark_form.addRow("", self.normalize_check)
+        options_layout.addLayout(watermark_form)
+        
+        dct_form = QFormLayout()
+        self.block_spin = QSpinBox()
+        self.block_spin.setRange(2, 64)
+        self.block_spin.setValue(8)
+        self.block_spin.setSuffix(" px")
+        dct_form.addRow("块边长:", self.block_spin)
+        self.u_spin, self.v_spin, coefficient_layout = self._coefficient_row(0, 1)
+        dct_form.addRow("系数 (u, v):", coefficient_layout)
+        self.bits_combo = QComboBox()
+        for key, name in DCT_BITS.items():
+            self.bits_combo.addItem(name, key)
+        dct_form.addRow("取比特:", self.bits_combo)
+        self.u2_spin, self.v2_spin, compare_layout = self._coefficient_row(1, 0)
+        dct_form.addRow("比较系数:", compare_layout)
+        options_layout.addLayout(dct_form)
+        
+        options_group.setLayout(options_layout)
+        main_layout.addWidget(options_group)
+        
+        # 按钮区域
+        button_layout = QHBoxLayout()
+        self.btn_analyze = QPushButton("🌀 分析")
+        self.btn_analyze.setMinimumHeight(36)
+        button_layout.addWidget(self.btn_analyze)
+        self.btn_cancel = QPushButton("⏹ 取消")
+        self.btn_cancel.setEnabled(False)
+        self.btn_cancel.setMinimumHeight(36)
+        button_layout.addWidget(self.btn_cancel)
+        self.btn_save = QPushButton("💾 保存结果")
+        self.btn_save.setMinimumHeight(36)
+        button_layout.addWidget(self.btn_save)
+        main_layout.addLayout(button_layout)
+        
+        self.progress_bar = QProgressBar()
+        self.progress_bar.setRange(0, 1000)
+        main_layout.addWidget(self.progress_bar)
+        
+        # 结果预览
+        self.preview_label = QLabel("未分析")
+        self.preview_label.setAlignment(Qt.AlignCenter)
+        self.preview_label.setMinimumHeight(240)
+        main_layout.addWidget(self.preview_label, 1)
+        self.info_label = QLabel("")
+        main_layout.addWidget(self.info_label)
+        
+        self.bits_view = ResultView()
+        self.bits_view.setMaximumHeight(90)
+        main_layout.addWidget(self.bits_view)
+        
+        # 日志输出
+        log_group = QGroupBox("📋 处理日志")
+        log_layout = QVBoxLayout()
+        
+        self.log_view = LogView()
+        self.log_view.setMaximumHeight(100)
+        log_layout.addWidget(self.log_view)
+        
+        log_group.setLayout(log_layout)
+        main_layout.addWidget(log_group)
+        
+        self.log("✅ 频域分析模块已加载", "success")
+        self.log("💡 提示: 盲水印先载入原图和水印图，种子与嵌入时相同才能还原置乱")
+    
+    @staticmethod
+    def _coefficient_row(u, v):
+        """一行 (u, v) 系数输入框"""
+        layout = QHBoxLayout()
+        spins = []
+        for value in (u, v):
+            spin = QSpinBox()
+            spin.setRange(0, 63)
+            spin.setValue(value)
+            layout.addWidget(spin)
+            spins.append(spin)
+        return spins[0], spins[1], layout
+    
+    def connect_signals(self):
+        """连接信号槽"""
+        self.btn_image.clicked.connect(lambda: self.on_browse_clicked('image'))
+        self.btn_reference.clicked.connect(lambda: self.on_browse_clicked('reference'))
+        self.mode_combo.currentIndexChanged.connect(self.on_mode_changed)
+        self.btn_analyze.clicked.connect(self.on_analyze_clicked)
+        self.btn_cancel.clicked.connect(self.on_cancel_clicked)
+        self.btn_save.clicked.connect(self.on_save_clicked)
+    
+    def on_mode_changed(self):
+        """按分析方式启用对应的选项"""
+        mode = self.mode_combo.currentData()
+        self.spectrum_combo.setEnabled(mode == 'spectrum')
+        for widget in (self.alpha_spin, self.seed_edit, self.normalize_check, self.btn_reference):
+            widget.setEnabled(mode == 'difference')
+        for widget in (self.block_spin, self.u_spin, self.v_spin, self.bits_combo,
+                       self.u2_spin, self.v2_spin):
+            widget.setEnabled(mode == 'dct')
+        self.bits_view.setVisible(mode == 'dct')
+    
+    # ==================== 图像 ====================
+    
+    def on_browse_clicked(self, slot):
+        """浏览文件"""
+        file_path, _ = QFileDialog.getOpenFileName(
+            self,
+            "选择原图" if slot == 'reference' else "选择图像",
+            "",
+            "图像文件 (*.png *.bmp *.jpg *.jpeg *.tif *.tiff *.gif);;所有文件 (*)"
+        )
+        if file_path:
+            self.load_image(file_path, slot)
+    
+    def load_image(self, file_path, slot='image'):
+        """在后台读取图像，完成后登记到分析器"""
+        self.log(f"⏳ 读取中: {os.path.basename(file_path)}")
+        worker = TaskWorker(load_rgba, file_path)
+        if slot == 'reference':
+            worker.signals.finished.connect(self.on_reference_loaded)
+        else:
+            worker.signals.finished.connect(self.on_image_loaded)
+        worker.signals.failed.connect(self.on_load_failed)
+        self.thread_pool.start(worker)
+    
+    def on_image_loaded(self, loaded):
+        """待分析图像读取完成"""
+        self.set_image('image', *loaded)
+    
+    def on_reference_loaded(self, loaded):
+        """原图读取完成"""
+        self.set_image('reference', *loaded)
+    
+    def set_image(self, slot, file_path, image):
+        """替换图像：旧图像及其缓存的频谱一并移除"""
+        if self.keys[slot] is not None:
+            self.processor.remove_image(self.keys[slot])
+        self.keys[slot] = self.processor.add_image(image)
+        label = self.reference_label if slot == 'reference' else self.image_label
+        label.setText(f"{os.path.basename(file_path)} ({image.shape[1]}x{image.shape[0]})")
+        self.log(f"📁 已载入: {os.path.basename(file_path)}")
+    
+    def on_load_failed(self, error):
+        """图像读取失败"""
+        self.log(f"❌ 读取失败: {error}", "error")
+    
+    # ==================== 分析 ====================
+    
+    def collect_options(self):
+        """收集分析选项，无效时返回 None"""
+        mode = self.mode_combo.currentData()
+        channel = self.channel_combo.currentData()
+        options = {'mode': mode, 'channel': channel}
+        if mode == 'spectrum':
+            options['spectrum'] = self.spectrum_combo.currentData()
+        elif mode == 'difference':
+            if self.keys['reference'] is None:
+                self.log("⚠️ 请先载入原图", "warning")
+                return None
+            seed = self.seed_edit.text().strip()
+            try:
+                options['seed'] = int(seed, 0) if seed else None
+            except ValueError:
+                self.log(f"⚠️ 种子必须是整数: {seed}", "warning")
+                return None
+            options.update(reference=self.keys['reference'], alpha=self.alpha_spin.value(),
+                           normalize=self.normalize_check.isChecked())
+        else:
+            block = self.block_spin.value()
+            pairs = [(self.u_spin.value(), self.v_spin.value()),
+                     (self.u2_spin.value(), self.v2_spin.value())]
+            if max(max(pair) for pair in pairs) >= block:
+                self.log(f"⚠️ 系数下标必须小于块边长 {block}", "warning")
+                return None
+            options.update(block=block, coefficient=pairs[0], compare=pairs[1],
+                           bits=self.bits_combo.currentData())
+        if channel == 'rgb' and mode != 'difference':
+            self.log("⚠️ RGB 合成只用于双图差分", "warning")
+            return None
+        return options
+    
+    def on_analyze_clicked(self):
+        """开始分析"""
+        if self.running:
+            return
+        if self.keys['image'] is None:
+            self.log("⚠️ 请先载入图像", "warning")
+            return
+        options = self.collect_options()
+        if options is None:
+            return
+        self.running = True
+        self.btn_analyze.setEnabled(False)
+        self.btn_cancel.setEnabled(True)
+        self.progress_bar.setValue(0)
+        
+        worker = TaskWorker(self.processor.process, self.keys['image'], options=options)
+        self.processor.set_progress_callback(worker.signals.progress.emit)
+        worker.signals.progress.connect(self.on_progress)
+        worker.signals.finished.connect(self.on_analyze_finished)
+        worker.signals.failed.connect(self.on_analyze_failed)
+        if self.status:
+            self.status.begin_job("频域分析", total=0)
+        self.thread_pool.start(worker)
+    
+    def on_cancel_clicked(self):
+        """取消分析"""
+        if self.processor:
+            self.processor.cancel()
+            self.btn_cancel.setEnabled(False)
+            self.log("⏹ 正在取消...")
+    
+    def on_progress(self, progress):
+        """更新进度"""
+        total = progress['total'] or 1
+        self.progress_bar.setValue(int(progress['current'] * 1000 / total))
+        if self.status:
+            self.status.update_progress(progress['current'], progress['total'])
+    
+    def _finish(self):
+        """分析结束（成功或失败）时恢复按钮"""
+        self.running = False
+        self.btn_analyze.setEnabled(True)
+        self.btn_cancel.setEnabled(False)
+        if self.status:
+            self.status.end_job()
+    
+    def on_analyze_finished(self, success):
+        """分析完成：显示结果"""
+        self._finish()
+        if not success:
+            self.log("⏹ 分析已取消或失败", "warning")
+            return
+        self.result = self.processor.get_result()
+        self.progress_bar.setValue(self.progress_bar.maximum())
+        image = self.result['image']
+        self.result_image = to_rgba(image) if image.ndim == 3 else image
+        width, height = self.PREVIEW_SIZE
+        preview = array_to_qimage(self.result_image).scaled(width, height, Qt.KeepAspectRatio,
+                                                            Qt.SmoothTransformation)
+        self.preview_label.setPixmap(QPixmap.fromImage(preview))
+        
+        cached, nbytes = self.processor.cache_info()
+        info = (f"{MODES[self.result['mode']]} | {image.shape[1]}x{image.shape[0]} | "
+                f"用时 {self.result['elapsed']:.2f}s | 缓存频谱 {cached} 个 ({nbytes / (1 << 20):.0f} MB)")
+        self.info_label.setText(info)
+        self.log(f"✨ {info}", "success")
+        if self.result['mode'] == 'dct':
+            self.show_bits()
+    
+    def on_analyze_failed(self, error):
+        """分析出错"""
+        self._finish()
+        self.log(f"❌ 分析失败: {error}", "error")
+    
+    def show_bits(self):
+        """显示 DCT 比特与打包后的字节，并发布"""
+        rows, cols = self.result['blocks']
+        data = self.result['bytes']
+        text = (f"{rows}x{cols} 块, {len(self.result['bits'])} 比特\n"
+                f"比特: {self.result['bits'][:4096]}\n"
+                f"字节: {data[:1024].hex()}\n"
+                f"文本: {data[:1024].decode('latin-1')!r}")
+        self.bits_view.set_text(text)
+        if self.parent_window and hasattr(self.parent_window, 'publish_data'):
+            self.parent_window.publish_data("DCT 比特", data.decode('latin-1'))
+    
+    def on_save_clicked(self):
+        """保存全分辨率结果"""
+        if self.result_image is None:
+            self.log("⚠️ 没有可保存的结果！", "warning")
+            return
+        file_path, _ = QFileDialog.getSaveFileName(self, "保存分析结果", "", "PNG图像 (*.png);;所有文件 (*)")
+        if not file_path:
+            return
+        if array_to_qimage(self.result_image).save(file_path):
+            self.log(f"💾 已保存到: {file_path}", "success")
+        else:
+            self.log(f"❌ 保存失败: {file_path}", "error")
+    
+    def log(self, message, level="info"):
+        """输出日志"""
+        self.log_view.append(message, level)
+        
+        # 更新状态栏
+        if self.parent_window and hasattr(self.parent_window, 'status'):
+            self.parent_window.status.show_message(message)
+    
+    def cleanup(self):
+        """清理资源"""
+        if self.processor:
+            self.processor.cleanup()
@@ -0,0 +1,6 @@
+"""
+图像隐写分析模块
+"""
+from .stego_module_ui import StegoModuleUI
+
+__all__ = ['StegoModuleUI']
@@ -0,0 +1,466 @@
+# -*- coding: utf-8 -*-
+"""
+图像隐写分析模块UI - 对应 core.BitPlaneProcessor / core.LsbExtractor
+
+- 位平面：加载图像后一次算出全部位平面，之后翻页只是把缓存的打包平面包装成
+  单色 QImage 显示，不再重新计算
+- LSB 提取：按通道 / 位 / 遍历顺序提取比特流并识别文件类型，
+  或扫描常见组合按得分排序
+"""
+
+import os
+import time
+
+from PySide6.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QPushButton,
+                               QLabel, QGroupBox, QComboBox, QFileDialog, QSpinBox,
+                               QTabWidget, QLineEdit, QTableWidget, QTableWidgetItem,
+                               QHeaderView)
+from PySide6.QtCore import Qt, QThreadPool
+from PySide6.QtGui import QImage, QPixmap, QKeySequence, QShortcut
+
+from core.modules.file_signature import hexdump
+from core.modules.lsb_extractor import parse_channels, parse_bits
+from vievs.widgets import LogView, TaskWorker, LRUCache, ResultView, qimage_to_array
+
+
+class StegoModuleUI(QWidget):
+    """图像隐写分析模块UI（位平面浏览 + LSB 提取）"""
+    
+    # 平面显示区域的最大尺寸
+    VIEW_SIZE = (640, 400)
+    # 提取结果中显示为十六进制的字节数
+    HEXDUMP_BYTES = 4096
+    
+    def __init__(self, parent=None, processor=None, extractor=None):
+        super().__init__(parent)
+        self.parent_window = parent
+        self.processor = processor  # BitPlaneProcessor 实例
+        self.extractor = extractor  # LsbExtractor 实例
+        self.extracted = b""
+        self.thread_pool = QThreadPool.globalInstance()
+        self.status = getattr(parent, 'status', None)  # MainWindow 的 StatusService
+        self.current_image_path = ""
+        self.image_array = None
+        # 已缩放的平面图: (图像版本, 通道, 位) -> (QPixmap, 1 的比例)，翻回看过的平面时直接显示
+        self.pixmap_cache = LRUCache(64)
+        self._version = 0
+        self._started = 0.0
+        
+        if self.processor:
+            self.processor.initialize()
+        if self.extractor:
+            self.extractor.initialize()
+        
+        self.init_ui()
+        self.connect_signals()
+    
+    def init_ui(self):
+        """初始化界面"""
+        main_layout = QVBoxLayout(self)
+        main_layout.setContentsMargins(20, 15, 20, 15)
+        main_layout.setSpacing(12)
+        
+        # 文件选择区域
+        file_group = QGroupBox("📁 图像文件")
+        file_layout = QHBoxLayout()
+        
+        self.file_label = QLabel("未选择文件")
+        file_layout.addWidget(self.file_label)
+        
+        self.btn_browse = QPushButton("📁 浏览...")
+        self.btn_browse.setMaximumWidth(100)
+        file_layout.addWidget(self.btn_browse)
+        
+        file_group.setLayout(file_layout)
+        main_layout.addWidget(file_group)
+        
+        self.tabs = QTabWidget()
+        self.tabs.addTab(self._create_plane_page(), "🔍 位平面")
+        self.tabs.addTab(self._create_lsb_page(), "🧬 LSB 提取")
+        main_layout.addWidget(self.tabs, 1)
+        
+        # 日志输出
+        log_group = QGroupBox("📋 处理日志")
+        log_layout = QVBoxLayout()
+        
+        self.log_view = LogView()
+        self.log_view.setMaximumHeight(160)
+        log_layout.addWidget(self.log_view)
+        
+        log_group.setLayout(log_layout)
+        main_layout.addWidget(log_group)
+        
+        self.set_planes_enabled(False)
+        
+        # 初始日志
+        self.log("✅ 图像隐写分析模块已加载", "success")
+        self.log("💡 提示: 加载图像后用 ←/→ 逐个浏览位平面，或在 LSB 提取页扫描常见组合")
+    
+    def _create_plane_page(self):
+        """位平面浏览页"""
+        page = QWidget()
+        page_layout = QVBoxLayout(page)
+        
+        # 位平面选择
+        plane_layout = QHBoxLayout()
+        
+        plane_layout.addWidget(QLabel("通道:"))
+        self.channel_combo = QComboBox()
+        self.channel_combo.addItems(["红 (R)", "绿 (G)", "蓝 (B)", "透明 (A)"])
+        plane_layout.addWidget(self.channel_combo)
+        
+        plane_layout.addWidget(QLabel("位:"))
+        self.bit_spin = QSpinBox()
+        self.bit_spin.setRange(0, 7)
+        plane_layout.addWidget(self.bit_spin)
+        
+        plane_layout.addStretch()
+        self.btn_prev = QPushButton("◀ 上一平面")
+        self.btn_next = QPushButton("下一平面 ▶")
+        plane_layout.addWidget(self.btn_prev)
+        plane_layout.addWidget(self.btn_next)
+        page_layout.addLayout(plane_layout)
+        
+        # 平面显示
+        self.plane_label = QLabel("未加载图像")
+        self.plane_label.setAlignment(Qt.AlignCenter)
+        self.plane_label.setMinimumHeight(240)
+        page_layout.addWidget(self.plane_label, 1)
+        
+        self.plane_info_label = QLabel("")
+        page_layout.addWidget(self.plane_info_label)
+        return page
+    
+    def _create_lsb_page(self):
+        """LSB 提取页：选项、扫描排名表、提取结果"""
+        page = QWidget()
+        page_layout = QVBoxLayout(page)
+        
+        options_layout = QHBoxLayout()
+        options_layout.addWidget(QLabel("通道:"))
+        self.channels_edit = QLineEdit("RGB")
+        self.channels_edit.setMaximumWidth(70)
+        self.channels_edit.setToolTip("按提取顺序排列的通道，如 RGB / BGR / A")
+        options_layout.addWidget(self.channels_edit)
+        
+        options_layout.addWidget(QLabel("位:"))
+        self.bits_edit = QLineEdit("0")
+        self.bits_edit.setMaximumWidth(70)
+        self.bits_edit.setToolTip("按提取顺序排列的位，如 0 / 1,0 / 7-4")
+        options_layout.addWidget(self.bits_edit)
+        
+        options_layout.addWidget(QLabel("遍历:"))
+        self.order_combo = QComboBox()
+        self.order_combo.addItems(["行优先", "列优先"])
+        options_layout.addWidget(self.order_combo)
+        
+        options_layout.addWidget(QLabel("位序:"))
+        self.bit_order_combo = QComboBox()
+        self.bit_order_combo.addItems(["MSB 在前", "LSB 在前"])
+        options_layout.addWidget(self.bit_order_combo)
+        options_layout.addStretch()
+        page_layout.addLayout(options_layout)
+        
+        button_layout = QHBoxLayout()
+        self.btn_extract = QPushButton("🧬 提取")
+        self.btn_sweep = QPushButton("🔎 扫描常见组合")
+        self.btn_save_data = QPushButton("💾 保存数据")
+        button_layout.addStretch()
+        button_layout.addWidget(self.btn_sweep)
+        button_layout.addWidget(self.btn_extract)
+        button_layout.addWidget(self.btn_save_data)
+        page_layout.addLayout(button_layout)
+        
+        # 扫描结果（双击一行按该组合完整提取）
+        self.sweep_table = QTableWidget(0, 8)
+        self.sweep_table.setHorizontalHeaderLabels(
+            ["通道", "位", "遍历", "位序", "识别结果", "熵", "可打印", "得分"])
+        self.sweep_table.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeToContents)
+        self.sweep_table.horizontalHeader().setStretchLastSection(True)
+        self.sweep_table.setEditTriggers(QTableWidget.NoEditTriggers)
+        self.sweep_table.setSelectionBehavior(QTableWidget.SelectRows)
+        page_layout.addWidget(self.sweep_table, 1)
+        
+        self.extract_view = ResultView()
+        page_layout.addWidget(self.extract_view, 1)
+        return page
+    
+    def connect_signals(self):
+        """连接信号槽"""
+        self.btn_browse.clicked.connect(self.on_browse_clicked)
+        self.channel_combo.currentIndexChanged.connect(self.show_plane)
+        self.bit_spin.valueChanged.connect(self.show_plane)
+        self.btn_prev.clicked.connect(lambda: self.step_plane(-1))
+        self.btn_next.clicked.connect(lambda: self.step_plane(1))
+        QShortcut(QKeySequence(Qt.Key_Left), self, lambda: self.step_plane(-1))
+        QShortcut(QKeySequence(Qt.Key_Right), self, lambda: self.step_plane(1))
+        self.btn_extract.clicked.connect(self.on_extract_clicked)
+        self.btn_sweep.clicked.connect(self.on_sweep_clicked)
+        self.btn_save_data.clicked.connect(self.on_save_data_clicked)
+        self.sweep_table.cellDoubleClicked.connect(self.on_sweep_row_activated)
+    
+    def set_planes_enabled(self, enabled):
+        """位平面控件只在平面计算完成后可用"""
+        for widget in (self.channel_combo, self.bit_spin, self.btn_prev, self.btn_next):
+            widget.setEnabled(enabled)
+    
+    def on_browse_clicked(self):
+        """浏览文件"""
+        file_path, _ = QFileDialog.getOpenFileName(
+            self,
+            "选择图像文件",
+            "",
+            "图像文件 (*.png *.bmp *.gif *.jpg *.jpeg *.tif *.tiff);;所有文件 (*)"
+        )
+        if file_path:
+            self.load_image(file_path)
+    
+    def load_image(self, file_path):
+        """加载图像并在线程池中计算全部位平面"""
+        image = QImage(file_path)
+        if image.isNull():
+            self.log(f"❌ 无法读取图像: {os.path.basename(file_path)}", "error")
+            return False
+        if not self.processor:
+            self.log("❌ 没有可用的处理器", "error")
+            return False
+        
+        # 始终按 RGBA 分析（灰度、调色板图像也展开为 4 个通道）
+        self.current_image_path = file_path
+        self.image_array = qimage_to_array(image.convertToFormat(QImage.Format_RGBA8888))
+        self.file_label.setText(os.path.basename(file_path))
+        self.log(f"📁 已选择: {os.path.basename(file_path)} ({image.width()}x{image.height()})")
+        
+        self.set_planes_enabled(False)
+        self.btn_browse.setEnabled(False)
+        self._started = time.perf_counter()
+        worker = TaskWorker(self.processor.process, self.image_array)
+        self.processor.set_progress_callback(worker.signals.progress.emit)
+        worker.signals.progress.connect(self.on_progress)
+        worker.signals.finished.connect(self.on_planes_finished)
+        worker.signals.failed.connect(self.on_planes_failed)
+        if self.status:
+            self.status.begin_job("计算位平面", total=image.height(), unit="行")
+        self.thread_pool.start(worker)
+        return True
+    
+    def on_progress(self, progress):
+        """计算进度"""
+        if self.status:
+            self.status.update_progress(progress['current'], progress['total'])
+    
+    def on_planes_finished(self, success):
+        """位平面计算完成"""
+        self.btn_browse.setEnabled(True)
+        if self.status:
+            self.status.end_job()
+        if not success:
+            self.log("❌ 位平面计算失败", "error")
+            return
+        self._version += 1
+        elapsed = time.perf_counter() - self._started
+        self.log(f"✨ 已计算 {self.processor.plane_count()} 个位平面，用时 {elapsed:.2f}s", "success")
+        self.set_planes_enabled(True)
+        self.show_plane()
+    
+    def on_planes_failed(self, error):
+        """位平面计算出错"""
+        self.btn_browse.setEnabled(True)
+        if self.status:
+            self.status.end_job()
+        self.log(f"❌ 位平面计算失败: {error}", "error")
+    
+    def step_plane(self, delta):
+        """按 R0..R7, G0..G7, ... 的顺序前后翻页（循环）"""
+        if not self.processor or self.processor.planes is None:
+            return
+        count = self.processor.plane_count()
+        index = (self.channel_combo.currentIndex() * 8 + self.bit_spin.value() + delta) % count
+        for widget in (self.channel_combo, self.bit_spin):
+            widget.blockSignals(True)
+        self.channel_combo.setCurrentIndex(index // 8)
+        self.bit_spin.setValue(index % 8)
+        for widget in (self.channel_combo, self.bit_spin):
+            widget.blockSignals(False)
+        self.show_plane()
+    
+    def show_plane(self):
+        """显示当前选择的位平面（打包数据直接作为单色图像，不解包）"""
+        if not self.processor or self.processor.planes is None:
+            return
+        channel, bit = self.channel_combo.currentIndex(), self.bit_spin.value()
+        key = (self._version, channel, bit)
+        cached = self.pixmap_cache.get(key)
+        if cached is None:
+            packed = self.processor.plane(channel, bit)
+            image = QImage(packed.data, self.processor.width, self.processor.height,
+                           packed.strides[0], QImage.Format_MonoLSB)
+            image.setColorTable([0xff000000, 0xffffffff])
+            width, height = self.VIEW_SIZE
+            pixmap = QPixmap.fromImage(image.scaled(width, height, Qt.KeepAspectRatio, Qt.FastTransformation))
+            cached = (pixmap, self.processor.plane_ratio(channel, bit))
+            self.pixmap_cache.put(key, cached)
+        pixmap, ratio = cached
+        self.plane_label.setPixmap(pixmap)
+        self.plane_info_label.setText(
+            f"平面 {self.processor.plane_name(channel, bit)}: "
+            f"{self.processor.width}x{self.processor.height}, 1 的比例 {ratio:.2%}")
+    
+    # ==================== LSB 提取 ====================
+    
+    def current_lsb_options(self):
+        """当前的提取选项（输入无效时抛出 ValueError）"""
+        channels = self.channels_edit.text().strip().upper()
+        parse_channels(channels)
+        return {
+            'mode': 'extract',
+            'channels': channels,
+            'bits': parse_bits(self.bits_edit.text()),
+            'order': 'column' if self.order_combo.currentIndex() == 1 else 'row',
+            'bit_order': 'lsb' if self.bit_order_combo.currentIndex() == 1 else 'msb',
+        }
+    
+    def run_extractor(self, options, finished):
+        """在线程池中运行 LsbExtractor"""
+        if self.image_array is None:
+            self.log("⚠️ 请先选择图像文件！", "warning")
+            return
+        if not self.extractor:
+            self.log("❌ 没有可用的处理器", "error")
+            return
+        self.btn_extract.setEnabled(False)
+        self.btn_sweep.setEnabled(False)
+        self._started = time.perf_counter()
+        worker = TaskWorker(self.extractor.process, self.image_array, options=options)
+        self.extractor.set_progress_callback(worker.signals.progress.emit)
+        worker.signals.progress.connect(self.on_progress)
+        worker.signals.finished.connect(finished)
+        worker.signals.failed.connect(self.on_extract_failed)
+        if self.status:
+            self.status.begin_job("LSB 扫描" if options['mode'] == 'sweep' else "LSB 提取")
+        self.thread_pool.start(worker)
+    
+    def _extract_done(self):
+        """提取 / 扫描结束后恢复界面"""
+        self.btn_extract.setEnabled(True)
+        self.btn_sweep.setEnabled(True)
+        if self.status:
+            self.status.end_job()
+    
+    def on_extract_clicked(self):
+        """按当前选项完整提取"""
+        try:
+            options = self.current_lsb_options()
+        except ValueError as e:
+            self.log(f"⚠️ {e}", "warning")
+            return
+        self.log(f"🧬 提取: 通道 {options['channels']}, 位 {options['bits']}, "
+                 f"{self.order_combo.currentText()}, {self.bit_order_combo.currentText()}")
+        self.run_extractor(options, self.on_extract_finished)
+    
+    def on_extract_finished(self, success):
+        """提取完成：识别文件类型并显示摘要与十六进制"""
+        self._extract_done()
+        if not success:
+            self.log("❌ 提取失败", "error")
+            return
+        self.extracted = self.extractor.get_result()
+        elapsed = time.perf_counter() - self._started
+        self.log(f"✨ 提取完成: {len(self.extracted)} 字节，用时 {elapsed:.2f}s", "success")
+        
+        lines = [f"长度: {len(self.extracted)} 字节"]
+        if self.extractor.file_types:
+            names = ", ".join(name for name, _ in self.extractor.file_types)
+            lines.append(f"文件类型: {names}")
+            self.log(f"🎯 识别为: {names}", "success")
+        else:
+            lines.append("文件类型: 未识别")
+        for offset, name, ext in self.extractor.signatures:
+            if offset:
+                lines.append(f"嵌入文件: 偏移 0x{offset:x} 处的 {name} (.{ext})")
+        lines.append("")
+        lines.append(hexdump(self.extracted[:self.HEXDUMP_BYTES]))
+        self.extract_view.set_text("\n".join(lines))
+        
+        # 发布给全局搜索等模块
+        if self.parent_window and hasattr(self.parent_window, 'publish_data'):
+            self.parent_window.publish_data("LSB 提取", self.extracted)
+    
+    def on_sweep_clicked(self):
+        """扫描常见组合"""
+        self.log("🔎 正在扫描常见的通道 / 位组合...")
+        self.run_extractor({'mode': 'sweep'}, self.on_sweep_finished)
+    
+    def on_sweep_finished(self, success):
+        """扫描完成：按得分填充排名表"""
+        self._extract_done()
+        if not success:
+            self.log("❌ 扫描失败", "error")
+            return
+        results = self.extractor.get_result()
+        self.sweep_table.setRowCount(len(results))
+        for row, item in enumerate(results):
+            values = [
+                item['channels'],
+                ",".join(str(bit) for bit in item['bits']),
+                "列优先" if item['order'] == 'column' else "行优先",
+                "LSB 在前" if item['bit_order'] == 'lsb' else "MSB 在前",
+                ", ".join(name for name, _ in item['types']),
+                f"{item['entropy']:.2f}",
+                f"{item['printable']:.0%}",
+                f"{item['score']:.2f}",
+            ]
+            for column, value in enumerate(values):
+                self.sweep_table.setItem(row, column, QTableWidgetItem(value))
+        elapsed = time.perf_counter() - self._started
+        self.log(f"✨ 扫描完成: {len(results)} 个组合，用时 {elapsed:.2f}s", "success")
+        if results and results[0]['types']:
+            names = ", ".join(name for name, _ in results[0]['types'])
+            self.log(f"🎯 最可能的组合: {results[0]['channels']} 位 {results[0]['bits']} → {names}", "success")
+    
+    def on_sweep_row_activated(self, row, _column):
+        """双击排名表的一行：填入该组合并完整提取"""
+        self.channels_edit.setText(self.sweep_table.item(row, 0).text())
+        self.bits_edit.setText(self.sweep_table.item(row, 1).text())
+        self.order_combo.setCurrentIndex(1 if self.sweep_table.item(row, 2).text() == "列优先" else 0)
+        self.bit_order_combo.setCurrentIndex(1 if self.sweep_table.item(row, 3).text() == "LSB 在前" else 0)
+        self.on_extract_clicked()
+    
+    def on_extract_failed(self, error):
+        """提取 / 扫描出错"""
+        self._extract_done()
+        self.log(f"❌ LSB 提取失败: {error}", "error")
+    
+    def on_save_data_clicked(self):
+        """保存提取出的数据（按识别出的类型建议扩展名）"""
+        if not self.extracted:
+            self.log("⚠️ 没有可保存的数据！", "warning")
+            return
+        ext = self.extractor.file_types[0][1] if self.extractor.file_types else "bin"
+        file_path, _ = QFileDialog.getSaveFileName(self, "保存提取的数据", f"extracted.{ext}", "所有文件 (*)")
+        if not file_path:
+            return
+        try:
+            with open(file_path, 'wb') as f:
+                f.write(self.extracted)
+        except OSError as e:
+            self.log(f"❌ 保存失败: {e}", "error")
+            return
+        self.log(f"💾 已保存到: {file_path}", "success")
+    
+    def log(self, message, level="info"):
+        """输出日志"""
+        self.log_view.append(message, level)
+        
+        # 更新状态栏
+        if self.parent_window and hasattr(self.parent_window, 'status'):
+            self.parent_window.status.show_message(message)
+    
+    def cleanup(self):
+        """清理资源"""
+        if self.processor:
+            self.processor.cancel()
+            self.processor.cleanup()
+        if self.extractor:
+            self.extractor.cancel()
+            self.extractor.cleanup()
@@ -4,9 +4,16 @@
 这个UI模块展示如何创建界面并调用 core 中的业务逻辑
 """
 
+import os
+
 from PySide6.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QPushButton,
-                               QLabel, QTextEdit, QGroupBox, QComboBox)
-from PySide6.QtCore import Qt
+                               QLabel, QTextEdit, QGroupBox, QComboBox, QTabWidget,
+                               QTableWidget, QTableWidgetItem, QHeaderView, QFileDialog,
+                               QProgressBar)
+from PySide6.QtCore import Qt, QThreadPool
+
+from core.modules.ngram_counter import format_gram
+from vievs.widgets import FrequencyChart, LogView, ResultView, TaskWorker
 
 
 class TextModuleUI(QWidget):
@@ -16,6 +23,9 @@ class TextModuleUI(QWidget):
         super().__init__(parent)
         self.parent_window = parent
         self.processor = processor  # TextProcessor 实例
+        self.thread_pool = QThreadPool.globalInstance()
+        self.status = getattr(parent, 'status', None)  # MainWindow 的 StatusService
+        self.analyzing = False
         
         # 初始化处理器
         if self.processor:
@@ -51,9 +61,15 @@ class TextModuleUI(QWidget):
             "转大写 (UPPER)",
             "转小写 (lower)",
             "首字母大写 (Title)",
-            "分析文本 (Analyze)"
+            "分析文本 (Analyze)",
+            "隐写检测 (Stego)"
         ])
         mode_layout.addWidget(self.mode_combo)
+        
+        mode_layout.addWidget(QLabel("统计单位:"))
+        self.unit_combo = QComboBox()
+        self.unit_combo.addItems(["字符 (Char)", "字节 (Byte)"])
+        mode_layout.addWidget(self.unit_combo)
         mode_layout.addStretch()
         
         main_layout.addLayout(mode_layout)
@@ -63,11 +79,20 @@ class TextModuleUI(QWidget):
         
         self.btn_process = QPushButton("🚀 开始处理")
         self.btn_process.setMinimumHeight(35)
+        self.btn_analyze_file = QPushButton("📂 分析文件...")
+        self.btn_analyze_file.setMinimumHeight(35)
+        self.btn_cancel = QPushButton("⏹ 取消")
+        self.btn_cancel.setMinimumHeight(35)
+        self.btn_cancel.setEnabled(False)
         self.btn_clear = QPushButton("🧹 清空")
         self.btn_clear.setMinimumHeight(35)
         
-        button_layout.addStretch()
+        self.progress_bar = QProgressBar()
+        self.progress_bar.setRange(0, 1000)
+        button_layout.addWidget(self.progress_bar, 1)
         button_layout.addWidget(self.btn_process)
+        button_layout.addWidget(self.btn_analyze_file)
+        button_layout.addWidget(self.btn_cancel)
         button_layout.addWidget(self.btn_clear)
         
         main_layout.addLayout(button_layout)
@@ -76,10 +101,37 @@ class TextModuleUI(QWidget):
         output_group = QGroupBox("✅ 处理结果")
         output_layout = QVBoxLayout()
         
-        self.output_text = QTextEdit()
-        self.output_text.setReadOnly(True)
-        self.output_text.setPlaceholderText("处理结果将显示在这里...")
-        output_layout.addWidget(self.output_text)
+        self.output_tabs = QTabWidget()
+        
+        # 结果只渲染可见行，超大结果也不会卡住界面
+        self.result_view = ResultView()
+        self.output_tabs.addTab(self.result_view, "📄 文本结果")
+        
+        # 频率分析页：n-gram 选择 + 排序表 + 柱状图
+        frequency_page = QWidget()
+        frequency_layout = QVBoxLayout(frequency_page)
+        
+        gram_layout = QHBoxLayout()
+        gram_layout.addWidget(QLabel("统计类型:"))
+        self.gram_combo = QComboBox()
+        self.gram_combo.addItems(["单字 (Unigram)", "双字 (Bigram)", "三字 (Trigram)"])
+        gram_layout.addWidget(self.gram_combo)
+        gram_layout.addStretch()
+        frequency_layout.addLayout(gram_layout)
+        
+        frequency_body = QHBoxLayout()
+        self.frequency_table = QTableWidget(0, 3)
+        self.frequency_table.setHorizontalHeaderLabels(["内容", "次数", "频率"])
+        self.frequency_table.horizontalHeader().setSectionResizeMode(QHeaderView.Stretch)
+        self.frequency_table.setEditTriggers(QTableWidget.NoEditTriggers)
+        frequency_body.addWidget(self.frequency_table, 1)
+        
+        self.frequency_chart = FrequencyChart()
+        frequency_body.addWidget(self.frequency_chart, 2)
+        frequency_layout.addLayout(frequency_body)
+        
+        self.output_tabs.addTab(frequency_page, "📊 频率分析")
+        output_layout.addWidget(self.output_tabs)
         
         output_group.setLayout(output_layout)
         main_layout.addWidget(output_group)
@@ -89,6 +141,17 @@ class TextModuleUI(QWidget):
         self.stats_label.setObjectName("statsLabel")
         main_layout.addWidget(self.stats_label)
         
+        # 日志输出（与处理结果分开）
+        log_group = QGroupBox("📋 处理日志")
+        log_layout = QVBoxLayout()
+        
+        self.log_view = LogView()
+        self.log_view.setMaximumHeight(160)
+        log_layout.addWidget(self.log_view)
+        
+        log_group.setLayout(log_layout)
+        main_layout.addWidget(log_group)
+        
         # 初始化日志
         self.log("✅ 文本处理模块已加载", "success")
         self.log("💡 提示: 输入文本，选择处理模式，然后点击'开始处理'", "info")
@@ -96,7 +159,10 @@ class TextModuleUI(QWidget):
     def connect_signals(self):
         """连接信号槽"""
         self.btn_process.clicked.connect(self.on_process_clicked)
+        self.btn_analyze_file.clicked.connect(self.on_analyze_file_clicked)
+        self.btn_cancel.clicked.connect(self.on_cancel_clicked)
         self.btn_clear.clicked.connect(self.on_clear_clicked)
+        self.gram_combo.currentIndexChanged.connect(self.update_frequency_view)
     
     def on_process_clicked(self):
         """处理按钮点击"""
@@ -109,7 +175,7 @@ class TextModuleUI(QWidget):
         
         # 获取处理模式
         mode_index = self.mode_combo.currentIndex()
-        mode_map = {0: 'upper', 1: 'lower', 2: 'title', 3: 'analyze'}
+        mode_map = {0: 'upper', 1: 'lower', 2: 'title', 3: 'analyze', 4: 'stego'}
         mode = mode_map.get(mode_index, 'upper')
         
         self.log(f"📝 处理模式: {self.mode_combo.currentText()}", "info")
@@ -119,14 +185,16 @@ class TextModuleUI(QWidget):
             try:
                 success = self.processor.process(
                     input_data,
-                    options={'mode': mode}
+                    options={'mode': mode, 'unit': self.current_unit()}
                 )
                 
                 if success:
                     # 获取并显示结果
                     result = self.processor.get_result()
-                    self.output_text.setPlainText(result)
+                    self.result_view.set_text(result)
+                    self.output_tabs.setCurrentIndex(0)
                     self.log("✨ 处理完成！", "success")
+                    self.publish_result(result)
                     
                     # 显示统计信息
                     stats = self.processor.get_statistics()
@@ -137,6 +205,9 @@ class TextModuleUI(QWidget):
                         f"空格数: {stats.get('space_count', 0)}"
                     )
                     self.stats_label.setText(f"统计信息: {stats_text}")
+                    
+                    if mode == 'analyze':
+                        self.update_frequency_view()
                 else:
                     self.log("❌ 处理失败", "error")
             
@@ -145,35 +216,128 @@ class TextModuleUI(QWidget):
         else:
             self.log("❌ 没有可用的处理器", "error")
     
+    def on_analyze_file_clicked(self):
+        """流式分析文件的频率（隐写检测模式下流式检测隐写）"""
+        file_path, _ = QFileDialog.getOpenFileName(self, "选择要分析的文件", "", "所有文件 (*)")
+        if file_path:
+            self.analyze_file(file_path)
+    
+    def analyze_file(self, file_path):
+        """在线程池中流式分析文件，期间可取消"""
+        if not self.processor or self.analyzing:
+            return
+        mode = 'stego' if self.mode_combo.currentIndex() == 4 else 'analyze'
+        self.log(f"📂 正在分析文件: {file_path}", "info")
+        self.set_analyzing(True)
+        self.progress_bar.setValue(0)
+        
+        worker = TaskWorker(self._analyze_file, file_path, self.current_unit(), mode)
+        self.processor.set_progress_callback(worker.signals.progress.emit)
+        worker.signals.progress.connect(self.on_file_progress)
+        worker.signals.finished.connect(self.on_file_analyzed)
+        worker.signals.failed.connect(self.on_file_failed)
+        if self.status:
+            self.status.begin_job("文件分析", total=os.path.getsize(file_path), unit="B")
+        self.thread_pool.start(worker)
+    
+    def _analyze_file(self, file_path, unit, mode):
+        """分析文件（工作线程）"""
+        success = self.processor.analyze_file(file_path, unit=unit, mode=mode)
+        return success, mode
+    
+    def set_analyzing(self, analyzing):
+        """文件分析期间禁用会读写处理器结果的按钮"""
+        self.analyzing = analyzing
+        self.btn_process.setEnabled(not analyzing)
+        self.btn_analyze_file.setEnabled(not analyzing)
+        self.btn_cancel.setEnabled(analyzing)
+    
+    def on_cancel_clicked(self):
+        """取消文件分析"""
+        if self.processor and self.analyzing:
+            self.processor.cancel()
+            self.btn_cancel.setEnabled(False)
+            self.log("⏹ 正在取消...")
+    
+    def on_file_progress(self, progress):
+        """更新文件分析进度"""
+        total = progress['total'] or 1
+        self.progress_bar.setValue(int(progress['current'] * 1000 / total))
+        if self.status:
+            self.status.update_progress(progress['current'], progress['total'])
+    
+    def _finish_file(self):
+        """文件分析结束（成功、失败或取消）"""
+        self.set_analyzing(False)
+        self.processor.set_progress_callback(None)
+        if self.status:
+            self.status.end_job()
+    
+    def on_file_analyzed(self, outcome):
+        """文件分析完成"""
+        self._finish_file()
+        success, mode = outcome
+        if success:
+            self.progress_bar.setValue(self.progress_bar.maximum())
+            self.result_view.set_text(self.processor.get_result())
+            self.output_tabs.setCurrentIndex(0)
+            if mode == 'analyze':
+                self.update_frequency_view()
+            self.log("✨ 文件分析完成！", "success")
+        elif self.processor.is_cancelled():
+            self.log("⏹ 文件分析已取消", "warning")
+        else:
+            self.log("❌ 文件分析失败", "error")
+    
+    def on_file_failed(self, error):
+        """文件分析出错"""
+        self._finish_file()
+        self.log(f"❌ 文件分析失败: {error}", "error")
+    
+    def current_unit(self):
+        """当前选择的统计单位"""
+        return 'byte' if self.unit_combo.currentIndex() == 1 else 'char'
+    
+    def update_frequency_view(self):
+        """根据选中的 n 刷新频率表与柱状图"""
+        if not self.processor or not getattr(self.processor, 'frequency', None):
+            return
+        
+        n = self.gram_combo.currentIndex() + 1
+        rows = self.processor.get_frequency_table(n, limit=500)
+        
+        self.frequency_table.setRowCount(len(rows))
+        for row, (gram, count, freq) in enumerate(rows):
+            self.frequency_table.setItem(row, 0, QTableWidgetItem(format_gram(gram)))
+            self.frequency_table.setItem(row, 1, QTableWidgetItem(str(count)))
+            self.frequency_table.setItem(row, 2, QTableWidgetItem(f"{freq:.4%}"))
+        
+        self.frequency_chart.set_data((format_gram(gram), count) for gram, count, _ in rows[:26])
+        self.output_tabs.setCurrentIndex(1)
+    
+    def publish_result(self, result):
+        """将处理结果发布给主窗口（全局搜索等模块会收到）"""
+        if self.parent_window and hasattr(self.parent_window, 'publish_data'):
+            self.parent_window.publish_data("文本处理", result)
+    
     def on_clear_clicked(self):
         """清空"""
-        self.output_text.clear()
+        self.result_view.clear()
+        self.frequency_table.setRowCount(0)
+        self.frequency_chart.set_data([])
         self.stats_label.setText("统计信息: --")
         self.log("🧹 已清空输出", "info")
     
     def log(self, message, level="info"):
         """输出日志"""
-        from PySide6.QtGui import QTextCursor
-        
-        color_map = {
-            "info": "#0078d4",
-            "success": "#107c10",
-            "warning": "#ff8c00",
-            "error": "#e81123"
-        }
-        color = color_map.get(level, "#000000")
-        
-        # 移动到末尾
-        cursor = self.output_text.textCursor()
-        cursor.movePosition(QTextCursor.End)
-        self.output_text.setTextCursor(cursor)
-        self.output_text.insertHtml(f'<span style="color:{color};">{message}</span><br>')
+        self.log_view.append(message, level)
         
         # 更新状态栏
-        if self.parent_window and hasattr(self.parent_window, 'statusbar'):
-            self.parent_window.statusbar.showMessage(message)
+        if self.parent_window and hasattr(self.parent_window, 'status'):
+            self.parent_window.status.show_message(message)
     
     def cleanup(self):
         """清理资源"""
         if self.processor:
+            self.processor.cancel()
             self.processor.cleanup()
@@ -0,0 +1,6 @@
+"""
+XOR 分析模块
+"""
+from .xor_module_ui import XorModuleUI
+
+__all__ = ['XorModuleUI']
@@ -0,0 +1,244 @@
+"""
+XOR 分析模块UI - 对应 core.XorProcessor
+
+分析主窗口 DataProcessor 中已加载文件的字节缓冲区
+"""
+
+import codecs
+import os
+
+from PySide6.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QPushButton,
+                               QLabel, QTextEdit, QGroupBox, QComboBox, QSpinBox,
+                               QLineEdit, QFormLayout, QFileDialog)
+
+from vievs.widgets import LogView
+
+
+class XorModuleUI(QWidget):
+    """XOR 分析模块UI"""
+    
+    def __init__(self, parent=None, processor=None):
+        super().__init__(parent)
+        self.parent_window = parent
+        self.processor = processor  # XorProcessor 实例
+        
+        # 初始化处理器
+        if self.processor:
+            self.processor.initialize()
+        
+        self.init_ui()
+        self.connect_signals()
+    
+    def init_ui(self):
+        """初始化界面"""
+        main_layout = QVBoxLayout(self)
+        main_layout.setContentsMargins(20, 15, 20, 15)
+        main_layout.setSpacing(12)
+        
+        # 文件区域
+        file_group = QGroupBox("📁 数据文件")
+        file_layout = QHBoxLayout()
+        
+        self.file_label = QLabel("未加载文件 (工具 → 打开...)")
+        file_layout.addWidget(self.file_label)
+        
+        self.btn_browse = QPushButton("📁 浏览...")
+        self.btn_browse.setMaximumWidth(100)
+        file_layout.addWidget(self.btn_browse)
+        
+        file_group.setLayout(file_layout)
+        main_layout.addWidget(file_group)
+        
+        # 分析选项
+        options_group = QGroupBox("⚙️ 分析选项")
+        options_layout = QFormLayout()
+        
+        self.method_combo = QComboBox()
+        self.method_combo.addItems(["归一化汉明距离 (Hamming)", "重合指数 (IC)"])
+        options_layout.addRow("长度估计:", self.method_combo)
+        
+        self.max_len_spin = QSpinBox()
+        self.max_len_spin.setRange(1, 256)
+        self.max_len_spin.setValue(32)
+        options_layout.addRow("最大密钥长度:", self.max_len_spin)
+        
+        self.key_len_spin = QSpinBox()
+        self.key_len_spin.setRange(0, 256)
+        self.key_len_spin.setSpecialValueText("自动")
+        options_layout.addRow("密钥长度:", self.key_len_spin)
+        
+        self.scoring_combo = QComboBox()
+        self.scoring_combo.addItems(["文本 (Text)", "二进制 (Binary)"])
+        options_layout.addRow("明文类型:", self.scoring_combo)
+        
+        self.crib_edit = QLineEdit()
+        self.crib_edit.setPlaceholderText(r"已知明文，支持转义，如 flag{ 或 PK\x03\x04")
+        options_layout.addRow("已知明文:", self.crib_edit)
+        
+        options_group.setLayout(options_layout)
+        main_layout.addWidget(options_group)
+        
+        # 操作按钮
+        button_layout = QHBoxLayout()
+        
+        self.btn_process = QPushButton("🚀 开始分析")
+        self.btn_process.setMinimumHeight(35)
+        self.btn_save = QPushButton("💾 保存解密结果")
+        self.btn_save.setMinimumHeight(35)
+        self.btn_save.setEnabled(False)
+        
+        button_layout.addStretch()
+        button_layout.addWidget(self.btn_process)
+        button_layout.addWidget(self.btn_save)
+        
+        main_layout.addLayout(button_layout)
+        
+        # 结果区域
+        output_group = QGroupBox("✅ 分析结果")
+        output_layout = QVBoxLayout()
+        
+        self.output_text = QTextEdit()
+        self.output_text.setReadOnly(True)
+        self.output_text.setPlaceholderText("分析结果将显示在这里...")
+        output_layout.addWidget(self.output_text)
+        
+        output_group.setLayout(output_layout)
+        main_layout.addWidget(output_group)
+        
+        # 日志输出
+        log_group = QGroupBox("📋 处理日志")
+        log_layout = QVBoxLayout()
+        
+        self.log_view = LogView()
+        self.log_view.setMaximumHeight(160)
+        log_layout.addWidget(self.log_view)
+        
+        log_group.setLayout(log_layout)
+        main_layout.addWidget(log_group)
+        
+        self.log("✅ XOR 分析模块已加载", "success")
+    
+    def connect_signals(self):
+        """连接信号槽"""
+        self.btn_browse.clicked.connect(self.on_browse_clicked)
+        self.btn_process.clicked.connect(self.on_process_clicked)
+        self.btn_save.clicked.connect(self.on_save_clicked)
+        
+        if self.parent_window and hasattr(self.parent_window, 'data_published'):
+            self.parent_window.data_published.connect(self.on_data_published)
+    
+    def on_data_published(self, source, data):
+        """加载新文件会关闭原来的映射，基于它的分析结果随之作废"""
+        if self.processor and self.processor.buffer_closed():
+            self.processor.release_buffer()
+            self.btn_save.setEnabled(False)
+            self.update_file_label()
+            self.log("ℹ️ 数据文件已更换，请重新分析")
+    
+    def on_browse_clicked(self):
+        """通过主窗口加载文件"""
+        file_path, _ = QFileDialog.getOpenFileName(self, "选择数据文件", "", "所有文件 (*)")
+        if file_path and self.parent_window:
+            self.parent_window.load_file(file_path)
+            self.update_file_label()
+    
+    def update_file_label(self):
+        """显示主窗口当前加载的文件"""
+        data_processor = getattr(self.parent_window, 'data_processor', None)
+        if data_processor and data_processor.file_path:
+            self.file_label.setText(os.path.basename(data_processor.file_path))
+    
+    def on_process_clicked(self):
+        """开始分析"""
+        data_processor = getattr(self.parent_window, 'data_processor', None)
+        buffer = data_processor.get_buffer() if data_processor else None
+        if buffer is None:
+            self.log("⚠️ 请先加载数据文件！", "warning")
+            return
+        self.update_file_label()
+        
+        try:
+            crib = codecs.decode(self.crib_edit.text(), 'unicode_escape').encode('latin-1')
+        except (UnicodeError, ValueError) as e:
+            self.log(f"❌ 已知明文格式错误: {e}", "error")
+            return
+        
+        options = {
+            'method': 'ic' if self.method_combo.currentIndex() == 1 else 'hamming',
+            'max_key_length': self.max_len_spin.value(),
+            'key_length': self.key_len_spin.value(),
+            'scoring': 'binary' if self.scoring_combo.currentIndex() == 1 else 'text',
+            'crib': crib,
+        }
+        self.log(f"🚀 开始分析 {len(buffer)} 字节...")
+        
+        if not self.processor or not self.processor.process(buffer, options=options):
+            self.btn_save.setEnabled(False)
+            self.log("❌ 分析失败", "error")
+            return
+        
+        self.show_result(self.processor.get_result())
+        self.btn_save.setEnabled(True)
+        self.log("✨ 分析完成！", "success")
+        
+        # 发布解密结果，供全局搜索扫描
+        if hasattr(self.parent_window, 'publish_data'):
+            try:
+                self.parent_window.publish_data("XOR 解密", self.processor.decrypt())
+            except ValueError as e:
+                self.log(f"❌ 解密失败: {e}", "error")
+    
+    def show_result(self, result):
+        """显示分析结果"""
+        lines = ["候选密钥长度 (得分):"]
+        lines += [f"  {length:>3}  {score:.4f}" for length, score in result['key_lengths'][:8]]
+        key = result['key']
+        lines.append("")
+        lines.append(f"统计求解密钥 (长度 {result['key_length']}):")
+        lines.append(f"  HEX:   {key.hex()}")
+        lines.append(f"  ASCII: {key.decode('latin-1')!r}")
+        
+        if result['crib_keys']:
+            lines.append("")
+            lines.append("已知明文恢复的密钥:")
+            for item in result['crib_keys'][:10]:
+                lines.append(f"  偏移 {item['offset']:>8}  得分 {item['score']:.3f}  "
+                             f"{item['key'].hex()}  {item['key'].decode('latin-1')!r}")
+        
+        preview = self.processor.decrypt(self.processor.buffer[:2048])
+        lines.append("")
+        lines.append("解密预览:")
+        lines.append(preview.decode('utf-8', errors='replace'))
+        self.output_text.setPlainText("\n".join(lines))
+    
+    def on_save_clicked(self):
+        """保存完整解密结果"""
+        if not self.processor or not self.processor.get_result():
+            self.log("⚠️ 没有可保存的结果！", "warning")
+            return
+        
+        file_path, _ = QFileDialog.getSaveFileName(self, "保存解密结果", "", "所有文件 (*)")
+        if not file_path:
+            return
+        try:
+            data = self.processor.decrypt()
+            with open(file_path, 'wb') as f:
+                f.write(data)
+        except (ValueError, OSError) as e:
+            self.btn_save.setEnabled(bool(self.processor.get_result()))
+            self.log(f"❌ 保存失败: {e}", "error")
+            return
+        self.log(f"💾 已保存到: {file_path}")
+    
+    def log(self, message, level="info"):
+        """输出日志"""
+        self.log_view.append(message, level)
+        
+        # 更新状态栏
+        if self.parent_window and hasattr(self.parent_window, 'status'):
+            self.parent_window.status.show_message(message)
+    
+    def cleanup(self):
+        """清理资源"""
+        if self.processor:
+            self.processor.cleanup()
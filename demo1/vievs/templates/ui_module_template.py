@@ -31,6 +31,8 @@ from PySide6.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QPushButton,
                                QLabel, QTextEdit, QLineEdit, QGroupBox, QFormLayout)
 from PySide6.QtCore import Signal, Qt
 
+from vievs.widgets import LogView
+
 
 class YourModuleUI(QWidget):
     """
@@ -118,6 +120,18 @@ class YourModuleUI(QWidget):
         output_group.setLayout(output_layout)
         main_layout.addWidget(output_group)
         
+        # ==================== 日志区域 ====================
+        # 日志与结果分开显示，LogView 容量固定，长时间运行也不会变慢
+        log_group = QGroupBox("处理日志")
+        log_layout = QVBoxLayout()
+        
+        self.log_view = LogView()
+        self.log_view.setMaximumHeight(150)
+        log_layout.addWidget(self.log_view)
+        
+        log_group.setLayout(log_layout)
+        main_layout.addWidget(log_group)
+        
         # 初始化日志
         self.log("✅ 模块已加载", "success")
     
@@ -160,7 +174,8 @@ class YourModuleUI(QWidget):
                 if success:
                     # 获取处理结果
                     result = self.processor.get_result()
-                    self.log(f"✨ 处理完成: {result}", "success")
+                    self.output_text.setPlainText(str(result))
+                    self.log("✨ 处理完成", "success")
                     self.status_changed.emit("处理成功")
                 else:
                     self.log("❌ 处理失败", "error")
@@ -191,18 +206,11 @@ class YourModuleUI(QWidget):
             message (str): 日志消息
             level (str): 日志级别 (info/success/warning/error)
         """
-        color_map = {
-            "info": "#0078d4",      # 蓝色
-            "success": "#107c10",   # 绿色
-            "warning": "#ff8c00",   # 橙色
-            "error": "#e81123"      # 红色
-        }
-        color = color_map.get(level, "#000000")
-        self.output_text.append(f'<span style="color:{color};">{message}</span>')
+        self.log_view.append(message, level)
         
         # 更新父窗口状态栏
-        if self.parent_window and hasattr(self.parent_window, 'statusbar'):
-            self.parent_window.statusbar.showMessage(message)
+        if self.parent_window and hasattr(self.parent_window, 'status'):
+            self.parent_window.status.show_message(message)
     
     def get_data(self):
         """
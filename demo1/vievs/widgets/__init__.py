@@ -0,0 +1,15 @@
+"""
+通用控件
+"""
+from .frequency_chart import FrequencyChart
+from .task_worker import TaskWorker, WorkerSignals
+from .log_view import LogView, LogModel
+from .status_service import StatusService
+from .result_view import ResultView
+from .image_array import (qimage_to_array, array_to_qimage, load_tiled_image,
+                          decode_image_bytes, encode_image_bytes)
+from .lru_cache import LRUCache
+
+__all__ = ['FrequencyChart', 'TaskWorker', 'WorkerSignals', 'LogView', 'LogModel',
+           'StatusService', 'ResultView', 'qimage_to_array', 'array_to_qimage', 'load_tiled_image',
+           'decode_image_bytes', 'encode_image_bytes', 'LRUCache']
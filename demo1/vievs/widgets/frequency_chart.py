@@ -0,0 +1,66 @@
+"""
+频率柱状图控件
+"""
+
+from PySide6.QtWidgets import QWidget, QSizePolicy
+from PySide6.QtCore import Qt, QRectF
+from PySide6.QtGui import QPainter, QColor, QFontMetrics
+
+
+class FrequencyChart(QWidget):
+    """
+    简单的频率柱状图
+    
+    直接用 QPainter 绘制，不依赖 QtCharts；数据为 [(标签, 数值), ...]
+    """
+    
+    BAR_COLOR = QColor("#0078d4")
+    TEXT_COLOR = QColor("#c8c8c8")
+    
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.items = []
+        self.setMinimumHeight(160)
+        self.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Expanding)
+    
+    def set_data(self, items):
+        """
+        设置数据
+        
+        Args:
+            items (list): [(label, value), ...]，按显示顺序排列
+        """
+        self.items = list(items)
+        self.update()
+    
+    def paintEvent(self, event):
+        """绘制柱状图"""
+        if not self.items:
+            return
+        
+        painter = QPainter(self)
+        painter.setRenderHint(QPainter.Antialiasing)
+        metrics = QFontMetrics(self.font())
+        label_height = metrics.height() + 4
+        value_height = metrics.height()
+        
+        width = self.width()
+        height = self.height() - label_height - value_height
+        slot = width / len(self.items)
+        peak = max(value for _, value in self.items) or 1
+        
+        for i, (label, value) in enumerate(self.items):
+            bar_height = height * value / peak
+            x = i * slot
+            bar = QRectF(x + slot * 0.15, value_height + height - bar_height, slot * 0.7, bar_height)
+            painter.fillRect(bar, self.BAR_COLOR)
+            
+            painter.setPen(self.TEXT_COLOR)
+            label_rect = QRectF(x, value_height + height + 2, slot, label_height)
+            painter.drawText(label_rect, Qt.AlignHCenter | Qt.AlignTop,
+                             metrics.elidedText(label, Qt.ElideRight, int(slot)))
+            if slot >= metrics.horizontalAdvance(str(value)):
+                value_rect = QRectF(x, bar.top() - value_height, slot, value_height)
+                painter.drawText(value_rect, Qt.AlignHCenter | Qt.AlignBottom, str(value))
+        
+        painter.end()
@@ -0,0 +1,150 @@
+"""
+QImage 与 NumPy 数组的零拷贝转换
+
+core 中的图像处理器只处理 uint8 数组：彩色为 (H, W, 4) RGBA，灰度为 (H, W)。
+这里的转换直接共享像素内存，不复制数据；返回的对象会持有对方的引用，
+保证共享的内存在使用期间不会被释放。
+
+超大图像用 load_tiled_image 解码到内存映射的 TiledImage，不经过整幅 QImage。
+"""
+
+import os
+
+import numpy as np
+from PySide6.QtCore import QRect, QBuffer, QByteArray, QIODevice
+from PySide6.QtGui import QImage, QImageReader, QImageIOHandler
+
+from core.modules.tiled_image import TiledImage
+
+# ClipRect 解码每个行带时都要从文件头解码到该行带（JPEG 不能随机访问行），
+# 行带越多总耗时越接近平方增长，因此这里的行带远大于 TiledImage.STRIP_BYTES
+CLIP_BAND_BYTES = 1 << 28
+
+
+class _ImageBuffer:
+    """持有 QImage 并通过 __array_interface__ 暴露其像素（数组的 base 即为本对象）"""
+    
+    def __init__(self, image, shape, strides):
+        self.image = image
+        bits = image.constBits()
+        self.__array_interface__ = {
+            'version': 3,
+            'shape': shape,
+            'strides': strides,
+            'typestr': '|u1',
+            'data': np.frombuffer(bits, dtype=np.uint8).__array_interface__['data'],
+        }
+        self._bits = bits
+
+
+def qimage_to_array(image):
+    """
+    QImage → 只读 ndarray（共享内存）
+    
+    灰度图返回 (H, W)，其他格式先转换为 RGBA8888（这一步会复制一次，
+    之后的处理与显示都不再复制），返回 (H, W, 4)
+    """
+    if image.format() != QImage.Format_Grayscale8 and image.format() != QImage.Format_RGBA8888:
+        image = image.convertToFormat(QImage.Format_RGBA8888)
+    stride = image.bytesPerLine()
+    if image.format() == QImage.Format_Grayscale8:
+        shape, strides = (image.height(), image.width()), (stride, 1)
+    else:
+        shape, strides = (image.height(), image.width(), 4), (stride, 4, 1)
+    array = np.asarray(_ImageBuffer(image, shape, strides))
+    array.flags.writeable = False
+    return array
+
+
+def array_to_qimage(array):
+    """
+    ndarray → QImage（共享内存，QImage 持有数组引用）
+    
+    支持 (H, W) 灰度与 (H, W, 4) RGBA；行内像素不连续时先整理为连续数组
+    """
+    if array.ndim == 2:
+        image_format, channels = QImage.Format_Grayscale8, 1
+    elif array.ndim == 3 and array.shape[2] == 4:
+        image_format, channels = QImage.Format_RGBA8888, 4
+    else:
+        raise ValueError(f"不支持的图像数组形状: {array.shape}")
+    if array.dtype != np.uint8 or array.strides[-1] != 1 or array.strides[1] != channels:
+        array = np.ascontiguousarray(array, dtype=np.uint8)
+    height, width = array.shape[:2]
+    image = QImage(array.data, width, height, array.strides[0], image_format)
+    image._array = array
+    return image
+
+
+def decode_image_bytes(data):
+    """
+    编码后的图像字节 → ndarray（灰度为 (H, W)，其他为 (H, W, 4) RGBA）
+    
+    只用到 QtGui 的编解码器，不需要 QApplication，可在批量处理的子进程中调用
+    """
+    buffer = QBuffer()
+    buffer.setData(QByteArray(data))
+    buffer.open(QIODevice.ReadOnly)
+    reader = QImageReader(buffer)
+    reader.setAllocationLimit(0)
+    image = reader.read()
+    if image.isNull():
+        raise ValueError(reader.errorString())
+    return qimage_to_array(image)
+
+
+def encode_image_bytes(array, image_format='PNG', quality=-1):
+    """ndarray → 编码后的图像字节（image_format 为 PNG / JPG / BMP 等，quality 为 -1 时用默认质量）"""
+    buffer = QBuffer()
+    buffer.open(QIODevice.WriteOnly)
+    if not array_to_qimage(array).save(buffer, image_format, quality):
+        raise ValueError(f"无法编码为 {image_format}")
+    return bytes(buffer.data())
+
+
+def load_tiled_image(file_path, directory=None):
+    """
+    把图像文件解码到 TiledImage
+    
+    - PNG：core 中的流式解码器逐行带解码（隔行扫描等不支持的 PNG 回退到 Qt）
+    - PGM / PPM：直接映射文件
+    - 支持 ClipRect 的格式（如 JPEG）：按行带分别解码
+    - 其他格式：只能由 Qt 整幅解码一次再复制到存储
+    """
+    extension = os.path.splitext(file_path)[1].lower()
+    try:
+        if extension == '.png':
+            return TiledImage.from_png(file_path, directory)
+        if extension in ('.pgm', '.ppm'):
+            return TiledImage.from_netpbm(file_path, directory)
+    except ValueError:
+        pass
+    
+    reader = QImageReader(file_path)
+    reader.setAllocationLimit(0)
+    size = reader.size()
+    if not reader.supportsOption(QImageIOHandler.ClipRect) or not size.isValid():
+        image = reader.read()
+        if image.isNull():
+            raise ValueError(reader.errorString())
+        return TiledImage.from_array(qimage_to_array(image), directory)
+    
+    width, height = size.width(), size.height()
+    store = TiledImage.create(height, width, 4, directory)
+    rows = max(CLIP_BAND_BYTES // (width * 4), 1)
+    try:
+        for y0 in range(0, height, rows):
+            y1 = min(y0 + rows, height)
+            # 读取一次后 reader 不能再读，每个行带使用新的 reader
+            reader = QImageReader(file_path)
+            reader.setAllocationLimit(0)
+            reader.setClipRect(QRect(0, y0, width, y1 - y0))
+            image = reader.read()
+            if image.isNull():
+                raise ValueError(reader.errorString())
+            store.pixels[y0:y1] = qimage_to_array(image.convertToFormat(QImage.Format_RGBA8888))
+    except Exception:
+        store.close()
+        raise
+    store.flush()
+    return store
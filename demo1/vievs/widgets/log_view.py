@@ -0,0 +1,244 @@
+"""
+日志控件 - 固定容量环形缓冲 + QListView 虚拟化显示
+
+日志与处理结果分开显示；追加日志只写入待处理队列，同一轮事件循环内的
+所有日志合并为一次刷新。未满时新日志以一次 beginInsertRows 追加为新行；
+写满后行数固定不变，环形缓冲整体前移覆盖最旧的日志，再用一次 dataChanged
+通知视图重绘（不删除模型行，避免 QListView 重新布局全部行），
+因此无论会话中累计多少条日志，每次追加的代价都是常数。
+"""
+
+import time
+
+from PySide6.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QListView,
+                               QCheckBox, QPushButton, QAbstractItemView)
+from PySide6.QtCore import Qt, QAbstractListModel, QModelIndex, QTimer
+from PySide6.QtGui import QColor
+
+
+LEVEL_COLORS = {
+    "info": "#0078d4",
+    "success": "#107c10",
+    "warning": "#ff8c00",
+    "error": "#e81123",
+}
+
+LEVEL_NAMES = {
+    "info": "信息",
+    "success": "成功",
+    "warning": "警告",
+    "error": "错误",
+}
+
+
+class RingBuffer:
+    """固定容量的环形缓冲，支持 O(1) 随机访问、尾部追加与头部批量移除"""
+    
+    def __init__(self, capacity):
+        self.capacity = capacity
+        self.clear()
+    
+    def clear(self):
+        """清空"""
+        self._items = [None] * self.capacity
+        self._start = 0
+        self._count = 0
+    
+    def __len__(self):
+        return self._count
+    
+    def __getitem__(self, index):
+        return self._items[(self._start + index) % self.capacity]
+    
+    def __iter__(self):
+        for index in range(self._count):
+            yield self[index]
+    
+    def append(self, item):
+        """追加到尾部，调用方需保证未满"""
+        self._items[(self._start + self._count) % self.capacity] = item
+        self._count += 1
+    
+    def popleft(self, count):
+        """从头部移除 count 个元素"""
+        for index in range(count):
+            self._items[(self._start + index) % self.capacity] = None
+        self._start = (self._start + count) % self.capacity
+        self._count -= count
+
+
+class LogModel(QAbstractListModel):
+    """
+    日志数据模型
+    
+    所有日志保存在 entries 中，当前级别过滤后可见的日志保存在 visible 中，
+    两者都是固定容量的环形缓冲。只能在主线程中调用 append。
+    """
+    
+    def __init__(self, capacity=10000, parent=None):
+        super().__init__(parent)
+        self.entries = RingBuffer(capacity)
+        self.visible = RingBuffer(capacity)
+        self.levels = set(LEVEL_COLORS)
+        self._pending = []
+        self._colors = {level: QColor(color) for level, color in LEVEL_COLORS.items()}
+        
+        # 0 毫秒单次定时器：本轮事件循环处理完后统一刷新
+        self._flush_timer = QTimer(self)
+        self._flush_timer.setSingleShot(True)
+        self._flush_timer.setInterval(0)
+        self._flush_timer.timeout.connect(self.flush)
+    
+    def rowCount(self, parent=QModelIndex()):
+        """可见行数"""
+        return 0 if parent.isValid() else len(self.visible)
+    
+    def data(self, index, role=Qt.DisplayRole):
+        """返回单行数据"""
+        if not index.isValid() or index.row() >= len(self.visible):
+            return None
+        stamp, level, message = self.visible[index.row()]
+        if role == Qt.DisplayRole:
+            return message
+        if role == Qt.ForegroundRole:
+            return self._colors.get(level)
+        if role == Qt.ToolTipRole:
+            return f"{time.strftime('%H:%M:%S', time.localtime(stamp))} [{LEVEL_NAMES.get(level, level)}]"
+        return None
+    
+    def append(self, message, level="info"):
+        """追加一条日志，实际插入推迟到本轮事件循环结束"""
+        if not self._pending:
+            self._flush_timer.start()
+        self._pending.append((time.time(), level, message))
+    
+    def flush(self):
+        """将待处理日志一次性写入模型"""
+        if not self._pending:
+            return
+        capacity = self.entries.capacity
+        batch = self._pending[-capacity:]
+        self._pending = []
+        
+        overflow = len(self.entries) + len(batch) - capacity
+        if overflow > 0:
+            self.entries.popleft(overflow)
+        for entry in batch:
+            self.entries.append(entry)
+        
+        shown = [entry for entry in batch if entry[1] in self.levels]
+        if not shown:
+            return
+        # 未满部分作为新行插入
+        room = capacity - len(self.visible)
+        if room > 0:
+            first = len(self.visible)
+            inserted = shown[:room]
+            self.beginInsertRows(QModelIndex(), first, first + len(inserted) - 1)
+            for entry in inserted:
+                self.visible.append(entry)
+            self.endInsertRows()
+            shown = shown[room:]
+        # 已满后行数保持不变，环形缓冲整体前移并通知内容变化；
+        # 删除首行会让 QListView 重新布局全部行，dataChanged 只重绘可见区域
+        if shown:
+            self.visible.popleft(len(shown))
+            for entry in shown:
+                self.visible.append(entry)
+            self.dataChanged.emit(self.index(0), self.index(len(self.visible) - 1))
+    
+    def set_levels(self, levels):
+        """设置可见级别并重建可见列表"""
+        self.flush()
+        self.beginResetModel()
+        self.levels = set(levels)
+        self.visible.clear()
+        for entry in self.entries:
+            if entry[1] in self.levels:
+                self.visible.append(entry)
+        self.endResetModel()
+    
+    def clear(self):
+        """清空日志"""
+        self.beginResetModel()
+        self._pending = []
+        self.entries.clear()
+        self.visible.clear()
+        self.endResetModel()
+    
+    def to_text(self):
+        """全部可见日志的纯文本"""
+        return "\n".join(message for _, _, message in self.visible)
+
+
+class LogView(QWidget):
+    """
+    日志面板：级别过滤 + 虚拟化列表
+    
+    示例:
+        self.log_view = LogView()
+        self.log_view.append("✅ 模块已加载", "success")
+    """
+    
+    def __init__(self, parent=None, capacity=10000):
+        super().__init__(parent)
+        self.model = LogModel(capacity, self)
+        self.init_ui()
+    
+    def init_ui(self):
+        """初始化界面"""
+        layout = QVBoxLayout(self)
+        layout.setContentsMargins(0, 0, 0, 0)
+        layout.setSpacing(4)
+        
+        filter_layout = QHBoxLayout()
+        self.level_checks = {}
+        for level, name in LEVEL_NAMES.items():
+            check = QCheckBox(name)
+            check.setChecked(True)
+            check.toggled.connect(self.on_filter_changed)
+            self.level_checks[level] = check
+            filter_layout.addWidget(check)
+        filter_layout.addStretch()
+        
+        self.btn_clear = QPushButton("🧹 清空日志")
+        self.btn_clear.clicked.connect(self.model.clear)
+        filter_layout.addWidget(self.btn_clear)
+        layout.addLayout(filter_layout)
+        
+        # 行高一致时 QListView 只需布局可见区域，大量日志也不会变慢
+        self.list_view = QListView()
+        self.list_view.setModel(self.model)
+        self.list_view.setUniformItemSizes(True)
+        self.list_view.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        self.list_view.setSelectionMode(QAbstractItemView.ExtendedSelection)
+        layout.addWidget(self.list_view)
+        
+        # 停留在底部时跟随最新日志；直接设置滚动条值，
+        # scrollToBottom 会触发整表布局计算，日志多时每次都要几十毫秒
+        self._follow = True
+        bar = self.list_view.verticalScrollBar()
+        bar.valueChanged.connect(self._on_scrolled)
+        bar.rangeChanged.connect(self._on_range_changed)
+    
+    def append(self, message, level="info"):
+        """追加日志"""
+        self.model.append(message, level)
+    
+    def clear(self):
+        """清空日志"""
+        self.model.clear()
+    
+    def on_filter_changed(self):
+        """级别过滤改变"""
+        self._follow = True
+        self.model.set_levels(level for level, check in self.level_checks.items() if check.isChecked())
+    
+    def _on_scrolled(self, value):
+        """记录是否停留在底部"""
+        self._follow = value >= self.list_view.verticalScrollBar().maximum()
+    
+    def _on_range_changed(self, minimum, maximum):
+        """行数变化后，原本在底部时继续停留在底部"""
+        if self._follow:
+            self.list_view.verticalScrollBar().setValue(maximum)
@@ -0,0 +1,63 @@
+"""
+最近最少使用（LRU）缓存
+
+界面中缓存预览图等可重新计算的结果：命中时移到末尾，超出容量时淘汰最久未使用的项。
+容量可以按项数限制，也可以按 size_of 计算的总字节数限制。
+只在主线程中使用，不加锁。
+"""
+
+from collections import OrderedDict
+
+
+class LRUCache:
+    """
+    固定容量的 LRU 缓存
+    
+    示例:
+        cache = LRUCache(capacity=32)
+        cache.put(key, value)
+        value = cache.get(key)  # 未命中返回 None
+        
+        # 按内存限制：最多 256 MB 的数组
+        cache = LRUCache(capacity=64, max_bytes=256 << 20, size_of=lambda a: a.nbytes)
+    """
+    
+    def __init__(self, capacity=32, max_bytes=None, size_of=None):
+        self.capacity = max(int(capacity), 1)
+        self.max_bytes = max_bytes
+        self.size_of = size_of
+        self.total_bytes = 0
+        self._items = OrderedDict()
+        self._sizes = {}
+    
+    def get(self, key, default=None):
+        """查找并标记为最近使用"""
+        if key not in self._items:
+            return default
+        self._items.move_to_end(key)
+        return self._items[key]
+    
+    def put(self, key, value):
+        """写入；超出项数或字节数限制时淘汰最久未使用的项（至少保留刚写入的一项）"""
+        self.total_bytes -= self._sizes.pop(key, 0)
+        self._items[key] = value
+        self._items.move_to_end(key)
+        if self.size_of:
+            self._sizes[key] = self.size_of(value)
+            self.total_bytes += self._sizes[key]
+        while len(self._items) > 1 and (len(self._items) > self.capacity or
+                                        (self.max_bytes and self.total_bytes > self.max_bytes)):
+            old_key, _ = self._items.popitem(last=False)
+            self.total_bytes -= self._sizes.pop(old_key, 0)
+    
+    def clear(self):
+        """清空缓存"""
+        self._items.clear()
+        self._sizes.clear()
+        self.total_bytes = 0
+    
+    def __contains__(self, key):
+        return key in self._items
+    
+    def __len__(self):
+        return len(self._items)
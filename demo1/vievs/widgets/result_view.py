@@ -0,0 +1,389 @@
+"""
+大结果查看控件 - 结果保存在后备缓冲中，只渲染可见行
+
+结果以 UTF-8 字节保存，超过 SPILL_SIZE 时写入临时文件并通过 mmap 访问；
+行索引（每行起始偏移）在线程池中按块用 numpy 查找换行符建立，建立过程中
+已完成部分立即可见。QListView 只为可见区域请求行内容，因此显示数百 MB 的
+结果不会阻塞界面，也不会在 QTextDocument 中再复制一份。
+"""
+
+import mmap
+import shutil
+import tempfile
+
+import numpy as np
+from PySide6.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QListView, QLineEdit,
+                               QPushButton, QLabel, QAbstractItemView, QFileDialog,
+                               QApplication)
+from PySide6.QtCore import Qt, QAbstractListModel, QModelIndex, QObject, QThreadPool, Signal
+from PySide6.QtGui import QFontDatabase, QKeySequence, QShortcut
+
+from .task_worker import TaskWorker
+
+
+class ResultBuffer:
+    """
+    结果后备缓冲
+    
+    小结果直接保存为 bytes，大结果写入临时文件后 mmap（关闭时自动删除）
+    """
+    
+    # 超过该大小的结果写入临时文件
+    SPILL_SIZE = 1 << 24
+    
+    def __init__(self, result):
+        data = result.encode('utf-8', errors='replace') if isinstance(result, str) else bytes(result)
+        self._file = None
+        if len(data) > self.SPILL_SIZE:
+            self._file = tempfile.TemporaryFile()
+            self._file.write(data)
+            self._file.flush()
+            del data
+            self.data = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        else:
+            self.data = data
+        self.size = len(self.data)
+    
+    def __len__(self):
+        return self.size
+    
+    def slice(self, start, end):
+        """读取 [start, end) 字节"""
+        return self.data[start:end]
+    
+    def find(self, needle, start=0):
+        """从 start 开始查找，返回偏移或 -1"""
+        return self.data.find(needle, start)
+    
+    def rfind(self, needle, end):
+        """在 [0, end) 中反向查找，返回偏移或 -1"""
+        return self.data.rfind(needle, 0, end)
+    
+    def export(self, file_path):
+        """写出到文件"""
+        with open(file_path, 'wb') as f:
+            if self._file:
+                self._file.seek(0)
+                shutil.copyfileobj(self._file, f, 1 << 20)
+            else:
+                f.write(self.data)
+    
+    def close(self):
+        """释放缓冲"""
+        if isinstance(self.data, mmap.mmap):
+            try:
+                self.data.close()
+            except BufferError:
+                # 后台索引仍持有视图，等其结束后由垃圾回收释放
+                pass
+        if self._file:
+            self._file.close()
+            self._file = None
+        self.data = b""
+
+
+def build_line_index(buffer, chunk_size=1 << 24, progress=None, cancelled=None):
+    """
+    建立行起始偏移索引
+    
+    Args:
+        buffer (ResultBuffer): 后备缓冲
+        progress (callable): 每处理完一块调用 progress(本块新发现的行起点数组, 已处理字节数)
+        cancelled (callable): 返回 True 时提前结束
+    
+    Returns:
+        bool: 是否完整建立
+    """
+    size = len(buffer)
+    for start in range(0, size, chunk_size):
+        if cancelled and cancelled():
+            return False
+        count = min(chunk_size, size - start)
+        chunk = np.frombuffer(buffer.data, dtype=np.uint8, count=count, offset=start)
+        starts = np.flatnonzero(chunk == 0x0A) + (start + 1)
+        del chunk
+        if starts.size and starts[-1] == size:
+            starts = starts[:-1]
+        if progress:
+            progress(starts.astype(np.int64), start + count)
+    return True
+
+
+class ResultModel(QAbstractListModel):
+    """
+    结果行模型
+    
+    starts 为已知的行起点；索引建立完成前，最后一个起点所在的行长度未知，不显示
+    """
+    
+    # 单行最多显示的字节数，超长行截断显示
+    MAX_LINE_BYTES = 4096
+    
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.buffer = None
+        self.starts = np.zeros(1, dtype=np.int64)
+        self.complete = True
+        self._rows = 0
+    
+    def set_buffer(self, buffer):
+        """设置新的后备缓冲，行索引从头开始"""
+        self.beginResetModel()
+        self.buffer = buffer
+        self.starts = np.zeros(1, dtype=np.int64)
+        self.complete = buffer is None or len(buffer) == 0
+        self._rows = 0
+        self.endResetModel()
+    
+    def add_starts(self, starts):
+        """追加后台索引发现的行起点"""
+        if starts.size == 0:
+            return
+        self.starts = np.concatenate([self.starts, starts])
+        self._update_rows()
+    
+    def finish(self):
+        """索引建立完成，最后一行也可以显示"""
+        self.complete = True
+        self._update_rows()
+    
+    def _update_rows(self):
+        """根据已知行数插入新行"""
+        if self.buffer is None or len(self.buffer) == 0:
+            return
+        rows = self.starts.size if self.complete else self.starts.size - 1
+        if rows > self._rows:
+            self.beginInsertRows(QModelIndex(), self._rows, rows - 1)
+            self._rows = rows
+            self.endInsertRows()
+    
+    def rowCount(self, parent=QModelIndex()):
+        """已索引的行数"""
+        return 0 if parent.isValid() else self._rows
+    
+    def line_range(self, row):
+        """第 row 行的字节范围（不含换行符）"""
+        start = int(self.starts[row])
+        if row + 1 < self.starts.size:
+            return start, int(self.starts[row + 1]) - 1
+        end = len(self.buffer)
+        if end > start and self.buffer.slice(end - 1, end) == b"\n":
+            end -= 1
+        return start, end
+    
+    def line_text(self, row, limit=None):
+        """第 row 行的文本"""
+        start, end = self.line_range(row)
+        if limit is not None:
+            end = min(end, start + limit)
+        return self.buffer.slice(start, end).decode('utf-8', errors='replace').rstrip('\r')
+    
+    def data(self, index, role=Qt.DisplayRole):
+        """返回单行数据"""
+        if not index.isValid() or index.row() >= self._rows:
+            return None
+        if role == Qt.DisplayRole:
+            start, end = self.line_range(index.row())
+            text = self.line_text(index.row(), self.MAX_LINE_BYTES)
+            if end - start > self.MAX_LINE_BYTES:
+                text += f" …（共 {end - start} 字节）"
+            return text
+        return None
+    
+    def row_of_offset(self, offset):
+        """字节偏移所在的行号"""
+        return int(np.searchsorted(self.starts, offset, side='right')) - 1
+
+
+class _IndexSignals(QObject):
+    """行索引进度信号（从线程池转发到主线程）"""
+    
+    chunk = Signal(int, object, int)
+    done = Signal(int, bool)
+
+
+class ResultView(QWidget):
+    """
+    大结果查看器：虚拟化显示 + 后台行索引 + 搜索 + 导出
+    
+    示例:
+        self.result_view = ResultView()
+        self.result_view.set_text(result)
+    """
+    
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.buffer = None
+        self.generation = 0
+        self.thread_pool = QThreadPool.globalInstance()
+        self.model = ResultModel(self)
+        self._signals = _IndexSignals()
+        self._signals.chunk.connect(self._on_index_chunk)
+        self._signals.done.connect(self._on_index_finished)
+        self.init_ui()
+    
+    def init_ui(self):
+        """初始化界面"""
+        layout = QVBoxLayout(self)
+        layout.setContentsMargins(0, 0, 0, 0)
+        layout.setSpacing(4)
+        
+        tool_layout = QHBoxLayout()
+        self.search_edit = QLineEdit()
+        self.search_edit.setPlaceholderText("🔍 搜索结果...")
+        tool_layout.addWidget(self.search_edit)
+        self.btn_prev = QPushButton("⬆")
+        self.btn_prev.setMaximumWidth(36)
+        self.btn_next = QPushButton("⬇")
+        self.btn_next.setMaximumWidth(36)
+        tool_layout.addWidget(self.btn_prev)
+        tool_layout.addWidget(self.btn_next)
+        self.btn_export = QPushButton("💾 导出...")
+        tool_layout.addWidget(self.btn_export)
+        layout.addLayout(tool_layout)
+        
+        self.list_view = QListView()
+        self.list_view.setModel(self.model)
+        self.list_view.setUniformItemSizes(True)
+        self.list_view.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        self.list_view.setSelectionMode(QAbstractItemView.ExtendedSelection)
+        self.list_view.setFont(QFontDatabase.systemFont(QFontDatabase.FixedFont))
+        # 按行滚动：滚动条的值就是首个可见行号，跳转时直接设置，
+        # 不用 scrollTo（行数上百万时它要遍历全部行）
+        self.list_view.setVerticalScrollMode(QAbstractItemView.ScrollPerItem)
+        layout.addWidget(self.list_view)
+        
+        self.info_label = QLabel("")
+        layout.addWidget(self.info_label)
+        
+        self.search_edit.returnPressed.connect(self.find_next)
+        self.btn_next.clicked.connect(self.find_next)
+        self.btn_prev.clicked.connect(self.find_previous)
+        self.btn_export.clicked.connect(self.on_export_clicked)
+        QShortcut(QKeySequence.Copy, self.list_view, self.copy_selection)
+    
+    # ==================== 数据 ====================
+    
+    def set_text(self, result):
+        """
+        显示结果
+        
+        Args:
+            result: str / bytes，可以很大
+        """
+        self.clear()
+        if not result:
+            return
+        self.buffer = ResultBuffer(result)
+        self.model.set_buffer(self.buffer)
+        self._start_indexing()
+    
+    def clear(self):
+        """清空结果，正在进行的索引会被丢弃"""
+        self.generation += 1
+        self.model.set_buffer(None)
+        if self.buffer:
+            self.buffer.close()
+        self.buffer = None
+        self.info_label.setText("")
+    
+    def text(self):
+        """完整结果文本"""
+        if not self.buffer:
+            return ""
+        return self.buffer.slice(0, len(self.buffer)).decode('utf-8', errors='replace')
+    
+    def _start_indexing(self):
+        """在线程池中建立行索引"""
+        worker = TaskWorker(self._index_task, self.buffer, self.generation)
+        self.info_label.setText("⏳ 正在建立行索引...")
+        self.thread_pool.start(worker)
+    
+    def _index_task(self, buffer, generation):
+        """后台线程：建立索引，结果通过 _signals 排队送回主线程"""
+        complete = build_line_index(
+            buffer,
+            progress=lambda starts, done: self._signals.chunk.emit(generation, starts, done),
+            cancelled=lambda: generation != self.generation,
+        )
+        self._signals.done.emit(generation, complete)
+    
+    def _on_index_chunk(self, generation, starts, done):
+        """收到一块行索引"""
+        if generation != self.generation:
+            return
+        self.model.add_starts(starts)
+        self.info_label.setText(f"⏳ 正在建立行索引... {done * 100 // max(len(self.buffer), 1)}%  "
+                                f"已索引 {self.model.starts.size:,} 行")
+    
+    def _on_index_finished(self, generation, complete):
+        """行索引建立完成"""
+        if generation != self.generation or not complete:
+            return
+        self.model.finish()
+        self.info_label.setText(f"共 {self.model.rowCount():,} 行, {len(self.buffer):,} 字节")
+    
+    # ==================== 搜索 ====================
+    
+    def _current_offset(self):
+        """当前选中行的起始偏移"""
+        index = self.list_view.currentIndex()
+        if not index.isValid():
+            return None
+        return self.model.line_range(index.row())[0]
+    
+    def find_next(self):
+        """从当前行之后查找"""
+        self._find(forward=True)
+    
+    def find_previous(self):
+        """从当前行之前查找"""
+        self._find(forward=False)
+    
+    def _find(self, forward):
+        """在后备缓冲中查找关键字并跳转到所在行"""
+        query = self.search_edit.text()
+        if not query or not self.buffer:
+            return
+        needle = query.encode('utf-8')
+        current = self._current_offset()
+        if forward:
+            start = 0 if current is None else self.model.line_range(self.list_view.currentIndex().row())[1]
+            offset = self.buffer.find(needle, start)
+            if offset < 0:
+                offset = self.buffer.find(needle, 0)
+        else:
+            end = len(self.buffer) if current is None else current
+            offset = self.buffer.rfind(needle, end)
+            if offset < 0:
+                offset = self.buffer.rfind(needle, len(self.buffer))
+        
+        if offset < 0:
+            self.info_label.setText(f"未找到: {query}")
+            return
+        row = self.model.row_of_offset(offset)
+        if row >= self.model.rowCount():
+            self.info_label.setText("⏳ 匹配位于尚未索引的部分，请稍候")
+            return
+        index = self.model.index(row)
+        self.list_view.setCurrentIndex(index)
+        bar = self.list_view.verticalScrollBar()
+        bar.setValue(max(row - bar.pageStep() // 2, 0))
+        self.info_label.setText(f"第 {row + 1:,} 行, 偏移 0x{offset:x}")
+    
+    # ==================== 导出 / 复制 ====================
+    
+    def on_export_clicked(self):
+        """导出完整结果"""
+        if not self.buffer:
+            return
+        file_path, _ = QFileDialog.getSaveFileName(self, "导出结果", "", "文本文件 (*.txt);;所有文件 (*)")
+        if file_path:
+            self.buffer.export(file_path)
+            self.info_label.setText(f"💾 已导出到: {file_path}")
+    
+    def copy_selection(self):
+        """复制选中的行"""
+        rows = sorted(index.row() for index in self.list_view.selectionModel().selectedIndexes())
+        if rows:
+            QApplication.clipboard().setText("\n".join(self.model.line_text(row) for row in rows))
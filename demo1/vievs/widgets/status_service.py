@@ -0,0 +1,157 @@
+"""
+状态栏服务 - 合并高频状态消息，显示任务进度与吞吐量
+
+模块的 log() 可能每秒产生成千上万条消息，如果每条都调用 showMessage，
+主窗口会为每条消息重绘一次状态栏。StatusService 只记录最新的消息和进度，
+由定时器以固定频率（默认 30 Hz）统一刷新到界面。
+"""
+
+import time
+
+from PySide6.QtWidgets import QLabel, QProgressBar
+from PySide6.QtCore import QObject, QTimer
+
+
+class StatusService(QObject):
+    """
+    限频的状态栏服务（只能在主线程中调用）
+    
+    示例:
+        self.status = StatusService(self.statusBar(), self)
+        self.status.show_message("已加载")
+        self.status.begin_job("哈希破解", total=size)
+        self.status.update_progress(done, rate=speed, unit="H")
+        self.status.end_job()
+    """
+    
+    # 刷新频率 (Hz)
+    REFRESH_RATE = 30
+    # 未给出速率时，用于平滑计算吞吐量的系数
+    RATE_SMOOTHING = 0.3
+    
+    def __init__(self, statusbar, parent=None):
+        super().__init__(parent)
+        self.statusbar = statusbar
+        self._message = None
+        self._job = None
+        self._dirty = False
+        
+        self.progress_bar = QProgressBar()
+        self.progress_bar.setRange(0, 1000)
+        self.progress_bar.setMaximumWidth(160)
+        self.progress_bar.setTextVisible(False)
+        self.progress_bar.hide()
+        self.rate_label = QLabel()
+        self.rate_label.hide()
+        statusbar.addPermanentWidget(self.rate_label)
+        statusbar.addPermanentWidget(self.progress_bar)
+        
+        self._timer = QTimer(self)
+        self._timer.setInterval(1000 // self.REFRESH_RATE)
+        self._timer.timeout.connect(self.refresh)
+    
+    def show_message(self, message):
+        """设置状态消息，只有最新的一条会被显示"""
+        self._message = message
+        self._schedule()
+    
+    def begin_job(self, name, total=0, unit=""):
+        """
+        开始一个任务
+        
+        Args:
+            name (str): 任务名称
+            total (int): 总量，0 表示不确定（进度条显示为忙碌状态）
+            unit (str): 吞吐量单位，如 "B"、"H"
+        """
+        now = time.perf_counter()
+        self._job = {
+            'name': name, 'current': 0, 'total': total, 'unit': unit,
+            'rate': 0.0, 'explicit_rate': False, 'last_time': now, 'last_current': 0,
+        }
+        self._schedule()
+    
+    def update_progress(self, current, total=None, rate=None, unit=None):
+        """
+        更新任务进度
+        
+        Args:
+            current: 已完成量
+            total: 总量（可选，更新总量）
+            rate: 每秒处理量（可选，不给出时按进度变化自动估算）
+            unit: 吞吐量单位（可选）
+        """
+        if self._job is None:
+            self.begin_job("", total or 0, unit or "")
+        job = self._job
+        if total is not None:
+            job['total'] = total
+        if unit is not None:
+            job['unit'] = unit
+        if rate is not None:
+            job['rate'] = rate
+            job['explicit_rate'] = True
+        else:
+            now = time.perf_counter()
+            elapsed = now - job['last_time']
+            if elapsed > 0 and not job['explicit_rate']:
+                instant = (current - job['last_current']) / elapsed
+                job['rate'] += self.RATE_SMOOTHING * (instant - job['rate'])
+                job['last_time'] = now
+                job['last_current'] = current
+        job['current'] = current
+        self._schedule()
+    
+    def end_job(self, message=None):
+        """结束当前任务"""
+        self._job = None
+        if message is not None:
+            self._message = message
+        self._schedule()
+    
+    def _schedule(self):
+        """标记需要刷新，定时器空闲时启动"""
+        self._dirty = True
+        if not self._timer.isActive():
+            self.refresh()
+            self._timer.start()
+    
+    def refresh(self):
+        """把最新状态写到状态栏"""
+        if not self._dirty:
+            # 一个周期内没有新状态，停止定时器
+            self._timer.stop()
+            return
+        self._dirty = False
+        
+        if self._message is not None:
+            self.statusbar.showMessage(self._message)
+            self._message = None
+        
+        job = self._job
+        if job is None:
+            self.progress_bar.hide()
+            self.rate_label.hide()
+            return
+        
+        if job['total']:
+            self.progress_bar.setRange(0, 1000)
+            self.progress_bar.setValue(int(min(job['current'] / job['total'], 1.0) * 1000))
+        else:
+            self.progress_bar.setRange(0, 0)
+        self.progress_bar.show()
+        
+        text = job['name']
+        if job['rate']:
+            text = f"{text}  {format_rate(job['rate'], job['unit'])}".strip()
+        self.rate_label.setText(text)
+        self.rate_label.setVisible(bool(text))
+
+
+def format_rate(rate, unit=""):
+    """格式化吞吐量，如 12.3 MB/s、4.5 kH/s"""
+    for prefix in ("", "k", "M", "G"):
+        if abs(rate) < 1000 or prefix == "G":
+            break
+        rate /= 1000
+    return f"{rate:.1f} {prefix}{unit}/s" if prefix else f"{rate:.0f} {unit}/s"
@@ -0,0 +1,47 @@
+"""
+后台任务封装 - 在 QThreadPool 中执行耗时函数
+"""
+
+from PySide6.QtCore import QObject, QRunnable, Signal
+
+
+class WorkerSignals(QObject):
+    """
+    后台任务信号（在主线程中接收）
+    
+    Signals:
+        finished: 任务完成，携带函数返回值
+        failed: 任务抛出异常，携带错误信息
+        progress: 进度信息，由任务通过 signals.progress.emit 发送
+    """
+    
+    finished = Signal(object)
+    failed = Signal(str)
+    progress = Signal(object)
+
+
+class TaskWorker(QRunnable):
+    """
+    在线程池中执行 fn(*args, **kwargs)
+    
+    示例:
+        worker = TaskWorker(processor.scan, data)
+        worker.signals.finished.connect(self.on_scan_finished)
+        QThreadPool.globalInstance().start(worker)
+    """
+    
+    def __init__(self, fn, *args, **kwargs):
+        super().__init__()
+        self.fn = fn
+        self.args = args
+        self.kwargs = kwargs
+        self.signals = WorkerSignals()
+    
+    def run(self):
+        """执行任务"""
+        try:
+            result = self.fn(*self.args, **self.kwargs)
+        except Exception as e:
+            self.signals.failed.emit(str(e))
+        else:
+            self.signals.finished.emit(result)